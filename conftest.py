@@ -146,8 +146,10 @@ def _make_fake_redis() -> MagicMock:
     """
     A dict-backed Redis mock matching the surface our code uses.
 
-    String ops (get/set/delete/expire/exists/flushdb/publish) and list
-    ops (rpush/lpop/blpop) are modelled on the real Redis semantics so
+    String ops (get/set/incr/delete/expire/exists/flushdb/publish), list
+    ops (rpush/lpush/lpop/blpop/lrange/ltrim), set ops
+    (sadd/srem/smembers/scard) and hash counters (hincrby/hgetall) are
+    modelled on the real Redis semantics so
     test paths that exercise both — notably ``ReplyCollector.recv_json``
     via BLPOP — see realistic behaviour rather than no-ops.
     """
@@ -155,6 +157,9 @@ def _make_fake_redis() -> MagicMock:
 
     fake = MagicMock(name='FakeRedis')
     fake.get.side_effect = store.get
+    fake.mget.side_effect = lambda keys, *args: [
+        store.get(k) for k in [*keys, *args]
+    ]
 
     def _set(
         key: str,
@@ -226,9 +231,58 @@ def _make_fake_redis() -> MagicMock:
                 return (key, value)
         return None
 
+    def _incr(key: str, amount: int = 1) -> int:
+        value = int(store.get(key, 0)) + amount
+        store[key] = str(value)
+        return value
+
+    def _lpush(key: str, *values: Any) -> int:
+        bucket = store.setdefault(key, [])
+        for value in values:
+            bucket.insert(0, value)
+        return len(bucket)
+
+    def _lrange(key: str, start: int, end: int) -> list[Any]:
+        bucket = store.get(key) or []
+        return list(bucket[start : None if end == -1 else end + 1])
+
+    def _ltrim(key: str, start: int, end: int) -> bool:
+        if key in store:
+            store[key] = _lrange(key, start, end)
+        return True
+
+    def _sadd(key: str, *members: Any) -> int:
+        bucket = store.setdefault(key, set())
+        added = len(set(members) - bucket)
+        bucket.update(members)
+        return added
+
+    def _srem(key: str, *members: Any) -> int:
+        bucket = store.get(key) or set()
+        removed = len(bucket & set(members))
+        bucket.difference_update(members)
+        if not bucket:
+            store.pop(key, None)
+        return removed
+
+    def _hincrby(key: str, field: str, amount: int = 1) -> int:
+        bucket = store.setdefault(key, {})
+        bucket[field] = int(bucket.get(field, 0)) + amount
+        return int(bucket[field])
+
+    fake.hincrby.side_effect = _hincrby
+    fake.hgetall.side_effect = lambda key: dict(store.get(key) or {})
+    fake.sadd.side_effect = _sadd
+    fake.srem.side_effect = _srem
+    fake.smembers.side_effect = lambda key: set(store.get(key) or ())
+    fake.scard.side_effect = lambda key: len(store.get(key) or ())
     fake.rpush.side_effect = _rpush
     fake.lpop.side_effect = _lpop
     fake.blpop.side_effect = _blpop
+    fake.incr.side_effect = _incr
+    fake.lpush.side_effect = _lpush
+    fake.lrange.side_effect = _lrange
+    fake.ltrim.side_effect = _ltrim
     return fake
 
 
@@ -357,10 +411,23 @@ def _mock_redis(monkeypatch: pytest.MonkeyPatch) -> Iterator[MagicMock]:
     _seed_singleton(ViewerPublisher)
     _seed_singleton(ReplyCollector)
 
+    # Coalesced notifications flush on a timer thread that would fire
+    # after the test (and its mocks) are gone. Flush them inline instead,
+    # so a write still reaches ``send_to_viewer`` / ``publish_asset_change``
+    # before the test asserts on it — the notification equivalent of
+    # ``CELERY_ALWAYS_EAGER``. Tests of the window itself set it back.
+    monkeypatch.setattr('anthias_server.coalesce.COALESCE_WINDOW_S', 0)
+
     yield fake
 
     ViewerPublisher.INSTANCE = None
     ReplyCollector.INSTANCE = None
+    # Same for the server's playlist cache: it holds this test's fake
+    # (and a timeline of this test's rows), so drop it rather than let
+    # the next test hit a snapshot keyed on a revision it never wrote.
+    playlist = sys.modules.get('anthias_server.app.playlist')
+    if playlist is not None:
+        playlist.PlaylistCache.INSTANCE = None
 
 
 @pytest.fixture
@@ -0,0 +1,570 @@
+"""On-device cache for remote image assets.
+
+A remote image used to cross the network over and over: the webview
+fetched it every time it came round in the rotation, and
+``revalidate_asset_urls`` fetched it again every quarter of an hour
+(a HEAD, then a full GET whenever the origin refused HEAD) just to
+decide whether it was reachable. On a metered LTE uplink a 40-image
+playlist turned that into hundreds of MB a day for bytes that almost
+never change.
+
+This module keeps one local copy per URI, directly in ``assetdir``
+(the webview maps a local path to ``/anthias_assets/<basename>``, so
+the copy has to sit next to the uploads rather than in a
+subdirectory), plus a small JSON record per copy under
+``assetdir/.content-cache/`` holding the validators and the freshness
+the origin sent with it:
+
+* :func:`revalidate` is the one network path. A copy that is still
+  fresh by the origin's ``Cache-Control: max-age`` / ``Expires`` (or
+  the RFC 9111 heuristic off ``Last-Modified``) costs nothing; a stale
+  one costs a conditional GET, which is a bodiless 304 when nothing
+  changed. The reachability sweep and the viewer's lookahead both go
+  through it, so the probe that used to download the image now
+  refreshes the copy the viewer plays.
+* :func:`cached_path` is what the viewer plays: the local copy when
+  there is one, fresh or not -- revalidation happens off the display
+  path.
+* :func:`enforce_limit` keeps the copies inside ``content_cache_mb``,
+  least recently played first, and inside what
+  ``storage_health.disk_headroom`` says the card can spare. It lists
+  ``assetdir``, so a write doesn't call it unless a running total of
+  the copies' bytes, kept in Redis by every write and removal, says
+  the cache has outgrown its limit. The daily ``cleanup()`` pass and
+  the storage watcher call it regardless and reset the total.
+
+``no-store`` responses, bodies over the limit and assets marked
+``nocache`` are never stored. Web pages aren't either: the webview
+renders the live page through its own HTTP cache, which ``nocache``
+already controls.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import warnings
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import asdict, dataclass
+from datetime import UTC
+from email.utils import parsedate_to_datetime
+from os import path
+from typing import Any
+from urllib.parse import urlparse
+
+import certifi
+import redis
+import requests
+import urllib3
+
+from anthias_common import storage_health
+from anthias_common.utils import PROBE_HEADERS, validate_url
+from anthias_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Copies are named ``cache-<sha256 of the URI><ext>``. The prefix is
+# what celery's ``cleanup()`` recognises to leave them to
+# ``enforce_limit`` (or, for a marked copy, ``drop_copy``) instead of
+# sweeping them as orphans.
+CACHE_PREFIX = 'cache-'
+
+# Records live in a subdirectory: the webview never needs to reach
+# them, and a dot-directory stays out of the orphan sweep (which only
+# looks at regular files) and out of an operator's listing.
+META_DIRNAME = '.content-cache'
+
+# (connect, read) timeouts. The connect side matches the 10 s the
+# HEAD/GET probe in ``url_fails`` has always allowed.
+FETCH_TIMEOUT_S = (10, 30)
+
+FETCH_CHUNK_BYTES = 64 * 1024
+
+# RFC 9111 4.2.2: with no explicit lifetime, a cache may treat a
+# response as fresh for a fraction of the time since it last changed.
+# Capped at a day so an image untouched for years is still checked
+# daily.
+HEURISTIC_FRESHNESS_FRACTION = 0.1
+HEURISTIC_FRESHNESS_MAX_S = 24 * 60 * 60
+
+# LRU order is the copy's mtime, bumped when the viewer plays it. Only
+# bumped when it's older than this, so a short rotation doesn't write
+# an inode update to the SD card every few seconds.
+TOUCH_INTERVAL_S = 10 * 60
+
+# A copy without a record is normally the moment between writing the
+# body and its record; only one this old is an orphan. Matches the
+# guard ``cleanup()`` applies to the rest of assetdir.
+ORPHAN_GRACE_S = 60 * 60
+
+# The bytes of every copy, as of the last ``enforce_limit`` plus what
+# was written and removed since. Missing (Redis lost it) means
+# unknown, and the next write reconciles it.
+SIZE_KEY = 'content-cache:bytes'
+
+# Keep whatever extension the URL had (the webview's image loader is
+# happier with one) as long as it looks like an extension.
+_EXTENSION_RE = re.compile(r'^\.[A-Za-z0-9]{1,8}$')
+
+
+@dataclass
+class CacheEntry:
+    uri: str
+    size: int
+    fetched_at: float
+    fresh_until: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+
+def cache_limit_bytes() -> int:
+    return max(0, int(settings['content_cache_mb'])) * 1024 * 1024
+
+
+def is_cacheable(uri: str, nocache: bool = False) -> bool:
+    """Whether ``uri`` may be served from, and stored in, the cache."""
+    return (
+        not nocache
+        and cache_limit_bytes() > 0
+        and urlparse(uri).scheme in ('http', 'https')
+        and validate_url(uri)
+    )
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def _add_to_total(delta: int) -> int | None:
+    """Move the running total by ``delta``; the new total, or None
+    while it's unknown."""
+    try:
+        r = _redis()
+        if r.get(SIZE_KEY) is None:
+            return None
+        return int(r.incr(SIZE_KEY, delta))
+    except (redis.RedisError, TypeError, ValueError):
+        return None
+
+
+def _set_total(used: int) -> None:
+    try:
+        _redis().set(SIZE_KEY, used)
+    except redis.RedisError:
+        logger.debug('Could not record the content cache size')
+
+
+def _size_of(file_path: str) -> int:
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return 0
+
+
+def is_cache_file(name: str) -> bool:
+    return name.startswith(CACHE_PREFIX)
+
+
+def _digest(uri: str) -> str:
+    return hashlib.sha256(uri.encode('utf-8')).hexdigest()
+
+
+def copy_name(uri: str) -> str:
+    """The basename of ``uri``'s copy in ``assetdir``."""
+    _, ext = path.splitext(urlparse(uri).path)
+    if not _EXTENSION_RE.match(ext):
+        ext = ''
+    return f'{CACHE_PREFIX}{_digest(uri)}{ext}'
+
+
+def body_path(uri: str) -> str:
+    return path.join(settings['assetdir'], copy_name(uri))
+
+
+def _meta_dir() -> str:
+    return path.join(settings['assetdir'], META_DIRNAME)
+
+
+def _meta_path(uri: str) -> str:
+    return path.join(_meta_dir(), f'{_digest(uri)}.json')
+
+
+def load_entry(uri: str) -> CacheEntry | None:
+    try:
+        with open(_meta_path(uri)) as f:
+            entry = CacheEntry(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+    # A digest collision is not a practical concern, but a record that
+    # names some other URI is not this URI's record either way.
+    return entry if entry.uri == uri else None
+
+
+def _save_entry(entry: CacheEntry) -> None:
+    os.makedirs(_meta_dir(), exist_ok=True)
+    target = _meta_path(entry.uri)
+    partial = f'{target}.tmp'
+    with open(partial, 'w') as f:
+        json.dump(asdict(entry), f)
+    os.replace(partial, target)
+
+
+def drop(uri: str) -> None:
+    body = body_path(uri)
+    size = _size_of(body)
+    for file_path in (body, _meta_path(uri)):
+        _remove_quietly(file_path)
+    if size:
+        _add_to_total(-size)
+
+
+def drop_copy(name: str) -> None:
+    """Remove the copy called ``name`` and its record, for a caller
+    that knows the copy rather than its URI."""
+    digest = path.splitext(name[len(CACHE_PREFIX) :])[0]
+    body = path.join(settings['assetdir'], name)
+    size = _size_of(body)
+    _evict(body, path.join(_meta_dir(), f'{digest}.json'))
+    if size:
+        _add_to_total(-size)
+
+
+def cached_path(uri: str) -> str | None:
+    """The local copy of ``uri`` to play, or None if there isn't one.
+
+    The size check catches the moment between a refreshed body landing
+    and its record being rewritten (the body goes first): the remote
+    URI is played for that one rotation rather than a body the record
+    doesn't describe.
+    """
+    entry = load_entry(uri)
+    if entry is None:
+        return None
+    body = body_path(uri)
+    try:
+        stat = os.stat(body)
+    except OSError:
+        return None
+    if stat.st_size != entry.size:
+        return None
+    now = time.time()
+    if now - stat.st_mtime >= TOUCH_INTERVAL_S:
+        try:
+            os.utime(body, (now, now))
+        except OSError:
+            pass
+    return body
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+def freshness(headers: Mapping[str, str], now: float) -> float | None:
+    """When a response received at ``now`` goes stale; None if it must
+    not be stored at all (``no-store``).
+
+    Only what a private cache needs: ``s-maxage`` and ``private`` are
+    about shared caches and don't apply to a single device.
+    """
+    directives: dict[str, str] = {}
+    for part in (headers.get('Cache-Control') or '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return now
+    if 'max-age' in directives:
+        try:
+            return now + max(0, int(directives['max-age']))
+        except ValueError:
+            return now
+
+    expires = _http_date(headers.get('Expires'))
+    if expires is not None:
+        # Relative to the origin's own Date, so a device clock that
+        # disagrees with the origin's (a Pi has no RTC) doesn't stretch
+        # or cancel the lifetime.
+        date = _http_date(headers.get('Date'))
+        return now + max(0.0, expires - (now if date is None else date))
+
+    last_modified = _http_date(headers.get('Last-Modified'))
+    if last_modified is not None:
+        age = max(0.0, now - last_modified)
+        return now + min(
+            age * HEURISTIC_FRESHNESS_FRACTION, HEURISTIC_FRESHNESS_MAX_S
+        )
+    return now
+
+
+def revalidate(
+    uri: str,
+    verify_ssl: bool,
+    max_bytes: int | None = None,
+    session: requests.Session | None = None,
+) -> bool:
+    """Bring the cached copy of ``uri`` up to date; return whether the
+    asset can be shown.
+
+    True when the origin answered 2xx/304, when the copy is still fresh
+    (no request at all), or when the origin couldn't be reached but a
+    copy is on disk to play. Callers check :func:`is_cacheable` first.
+    ``max_bytes`` lowers the size limit for this one fetch (the
+    viewer's lookahead budget).
+    """
+    now = time.time()
+    entry = load_entry(uri)
+    if entry is not None and not path.isfile(body_path(uri)):
+        entry = None
+    if entry is not None and entry.is_fresh(now):
+        return True
+
+    headers = dict(PROBE_HEADERS)
+    if entry is not None:
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+    # Same verification policy as ``url_fails``: the certifi bundle
+    # when verifying, a bare False when the operator opted out.
+    verify: str | bool = certifi.where() if verify_ssl else False
+    get = session.get if session is not None else requests.get
+    try:
+        with warnings.catch_warnings():
+            if verify is False:
+                warnings.simplefilter(
+                    'ignore', urllib3.exceptions.InsecureRequestWarning
+                )
+            with get(
+                uri,
+                headers=headers,
+                stream=True,
+                allow_redirects=True,
+                timeout=FETCH_TIMEOUT_S,
+                verify=verify,
+            ) as response:
+                return _store(uri, response, entry, now, max_bytes)
+    except requests.exceptions.RequestException:
+        # Unreachable right now (DNS, refused, TLS, timeout, a
+        # connection dropped mid-body). The viewer plays the local copy
+        # regardless of the origin, so one on disk keeps the asset
+        # showable -- which is the point of caching on a flaky uplink.
+        return entry is not None
+
+
+def _store(
+    uri: str,
+    response: requests.Response,
+    entry: CacheEntry | None,
+    now: float,
+    max_bytes: int | None,
+) -> bool:
+    if response.status_code == 304:
+        if entry is not None:
+            fresh_until = freshness(response.headers, now)
+            entry.fetched_at = now
+            entry.fresh_until = now if fresh_until is None else fresh_until
+            entry.etag = response.headers.get('ETag') or entry.etag
+            entry.last_modified = (
+                response.headers.get('Last-Modified') or entry.last_modified
+            )
+            _write_quietly(uri, lambda: _save_entry(entry))
+        return True
+    if not response.ok:
+        return False
+
+    fresh_until = freshness(response.headers, now)
+    if fresh_until is None:
+        drop(uri)
+        return True
+
+    limit = cache_limit_bytes()
+    if max_bytes is not None:
+        limit = min(limit, max_bytes)
+    headroom = storage_health.disk_headroom(settings['assetdir'])
+    if headroom is not None:
+        limit = min(limit, headroom)
+
+    def _write() -> None:
+        body = body_path(uri)
+        replaced = _size_of(body)
+        size = _write_body(response, body, limit)
+        if size is None:
+            logger.debug('Not caching %s: over %d bytes', uri, limit)
+            drop(uri)
+            return
+        _save_entry(
+            CacheEntry(
+                uri=uri,
+                size=size,
+                fetched_at=now,
+                fresh_until=fresh_until,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+        )
+        total = _add_to_total(size - replaced)
+        if (
+            total is None
+            or total > cache_limit_bytes()
+            or (headroom is not None and headroom < size - replaced)
+        ):
+            enforce_limit()
+
+    _write_quietly(uri, _write)
+    return True
+
+
+def _write_quietly(uri: str, write: Callable[[], None]) -> None:
+    try:
+        write()
+    except OSError:
+        # A full or read-only card. The origin answered, so the asset
+        # is reachable; it just won't be cached this time.
+        # storage_health reports the card itself.
+        logger.warning('Could not cache %s', uri, exc_info=True)
+
+
+def _write_body(
+    response: requests.Response, target: str, limit: int
+) -> int | None:
+    """Stream the body to ``target``; None (and nothing written) if it
+    turns out larger than ``limit``."""
+    length = response.headers.get('Content-Length', '')
+    if limit <= 0 or (length.isdigit() and int(length) > limit):
+        return None
+    # ``.tmp`` so a crash mid-download is swept by ``cleanup()``.
+    partial = f'{target}.tmp'
+    written = 0
+    try:
+        with open(partial, 'wb') as f:
+            for chunk in response.iter_content(FETCH_CHUNK_BYTES):
+                written += len(chunk)
+                if written > limit:
+                    return None
+                f.write(chunk)
+        os.replace(partial, target)
+    finally:
+        # Gone after a successful replace; otherwise what an error or
+        # an over-limit abort left behind.
+        _remove_quietly(partial)
+    return written
+
+
+def enforce_limit(keep_uris: Collection[str] | None = None) -> int:
+    """Evict copies until the cache fits; return the bytes freed.
+
+    Least recently played goes first. The limit is ``content_cache_mb``
+    or, when ``storage_health.disk_headroom`` says free space is
+    already inside the reserve, whatever is left after giving that
+    space back. ``keep_uris`` (``cleanup()``'s daily full pass passes
+    every asset URI) also evicts copies no asset refers to any more.
+    Records without a copy, and copies whose record never arrived, are
+    tidied up too.
+    """
+    asset_dir = settings['assetdir']
+    now = time.time()
+    copies: list[tuple[float, int, str, str]] = []
+    try:
+        scan = list(os.scandir(asset_dir))
+    except OSError:
+        return 0
+    for dir_entry in scan:
+        if (
+            not is_cache_file(dir_entry.name)
+            or dir_entry.name.endswith('.tmp')
+            or not dir_entry.is_file()
+        ):
+            continue
+        digest = path.splitext(dir_entry.name[len(CACHE_PREFIX) :])[0]
+        try:
+            stat = dir_entry.stat()
+        except OSError:
+            continue
+        copies.append((stat.st_mtime, stat.st_size, dir_entry.path, digest))
+
+    records: dict[str, str] = {}
+    try:
+        record_names = os.listdir(_meta_dir())
+    except OSError:
+        record_names = []
+    for name in record_names:
+        if name.endswith('.json'):
+            records[name[: -len('.json')]] = path.join(_meta_dir(), name)
+    digests = {copy[3] for copy in copies}
+    for digest, record in records.items():
+        if digest not in digests:
+            _remove_quietly(record)
+
+    def _unwanted(digest: str, mtime: float) -> bool:
+        record = records.get(digest)
+        if record is None:
+            return now - mtime >= ORPHAN_GRACE_S
+        if keep_uris is None:
+            return False
+        try:
+            with open(record) as f:
+                return json.load(f).get('uri') not in keep_uris
+        except (OSError, ValueError, AttributeError):
+            return True
+
+    freed = 0
+    kept: list[tuple[float, int, str, str]] = []
+    for copy in copies:
+        mtime, size, body, digest = copy
+        if _unwanted(digest, mtime):
+            _evict(body, records.get(digest))
+            freed += size
+        else:
+            kept.append(copy)
+
+    used = sum(copy[1] for copy in kept)
+    limit = cache_limit_bytes()
+    headroom = storage_health.disk_headroom(asset_dir)
+    if headroom is not None and headroom < 0:
+        limit = min(limit, max(0, used + headroom))
+    for _, size, body, digest in sorted(kept):
+        if used <= limit:
+            break
+        _evict(body, records.get(digest))
+        used -= size
+        freed += size
+
+    _set_total(used)
+    if freed:
+        logger.info('Content cache: freed %d bytes', freed)
+    return freed
+
+
+def _evict(body: str, record: str | None) -> None:
+    if record is not None:
+        _remove_quietly(record)
+    _remove_quietly(body)
+
+
+def _remove_quietly(file_path: str) -> None:
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.debug('Could not remove %s', file_path, exc_info=True)
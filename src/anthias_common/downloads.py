@@ -0,0 +1,554 @@
+"""Resumable HTTP downloads into a ``.part`` file.
+
+The remote-video task and the provider importer both used to fetch a
+file in one GET into a ``.part`` that was deleted on any error, so a
+link that dropped at 90% of a 2 GB video sent the next attempt back to
+byte zero — on a flaky site uplink, a retry loop that never finished.
+``fetch`` keeps what already landed instead:
+
+* when the origin advertises ``Accept-Ranges: bytes`` and a validator
+  (a strong ``ETag`` or ``Last-Modified``), the bytes written so far
+  are tracked in a small JSON sidecar next to the ``.part``, and a
+  dropped connection resumes with ``Range`` + ``If-Range`` — within the
+  same call, and across calls (a Celery retry, a re-run import);
+* large files can be fetched as N range segments in parallel, which is
+  what gets a CDN that throttles per connection up to link speed;
+* before returning, the length is checked against what the origin
+  announced and every range response's ``ETag`` against the first one,
+  so a file that changed under the download is refetched rather than
+  stitched together from two versions.
+
+Origins that don't support ranges (or don't say what version they're
+serving) get the old single GET, without a sidecar. The caller still
+owns the final ``os.replace`` into place and cleaning up on a
+permanent failure (``discard``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# 1 MiB is the sweet spot for the Pi-class SD-card writer: smaller
+# chunks add per-write syscall overhead, larger chunks tie up RAM that
+# could be feeding the kernel page cache.
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Below this a single stream is as fast as several and the extra
+# requests just add round trips.
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+# How much can land between two sidecar checkpoints — i.e. the most a
+# crash or a hard task kill can cost the next attempt.
+CHECKPOINT_BYTES = 16 * 1024 * 1024
+
+# How often ``progress`` is called while bytes are arriving.
+PROGRESS_INTERVAL_S = 5.0
+
+# In-call resumes after a transient error, before it's handed back to
+# the caller (whose own retry resumes from the sidecar).
+RESUME_ATTEMPTS = 3
+RESUME_BACKOFF_S = 2.0
+
+STATE_SUFFIX = '.state'
+
+_CONTENT_RANGE_RE = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+Progress = Callable[[int, int | None], None]
+
+
+class DownloadError(Exception):
+    """A permanent failure: asking again would get the same answer."""
+
+
+class DownloadTooLarge(DownloadError):
+    pass
+
+
+class EmptyDownload(DownloadError):
+    pass
+
+
+class IncompleteDownload(OSError):
+    """The body ended short and the resumes ran out. An ``OSError`` so
+    callers that retry transient I/O errors retry this too."""
+
+
+class _Restart(Exception):
+    """The origin's copy changed (or forgot the range) mid-download."""
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int  # exclusive
+    done: int = 0
+
+    @property
+    def position(self) -> int:
+        return self.start + self.done
+
+    @property
+    def remaining(self) -> int:
+        return self.end - self.position
+
+
+def state_path(part_path: str) -> str:
+    return part_path + STATE_SUFFIX
+
+
+def discard(part_path: str) -> None:
+    """Remove a ``.part`` and its sidecar (a permanent failure, or a
+    download that is no longer wanted)."""
+    for leftover in (part_path, state_path(part_path)):
+        try:
+            os.remove(leftover)
+        except OSError:
+            pass
+
+
+def _validator(response: Any) -> str | None:
+    """The ``If-Range`` value for ``response``: a strong ETag, else its
+    Last-Modified. Weak ETags can't be used with ``If-Range``."""
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return str(etag)
+    last_modified = response.headers.get('Last-Modified')
+    return str(last_modified) if last_modified else None
+
+
+def _content_length(response: Any) -> int | None:
+    encoding = (response.headers.get('Content-Encoding') or '').lower()
+    if encoding not in ('', 'identity'):
+        # ``iter_content`` decodes, so the announced length isn't the
+        # number of bytes that will land.
+        return None
+    try:
+        return int(response.headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _accepts_ranges(response: Any) -> bool:
+    return 'bytes' in (response.headers.get('Accept-Ranges') or '').lower()
+
+
+class _Download:
+    def __init__(
+        self,
+        session: requests.Session,
+        url: str,
+        part_path: str,
+        *,
+        max_bytes: int,
+        timeout: Any,
+        headers: dict[str, str],
+        check_response: Callable[[Any], None] | None,
+        segments: int,
+        progress: Progress | None,
+    ) -> None:
+        self.session = session
+        self.url = url
+        self.part_path = part_path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        # Ranges count encoded bytes; ask for the file as stored.
+        self.headers = {**headers, 'Accept-Encoding': 'identity'}
+        self.check_response = check_response
+        self.max_segments = max(1, segments)
+        self.progress = progress
+
+        self.length: int | None = None
+        self.validator: str | None = None
+        self.segments: list[_Segment] = []
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self._fd = -1
+        self._checkpointed = 0
+        self._reported_at = time.monotonic()
+
+    @property
+    def resumable(self) -> bool:
+        return self.length is not None and self.validator is not None
+
+    @property
+    def written(self) -> int:
+        return sum(segment.done for segment in self.segments)
+
+    # -- sidecar ---------------------------------------------------------
+
+    def load_state(self) -> bool:
+        try:
+            with open(state_path(self.part_path)) as fh:
+                state = json.load(fh)
+            if state['url'] != self.url or not os.path.exists(self.part_path):
+                return False
+            length = int(state['length'])
+            validator = str(state['validator'])
+            segments = [
+                _Segment(int(start), int(end), int(done))
+                for start, end, done in state['segments']
+            ]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self.length, self.validator, self.segments = (
+            length,
+            validator,
+            segments,
+        )
+        return True
+
+    def _save_state(self) -> None:
+        """Write the sidecar — after an fsync, so it never claims bytes
+        the ``.part`` doesn't have yet."""
+        if not self.resumable:
+            return
+        os.fsync(self._fd)
+        state = {
+            'url': self.url,
+            'length': self.length,
+            'validator': self.validator,
+            'segments': [
+                [segment.start, segment.end, segment.done]
+                for segment in self.segments
+            ],
+        }
+        target = state_path(self.part_path)
+        with open(target + '.tmp', 'w') as fh:
+            json.dump(state, fh)
+        os.replace(target + '.tmp', target)
+        self._checkpointed = self.written
+
+    # -- requests --------------------------------------------------------
+
+    def _get(self, extra_headers: dict[str, str] | None = None) -> Any:
+        return self.session.get(
+            self.url,
+            headers={**self.headers, **(extra_headers or {})},
+            stream=True,
+            allow_redirects=True,
+            timeout=self.timeout,
+        )
+
+    def _check(self, response: Any) -> None:
+        if self.check_response is not None:
+            self.check_response(response)
+        elif response.status_code >= 400:
+            raise DownloadError(f'HTTP {response.status_code}')
+
+    def _start(self) -> Any | None:
+        """First request of a fresh download. Returns the response when
+        its body should be streamed as the single segment, or None once
+        the file has been split into range segments."""
+        self._close()
+        discard(self.part_path)
+        response = self._get()
+        try:
+            self._check(response)
+            self.length = _content_length(response)
+            self.validator = (
+                _validator(response) if _accepts_ranges(response) else None
+            )
+            if self.length is not None and self.length > self.max_bytes:
+                raise DownloadTooLarge(
+                    f'{self.length} bytes exceeds the {self.max_bytes} '
+                    'byte limit'
+                )
+            self._open()
+            if (
+                self.resumable
+                and self.max_segments > 1
+                and self.length is not None
+                and self.length >= PARALLEL_MIN_BYTES
+            ):
+                self._split(self.max_segments)
+                self._save_state()
+                response.close()
+                return None
+            # Unknown length: one open-ended segment, capped as it
+            # streams.
+            end = self.max_bytes + 1 if self.length is None else self.length
+            self.segments = [_Segment(0, end)]
+            return response
+        except BaseException:
+            response.close()
+            raise
+
+    def _split(self, count: int) -> None:
+        assert self.length is not None
+        size = -(-self.length // count)
+        self.segments = [
+            _Segment(start, min(start + size, self.length))
+            for start in range(0, self.length, size)
+        ]
+
+    def _open(self) -> None:
+        if self._fd < 0:
+            self._fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if self.length is not None:
+            # Segments write at their own offsets; size the file up
+            # front (sparse) so each can land wherever it is.
+            os.ftruncate(self._fd, self.length)
+
+    def _close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _range_response(self, segment: _Segment) -> Any:
+        assert self.validator is not None
+        response = self._get(
+            {
+                'Range': f'bytes={segment.position}-{segment.end - 1}',
+                'If-Range': self.validator,
+            }
+        )
+        try:
+            if response.status_code != 206:
+                if response.status_code not in (200, 416):
+                    # A 5xx is transient: HTTPError is an OSError.
+                    response.raise_for_status()
+                # 200: If-Range didn't match (or the origin ignored
+                # Range) and this is the whole, possibly different,
+                # file; 416: the range no longer fits it.
+                raise _Restart()
+            match = _CONTENT_RANGE_RE.fullmatch(
+                response.headers.get('Content-Range') or ''
+            )
+            etag = response.headers.get('ETag')
+            if (
+                match is None
+                or int(match.group(1)) != segment.position
+                or int(match.group(3)) != self.length
+                or (
+                    etag
+                    and self.validator.startswith('"')
+                    and etag != self.validator
+                )
+            ):
+                raise _Restart()
+        except BaseException:
+            response.close()
+            raise
+        return response
+
+    # -- transfer --------------------------------------------------------
+
+    def _stream(
+        self, response: Any, segment: _Segment, *, report: bool
+    ) -> None:
+        with response:
+            for chunk in response.iter_content(
+                chunk_size=DOWNLOAD_CHUNK_BYTES
+            ):
+                if self._abort.is_set():
+                    return
+                if not chunk:
+                    # iter_content yields empty bytes for keep-alive
+                    # padding on some servers; skip rather than
+                    # treating as EOF.
+                    continue
+                chunk = chunk[: segment.remaining]
+                if self.length is None and (
+                    segment.done + len(chunk) > self.max_bytes
+                ):
+                    raise DownloadTooLarge(
+                        f'download exceeded the {self.max_bytes} byte limit'
+                    )
+                os.pwrite(self._fd, chunk, segment.position)
+                with self._lock:
+                    segment.done += len(chunk)
+                    if self.written - self._checkpointed >= CHECKPOINT_BYTES:
+                        self._save_state()
+                if report:
+                    self._report()
+                if segment.remaining <= 0:
+                    return
+
+    def _fetch_segment(
+        self, segment: _Segment, *, report: bool = False
+    ) -> None:
+        if segment.remaining > 0:
+            self._stream(self._range_response(segment), segment, report=report)
+
+    def _report(self) -> None:
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if now - self._reported_at >= PROGRESS_INTERVAL_S:
+            self._reported_at = now
+            self.progress(self.written, self.length)
+
+    def _transfer(self) -> None:
+        """Fetch every unfinished segment; the calling thread reports
+        progress (it may touch the database, which worker threads
+        mustn't)."""
+        pending = [s for s in self.segments if s.remaining > 0]
+        if len(pending) <= 1:
+            for segment in pending:
+                self._fetch_segment(segment, report=True)
+            return
+        self._abort.clear()
+        with ThreadPoolExecutor(
+            max_workers=len(pending), thread_name_prefix='download'
+        ) as pool:
+            futures = [pool.submit(self._fetch_segment, s) for s in pending]
+            not_done = set(futures)
+            while not_done:
+                done, not_done = wait(
+                    not_done,
+                    timeout=PROGRESS_INTERVAL_S,
+                    return_when=FIRST_EXCEPTION,
+                )
+                self._report()
+                failed = [f for f in done if f.exception() is not None]
+                if failed:
+                    self._abort.set()
+                    for future in not_done:
+                        future.cancel()
+                    exc = failed[0].exception()
+                    assert exc is not None
+                    raise exc
+
+    def _verify(self) -> None:
+        written = self.written
+        if written == 0:
+            raise EmptyDownload('origin returned zero bytes')
+        if self.length is None:
+            os.ftruncate(self._fd, written)
+            return
+        if any(segment.remaining > 0 for segment in self.segments):
+            raise IncompleteDownload(f'got {written} of {self.length} bytes')
+        if os.fstat(self._fd).st_size != self.length:
+            raise IncompleteDownload(
+                f'.part is {os.fstat(self._fd).st_size} bytes, '
+                f'expected {self.length}'
+            )
+
+    def run(self) -> int:
+        resumed = self.load_state()
+        if resumed:
+            logger.info(
+                'Resuming download of %s at %d of %d bytes',
+                self.url,
+                self.written,
+                self.length,
+            )
+            self._open()
+        restarts = 0
+        attempts = 0
+        try:
+            while True:
+                try:
+                    if not resumed:
+                        response = self._start()
+                        resumed = True
+                        if response is not None:
+                            self._stream(
+                                response, self.segments[0], report=True
+                            )
+                    if not self.resumable:
+                        # Nothing to resume from: whatever landed is
+                        # what ``_verify`` gets to judge.
+                        break
+                    self._transfer()
+                    if all(s.remaining <= 0 for s in self.segments):
+                        break
+                    # A stream that ended short without an error;
+                    # resume the rest.
+                    raise IncompleteDownload(
+                        f'got {self.written} of {self.length} bytes'
+                    )
+                except _Restart:
+                    restarts += 1
+                    if restarts > 1:
+                        raise IncompleteDownload(
+                            f'{self.url} changed during the download'
+                        ) from None
+                    logger.info('%s changed; restarting download', self.url)
+                    resumed = False
+                except OSError:
+                    # requests' errors are OSErrors too. Resumable:
+                    # keep what landed and go again from there.
+                    attempts += 1
+                    if not self.resumable or attempts > RESUME_ATTEMPTS:
+                        raise
+                    logger.info(
+                        'Download of %s interrupted at %d of %d bytes; '
+                        'resuming',
+                        self.url,
+                        self.written,
+                        self.length,
+                        exc_info=True,
+                    )
+                    time.sleep(RESUME_BACKOFF_S * attempts)
+            self._verify()
+        except BaseException:
+            if self._fd >= 0 and self.resumable:
+                try:
+                    self._save_state()
+                except OSError:
+                    logger.warning('Could not checkpoint %s', self.part_path)
+            raise
+        finally:
+            self._close()
+        try:
+            os.remove(state_path(self.part_path))
+        except OSError:
+            pass
+        return self.written
+
+
+def fetch(
+    session: requests.Session,
+    url: str,
+    part_path: str,
+    *,
+    max_bytes: int,
+    timeout: Any,
+    headers: dict[str, str] | None = None,
+    check_response: Callable[[Any], None] | None = None,
+    segments: int = 1,
+    progress: Progress | None = None,
+) -> int:
+    """Download ``url`` into ``part_path`` and return its size.
+
+    Picks up where an earlier call left off when ``part_path`` has a
+    sidecar from one. ``check_response`` sees the first full response
+    (status, Content-Type) and raises whatever the caller uses for a
+    rejected download; without one any 4xx/5xx is a ``DownloadError``.
+    ``segments`` > 1 fetches files of ``PARALLEL_MIN_BYTES`` or more as
+    that many parallel ranges. ``progress(written, total)`` is called
+    every ``PROGRESS_INTERVAL_S`` while bytes arrive, from the calling
+    thread.
+
+    Raises ``DownloadTooLarge`` / ``EmptyDownload`` for permanent
+    failures, and leaves transient ones (``OSError``, which covers
+    ``requests.RequestException`` and ``IncompleteDownload``) to the
+    caller's retry with the ``.part`` and sidecar in place when the
+    download can be resumed. The caller removes them (``discard``) once
+    it gives up.
+    """
+    return _Download(
+        session,
+        url,
+        part_path,
+        max_bytes=max_bytes,
+        timeout=timeout,
+        headers=headers or {},
+        check_response=check_response,
+        segments=segments,
+        progress=progress,
+    ).run()
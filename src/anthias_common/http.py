@@ -7,7 +7,7 @@ default ``python-requests/<x.y>``.
 
 Spoofed-UA traffic (the URL-availability probe in
 ``anthias_common.utils`` that pretends to be Safari to dodge anti-bot
-pages) deliberately bypasses this — it sets its own header inline.
+pages) deliberately bypasses this — it sends ``utils.PROBE_HEADERS``.
 """
 
 from __future__ import annotations
@@ -0,0 +1,169 @@
+"""One ffprobe per media file, shared by everything that asks.
+
+The normalise task's codec gate, the duration probe behind the v1.1
+create path and ``probe_video_duration``, and the serializer's inline
+duration lookup each shelled out to ffprobe on their own — the same
+file could be probed three times on its way into rotation, and every
+probe of a multi-GB file on an SD card costs seconds. ``probe`` runs
+ffprobe once (streams and format in a single JSON document) and keeps
+the answer in Redis under the file's identity: device, inode, size and
+mtime. Any rewrite of the file changes at least one of those, so a
+cached answer is never served for different bytes — and two asset
+files that are links to one blob (see ``anthias_server.blobstore``)
+share an entry.
+
+``probe_many`` fans a batch out over a bounded pool, so a bulk import
+of a few hundred videos is inspected with several ffprobe processes at
+once instead of one per Celery task in turn; the per-asset tasks that
+follow read the cache.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any
+
+import redis
+import sh
+
+logger = logging.getLogger(__name__)
+
+# Wall-clock cap on one ffprobe. A working ffprobe answers in under a
+# second on small files; 60s covers a stalled-IO worst case and stops
+# a hung process from blocking the caller indefinitely.
+PROBE_TIMEOUT_S = 60
+
+# The key already changes whenever the file does; the TTL only bounds
+# how long answers for deleted files sit in Redis.
+CACHE_TTL_S = 7 * 24 * 60 * 60
+
+CACHE_KEY_PREFIX = 'mediainfo:probe:'
+
+# ffprobe is mostly waiting on the card, so a few at once overlap the
+# seeks without starving the viewer of CPU on a quad-core Pi.
+PROBE_CONCURRENCY = max(1, min(4, os.cpu_count() or 1))
+
+
+def cache_key(file_path: str) -> str | None:
+    """The cache key for ``file_path`` as it is now, or None if it
+    can't be stat'ed (the probe then runs uncached and reports the
+    real error)."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (
+        f'{CACHE_KEY_PREFIX}{st.st_dev}:{st.st_ino}:{st.st_size}'
+        f':{st.st_mtime_ns}'
+    )
+
+
+def _cache_get(key: str) -> dict[str, Any] | None:
+    from anthias_common.utils import connect_to_redis
+
+    try:
+        raw = connect_to_redis().get(key)
+    except redis.RedisError:
+        return None
+    if raw is None:
+        return None
+    try:
+        cached: dict[str, Any] = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return cached
+
+
+def _cache_set(key: str, result: dict[str, Any]) -> None:
+    from anthias_common.utils import connect_to_redis
+
+    try:
+        connect_to_redis().set(key, json.dumps(result), ex=CACHE_TTL_S)
+    except redis.RedisError:
+        # Only a lost shortcut; the next caller probes again.
+        logger.debug('mediainfo: could not cache probe for %s', key)
+
+
+def run_ffprobe(file_path: str) -> dict[str, Any]:
+    """ffprobe's parsed JSON for ``file_path``, uncached.
+
+    ``-show_format -show_streams`` in one document: container metadata
+    and every stream's codec. A non-zero exit (corrupt file, no
+    streams), a timeout or a missing ffprobe raise the ``sh``
+    exception for the caller to classify.
+    """
+    out = sh.ffprobe(
+        '-v',
+        'error',
+        '-show_format',
+        '-show_streams',
+        '-print_format',
+        'json',
+        file_path,
+        _timeout=PROBE_TIMEOUT_S,
+    )
+    parsed: dict[str, Any] = json.loads(str(out))
+    return parsed
+
+
+def probe(file_path: str) -> dict[str, Any]:
+    """ffprobe's streams + format for ``file_path``, from the cache
+    when this exact file has been probed before."""
+    key = cache_key(file_path)
+    if key is not None:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+    result = run_ffprobe(file_path)
+    if key is not None:
+        _cache_set(key, result)
+    return result
+
+
+def probe_many(
+    file_paths: Iterable[str], max_workers: int = PROBE_CONCURRENCY
+) -> dict[str, dict[str, Any] | Exception]:
+    """Probe every path, up to ``max_workers`` ffprobes at a time.
+
+    Returns each path's result, or the exception its probe raised —
+    one unreadable file doesn't fail the batch. Cached files cost a
+    Redis ``GET`` and never reach the pool's ffprobe.
+    """
+    paths = list(dict.fromkeys(file_paths))
+    results: dict[str, dict[str, Any] | Exception] = {}
+    if not paths:
+        return results
+
+    def _one(file_path: str) -> dict[str, Any] | Exception:
+        try:
+            return probe(file_path)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(paths))),
+        thread_name_prefix='mediainfo',
+    ) as pool:
+        for file_path, result in zip(paths, pool.map(_one, paths)):
+            results[file_path] = result
+    return results
+
+
+def duration(result: dict[str, Any]) -> timedelta | None:
+    """The container duration a probe reported, if any."""
+    raw = (result.get('format') or {}).get('duration')
+    if raw is None:
+        return None
+    try:
+        seconds = float(raw)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(seconds) or seconds < 0:
+        return None
+    return timedelta(seconds=seconds)
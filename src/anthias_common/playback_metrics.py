@@ -0,0 +1,228 @@
+"""Playback metrics: how long assets take to appear, and how well
+videos play once they have.
+
+``asset_loop`` logs "Showing asset" and nothing after it, so the
+question "is this playlist too heavy for a Pi 3?" had no answer short
+of watching the screen with a stopwatch. The viewer now records, per
+board:
+
+* **load latency** (``load_ms``, per asset kind) -- from the moment the
+  viewer starts showing an asset to the moment the webview or the
+  video player has accepted it: the ``loadImage``/``loadPage``/
+  ``playVideo`` D-Bus round trip, or the GStreamer helper's spawn,
+  including a webview respawn if one was needed first;
+* **time to first frame** (``first_frame_ms``, per video player) --
+  from ``play()`` to the first frame. The GStreamer helper measures it
+  to its first preroll (``ASYNC_DONE``); on the QtMultimedia path it is
+  the time before the webview reported the media loaded, derived from
+  the ``STOP`` line of the webview's playback-stats log;
+* **loop gaps** (``loop_gap_ms``) -- how long a looping clip stalls
+  when the GStreamer helper has to fall back from the gapless
+  ``about-to-finish`` re-queue to a seek or a pipeline restart;
+* **frame counters** (``frames_rendered``/``frames_dropped``/
+  ``frames_late``, per video player) and the number of **webview
+  respawns** during playback.
+
+Durations land in fixed-bucket histograms (``BUCKETS_MS``), stored as
+one Redis hash per histogram with a counter per bucket plus the sample
+count and sum, so recording is a few ``HINCRBY`` and the numbers
+survive viewer restarts. Fixed buckets are what make devices
+comparable: a fleet tool can add up the same buckets across every Pi 3
+and every Pi 5 and compare the two distributions directly.
+
+Best-effort throughout: this runs on the ``asset_loop`` thread, and a
+Redis hiccup must cost a missing sample, never a missed asset.
+"""
+
+import logging
+from typing import Any
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'anthias.playback.'
+COUNTERS_KEY = REDIS_KEY_PREFIX + 'counters'
+
+# Upper bounds of the histogram buckets, in milliseconds. A sample is
+# counted in the first bucket it fits under, or in ``+Inf``.
+BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+PLAYERS = ('gst-fbdev', 'qtmultimedia')
+
+# Histogram name -> the labels it is split by.
+HISTOGRAMS: dict[str, tuple[str, ...]] = {
+    'load_ms': ('image', 'web', 'video'),
+    'first_frame_ms': PLAYERS,
+    'loop_gap_ms': PLAYERS,
+}
+
+# Counter name -> the labels it is split by. A webview respawn either
+# interrupts a D-Bus call (the process died under it) or is found
+# between assets (it died, or was bounced for a rotation change).
+COUNTERS: dict[str, tuple[str, ...]] = {
+    'videos': PLAYERS,
+    'frames_rendered': PLAYERS,
+    'frames_dropped': PLAYERS,
+    'frames_late': PLAYERS,
+    'webview_respawns': ('mid_call', 'between_assets'),
+}
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def _histogram_key(name: str, label: str) -> str:
+    return f'{REDIS_KEY_PREFIX}{name}.{label}'
+
+
+def _bucket(value_ms: float) -> str:
+    for bound in BUCKETS_MS:
+        if value_ms <= bound:
+            return str(bound)
+    return '+Inf'
+
+
+def observe(name: str, label: str, value_ms: float) -> None:
+    """Add one sample to histogram ``name`` under ``label``."""
+    if label not in HISTOGRAMS.get(name, ()):
+        raise ValueError(f'Unknown histogram {name}/{label}')
+    if value_ms < 0:
+        return
+    key = _histogram_key(name, label)
+    try:
+        r = _redis()
+        r.hincrby(key, _bucket(value_ms), 1)
+        r.hincrby(key, 'count', 1)
+        r.hincrby(key, 'sum', round(value_ms))
+    except redis.RedisError:
+        logger.debug('Could not record %s/%s', name, label, exc_info=True)
+
+
+def increment(name: str, label: str, amount: int = 1) -> None:
+    """Add ``amount`` to counter ``name`` under ``label``."""
+    if label not in COUNTERS.get(name, ()):
+        raise ValueError(f'Unknown counter {name}/{label}')
+    if amount <= 0:
+        return
+    try:
+        _redis().hincrby(COUNTERS_KEY, f'{name}.{label}', amount)
+    except redis.RedisError:
+        logger.debug('Could not count %s/%s', name, label, exc_info=True)
+
+
+def record_video(
+    player: str,
+    *,
+    first_frame_ms: float | None = None,
+    rendered: int | None = None,
+    dropped: int | None = None,
+    late: int | None = None,
+    loop_gaps_ms: list[float] | None = None,
+) -> None:
+    """Record one video's run. ``None`` means the player could not
+    tell, which is not the same as zero and is left out."""
+    increment('videos', player)
+    if first_frame_ms is not None:
+        observe('first_frame_ms', player, first_frame_ms)
+    for gap_ms in loop_gaps_ms or ():
+        observe('loop_gap_ms', player, gap_ms)
+    for name, value in (
+        ('frames_rendered', rendered),
+        ('frames_dropped', dropped),
+        ('frames_late', late),
+    ):
+        if value is not None:
+            increment(name, player, value)
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _decode(raw: dict[Any, Any]) -> dict[str, int]:
+    return {
+        (k.decode() if isinstance(k, bytes) else str(k)): _int(v)
+        for k, v in (raw or {}).items()
+    }
+
+
+def _summarise(raw: dict[str, int]) -> dict[str, Any]:
+    count = raw.get('count', 0)
+    total = raw.get('sum', 0)
+    # Cumulative, Prometheus-style: each bucket counts every sample at
+    # or under its bound, so buckets from different devices add up.
+    buckets: dict[str, int] = {}
+    running = 0
+    for bound in (*map(str, BUCKETS_MS), '+Inf'):
+        running += raw.get(bound, 0)
+        buckets[bound] = running
+
+    def quantile(q: float) -> int | None:
+        # The bound of the bucket the q-th sample falls in: an upper
+        # estimate, as precise as the buckets are. None when there are
+        # no samples, or when it is past the last bound.
+        if not count:
+            return None
+        rank = q * count
+        for bound in BUCKETS_MS:
+            if buckets[str(bound)] >= rank:
+                return bound
+        return None
+
+    return {
+        'count': count,
+        'sum_ms': total,
+        'mean_ms': round(total / count) if count else None,
+        'p50_ms': quantile(0.5),
+        'p95_ms': quantile(0.95),
+        'buckets': buckets,
+    }
+
+
+def read() -> dict[str, Any]:
+    """Every histogram and counter, labelled, with zero for anything
+    never recorded. Empty when Redis is unreachable."""
+    try:
+        r = _redis()
+        histograms = {
+            name: {
+                label: _summarise(
+                    _decode(r.hgetall(_histogram_key(name, label)))
+                )
+                for label in labels
+            }
+            for name, labels in HISTOGRAMS.items()
+        }
+        raw_counters = _decode(r.hgetall(COUNTERS_KEY))
+    except redis.RedisError:
+        logger.warning('Could not read playback metrics', exc_info=True)
+        return {}
+    counters = {
+        name: {
+            label: raw_counters.get(f'{name}.{label}', 0) for label in labels
+        }
+        for name, labels in COUNTERS.items()
+    }
+    return {
+        'buckets_ms': list(BUCKETS_MS),
+        'histograms': histograms,
+        'counters': counters,
+    }
+
+
+def reset() -> None:
+    """Drop every recorded sample, to measure a changed playlist from
+    a clean slate."""
+    keys = [COUNTERS_KEY] + [
+        _histogram_key(name, label)
+        for name, labels in HISTOGRAMS.items()
+        for label in labels
+    ]
+    _redis().delete(*keys)
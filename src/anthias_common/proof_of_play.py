@@ -0,0 +1,387 @@
+"""Proof-of-play log: what the viewer showed, when, and how it ended.
+
+Advertisers ask for proof of play, and the only trace used to be the
+``Showing asset`` journal lines, which the ~15 MB volatile journal
+evicts within hours. The viewer now appends one fixed-size record per
+rotation to a ring file on the data partition:
+
+* the asset id, the wall-clock start and end in milliseconds, and the
+  asset kind;
+* the outcome -- ``completed`` (ran its full duration), ``skipped``
+  (cut short), ``failed`` (showing it raised) or ``unavailable`` (in
+  the playlist but not displayable; recorded once per offending asset,
+  not per 0.5 s retry);
+* for a skip, why: an operator ``next``/``previous``/``navigate``,
+  ``stop``/``blank``, the asset going inactive, or a display-settings
+  change bouncing the webview.
+
+The ring is a memory-mapped file of ``RECORD_SIZE``-byte slots behind
+a ``HEADER_SIZE`` header. Appending is a copy into the mapping under a
+lock -- no system call on the ``asset_loop`` thread -- so sub-second
+rotations cost nothing measurable. Record ``seq`` lives in slot
+``(seq - 1) % capacity``; once the ring is full the oldest record is
+overwritten, so the file never grows. A background thread ``fsync``\\ s
+the file when there is something new, at most once per
+``FLUSH_INTERVAL_S``: with 64 records to a page, the SD card sees one
+page write per flush rather than one per rotation. A power cut loses
+at most that interval (the kernel's own writeback usually gets there
+sooner), and the rotation that was on screen.
+
+Readers (the v2 export) open the file read-only and page through it by
+``seq``, a batch at a time, so exporting never loads the whole log and
+never blocks the writer. Within a slot the ``seq`` field is written
+last and cleared first, so a reader racing the writer sees either the
+whole record or a slot it skips.
+"""
+
+import logging
+import os
+import struct
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from mmap import mmap
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RING_FILE = 'proof-of-play.ring'
+
+MAGIC = b'APOP'
+VERSION = 1
+
+# magic, version, record size, capacity, seq of the newest record
+# (0 while empty); padded so records stay page-aligned.
+_HEADER = struct.Struct('<4sHHIQ')
+HEADER_SIZE = 64
+
+# seq, asset id, start ms, end ms, outcome, skip reason, kind.
+_RECORD = struct.Struct('<Q32sqqBBB5x')
+RECORD_SIZE = _RECORD.size
+_SEQ = struct.Struct('<Q')
+
+# 8 MiB: about two weeks of 10-second rotations. Only used when the
+# file is created; an existing ring keeps the capacity in its header.
+DEFAULT_CAPACITY = 131072
+
+FLUSH_INTERVAL_S = 60
+
+# Records a reader fetches per batch.
+READ_BATCH = 512
+
+# Stored as the index into these tuples, so only ever append to them.
+OUTCOMES = ('completed', 'skipped', 'failed', 'unavailable')
+SKIP_REASONS = (
+    '',
+    'next',
+    'previous',
+    'navigate',
+    'stop',
+    'blank',
+    'unblank',
+    'asset_inactive',
+    'display_settings',
+)
+KINDS = ('', 'image', 'web', 'video')
+
+CSV_FIELDS = (
+    'seq',
+    'asset_id',
+    'kind',
+    'started_at',
+    'ended_at',
+    'duration_ms',
+    'outcome',
+    'skip_reason',
+)
+
+
+def ring_path(configdir: str) -> str:
+    return os.path.join(configdir, RING_FILE)
+
+
+def _code(values: tuple[str, ...], value: str, what: str) -> int:
+    try:
+        return values.index(value)
+    except ValueError:
+        raise ValueError(f'Unknown {what} {value!r}') from None
+
+
+def _label(values: tuple[str, ...], code: int) -> str:
+    return values[code] if code < len(values) else ''
+
+
+def _iso(ms: int) -> str:
+    return (
+        datetime.fromtimestamp(ms / 1000, tz=UTC)
+        .isoformat(timespec='milliseconds')
+        .replace('+00:00', 'Z')
+    )
+
+
+@dataclass(frozen=True)
+class PlayRecord:
+    seq: int
+    asset_id: str
+    start_ms: int
+    end_ms: int
+    outcome: str
+    skip_reason: str
+    kind: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'seq': self.seq,
+            'asset_id': self.asset_id,
+            'kind': self.kind,
+            'started_at': _iso(self.start_ms),
+            'ended_at': _iso(self.end_ms),
+            'duration_ms': self.end_ms - self.start_ms,
+            'outcome': self.outcome,
+            'skip_reason': self.skip_reason,
+        }
+
+
+def _unpack(raw: bytes) -> PlayRecord:
+    seq, asset_id, start_ms, end_ms, outcome, reason, kind = _RECORD.unpack(
+        raw
+    )
+    return PlayRecord(
+        seq=seq,
+        asset_id=asset_id.rstrip(b'\0').decode('utf-8', 'replace'),
+        start_ms=start_ms,
+        end_ms=end_ms,
+        outcome=_label(OUTCOMES, outcome),
+        skip_reason=_label(SKIP_REASONS, reason),
+        kind=_label(KINDS, kind),
+    )
+
+
+def _read_header(raw: bytes) -> tuple[int, int] | None:
+    """(capacity, head) from a ring header, or None if it is not one
+    this code wrote."""
+    if len(raw) < _HEADER.size:
+        return None
+    magic, version, record_size, capacity, head = _HEADER.unpack_from(raw)
+    if (
+        magic != MAGIC
+        or version != VERSION
+        or record_size != RECORD_SIZE
+        or capacity <= 0
+    ):
+        return None
+    return capacity, head
+
+
+class Recorder:
+    """Appends play records to the ring at ``path``.
+
+    Opened on the first ``record``; if the file cannot be opened or
+    created (read-only or full data partition) the recorder logs once
+    and drops records from then on -- proof of play must never stop
+    playback.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = DEFAULT_CAPACITY,
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+    ) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._map: mmap | None = None
+        self._head = 0
+        self._dirty = False
+        self._broken = False
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def _open(self) -> bool:
+        if self._map is not None:
+            return True
+        if self._broken:
+            return False
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                header = _read_header(os.pread(fd, _HEADER.size, 0))
+                if header is None:
+                    if os.fstat(fd).st_size:
+                        logger.warning(
+                            'Proof-of-play ring %s is not one this '
+                            'version can read; starting a new one',
+                            self.path,
+                        )
+                    capacity, head = self.capacity, 0
+                    os.ftruncate(fd, 0)
+                    # Sparse: blocks are allocated as slots are written.
+                    os.ftruncate(fd, HEADER_SIZE + capacity * RECORD_SIZE)
+                    os.pwrite(
+                        fd,
+                        _HEADER.pack(MAGIC, VERSION, RECORD_SIZE, capacity, 0),
+                        0,
+                    )
+                else:
+                    capacity, head = header
+                self._map = mmap(fd, HEADER_SIZE + capacity * RECORD_SIZE)
+            except BaseException:
+                os.close(fd)
+                raise
+        except (OSError, ValueError):
+            logger.exception(
+                'Could not open the proof-of-play ring %s; not recording',
+                self.path,
+            )
+            self._broken = True
+            return False
+        self._fd = fd
+        self.capacity = capacity
+        self._head = head
+        self._stop.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name='proof-of-play-flush', daemon=True
+        )
+        self._flusher.start()
+        return True
+
+    def record(
+        self,
+        asset_id: str,
+        *,
+        start_ms: int,
+        end_ms: int,
+        outcome: str,
+        skip_reason: str = '',
+        kind: str = '',
+    ) -> int | None:
+        """Append one record; its ``seq``, or None if not recorded."""
+        raw_record = _RECORD.pack(
+            0,
+            (asset_id or '').encode('utf-8')[:32],
+            start_ms,
+            end_ms,
+            _code(OUTCOMES, outcome, 'outcome'),
+            _code(SKIP_REASONS, skip_reason, 'skip reason'),
+            _code(KINDS, kind, 'kind'),
+        )
+        with self._lock:
+            if not self._open():
+                return None
+            assert self._map is not None
+            seq = self._head + 1
+            offset = HEADER_SIZE + ((seq - 1) % self.capacity) * RECORD_SIZE
+            ring = self._map
+            # Clear the slot's seq, fill the body, then set the seq: a
+            # concurrent reader never takes a half-written slot.
+            _SEQ.pack_into(ring, offset, 0)
+            ring[offset + _SEQ.size : offset + RECORD_SIZE] = raw_record[
+                _SEQ.size :
+            ]
+            _SEQ.pack_into(ring, offset, seq)
+            _HEADER.pack_into(
+                ring, 0, MAGIC, VERSION, RECORD_SIZE, self.capacity, seq
+            )
+            self._head = seq
+            self._dirty = True
+        return seq
+
+    def flush(self) -> None:
+        """Write pending records to the card now."""
+        with self._lock:
+            if self._fd is None or not self._dirty:
+                return
+            self._dirty = False
+            fd = self._fd
+        try:
+            # fsync covers the mapping's dirty pages on Linux, and
+            # unlike mmap.flush it releases the GIL while the card
+            # works, so the asset_loop thread is never held up.
+            os.fsync(fd)
+        except OSError:
+            logger.warning('Could not flush the proof-of-play ring')
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval_s):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def head(path: str) -> int:
+    """The ``seq`` of the newest record; 0 when there are none."""
+    try:
+        with open(path, 'rb') as f:
+            header = _read_header(f.read(_HEADER.size))
+    except FileNotFoundError:
+        return 0
+    return header[1] if header else 0
+
+
+def read_batch(
+    path: str, after: int = 0, count: int = READ_BATCH
+) -> tuple[list[PlayRecord], int]:
+    """Up to ``count`` slots' worth of records with ``seq > after``,
+    oldest first, and the ``seq`` to continue after. Records already
+    overwritten by the ring, or lost to a power cut, are skipped; the
+    cursor does not move once it has caught up with the writer."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return [], after
+    try:
+        header = _read_header(os.pread(fd, _HEADER.size, 0))
+        if header is None:
+            return [], after
+        capacity, newest = header
+        first = max(after + 1, newest - capacity + 1, 1)
+        last = min(newest, first + count - 1)
+        records: list[PlayRecord] = []
+        seq = first
+        while seq <= last:
+            slot = (seq - 1) % capacity
+            # Read up to the end of the ring in one go, then wrap.
+            run = min(last - seq + 1, capacity - slot)
+            raw = os.pread(
+                fd, run * RECORD_SIZE, HEADER_SIZE + slot * RECORD_SIZE
+            )
+            for i in range(len(raw) // RECORD_SIZE):
+                record = _unpack(raw[i * RECORD_SIZE : (i + 1) * RECORD_SIZE])
+                if record.seq == seq + i:
+                    records.append(record)
+            seq += run
+    finally:
+        os.close(fd)
+    return records, max(after, last)
+
+
+def iter_records(path: str, after: int = 0) -> Iterator[PlayRecord]:
+    """Every record with ``seq > after`` up to the head as it was when
+    iteration started, a batch at a time."""
+    newest = head(path)
+    while after < newest:
+        records, cursor = read_batch(
+            path, after, min(READ_BATCH, newest - after)
+        )
+        if cursor == after:
+            # The ring was replaced under us.
+            return
+        after = cursor
+        yield from records
@@ -153,6 +153,15 @@ WEAR_WARN_PCT = 80
 # into the current boot. See _assemble.
 STARTUP_GRACE_S = 3600
 
+# Free space that discretionary writers -- today the on-device
+# content cache -- must leave alone: the larger of a share of the
+# filesystem and a floor. Uploads, SQLite and the logs are what the
+# device actually needs the space for, and a cache that pushed the
+# card into ENOSPC would turn a bandwidth saving into the ``full``
+# banner. See disk_headroom.
+DISCRETIONARY_RESERVE_PCT = 10
+DISCRETIONARY_RESERVE_MIN_BYTES = 256 * 1024 * 1024
+
 # Card manufacturer IDs, transcribed from mmc-utils' lsmmc.c, which is
 # the closest thing to a canonical table that exists. There is no
 # public authoritative registry: JEDEC assigns eMMC MIDs and does not
@@ -779,6 +788,30 @@ def run_write_check(data_dir: str) -> dict[str, Any]:
     return result
 
 
+def disk_headroom(data_dir: str | None = None) -> int | None:
+    """Bytes discretionary data may still take on ``data_dir``'s
+    filesystem before it is under pressure.
+
+    Negative once free space is already inside the reserve, which is
+    the caller's cue to give some back rather than merely stop
+    growing. None when the filesystem cannot be stat'ed. Cheap enough
+    to call on every write: one ``statvfs``, no sysfs and no Redis.
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    try:
+        stat = os.statvfs(data_dir)
+    except OSError:
+        return None
+    total = stat.f_blocks * stat.f_frsize
+    free = stat.f_bavail * stat.f_frsize
+    reserve = max(
+        total * DISCRETIONARY_RESERVE_PCT // 100,
+        DISCRETIONARY_RESERVE_MIN_BYTES,
+    )
+    return free - reserve
+
+
 def _blank_latch() -> dict[str, Any]:
     return {
         'errors_baseline': None,
@@ -56,6 +56,15 @@ def clamp_screen_rotation(value: Any) -> int:
     return rotation if rotation in SCREEN_ROTATION_CHOICES else 0
 
 
+# Sent by the URL-availability probes (``url_fails`` and the content
+# cache's conditional GET). A browser UA rather than ``Anthias/<x>``:
+# some origins serve an anti-bot page to anything that doesn't look
+# like one, and the probe must see what the webview will see.
+PROBE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux armv7l) AppleWebKit/538.15 (KHTML, like Gecko) Version/8.0 Safari/538.15'
+}
+
+
 # Operator-facing message for ENOSPC during an upload — shared by the
 # HTML upload toast and the API's 507 response so the wording can't
 # drift between surfaces (Sentry ANTHIAS-3K).
@@ -534,31 +543,21 @@ def get_video_duration(file: str) -> timedelta | None:
     Returns the duration of a video file in timedelta.
 
     Returns None if ffprobe is not available on the host so callers can
-    surface a clean validation error instead of a 500.
+    surface a clean validation error instead of a 500. Reads the shared
+    ``mediainfo`` probe, so a file the normalise task already inspected
+    isn't probed again.
     """
-    time = None
+    from anthias_common import mediainfo
 
     try:
-        run_player = sh.Command('ffprobe')('-i', file, _err_to_out=True)
+        result = mediainfo.probe(file)
     except sh.CommandNotFound:
         logger.warning('ffprobe is not installed; cannot determine duration')
         return None
     except sh.ErrorReturnCode_1 as err:
         raise RuntimeError('Bad video format') from err
 
-    for line in run_player.split('\n'):
-        if 'Duration' in line:
-            match = re.search(r'[0-9]+:[0-9]+:[0-9]+\.[0-9]+', line)
-            if match:
-                time_input = match.group()
-                time_split = time_input.split(':')
-                hours = int(time_split[0])
-                minutes = int(time_split[1])
-                seconds = float(time_split[2])
-                time = timedelta(hours=hours, minutes=minutes, seconds=seconds)
-            break
-
-    return time
+    return mediainfo.duration(result)
 
 
 def handler(obj: Any) -> str:
@@ -577,7 +576,11 @@ def json_dump(obj: Any) -> str:
     return json.dumps(obj, default=handler)
 
 
-def url_fails(url: str, verify_ssl: bool | None = None) -> bool:
+def url_fails(
+    url: str,
+    verify_ssl: bool | None = None,
+    session: requests.Session | None = None,
+) -> bool:
     """
     If it is streaming
 
@@ -587,6 +590,10 @@ def url_fails(url: str, verify_ssl: bool | None = None) -> bool:
     callers. Callers that know a per-asset override (``Asset.
     skip_ssl_verify``) pass the already-composed effective flag so a
     trusted self-signed host isn't wrongly marked unreachable.
+
+    ``session`` lets a caller probing many URLs on the same host reuse
+    its pooled connections (the reachability sweep keeps one per host);
+    without it each probe opens a fresh connection as before.
     """
     # Note: no private/LAN-address filtering here. Serving signage from
     # a LAN host (an intranet dashboard, a sibling Docker container, a
@@ -638,9 +645,7 @@ def url_fails(url: str, verify_ssl: bool | None = None) -> bool:
         # 2019 (commit c1dd61ce); restored here.
         verify = False
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (X11; Linux armv7l) AppleWebKit/538.15 (KHTML, like Gecko) Version/8.0 Safari/538.15'
-    }
+    headers = PROBE_HEADERS
     try:
         if not validate_url(url):
             return False
@@ -658,7 +663,8 @@ def url_fails(url: str, verify_ssl: bool | None = None) -> bool:
                     'ignore', urllib3.exceptions.InsecureRequestWarning
                 )
 
-            if requests.head(
+            http: Any = requests if session is None else session
+            if http.head(
                 url,
                 allow_redirects=True,
                 headers=headers,
@@ -667,7 +673,7 @@ def url_fails(url: str, verify_ssl: bool | None = None) -> bool:
             ).ok:
                 return False
 
-            if requests.get(
+            if http.get(
                 url,
                 allow_redirects=True,
                 headers=headers,
@@ -2,15 +2,16 @@ import json
 from typing import Any
 
 from dateutil import parser as date_parser
+from django.db import transaction
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
 from anthias_common.remote_video import dispatch_remote_video_download
 from anthias_common.youtube import dispatch_download
-from anthias_server.app.models import Asset
+from anthias_server.app.models import Asset, asset_change_batch
+from anthias_server.coalesce import request_viewer_reload
 from anthias_server.processing import dispatch_pending_normalize
-from anthias_server.settings import ViewerPublisher
 
 
 class AssetCreationError(Exception):
@@ -121,8 +122,25 @@ def get_active_asset_ids() -> list[str]:
 
 
 def save_active_assets_ordering(active_asset_ids: list[str]) -> None:
-    for i, asset_id in enumerate(active_asset_ids):
-        Asset.objects.filter(asset_id=asset_id).update(play_order=i)
+    """Give each listed asset its position as ``play_order``.
+
+    One read, then one transaction that rewrites only the rows whose
+    position changed (``bulk_update``), announced as a single playlist
+    revision and dashboard delta — reordering a long playlist used to
+    be an UPDATE, a revision bump and a websocket frame per row.
+    """
+    order = {asset_id: i for i, asset_id in enumerate(active_asset_ids)}
+    with transaction.atomic(), asset_change_batch():
+        moved = [
+            asset
+            for asset in Asset.objects.filter(asset_id__in=order).only(
+                'asset_id', 'play_order'
+            )
+            if asset.play_order != order[asset.asset_id]
+        ]
+        for asset in moved:
+            asset.play_order = order[asset.asset_id]
+        Asset.objects.bulk_update(moved, ['play_order'], batch_size=500)
 
 
 def finalize_asset_update(asset: Asset) -> None:
@@ -134,21 +152,33 @@ def finalize_asset_update(asset: Asset) -> None:
     the viewer so it can skip past the asset if it's still on screen
     but no longer active (issue #2430).
     """
+    finalize_asset_updates([asset])
+
+
+def finalize_asset_updates(
+    assets: list[Asset], *, reload_viewer: bool = True
+) -> None:
+    """``finalize_asset_update`` for a batch of saved rows: one reorder
+    and one viewer reload for all of them (``reload_viewer=False``
+    leaves the reload to a caller still inside its transaction)."""
     active_asset_ids = get_active_asset_ids()
-    asset.refresh_from_db()
+    for asset in assets:
+        asset.refresh_from_db()
 
-    try:
-        active_asset_ids.remove(asset.asset_id)
-    except ValueError:
-        pass
+        try:
+            active_asset_ids.remove(asset.asset_id)
+        except ValueError:
+            pass
 
-    if asset.is_active():
-        active_asset_ids.insert(asset.play_order, asset.asset_id)
+        if asset.is_active():
+            active_asset_ids.insert(asset.play_order, asset.asset_id)
 
     save_active_assets_ordering(active_asset_ids)
-    asset.refresh_from_db()
+    for asset in assets:
+        asset.refresh_from_db()
 
-    ViewerPublisher.get_instance().send_to_viewer('reload')
+    if reload_viewer:
+        request_viewer_reload([asset.asset_id for asset in assets])
 
 
 def parse_request(request: Any) -> Any:
@@ -15,6 +15,7 @@ from anthias_common.utils import (
     url_fails,
 )
 from anthias_common.youtube import is_youtube_url, youtube_destination_path
+from anthias_server import blobstore
 from anthias_server.api.errors import AssetCreationError
 from anthias_server.app.models import DURATION_S_MAX, clamp_duration
 from anthias_server.processing import needs_image_processing
@@ -101,6 +102,11 @@ class CreateAssetSerializerMixin:
             rename(uri, new_uri)
             uri = new_uri
             is_local_upload = True
+            # Share storage with an identical file already on the
+            # device (the same MP4 uploaded twice, or imported and
+            # uploaded). The normalise task reads the digest back off
+            # the blob rather than hashing again.
+            blobstore.intern(uri)
 
         # Exact match — substring `'youtube_asset' in mimetype`
         # would also fire on `not_youtube_asset` and crash on a
@@ -17,6 +17,7 @@ from anthias_common.utils import (
     url_fails,
 )
 from anthias_common.youtube import is_youtube_url, youtube_destination_path
+from anthias_server import blobstore
 from anthias_server.app.models import DURATION_S_MAX, clamp_duration
 from anthias_server.settings import settings
 
@@ -102,6 +103,8 @@ class CreateAssetSerializerV1_1(Serializer[dict[str, Any]]):
                 rename(uri, path.join(settings['assetdir'], asset['asset_id']))
                 uri = path.join(settings['assetdir'], asset['asset_id'])
                 is_local_upload = True
+                # See ``CreateAssetSerializerMixin.prepare_asset``.
+                blobstore.intern(uri)
 
         # Exact match — substring `'youtube_asset' in mimetype`
         # would also fire on `not_youtube_asset` and crash on a
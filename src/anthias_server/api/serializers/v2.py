@@ -432,6 +432,7 @@ class DeviceSettingsSerializerV2(Serializer[Any]):
     debug_logging = BooleanField()
     prefer_dark_mode = BooleanField()
     verify_ssl = BooleanField()
+    prefetch_next_asset = BooleanField()
     # Mirror the PATCH-side ChoiceField so the OpenAPI schema
     # advertises the same enum on both directions — clients can rely
     # on the value being one of {0, 90, 180, 270} when reading too.
@@ -473,6 +474,7 @@ class UpdateDeviceSettingsSerializerV2(Serializer[Any]):
     debug_logging = BooleanField(required=False)
     prefer_dark_mode = BooleanField(required=False)
     verify_ssl = BooleanField(required=False)
+    prefetch_next_asset = BooleanField(required=False)
     screen_rotation = ChoiceField(
         required=False, choices=SCREEN_ROTATION_CHOICES
     )
@@ -589,10 +591,36 @@ class ScreenlyMigrateAssetSerializerV2(Serializer[Any]):
     asset_group_id = CharField(required=False, allow_blank=True)
 
 
+# Rows per listing page; past this a page is no faster to render than
+# the whole library was.
+MAX_IMPORT_PAGE_SIZE = 500
+
+
 class ImportValidateSerializerV2(Serializer[Any]):
-    """Request body for validating an import provider's token."""
+    """Request body for validating an import provider's token.
+
+    Without ``limit`` the whole listing comes back, as it always has;
+    with it, only the first page (the rest via ``ImportListingViewV2``).
+    """
 
     token = CharField(write_only=True)
+    limit = IntegerField(
+        required=False, min_value=1, max_value=MAX_IMPORT_PAGE_SIZE
+    )
+
+
+class ImportListingSerializerV2(Serializer[Any]):
+    """Request body for one page of a provider's cached listing."""
+
+    token = CharField(write_only=True)
+    offset = IntegerField(required=False, default=0, min_value=0)
+    limit = IntegerField(
+        required=False,
+        default=100,
+        min_value=1,
+        max_value=MAX_IMPORT_PAGE_SIZE,
+    )
+    refresh = BooleanField(required=False, default=False)
 
 
 class ImportItemSerializerV2(Serializer[Any]):
@@ -606,3 +634,63 @@ class ImportItemSerializerV2(Serializer[Any]):
     token = CharField(write_only=True)
     remote_id = CharField()
     enable = BooleanField(required=False, default=True)
+
+
+# Operations accepted in one ``v2/assets/batch`` request.
+MAX_ASSET_BATCH_OPERATIONS = 1000
+
+ASSET_BATCH_OPS = ('update', 'delete', 'order')
+
+
+class AssetBatchOperationSerializerV2(Serializer[Any]):
+    """One operation of an asset batch:
+
+    * ``update`` — ``changes`` applied to ``asset_id`` as a PATCH would.
+    * ``delete`` — removes ``asset_id``.
+    * ``order`` — ``ids`` become the active playlist's order.
+    """
+
+    op = ChoiceField(choices=ASSET_BATCH_OPS)
+    asset_id = CharField(required=False)
+    changes = DictField(required=False)
+    ids = ListField(child=CharField(), required=False)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs['op'] == 'order':
+            if 'ids' not in attrs:
+                raise serializers.ValidationError(
+                    {'ids': 'An order operation needs "ids".'}
+                )
+        elif not attrs.get('asset_id'):
+            raise serializers.ValidationError(
+                {'asset_id': f'A {attrs["op"]} operation needs "asset_id".'}
+            )
+        if attrs['op'] == 'update' and not attrs.get('changes'):
+            raise serializers.ValidationError(
+                {'changes': 'An update operation needs "changes".'}
+            )
+        return attrs
+
+
+class AssetBatchSerializerV2(Serializer[Any]):
+    operations = ListField(
+        child=AssetBatchOperationSerializerV2(),
+        allow_empty=False,
+        max_length=MAX_ASSET_BATCH_OPERATIONS,
+    )
+
+
+# The wizard's selection is one account's library; anything past this
+# is a client bug rather than an import.
+MAX_IMPORT_JOB_ITEMS = 5000
+
+
+class ImportJobSerializerV2(Serializer[Any]):
+    """Request body for a bulk import job: the wizard's whole
+    selection in one request."""
+
+    token = CharField(write_only=True)
+    remote_ids = ListField(
+        child=CharField(), allow_empty=False, max_length=MAX_IMPORT_JOB_ITEMS
+    )
+    enable = BooleanField(required=False, default=True)
@@ -47,11 +47,16 @@ def gql_response(
     return resp
 
 
-def stream_response(status: int, chunks: list[bytes]) -> MagicMock:
+def stream_response(
+    status: int,
+    chunks: list[bytes],
+    headers: dict[str, str] | None = None,
+) -> MagicMock:
     """A fake streaming response usable as a context manager."""
     resp = MagicMock(spec=requests.Response)
     resp.status_code = status
     resp.ok = 200 <= status < 400
+    resp.headers = requests.structures.CaseInsensitiveDict(headers or {})
     resp.iter_content.return_value = iter(chunks)
     resp.__enter__.return_value = resp
     resp.__exit__.return_value = False
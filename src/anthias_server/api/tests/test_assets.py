@@ -1044,46 +1044,31 @@ def test_create_youtube_asset_rejects_non_youtube_uri(
 
 @pytest.mark.django_db
 @pytest.mark.parametrize('version', ['v1', 'v1_1', 'v1_2', 'v2'])
-@mock.patch('anthias_server.app.helpers.ViewerPublisher')
+@mock.patch('anthias_server.settings.ViewerPublisher.send_to_viewer')
 def test_delete_asset_publishes_reload(
-    publisher_mock: Any, api_client: APIClient, version: str
+    send_to_viewer: Any, api_client: APIClient, version: str
 ) -> None:
-    publisher_instance = mock.MagicMock()
-    publisher_mock.get_instance.return_value = publisher_instance
-
     asset = _create_asset(api_client, ASSET_CREATION_DATA, version)
     response = _delete_asset(api_client, asset['asset_id'], version)
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
-    publisher_instance.send_to_viewer.assert_called_once_with('reload')
+    send_to_viewer.assert_called_once_with('reload')
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize(
-    'version,publisher_target',
-    [
-        ('v1', 'anthias_server.api.views.v1.ViewerPublisher'),
-        ('v1_1', 'anthias_server.api.views.v1_1.ViewerPublisher'),
-        ('v1_2', 'anthias_server.api.helpers.ViewerPublisher'),
-        ('v2', 'anthias_server.api.helpers.ViewerPublisher'),
-    ],
-)
+@pytest.mark.parametrize('version', ['v1', 'v1_1', 'v1_2', 'v2'])
+@mock.patch('anthias_server.settings.ViewerPublisher.send_to_viewer')
 def test_update_asset_publishes_reload(
-    api_client: APIClient, version: str, publisher_target: str
+    send_to_viewer: Any, api_client: APIClient, version: str
 ) -> None:
-    """v1.x put writes its own publish; v1_2/v2 share the helper."""
-    with mock.patch(publisher_target) as publisher_mock:
-        publisher_instance = mock.MagicMock()
-        publisher_mock.get_instance.return_value = publisher_instance
-
-        asset = _create_asset(api_client, ASSET_CREATION_DATA, version)
-        data = (
-            ASSET_UPDATE_DATA_V2 if version == 'v2' else ASSET_UPDATE_DATA_V1_2
-        )
+    """v1.x put writes its own publish; v1_2/v2 share the helper's
+    (coalesced) one."""
+    asset = _create_asset(api_client, ASSET_CREATION_DATA, version)
+    data = ASSET_UPDATE_DATA_V2 if version == 'v2' else ASSET_UPDATE_DATA_V1_2
 
-        _update_asset(api_client, asset['asset_id'], data, version)
+    _update_asset(api_client, asset['asset_id'], data, version)
 
-        publisher_instance.send_to_viewer.assert_called_once_with('reload')
+    send_to_viewer.assert_called_once_with('reload')
 
 
 @pytest.mark.django_db
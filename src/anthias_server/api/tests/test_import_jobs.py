@@ -0,0 +1,215 @@
+"""Tests for bulk import jobs (``lib.integrations.jobs``).
+
+A fake provider stands in for the real ones, so nothing touches the
+network; the job record lives in the conftest's dict-backed Redis.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from anthias_server.lib.integrations import jobs
+from anthias_server.lib.integrations.base import (
+    ImportOutcome,
+    ProviderImportError,
+)
+from anthias_server.lib.integrations.http import LoginReuse
+
+
+class _Provider:
+    key = 'fake'
+
+    def __init__(self) -> None:
+        self.batches: list[str] = []
+        self.calls: list[str] = []
+
+    @contextmanager
+    def batch(self, token: str) -> Iterator[None]:
+        self.batches.append(token)
+        yield
+
+    def import_item(
+        self, token: str, remote_id: str, *, enable: bool = True
+    ) -> ImportOutcome:
+        self.calls.append(remote_id)
+        if remote_id == 'gone':
+            raise ProviderImportError('Media no longer exists.')
+        if remote_id == 'offline':
+            raise requests.ConnectionError('down')
+        if remote_id == 'audio':
+            return ImportOutcome(success=False, skipped=True, reason='Audio')
+        return ImportOutcome(success=True, asset_id=f'asset-{remote_id}')
+
+
+@pytest.fixture
+def provider() -> Iterator[_Provider]:
+    fake = _Provider()
+    with (
+        mock.patch.object(jobs, 'get_provider', return_value=fake),
+        mock.patch(
+            'anthias_server.app.consumers.notify_import_progress'
+        ) as notify,
+    ):
+        fake.notify = notify  # type: ignore[attr-defined]
+        yield fake
+
+
+def _statuses(job_id: str) -> dict[str, Any]:
+    job = jobs.get_job(job_id)
+    assert job is not None
+    return {item['remote_id']: item['status'] for item in job['items']}
+
+
+def test_job_records_every_outcome(provider: _Provider) -> None:
+    job = jobs.create_job(
+        'fake', 'tok', ['1', 'gone', 'offline', 'audio', '1']
+    )
+    assert jobs.active_job_ids() == [job['job_id']]
+
+    assert jobs.run_job(job['job_id'], max_workers=1) is False
+
+    assert _statuses(job['job_id']) == {
+        '1': 'success',
+        'gone': 'failed',
+        'offline': 'failed',
+        'audio': 'skipped',
+    }
+    done = jobs.get_job(job['job_id'])
+    assert done is not None
+    assert done['status'] == 'done'
+    by_id = {item['remote_id']: item for item in done['items']}
+    assert by_id['1']['asset_id'] == 'asset-1'
+    assert by_id['gone']['error'] == 'Media no longer exists.'
+    assert by_id['offline']['error'] == jobs.NETWORK_ERROR_MESSAGE
+    # One login scope for the whole run, and the token is gone after.
+    assert provider.batches == ['tok']
+    assert jobs.active_job_ids() == []
+    assert jobs._redis().get(jobs._token_key(job['job_id'])) is None
+    final = provider.notify.call_args.args[0]  # type: ignore[attr-defined]
+    assert final['status'] == 'done'
+    assert final['counts']['success'] == 1
+
+
+def test_job_runs_in_slices(provider: _Provider) -> None:
+    job = jobs.create_job('fake', 'tok', ['1', '2', '3'])
+    with mock.patch.object(jobs, 'JOB_SLICE_ITEMS', 2):
+        assert jobs.run_job(job['job_id'], max_workers=1) is True
+        assert provider.calls == ['1', '2']
+        assert jobs.run_job(job['job_id'], max_workers=1) is False
+    assert provider.calls == ['1', '2', '3']
+
+
+def test_items_run_concurrently(provider: _Provider) -> None:
+    barrier = threading.Barrier(3, timeout=5)
+    real_import = provider.import_item
+
+    def import_item(token: str, remote_id: str, **kwargs: Any) -> Any:
+        # Only a pool of three gets every item past the barrier.
+        barrier.wait()
+        return real_import(token, remote_id, **kwargs)
+
+    provider.import_item = import_item  # type: ignore[method-assign]
+    job = jobs.create_job('fake', 'tok', ['1', '2', '3'])
+    heartbeat = MagicMock()
+    jobs.run_job(job['job_id'], heartbeat=heartbeat, max_workers=3)
+    assert set(_statuses(job['job_id']).values()) == {'success'}
+    heartbeat.assert_called()
+
+
+def test_interrupted_job_is_resumed(provider: _Provider) -> None:
+    job = jobs.create_job('fake', 'tok', ['1', '2'])
+    # A worker killed mid-item leaves it ``running``.
+    job['items'][0]['status'] = jobs.ITEM_RUNNING
+    jobs._save(job)
+
+    assert jobs.stalled_job_ids(60) == []
+    later = time.time() + 61
+    with mock.patch(
+        'anthias_server.lib.integrations.jobs.time.time', return_value=later
+    ):
+        assert jobs.stalled_job_ids(60) == [job['job_id']]
+        jobs._redis().set(jobs.lock_key(job['job_id']), 'held')
+        assert jobs.stalled_job_ids(60) == []
+
+    jobs.run_job(job['job_id'], max_workers=1)
+    assert provider.calls == ['1', '2']
+
+
+def test_job_without_its_token_fails_cleanly(provider: _Provider) -> None:
+    job = jobs.create_job('fake', 'tok', ['1'])
+    jobs._redis().delete(jobs._token_key(job['job_id']))
+    assert jobs.run_job(job['job_id'], max_workers=1) is False
+    assert _statuses(job['job_id']) == {'1': 'failed'}
+    assert provider.calls == []
+
+
+def test_login_is_shared_within_a_batch() -> None:
+    logins = LoginReuse()
+    do_login = MagicMock(side_effect=['first', 'second', 'third'])
+    assert logins.login('tok', do_login) == 'first'
+    with logins.batch('tok'):
+        assert logins.login('tok', do_login) == 'second'
+        assert logins.login('tok', do_login) == 'second'
+    assert logins.login('tok', do_login) == 'third'
+    assert do_login.call_count == 3
+
+
+@pytest.mark.django_db
+class TestImportJobEndpoints:
+    @mock.patch('anthias_server.celery_tasks.run_import_job.delay')
+    def test_start_and_follow(self, delay: MagicMock) -> None:
+        client = APIClient()
+        response = client.post(
+            reverse('api:import_jobs_v2', kwargs={'provider': 'yodeck'}),
+            {'token': 'secret', 'remote_ids': ['1', '2'], 'enable': False},
+            format='json',
+        )
+        assert response.status_code == 202
+        body = response.json()
+        assert 'secret' not in response.content.decode()
+        assert body['total'] == 2
+        assert body['counts']['pending'] == 2
+        delay.assert_called_once_with(body['job_id'])
+
+        url = reverse(
+            'api:import_job_v2',
+            kwargs={'provider': 'yodeck', 'job_id': body['job_id']},
+        )
+        followed = client.get(url)
+        assert followed.status_code == 200
+        assert [i['remote_id'] for i in followed.json()['items']] == [
+            '1',
+            '2',
+        ]
+        other = reverse(
+            'api:import_job_v2',
+            kwargs={'provider': 'xibo', 'job_id': body['job_id']},
+        )
+        assert client.get(other).status_code == 404
+
+    def test_unknown_provider(self) -> None:
+        response = APIClient().post(
+            reverse('api:import_jobs_v2', kwargs={'provider': 'nope'}),
+            {'token': 't', 'remote_ids': ['1']},
+            format='json',
+        )
+        assert response.status_code == 404
+
+    def test_empty_selection_is_rejected(self) -> None:
+        response = APIClient().post(
+            reverse('api:import_jobs_v2', kwargs={'provider': 'yodeck'}),
+            {'token': 't', 'remote_ids': []},
+            format='json',
+        )
+        assert response.status_code == 400
@@ -0,0 +1,258 @@
+"""Tests for cached, paged provider listings (``lib.integrations.listings``).
+
+The listing lives in the conftest's dict-backed Redis; providers are
+mocks, except for ScreenCloud's ``list_changes``, which runs against a
+routed fake GraphQL session as in ``test_screencloud_import``.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from anthias_server.api.tests._graphql_helpers import gql_response as _gql
+from anthias_server.app.models import Asset, ImportSource
+from anthias_server.lib.integrations import ingest, listings, screencloud
+from anthias_server.lib.integrations.base import RemoteMediaItem
+
+
+def _items(count: int, stamp: str = '2026-01-01T00:00:00+00:00') -> Any:
+    return [
+        RemoteMediaItem(str(n), f'Item {n}', 'image', True, updated_at=stamp)
+        for n in range(count)
+    ]
+
+
+def _provider(items: list[RemoteMediaItem]) -> MagicMock:
+    provider = MagicMock()
+    provider.key = 'fake'
+    provider.validate_token.return_value = True
+    provider.list_media.return_value = items
+    return provider
+
+
+def test_listing_is_cached_per_token() -> None:
+    provider = _provider(_items(3))
+    first = listings.get_listing(provider, 'tok')
+    assert listings.get_listing(provider, 'tok') == first
+    provider.list_media.assert_called_once()
+    listings.get_listing(provider, 'other')
+    assert provider.list_media.call_count == 2
+    # The key carries a fingerprint, never the token.
+    assert 'tok' not in listings.listing_key('fake', 'tok').split(':')[-1]
+
+
+def test_refresh_merges_changes() -> None:
+    provider = _provider(_items(3))
+    listings.get_listing(provider, 'tok')
+    provider.list_changes.return_value = [
+        RemoteMediaItem('1', 'Renamed', 'image', True, updated_at='2026-02'),
+        RemoteMediaItem('9', 'New', 'image', True, updated_at='2026-03'),
+    ]
+
+    listing = listings.get_listing(provider, 'tok', refresh=True)
+
+    provider.list_changes.assert_called_once_with(
+        'tok', '2026-01-01T00:00:00+00:00'
+    )
+    assert provider.list_media.call_count == 1
+    assert [(i['remote_id'], i['name']) for i in listing['items']] == [
+        ('9', 'New'),
+        ('0', 'Item 0'),
+        ('1', 'Renamed'),
+        ('2', 'Item 2'),
+    ]
+    assert listing['watermark'] == '2026-03'
+
+
+def test_refresh_without_change_support_lists_again() -> None:
+    provider = _provider(_items(2))
+    listings.get_listing(provider, 'tok')
+    provider.list_changes.return_value = None
+    provider.list_media.return_value = _items(1)
+    listing = listings.get_listing(provider, 'tok', refresh=True)
+    assert [i['remote_id'] for i in listing['items']] == ['0']
+
+
+@pytest.mark.django_db
+def test_page_marks_imported_rows() -> None:
+    asset = Asset.objects.create(
+        asset_id='already',
+        name='Item 1',
+        metadata={'import_source': {'provider': 'fake', 'remote_id': '1'}},
+    )
+    ImportSource.objects.create(asset=asset, provider='fake', remote_id='1')
+    listing = listings.get_listing(_provider(_items(5)), 'tok')
+
+    first = listings.page('fake', listing, 0, 2)
+    assert [i['remote_id'] for i in first['items']] == ['0', '1']
+    assert [i['imported_asset_id'] for i in first['items']] == [
+        None,
+        'already',
+    ]
+    assert (first['total'], first['next_offset']) == (5, 2)
+    last = listings.page('fake', listing, 4, 2)
+    assert last['next_offset'] is None
+
+
+@pytest.mark.django_db
+def test_imported_lookup_is_one_query() -> None:
+    for n in range(3):
+        asset = Asset.objects.create(asset_id=f'a{n}', name=str(n))
+        ingest._stamp_import_source(asset, 'fake', str(n), remote_revision='r')
+    source = ImportSource.objects.get(asset_id='a1')
+    assert (source.remote_id, source.remote_revision) == ('1', 'r')
+    assert Asset.objects.get(asset_id='a1').metadata['import_source'] == {
+        'provider': 'fake',
+        'remote_id': '1',
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        found = ingest.find_imported_assets(
+            'fake', [str(n) for n in range(2000)]
+        )
+    assert found == {'0': 'a0', '1': 'a1', '2': 'a2'}
+    assert len(queries) == 1
+    assert ingest.find_imported_asset('other', '1') is None
+
+    Asset.objects.filter(asset_id='a0').delete()
+    assert not ImportSource.objects.filter(asset_id='a0').exists()
+
+
+@pytest.mark.django_db
+def test_backfill_from_metadata() -> None:
+    migration = importlib.import_module(
+        'anthias_server.app.migrations.0009_import_source'
+    )
+    Asset.objects.create(
+        asset_id='old',
+        metadata={'import_source': {'provider': 'xibo', 'remote_id': 7}},
+    )
+    Asset.objects.create(asset_id='uploaded', metadata={'ext': '.png'})
+    Asset.objects.create(
+        asset_id='junk', metadata={'import_source': 'not a dict'}
+    )
+
+    migration.backfill_import_sources(apps, None)
+
+    assert list(
+        ImportSource.objects.values_list('asset_id', 'provider', 'remote_id')
+    ) == [('old', 'xibo', '7')]
+
+
+@pytest.mark.django_db
+class TestListingEndpoints:
+    @mock.patch('anthias_server.api.views.v2.get_provider')
+    def test_validate_then_page(self, get_provider: MagicMock) -> None:
+        provider = _provider(_items(5))
+        get_provider.return_value = provider
+        client = APIClient()
+
+        response = client.post(
+            reverse('api:import_validate_v2', kwargs={'provider': 'fake'}),
+            {'token': 'tok', 'limit': 2},
+            format='json',
+        )
+        body = response.json()
+        assert body['valid'] is True
+        assert [i['remote_id'] for i in body['items']] == ['0', '1']
+        assert body['next_offset'] == 2
+
+        media_url = reverse(
+            'api:import_listing_v2', kwargs={'provider': 'fake'}
+        )
+        rest = client.post(
+            media_url,
+            {'token': 'tok', 'offset': 2, 'limit': 10},
+            format='json',
+        ).json()
+        assert [i['remote_id'] for i in rest['items']] == ['2', '3', '4']
+        assert rest['next_offset'] is None
+        provider.list_media.assert_called_once()
+
+    @mock.patch('anthias_server.api.views.v2.get_provider')
+    def test_page_limit_is_bounded(self, get_provider: MagicMock) -> None:
+        get_provider.return_value = _provider([])
+        response = APIClient().post(
+            reverse('api:import_listing_v2', kwargs={'provider': 'fake'}),
+            {'token': 'tok', 'limit': 100_000},
+            format='json',
+        )
+        assert response.status_code == 400
+
+
+class TestScreenCloudChanges:
+    @staticmethod
+    def _page(connection: str, nodes: list[dict[str, Any]]) -> MagicMock:
+        return _gql(
+            200,
+            data={
+                connection: {
+                    'pageInfo': {'hasNextPage': True, 'endCursor': 'next'},
+                    'nodes': nodes,
+                }
+            },
+        )
+
+    @mock.patch('anthias_server.lib.integrations.screencloud._session.post')
+    def test_stops_at_the_watermark(self, post: MagicMock) -> None:
+        screencloud._endpoint_cache.clear()
+        queries: list[str] = []
+        files = self._page(
+            'allFiles',
+            [
+                {
+                    'id': 'new',
+                    'mimetype': 'image/png',
+                    'updatedAt': '2026-03-01T00:00:00+00:00',
+                },
+                {
+                    'id': 'old',
+                    'mimetype': 'image/png',
+                    'updatedAt': '2026-01-01T00:00:00+00:00',
+                },
+            ],
+        )
+        links = self._page(
+            'allLinks',
+            [
+                {
+                    'id': 'old',
+                    'linkType': 'STANDARD',
+                    'updatedAt': '2025-12-01T00:00:00Z',
+                },
+            ],
+        )
+
+        def route(url: str, **kwargs: Any) -> MagicMock:
+            query = kwargs['json']['query']
+            queries.append(query)
+            if 'currentOrg' in query:
+                return _gql(200, data={'currentOrg': {'id': 'x'}})
+            return files if 'allFiles' in query else links
+
+        post.side_effect = route
+        changed = screencloud.ScreenCloudProvider().list_changes(
+            'tok', '2026-02-01T00:00:00+00:00'
+        )
+
+        assert changed is not None
+        assert [i.remote_id for i in changed] == ['file:new']
+        # One page of each connection: neither went on to ``next``.
+        listing_queries = [q for q in queries if 'currentOrg' not in q]
+        assert len(listing_queries) == 2
+        assert all('UPDATED_AT_DESC' in q for q in listing_queries)
+        screencloud._endpoint_cache.clear()
+
+    def test_unparseable_watermark_means_full_listing(self) -> None:
+        provider = screencloud.ScreenCloudProvider()
+        assert provider.list_changes('tok', 'yesterday') is None
@@ -20,11 +20,29 @@ from anthias_server.lib.diagnostics import get_anthias_release
 _ANTHIAS_RELEASE = get_anthias_release()
 
 
+_STATVFS = mock.MagicMock(
+    return_value=mock.Mock(f_blocks=1 << 22, f_bavail=1 << 21, f_frsize=4096)
+)
+
+
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
 
 
+@pytest.fixture(autouse=True)
+def _cold_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give the system snapshot a store of its own, empty, so every
+    field is sampled once per request. Sharing the fake Redis would
+    route the snapshot reads through the patched ``r.get`` whose call
+    count the tests pin to the display-power read."""
+    store = mock.MagicMock()
+    store.get.return_value = None
+    monkeypatch.setattr(
+        'anthias_server.lib.system_snapshot._redis', lambda: store
+    )
+
+
 def _assert_mock_calls(mocks: list[Any]) -> None:
     """Assert that all mocks were called exactly once."""
     for mock_obj in mocks:
@@ -41,9 +59,7 @@ def _assert_response_data(
 
 
 @pytest.mark.django_db
-@mock.patch(
-    'anthias_server.api.views.mixins.is_up_to_date', return_value=False
-)
+@mock.patch('anthias_server.lib.github.is_up_to_date', return_value=False)
 @mock.patch(
     'anthias_server.lib.diagnostics.get_load_avg',
     return_value={'15 min': 0.11},
@@ -52,7 +68,7 @@ def _assert_response_data(
     'anthias_server.api.views.mixins.filesizeformat',
     return_value='15.0\xa0GB',
 )
-@mock.patch('anthias_server.api.views.mixins.statvfs', mock.MagicMock())
+@mock.patch('anthias_server.lib.system_snapshot.statvfs', _STATVFS)
 @mock.patch('anthias_server.api.views.mixins.r.get', return_value='off')
 def test_info_v1_endpoint(
     redis_get_mock: Any,
@@ -93,7 +109,7 @@ def test_info_v1_endpoint(
 
 
 @pytest.mark.django_db
-@mock.patch('anthias_server.api.views.v2.is_up_to_date', return_value=True)
+@mock.patch('anthias_server.lib.github.is_up_to_date', return_value=True)
 @mock.patch(
     'anthias_server.lib.diagnostics.get_load_avg',
     return_value={'15 min': 0.25},
@@ -102,33 +118,31 @@ def test_info_v1_endpoint(
     'anthias_server.api.views.v2.filesizeformat',
     return_value='20.0\xa0GB',
 )
-@mock.patch('anthias_server.api.views.v2.statvfs', mock.MagicMock())
+@mock.patch('anthias_server.lib.system_snapshot.statvfs', _STATVFS)
 @mock.patch('anthias_server.api.views.v2.r.get', return_value='on')
 # Stubbed with an explicit `new` so it injects no extra argument.
 # Without it the storage probe reads its Redis latch, which is a
 # second `r.get` and would trip the call_count == 1 assertion below —
 # an assertion about the display-power read, not about this.
 @mock.patch(
-    'anthias_server.api.views.v2.storage_health.get_state',
+    'anthias_common.storage_health.get_state',
     mock.MagicMock(return_value={'supported': False, 'status': 'unknown'}),
 )
 @mock.patch(
-    'anthias_server.api.views.v2.diagnostics.get_git_branch',
+    'anthias_server.lib.diagnostics.get_git_branch',
     return_value='main',
 )
 @mock.patch(
-    'anthias_server.api.views.v2.diagnostics.get_git_short_hash',
+    'anthias_server.lib.diagnostics.get_git_short_hash',
     return_value='a1b2c3d',
 )
 @mock.patch(
-    'anthias_server.api.views.v2.device_helper.parse_cpu_info',
+    'anthias_common.device_helper.parse_cpu_info',
     return_value={'model': 'Raspberry Pi 4'},
 )
+@mock.patch('anthias_server.lib.diagnostics.get_uptime', return_value=86400)
 @mock.patch(
-    'anthias_server.api.views.v2.diagnostics.get_uptime', return_value=86400
-)
-@mock.patch(
-    'anthias_server.api.views.v2.psutil.virtual_memory',
+    'anthias_server.lib.system_snapshot.psutil.virtual_memory',
     return_value=mock.MagicMock(
         total=8192 << 20,  # 8GB
         used=4096 << 20,  # 4GB
@@ -139,11 +153,11 @@ def test_info_v1_endpoint(
     ),
 )
 @mock.patch(
-    'anthias_server.api.views.v2.get_node_mac_address',
+    'anthias_common.utils.get_node_mac_address',
     return_value='00:11:22:33:44:55',
 )
 @mock.patch(
-    'anthias_server.api.views.v2.get_node_ip',
+    'anthias_common.utils.get_node_ip',
     return_value='192.168.1.100 10.0.0.50',
 )
 @mock.patch('anthias_server.api.views.v2.getenv', return_value='testuser')
@@ -353,7 +367,7 @@ def _patch_storage(**overrides: Any) -> Any:
     }
     state.update(overrides)
     return mock.patch(
-        'anthias_server.api.views.v2.storage_health.get_state',
+        'anthias_common.storage_health.get_state',
         return_value=state,
     )
 
@@ -443,7 +457,7 @@ def test_info_v2_survives_an_unreadable_filesystem(
 ) -> None:
     # A diagnostic must never take the info endpoint down with it.
     with mock.patch(
-        'anthias_server.api.views.v2.storage_health.get_state',
+        'anthias_common.storage_health.get_state',
         side_effect=OSError('sysfs went away'),
     ):
         response = api_client.get(reverse('api:info_v2'))
@@ -21,7 +21,7 @@ from anthias_server.api.tests._graphql_helpers import (
 from anthias_server.api.tests._graphql_helpers import (
     stream_response as _stream,
 )
-from anthias_server.app.models import Asset
+from anthias_server.app.models import Asset, ImportSource
 from anthias_server.lib.integrations import pisignage
 from anthias_server.lib.integrations.base import ProviderImportError
 from anthias_server.lib.integrations.registry import (
@@ -158,7 +158,7 @@ class TestRegistry:
 @pytest.mark.django_db
 class TestImportItem:
     def test_idempotent_reimport_skips(self) -> None:
-        Asset.objects.create(
+        asset = Asset.objects.create(
             asset_id='pi-existing',
             name='pic.png',
             uri='/data/x.png',
@@ -171,6 +171,9 @@ class TestImportItem:
                 }
             },
         )
+        ImportSource.objects.create(
+            asset=asset, provider='pisignage', remote_id='pic.png'
+        )
         with patch(
             'anthias_server.lib.integrations.pisignage._session.post'
         ) as post_mock:
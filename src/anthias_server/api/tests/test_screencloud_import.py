@@ -20,7 +20,7 @@ from anthias_server.api.tests._graphql_helpers import (
 from anthias_server.api.tests._graphql_helpers import (
     stream_response as _stream,
 )
-from anthias_server.app.models import Asset
+from anthias_server.app.models import Asset, ImportSource
 from anthias_server.lib.integrations import graphql, screencloud
 from anthias_server.lib.integrations.registry import (
     get_provider,
@@ -235,7 +235,7 @@ class TestRegistry:
 @pytest.mark.django_db
 class TestImportItem:
     def test_idempotent_reimport_skips(self) -> None:
-        Asset.objects.create(
+        asset = Asset.objects.create(
             asset_id='sc-existing',
             name='Existing',
             uri='https://example.com/',
@@ -248,6 +248,9 @@ class TestImportItem:
                 }
             },
         )
+        ImportSource.objects.create(
+            asset=asset, provider='screencloud', remote_id='link:l1'
+        )
         with patch(
             'anthias_server.lib.integrations.screencloud._session.post'
         ) as post_mock:
@@ -3,6 +3,7 @@ Tests for V1 API endpoints.
 """
 
 import os
+import shutil
 from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
@@ -31,7 +32,11 @@ def cleanup_asset_dir() -> Iterator[None]:
     finally:
         asset_directory_path = Path(anthias_settings['assetdir'])
         for file in asset_directory_path.iterdir():
-            file.unlink()
+            # The upload path interns files into ``.blobs/``.
+            if file.is_dir():
+                shutil.rmtree(file)
+            else:
+                file.unlink()
 
 
 def _get_asset_content_url(asset_id: str) -> str:
@@ -70,6 +75,38 @@ def test_file_asset(api_client: APIClient, cleanup_asset_dir: None) -> None:
     assert data['ext'] == '.png'
 
 
+@pytest.mark.django_db
+def test_file_asset_streams_into_assetdir(
+    api_client: APIClient, cleanup_asset_dir: None
+) -> None:
+    """A single-shot upload is typed by its bytes, hashed on the way
+    in, and a rejected one leaves nothing staged behind."""
+    import hashlib
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from anthias_server import blobstore
+
+    body = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+    response = api_client.post(
+        reverse('api:file_asset_v1'),
+        data={'file_upload': SimpleUploadedFile('export.bin', body)},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['ext'] == '.png'
+    assert blobstore.digest_of(response.data['uri']) == (
+        hashlib.md5(body).hexdigest()
+    )
+
+    rejected = api_client.post(
+        reverse('api:file_asset_v1'),
+        data={'file_upload': SimpleUploadedFile('notes.txt', b'plain text')},
+    )
+    assert rejected.status_code == status.HTTP_400_BAD_REQUEST
+    staged = list(Path(anthias_settings['assetdir']).glob('*.tmp'))
+    assert staged == [Path(response.data['uri'])]
+
+
 @pytest.mark.django_db
 def test_file_asset_rejects_list_body(api_client: APIClient) -> None:
     # DRF parses a JSON array body into a list, so request.data.get(...)
@@ -100,7 +137,7 @@ def test_file_asset_disk_full_returns_507(
     with (
         open(image_path, 'rb') as file_upload,
         mock.patch(
-            'anthias_server.api.views.mixins.open',
+            'anthias_server.app.uploads.open',
             side_effect=OSError(errno.ENOSPC, 'No space left on device'),
             create=True,
         ),
@@ -162,9 +199,9 @@ def test_file_asset_disk_full_during_write_cleans_up_partial(
     )
     with (
         mock.patch(
-            'anthias_server.api.views.mixins.open', write_fails, create=True
+            'anthias_server.app.uploads.open', write_fails, create=True
         ),
-        mock.patch('anthias_server.api.views.mixins.remove') as mock_remove,
+        mock.patch('anthias_server.app.uploads.remove') as mock_remove,
     ):
         response = api_client.post(
             reverse('api:file_asset_v1'),
@@ -50,6 +50,7 @@ def test_get_device_settings(
         'use_24_hour_clock': True,
         'debug_logging': False,
         'prefer_dark_mode': True,
+        'prefetch_next_asset': True,
         'verify_ssl': True,
         'screen_rotation': 90,
         'display_power_schedule_enabled': False,
@@ -76,6 +77,7 @@ def test_get_device_settings(
         'use_24_hour_clock': True,
         'debug_logging': False,
         'prefer_dark_mode': True,
+        'prefetch_next_asset': True,
         'verify_ssl': True,
         'screen_rotation': 90,
         'username': '',
@@ -371,6 +373,7 @@ def test_disable_basic_auth(
         'use_24_hour_clock': True,
         'debug_logging': False,
         'prefer_dark_mode': False,
+        'prefetch_next_asset': True,
         'verify_ssl': True,
         'screen_rotation': 0,
         'display_power_schedule_enabled': False,
@@ -877,3 +880,149 @@ def test_device_settings_patch_blank_days_means_every_day(
     assert response.status_code == status.HTTP_200_OK
     settings.load()
     assert settings['display_power_days'] == '0,1,2,3,4,5,6'
+
+
+def _playlist_assets(count: int) -> list[Any]:
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from anthias_server.app.models import Asset
+
+    now = timezone.now()
+    return [
+        Asset.objects.create(
+            asset_id=f'a{n}',
+            name=f'Asset {n}',
+            uri='https://example.com',
+            mimetype='webpage',
+            duration=10,
+            is_enabled=True,
+            play_order=n,
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_reorder_is_one_write_and_one_change(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from anthias_server.api.helpers import save_active_assets_ordering
+    from anthias_server.app.models import Asset
+
+    _playlist_assets(30)
+    reversed_ids = [f'a{n}' for n in reversed(range(30))]
+    with (
+        mock.patch(
+            'anthias_server.settings.ViewerPublisher.publish_playlist_change'
+        ) as revision,
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as delta,
+        django_capture_on_commit_callbacks(execute=True),
+        CaptureQueriesContext(connection) as queries,
+    ):
+        save_active_assets_ordering(reversed_ids)
+
+    updates = [q for q in queries if q['sql'].startswith('UPDATE')]
+    assert len(updates) == 1
+    revision.assert_called_once_with(None)
+    delta.assert_called_once_with('moved', None)
+    assert (
+        list(
+            Asset.objects.order_by('play_order').values_list(
+                'asset_id', flat=True
+            )
+        )
+        == reversed_ids
+    )
+
+
+@pytest.mark.django_db
+class TestAssetBatch:
+    url = '/api/v2/assets/batch'
+
+    @mock.patch('anthias_server.settings.ViewerPublisher.send_to_viewer')
+    def test_applies_every_operation(
+        self,
+        send_to_viewer: mock.MagicMock,
+        api_client: APIClient,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        from anthias_server.app.models import Asset
+
+        _playlist_assets(4)
+        with (
+            mock.patch(
+                'anthias_server.app.consumers.publish_asset_change'
+            ) as delta,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            response = api_client.post(
+                self.url,
+                {
+                    'operations': [
+                        {
+                            'op': 'update',
+                            'asset_id': 'a1',
+                            'changes': {'name': 'Renamed', 'duration': 30},
+                        },
+                        {'op': 'delete', 'asset_id': 'a2'},
+                        {'op': 'order', 'ids': ['a3', 'a1', 'a0']},
+                    ]
+                },
+                format='json',
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body['deleted'] == ['a2']
+        assert [a['name'] for a in body['assets']] == ['Renamed']
+        assert list(
+            Asset.objects.order_by('play_order').values_list(
+                'asset_id', flat=True
+            )
+        ) == ['a3', 'a1', 'a0']
+        assert Asset.objects.get(asset_id='a1').duration == 30
+        send_to_viewer.assert_called_once_with('reload')
+        # Updates, a delete and a move fold into one reset delta.
+        delta.assert_called_once()
+        assert delta.call_args.args[0] == 'reset'
+
+    @mock.patch('anthias_server.settings.ViewerPublisher.send_to_viewer')
+    def test_one_bad_operation_writes_nothing(
+        self, send_to_viewer: mock.MagicMock, api_client: APIClient
+    ) -> None:
+        from anthias_server.app.models import Asset
+
+        _playlist_assets(2)
+        response = api_client.post(
+            self.url,
+            {
+                'operations': [
+                    {'op': 'delete', 'asset_id': 'a0'},
+                    {'op': 'delete', 'asset_id': 'missing'},
+                    {'op': 'update', 'asset_id': 'a1'},
+                ]
+            },
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Asset.objects.count() == 2
+        send_to_viewer.assert_not_called()
+
+        response = api_client.post(
+            self.url,
+            {'operations': [{'op': 'delete', 'asset_id': 'missing'}]},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            'operations': {'0': {'asset_id': 'No such asset.'}}
+        }
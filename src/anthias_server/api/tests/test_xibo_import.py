@@ -20,7 +20,7 @@ from anthias_server.api.tests._graphql_helpers import (
 from anthias_server.api.tests._graphql_helpers import (
     stream_response as _stream,
 )
-from anthias_server.app.models import Asset
+from anthias_server.app.models import Asset, ImportSource
 from anthias_server.lib.integrations import xibo
 from anthias_server.lib.integrations.base import ProviderImportError
 from anthias_server.lib.integrations.registry import (
@@ -129,7 +129,7 @@ class TestRegistry:
 @pytest.mark.django_db
 class TestImportItem:
     def test_idempotent_reimport_skips(self) -> None:
-        Asset.objects.create(
+        asset = Asset.objects.create(
             asset_id='xibo-existing',
             name='Pic',
             uri='/data/x.png',
@@ -137,6 +137,9 @@ class TestImportItem:
             duration=10,
             metadata={'import_source': {'provider': 'xibo', 'remote_id': '1'}},
         )
+        ImportSource.objects.create(
+            asset=asset, provider='xibo', remote_id='1'
+        )
         with patch(
             'anthias_server.lib.integrations.xibo._session.post'
         ) as post_mock:
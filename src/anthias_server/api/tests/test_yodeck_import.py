@@ -32,7 +32,7 @@ from anthias_server.api.tests._graphql_helpers import (
 from anthias_server.api.tests._graphql_helpers import (
     stream_response as _fake_stream_response,
 )
-from anthias_server.app.models import Asset
+from anthias_server.app.models import Asset, ImportSource
 from anthias_server.lib.integrations import ingest, yodeck
 from anthias_server.lib.integrations.base import (
     ImportOutcome,
@@ -346,6 +346,9 @@ class TestImportItem:
                 'import_source': {'provider': 'yodeck', 'remote_id': '77'}
             },
         )
+        ImportSource.objects.create(
+            asset=asset, provider='yodeck', remote_id='77'
+        )
         with patch(
             'anthias_server.lib.integrations.yodeck._session.get'
         ) as get_mock:
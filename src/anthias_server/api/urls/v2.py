@@ -1,6 +1,7 @@
 from django.urls import URLPattern, URLResolver, path
 
 from anthias_server.api.views.v2 import (
+    AssetBatchViewV2,
     AssetContentViewV2,
     AssetListViewV2,
     AssetRecheckViewV2,
@@ -11,11 +12,16 @@ from anthias_server.api.views.v2 import (
     DisplayPowerViewV2,
     FileAssetViewV2,
     ImportItemViewV2,
+    ImportJobListViewV2,
+    ImportJobViewV2,
+    ImportListingViewV2,
     ImportValidateViewV2,
     InfoViewV2,
     IntegrationsViewV2,
     NetworkIpAddressesViewV2,
+    PlaybackMetricsViewV2,
     PlaylistOrderViewV2,
+    ProofOfPlayViewV2,
     RebootViewV2,
     RecoverViewV2,
     ScreenlyMigrateAssetViewV2,
@@ -34,6 +40,12 @@ def get_url_patterns() -> list[URLPattern | URLResolver]:
             PlaylistOrderViewV2.as_view(),
             name='playlist_order_v2',
         ),
+        # Before ``v2/assets/<asset_id>``, which would match it too.
+        path(
+            'v2/assets/batch',
+            AssetBatchViewV2.as_view(),
+            name='asset_batch_v2',
+        ),
         path(
             'v2/assets/control/<str:command>',
             AssetsControlViewV2.as_view(),
@@ -94,16 +106,41 @@ def get_url_patterns() -> list[URLPattern | URLResolver]:
             ImportValidateViewV2.as_view(),
             name='import_validate_v2',
         ),
+        path(
+            'v2/integrations/import/<str:provider>/media',
+            ImportListingViewV2.as_view(),
+            name='import_listing_v2',
+        ),
         path(
             'v2/integrations/import/<str:provider>/item',
             ImportItemViewV2.as_view(),
             name='import_item_v2',
         ),
+        path(
+            'v2/integrations/import/<str:provider>/jobs',
+            ImportJobListViewV2.as_view(),
+            name='import_jobs_v2',
+        ),
+        path(
+            'v2/integrations/import/<str:provider>/jobs/<str:job_id>',
+            ImportJobViewV2.as_view(),
+            name='import_job_v2',
+        ),
         path(
             'v2/network/ip-addresses',
             NetworkIpAddressesViewV2.as_view(),
             name='network_ip_addresses_v2',
         ),
+        path(
+            'v2/playback/metrics',
+            PlaybackMetricsViewV2.as_view(),
+            name='playback_metrics_v2',
+        ),
+        path(
+            'v2/proof-of-play',
+            ProofOfPlayViewV2.as_view(),
+            name='proof_of_play_v2',
+        ),
         path(
             'v2/viewer/playlist',
             ViewerPlaylistViewV2.as_view(),
@@ -7,7 +7,7 @@ from base64 import b64encode
 from contextlib import suppress
 from inspect import cleandoc
 from mimetypes import guess_extension, guess_type
-from os import path, remove, statvfs
+from os import path, remove
 from typing import Any
 
 from django.shortcuts import get_object_or_404
@@ -25,6 +25,7 @@ from anthias_common.utils import (
     connect_to_redis,
     is_disk_full,
 )
+from anthias_server import assetsweep, blobstore
 from anthias_server.api.helpers import save_active_assets_ordering
 from anthias_server.api.serializers.mixins import (
     BackupViewSerializerMixin,
@@ -35,10 +36,10 @@ from anthias_server.api.serializers.mixins import (
 )
 from anthias_server.app.helpers import delete_asset_with_file
 from anthias_server.app.models import Asset
+from anthias_server.app.uploads import AssetUploadHandler, StagedUpload
 from anthias_server.celery_tasks import reboot_anthias, shutdown_anthias
-from anthias_server.lib import backup_helper, diagnostics
+from anthias_server.lib import backup_helper, diagnostics, system_snapshot
 from anthias_server.lib.auth import authorized
-from anthias_server.lib.github import is_up_to_date
 from anthias_server.settings import ViewerPublisher, settings
 
 logger = logging.getLogger(__name__)
@@ -251,6 +252,28 @@ class DisplayPowerViewMixin(APIView):
 
 
 class FileAssetViewMixin(APIView):
+    _upload_handler: AssetUploadHandler | None = None
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        # Before ``super().initial()``: session authentication's CSRF
+        # check reads ``request.POST``, which is where the body gets
+        # parsed. A resumable chunk can arrive out of order, so it
+        # can't be hashed or sniffed in flight and keeps the chunk
+        # writer in ``post``.
+        if request.method == 'POST' and 'Content-Range' not in request.headers:
+            self._upload_handler = AssetUploadHandler(request)
+            request.upload_handlers.insert(0, self._upload_handler)
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(
+        self, request: Request, response: Response, *args: Any, **kwargs: Any
+    ) -> Response:
+        if self._upload_handler is not None:
+            # A staged file the response didn't hand back to the client
+            # (rejected, unauthenticated, failed) is removed here.
+            self._upload_handler.discard()
+        return super().finalize_response(request, response, *args, **kwargs)
+
     @extend_schema(
         summary='Upload file asset',
         parameters=[
@@ -303,6 +326,11 @@ class FileAssetViewMixin(APIView):
                 {'detail': DISK_FULL_ERROR},
                 status=status.HTTP_507_INSUFFICIENT_STORAGE,
             )
+        if self._upload_handler is not None:
+            staged = self._upload_handler.upload
+            if staged is None:
+                raise ValidationError({'file_upload': 'No file uploaded.'})
+            return self._accept_staged(staged)
         if file_upload is None:
             raise ValidationError({'file_upload': 'No file uploaded.'})
         filename = file_upload.name
@@ -429,6 +457,9 @@ class FileAssetViewMixin(APIView):
                 status=status.HTTP_507_INSUFFICIENT_STORAGE,
             )
 
+        # Until the asset create renames it into place, the ``.tmp`` is
+        # an orphan if the client never comes back; let the sweep know.
+        assetsweep.mark([file_path])
         return Response(
             {
                 'uri': file_path,
@@ -437,6 +468,37 @@ class FileAssetViewMixin(APIView):
             }
         )
 
+    def _accept_staged(self, upload: StagedUpload) -> Response:
+        """Answer a single-shot upload ``AssetUploadHandler`` already
+        wrote to ``<assetdir>/<upload_id>.tmp``.
+
+        The bytes decide the type when they have a signature; the
+        filename only covers the rest. The response is the same as the
+        chunk writer's, so the asset serializer renames the file into
+        place exactly as before.
+        """
+        if upload.sniffed is not None:
+            file_type, ext = upload.sniffed
+        else:
+            file_type = guess_type(upload.name or '')[0] or ''
+            ext = guess_extension(file_type) or ''
+        if file_type.split('/')[0] not in ['image', 'video']:
+            raise ValidationError(
+                {'file_upload': 'Invalid file type. Expected image or video.'}
+            )
+
+        upload.keep()
+        blobstore.intern(upload.staged_path, upload.digest)
+        return Response(
+            {
+                'uri': upload.staged_path,
+                'ext': ext,
+                'upload_id': path.basename(upload.staged_path).removesuffix(
+                    '.tmp'
+                ),
+            }
+        )
+
 
 class AssetContentViewMixin(APIView):
     @extend_schema(
@@ -576,17 +638,17 @@ class InfoViewMixin(APIView):
     def get(self, request: Request) -> Response:
         viewlog = 'Not yet implemented'
 
-        # Calculate disk space
-        slash = statvfs('/')
-        free_space = filesizeformat(slash.f_bavail * slash.f_frsize)
+        # Read from the background-maintained snapshot, not sampled
+        # per request (see lib.system_snapshot).
+        free_space = filesizeformat(system_snapshot.get('disk')['free'])
         display_power = r.get('display_power')
 
         return Response(
             {
                 'viewlog': viewlog,
-                'loadavg': diagnostics.get_load_avg()['15 min'],
+                'loadavg': system_snapshot.get('loadavg')['15 min'],
                 'free_space': free_space,
                 'display_power': display_power,
-                'up_to_date': is_up_to_date(),
+                'up_to_date': system_snapshot.get('up_to_date'),
             }
         )
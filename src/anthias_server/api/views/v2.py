@@ -1,44 +1,58 @@
+import asyncio
+import csv
+import io
 import ipaddress
 import json
 import logging
-import secrets
-from datetime import datetime, timedelta
-from os import getenv, statvfs
-from platform import machine
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+from os import getenv
 from typing import Any
 
-import psutil
 import redis
 import requests
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.defaultfilters import filesizeformat
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from anthias_common import device_helper, storage_health, undervoltage
+from anthias_common import (
+    playback_metrics,
+    proof_of_play,
+    storage_health,
+    undervoltage,
+)
 from anthias_common.internal_auth import is_internal_request
 from anthias_common.utils import (
     clamp_screen_rotation,
     connect_to_redis,
     get_balena_device_info,
-    get_node_ip,
-    get_node_mac_address,
     is_balena_app,
 )
 from anthias_server.api.helpers import (
     AssetCreationError,
     finalize_asset_update,
+    finalize_asset_updates,
     persist_new_asset,
+    save_active_assets_ordering,
 )
 from anthias_server.api.serializers.v2 import (
+    AssetBatchSerializerV2,
     AssetSerializerV2,
     CreateAssetSerializerV2,
     DeviceSettingsSerializerV2,
     ImportItemSerializerV2,
+    ImportJobSerializerV2,
+    ImportListingSerializerV2,
     ImportValidateSerializerV2,
     IntegrationsSerializerV2,
     ScreenlyMigrateAssetSerializerV2,
@@ -63,17 +77,21 @@ from anthias_server.api.views.mixins import (
 )
 from anthias_server.app.helpers import (
     add_default_assets,
+    delete_assets_with_files,
     remove_default_assets,
 )
-from anthias_server.app.models import Asset
-from anthias_server.lib import diagnostics
+from anthias_server.app.models import Asset, asset_change_batch
+from anthias_server.app.playlist import PlaylistCache
+from anthias_server.coalesce import request_viewer_reload
+from anthias_server.lib import system_snapshot
 from anthias_server.lib.auth import (
     AuthSettingsError,
     apply_auth_settings,
     authorized,
     operator_username,
 )
-from anthias_server.lib.github import is_up_to_date
+from anthias_server.lib.integrations import jobs as import_jobs
+from anthias_server.lib.integrations import listings as import_listings
 from anthias_server.lib.integrations.base import ProviderImportError
 from anthias_server.lib.integrations.registry import get_provider
 from anthias_server.lib.screenly_migration import (
@@ -454,6 +472,96 @@ class AssetViewV2(APIView, DeleteAssetViewMixin):
         return self.update(request, asset_id, partial=False)
 
 
+class AssetBatchViewV2(APIView):
+    """Many asset writes in one request and one transaction.
+
+    Applied as: every ``update`` (in order), every ``delete``, the
+    reorder the updates call for, then any explicit ``order``. All of
+    it is validated first — one bad operation rejects the batch with
+    nothing written — and announced as one playlist revision, one
+    dashboard delta and one viewer reload.
+    """
+
+    serializer_class = AssetBatchSerializerV2
+
+    @extend_schema(
+        summary='Apply a batch of asset operations',
+        request=AssetBatchSerializerV2,
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'assets': {'type': 'array', 'items': {'type': 'object'}},
+                    'deleted': {'type': 'array', 'items': {'type': 'string'}},
+                },
+            }
+        },
+    )
+    @authorized
+    def post(self, request: Request) -> Response:
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data['operations']
+
+        assets = Asset.objects.in_bulk(
+            {op['asset_id'] for op in operations if op['op'] != 'order'},
+            field_name='asset_id',
+        )
+        errors: dict[str, Any] = {}
+        updates: list[UpdateAssetSerializerV2] = []
+        deleted: list[str] = []
+        orders: list[list[str]] = []
+        for index, operation in enumerate(operations):
+            if operation['op'] == 'order':
+                orders.append(operation['ids'])
+                continue
+            asset = assets.get(operation['asset_id'])
+            if asset is None:
+                errors[str(index)] = {'asset_id': 'No such asset.'}
+            elif operation['op'] == 'delete':
+                deleted.append(asset.asset_id)
+            else:
+                update = UpdateAssetSerializerV2(
+                    asset, data=operation['changes'], partial=True
+                )
+                if update.is_valid():
+                    updates.append(update)
+                else:
+                    errors[str(index)] = update.errors
+        if errors:
+            return Response(
+                {'operations': errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        deleting = set(deleted)
+        updated = [
+            update.instance
+            for update in updates
+            if update.instance is not None
+            and update.instance.asset_id not in deleting
+        ]
+        with transaction.atomic(), asset_change_batch():
+            for update in updates:
+                update.save()
+            delete_assets_with_files(deleted)
+            if updated:
+                finalize_asset_updates(updated, reload_viewer=False)
+            for ids in orders:
+                save_active_assets_ordering(ids)
+        request_viewer_reload(
+            [asset.asset_id for asset in updated] + sorted(deleted)
+        )
+
+        for asset in updated:
+            asset.refresh_from_db()
+        return Response(
+            {
+                'assets': [AssetSerializerV2(a).data for a in updated],
+                'deleted': deleted,
+            }
+        )
+
+
 class AssetRecheckViewV2(APIView):
     """On-demand reachability recheck, called from the viewer.
 
@@ -583,6 +691,7 @@ class DeviceSettingsViewV2(APIView):
                 'debug_logging': settings['debug_logging'],
                 'prefer_dark_mode': settings['prefer_dark_mode'],
                 'verify_ssl': settings['verify_ssl'],
+                'prefetch_next_asset': settings['prefetch_next_asset'],
                 # Clamp on read too — the OpenAPI schema advertises
                 # an enum of {0,90,180,270}, but a hand-edited conf
                 # could have a stale 45 or any other int sitting on
@@ -678,6 +787,8 @@ class DeviceSettingsViewV2(APIView):
                 settings['prefer_dark_mode'] = data['prefer_dark_mode']
             if 'verify_ssl' in data:
                 settings['verify_ssl'] = data['verify_ssl']
+            if 'prefetch_next_asset' in data:
+                settings['prefetch_next_asset'] = data['prefetch_next_asset']
             if 'screen_rotation' in data:
                 settings['screen_rotation'] = int(data['screen_rotation'])
             # Scheduled display power. Already normalised by the
@@ -715,81 +826,20 @@ class DeviceSettingsViewV2(APIView):
             )
 
 
-# Re-evaluate windowed playlists at most this often. Day-of-week and
-# time-of-day boundaries don't show up in start_date/end_date, so we
-# need a polling cap to ensure transitions are picked up. Mirrors
-# ``anthias_viewer.scheduling.WINDOWED_DEADLINE_CAP_SECONDS``; once
-# the C++ viewer consumes /api/v2/viewer/playlist (Phase 3 of GH
-# #2906) the Python copy can be deleted.
-_VIEWER_WINDOWED_DEADLINE_CAP_S = 60
-
-_viewer_sysrandom = secrets.SystemRandom()
-
+def _render_viewer_assets(
+    assets: list[dict[str, Any]], now: datetime
+) -> list[Any]:
+    """Serialise the timeline's asset dicts as ``AssetSerializerV2``
+    rows. Runs only when ``PlaylistCache`` has no snapshot for ``now``.
 
-def _evaluate_viewer_playlist(
-    now: datetime,
-) -> tuple[list[Asset], datetime | None]:
-    """Server-side equivalent of ``generate_asset_list()`` returning
-    Asset rows (so ``AssetSerializerV2`` can serialise them) instead
-    of plain dicts.
-
-    Active filter and deadline computation share a single ``now`` so
-    a row can't be filtered as active here while its end_date is
-    skipped as past in the deadline pass — the two would otherwise
-    disagree across a midnight tick.
+    Pass ``now`` through context so the ``is_active`` field renders
+    against the same instant the timeline was evaluated at — without
+    it a row right on a window boundary could be returned in
+    ``assets`` while its ``is_active`` re-evaluates to False a few ms
+    later.
     """
-    candidates = list(
-        Asset.objects.filter(
-            is_enabled=True,
-            start_date__isnull=False,
-            end_date__isnull=False,
-        ).order_by('play_order')
-    )
-
-    active_flags = [a.is_active(now=now) for a in candidates]
-    active_assets = [a for a, ok in zip(candidates, active_flags) if ok]
-
-    if settings['shuffle_playlist']:
-        _viewer_sysrandom.shuffle(active_assets)
-
-    deadline = _compute_viewer_deadline(candidates, active_flags, now)
-    return active_assets, deadline
-
-
-def _compute_viewer_deadline(
-    assets: list[Asset],
-    active_flags: list[bool],
-    now: datetime,
-) -> datetime | None:
-    """Soonest future moment when the playlist might need refetching.
-
-    Mirrors ``anthias_viewer.scheduling._compute_deadline``: past
-    boundaries are dropped so a long-ago start_date on a window-
-    blocked asset doesn't pin the deadline to "always overdue", and
-    the windowed cap only applies while the asset is in its date
-    range (the window can't toggle activeness outside of it).
-    """
-    candidates: list[datetime] = []
-    has_windowed = False
-
-    for asset, is_active in zip(assets, active_flags):
-        boundary = asset.end_date if is_active else asset.start_date
-        if boundary and boundary > now:
-            candidates.append(boundary)
-        if (
-            asset.has_window_filter()
-            and asset.start_date is not None
-            and asset.end_date is not None
-            and asset.start_date < now < asset.end_date
-        ):
-            has_windowed = True
-
-    if has_windowed:
-        candidates.append(
-            now + timedelta(seconds=_VIEWER_WINDOWED_DEADLINE_CAP_S)
-        )
-
-    return min(candidates) if candidates else None
+    rows = [Asset(**asset) for asset in assets]
+    return list(AssetSerializerV2(rows, many=True, context={'now': now}).data)
 
 
 class ViewerPlaylistViewV2(APIView):
@@ -797,9 +847,14 @@ class ViewerPlaylistViewV2(APIView):
 
     Intended for the C++ viewer (GH #2906 Phase 3) so the viewer no
     longer needs Django ORM access or its own ``Asset.is_active()``
-    re-implementation. The Python viewer keeps using
-    ``anthias_viewer.scheduling.generate_asset_list()`` directly until
-    Phase 3 swaps it.
+    re-implementation. Evaluated by the same ``PlaylistSource`` the
+    Python viewer's ``Scheduler`` runs, so both agree on the active set
+    and the (exact) deadline.
+
+    Cheap to poll: the evaluated playlist is cached until the playlist
+    revision, ``anthias.conf`` or the timeline segment moves on, and a
+    request whose ``If-None-Match`` carries the current ETag gets a
+    bare 304 without touching the database or the serializer.
 
     Internal-auth gated for the same reason as
     ``AssetRecheckViewV2``: the viewer can't attach operator
@@ -809,42 +864,45 @@ class ViewerPlaylistViewV2(APIView):
 
     @extend_schema(
         summary='Get the active playlist and next re-evaluation deadline',
-        responses={200: ViewerPlaylistSerializerV2, 403: None},
+        responses={200: ViewerPlaylistSerializerV2, 304: None, 403: None},
     )
     def get(self, request: Request) -> Response:
         if not is_internal_request(request, settings):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        # Re-read anthias.conf for the same reason DeviceSettingsViewV2
-        # does: an operator PATCH to /api/v2/device_settings updates the
-        # on-disk file, and a viewer GET arriving before the in-memory
-        # cache invalidates would otherwise shuffle (or not shuffle)
-        # off the stale value. The PATCH path also broadcasts a Redis
-        # ``reload`` so the viewer eventually catches up via the
-        # subscriber, but reloading on read avoids a one-tick lag.
-        try:
-            settings.load()
-        except Exception:
-            logger.exception('Failed to reload settings for viewer playlist')
-
         now = timezone.now()
-        active_assets, deadline = _evaluate_viewer_playlist(now)
+        snapshot = PlaylistCache.get_instance().snapshot(
+            now, _render_viewer_assets
+        )
+        headers = {}
+        if snapshot.etag is not None:
+            headers['ETag'] = snapshot.etag
+            if _etag_matches(
+                request.headers.get('If-None-Match', ''), snapshot.etag
+            ):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
         return Response(
             {
-                # Pass ``now`` through context so AssetSerializerV2's
-                # ``is_active`` field renders against the same instant
-                # the filter used — without it a row right on a window
-                # boundary could be returned in ``assets`` while its
-                # ``is_active`` re-evaluates to False a few ms later.
-                'assets': AssetSerializerV2(
-                    active_assets, many=True, context={'now': now}
-                ).data,
-                'deadline': deadline,
+                'assets': snapshot.rendered,
+                'deadline': snapshot.deadline,
                 'now': now,
-            }
+            },
+            headers=headers,
         )
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2), as ``If-None-Match`` uses."""
+    if if_none_match.strip() == '*':
+        return True
+    return any(
+        candidate.removeprefix('W/') == etag.removeprefix('W/')
+        for candidate in parse_etags(if_none_match)
+    )
+
+
 class ViewerSettingsViewV2(APIView):
     """Viewer-relevant settings subset for the C++ viewer.
 
@@ -863,7 +921,7 @@ class ViewerSettingsViewV2(APIView):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
         try:
-            settings.load()
+            settings.reload_if_changed()
         except Exception:
             logger.exception('Failed to reload settings for viewer')
 
@@ -881,21 +939,21 @@ class ViewerSettingsViewV2(APIView):
 
 
 class InfoViewV2(InfoViewMixin):
+    # Every device fact below comes from the background-maintained
+    # snapshot (lib.system_snapshot) rather than being sampled per
+    # request: fleet monitoring polls this endpoint every few seconds.
+
     def get_anthias_version(self) -> str:
         # Composed in lib.diagnostics so HTML and API ship the same
         # label string. See get_anthias_version() for the format.
-        return diagnostics.get_anthias_version()
+        return str(system_snapshot.get('anthias_version'))
 
     def get_device_model(self) -> str | int | None:
-        device_model = device_helper.parse_cpu_info().get('model')
-
-        if device_model is None and machine() == 'x86_64':
-            device_model = 'Generic x86_64 Device'
-
+        device_model: str | int | None = system_snapshot.get('device_model')
         return device_model
 
     def get_uptime(self) -> dict[str, int | float]:
-        system_uptime = timedelta(seconds=diagnostics.get_uptime())
+        system_uptime = timedelta(seconds=system_snapshot.get('uptime'))
         return {
             'days': system_uptime.days,
             'hours': round(system_uptime.seconds / 3600, 2),
@@ -904,7 +962,7 @@ class InfoViewV2(InfoViewMixin):
     def get_memory(self) -> dict[str, int | bool]:
         from anthias_common.board import LOW_RAM_THRESHOLD_KB
 
-        virtual_memory = psutil.virtual_memory()
+        memory = system_snapshot.get('memory')
         # ``low_ram`` echoes the same gate that drives the viewer's
         # single-QWebEngineView mode and the asset processor's
         # 1080p upload cap. Exposed via /api/v2/info so external
@@ -913,13 +971,13 @@ class InfoViewV2(InfoViewMixin):
         # ``bool`` is a subclass of ``int`` in Python so static
         # type-checkers don't flag the mixed dict.
         return {
-            'total': virtual_memory.total >> 20,
-            'used': virtual_memory.used >> 20,
-            'free': virtual_memory.free >> 20,
-            'shared': virtual_memory.shared >> 20,
-            'buff': virtual_memory.buffers >> 20,
-            'available': virtual_memory.available >> 20,
-            'low_ram': virtual_memory.total < LOW_RAM_THRESHOLD_KB * 1024,
+            'total': memory['total'] >> 20,
+            'used': memory['used'] >> 20,
+            'free': memory['free'] >> 20,
+            'shared': memory['shared'] >> 20,
+            'buff': memory['buffers'] >> 20,
+            'available': memory['available'] >> 20,
+            'low_ram': memory['total'] < LOW_RAM_THRESHOLD_KB * 1024,
         }
 
     def get_time(self) -> dict[str, str]:
@@ -994,7 +1052,8 @@ class InfoViewV2(InfoViewMixin):
         observed rather than things the filesystem recorded.
         """
         try:
-            return storage_health.get_state(r, settings.get_configdir())
+            storage: dict[str, Any] = system_snapshot.get('storage')
+            return storage
         except Exception:
             # A diagnostic must never take the info endpoint down.
             logger.exception('Could not read the storage-health state.')
@@ -1004,13 +1063,13 @@ class InfoViewV2(InfoViewMixin):
             }
 
     def get_ip_addresses(self) -> list[str]:
-        # /api/v2/info is auth'd and not polled, so blocking on
-        # get_node_ip()'s host-readiness loop is acceptable here —
-        # the formatter still tolerates 'Unknown'/'Unable to retrieve
-        # IP.' sentinels via _format_ip_urls. The polling endpoint
-        # (NetworkIpAddressesViewV2) uses _safe_ip_addresses() instead,
-        # which never blocks.
-        return _format_ip_urls(get_node_ip())
+        # The snapshot refreshes this in the background, so only a
+        # cold snapshot blocks on get_node_ip()'s host-readiness loop
+        # here — the formatter still tolerates 'Unknown'/'Unable to
+        # retrieve IP.' sentinels via _format_ip_urls. The polling
+        # endpoint (NetworkIpAddressesViewV2) uses _safe_ip_addresses()
+        # instead, which never blocks.
+        return _format_ip_urls(system_snapshot.get('ip_addresses'))
 
     @extend_schema(
         summary='Get system information',
@@ -1260,18 +1319,16 @@ class InfoViewV2(InfoViewMixin):
     def get(self, request: Request) -> Response:
         viewlog = 'Not yet implemented'
 
-        # Calculate disk space
-        slash = statvfs('/')
-        free_space = filesizeformat(slash.f_bavail * slash.f_frsize)
+        free_space = filesizeformat(system_snapshot.get('disk')['free'])
         display_power = r.get('display_power')
 
         return Response(
             {
                 'viewlog': viewlog,
-                'loadavg': diagnostics.get_load_avg()['15 min'],
+                'loadavg': system_snapshot.get('loadavg')['15 min'],
                 'free_space': free_space,
                 'display_power': display_power,
-                'up_to_date': is_up_to_date(),
+                'up_to_date': system_snapshot.get('up_to_date'),
                 'anthias_version': self.get_anthias_version(),
                 'device_model': self.get_device_model(),
                 'uptime': self.get_uptime(),
@@ -1279,13 +1336,222 @@ class InfoViewV2(InfoViewMixin):
                 'under_voltage': self.get_under_voltage(),
                 'storage': self.get_storage(),
                 'ip_addresses': self.get_ip_addresses(),
-                'mac_address': get_node_mac_address(),
+                'mac_address': system_snapshot.get('mac_address'),
                 'host_user': getenv('HOST_USER'),
                 'time': self.get_time(),
             }
         )
 
 
+class PlaybackMetricsViewV2(APIView):
+    """Playback latency and frame-drop metrics the viewer records
+    (see ``anthias_common.playback_metrics``).
+
+    ``device_model`` rides along so a fleet tool polling many devices
+    can group the histograms by board — the buckets are fixed, so the
+    histograms of every Pi 3 add up. DELETE clears the metrics, to
+    measure a changed playlist from a clean slate.
+    """
+
+    @extend_schema(
+        summary='Get playback metrics',
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'device_model': {'type': 'string'},
+                    'buckets_ms': {
+                        'type': 'array',
+                        'items': {'type': 'integer'},
+                    },
+                    'histograms': {'type': 'object'},
+                    'counters': {'type': 'object'},
+                },
+            },
+            503: None,
+        },
+    )
+    @authorized
+    def get(self, request: Request) -> Response:
+        metrics = playback_metrics.read()
+        if not metrics:
+            return Response(status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(
+            {'device_model': system_snapshot.get('device_model'), **metrics}
+        )
+
+    @extend_schema(
+        summary='Reset playback metrics',
+        responses={204: None},
+    )
+    @authorized
+    def delete(self, request: Request) -> Response:
+        playback_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def _epoch_ms(raw: str | None, name: str) -> int | None:
+    """An ISO 8601 query parameter as epoch milliseconds; naive times
+    are UTC."""
+    if not raw:
+        return None
+    try:
+        moment = parse_datetime(raw)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValueError(f'{name} must be an ISO 8601 date and time')
+    if timezone.is_naive(moment):
+        moment = moment.replace(tzinfo=UTC)
+    return int(moment.timestamp() * 1000)
+
+
+async def _astream_play_log(
+    path: str,
+    after: int,
+    newest: int,
+    *,
+    as_csv: bool,
+    since_ms: int | None,
+    until_ms: int | None,
+    asset_id: str | None,
+    limit: int | None,
+) -> AsyncGenerator[bytes]:
+    """Stream proof-of-play records ``after < seq <= newest`` one ring
+    batch at a time. Async for the same reason as astream_backup():
+    StreamingHttpResponse buffers a sync generator whole under ASGI.
+    Each batch is read off the event loop."""
+    if as_csv:
+        yield (','.join(proof_of_play.CSV_FIELDS) + '\r\n').encode()
+    sent = 0
+    while after < newest and (limit is None or sent < limit):
+        records, cursor = await asyncio.to_thread(
+            proof_of_play.read_batch,
+            path,
+            after,
+            min(proof_of_play.READ_BATCH, newest - after),
+        )
+        if cursor == after:
+            break
+        after = cursor
+        out = io.StringIO()
+        writer = csv.writer(out)
+        for record in records:
+            if asset_id and record.asset_id != asset_id:
+                continue
+            if since_ms is not None and record.start_ms < since_ms:
+                continue
+            if until_ms is not None and record.start_ms >= until_ms:
+                continue
+            row = record.as_dict()
+            if as_csv:
+                writer.writerow(
+                    [row[field] for field in proof_of_play.CSV_FIELDS]
+                )
+            else:
+                out.write(json.dumps(row) + '\n')
+            sent += 1
+            if limit is not None and sent >= limit:
+                break
+        if out.tell():
+            yield out.getvalue().encode()
+
+
+class ProofOfPlayViewV2(APIView):
+    """Export the proof-of-play log (see
+    ``anthias_common.proof_of_play``): one record per rotation, oldest
+    first, as NDJSON or CSV.
+
+    The response streams the ring a batch at a time, so exporting a
+    full log never loads it into memory. Every record carries its
+    ``seq``; a collector passes the last one it stored as ``after`` to
+    fetch only what is new. ``X-Proof-Of-Play-Head`` is the newest
+    ``seq`` at the time of the request -- the export stops there even
+    while the viewer keeps recording.
+    """
+
+    @extend_schema(
+        summary='Export the proof-of-play log',
+        parameters=[
+            OpenApiParameter(
+                name='output',
+                type=OpenApiTypes.STR,
+                enum=['ndjson', 'csv'],
+                # Not ``format``: DRF reserves that for its renderers.
+                description='NDJSON (the default) or CSV.',
+            ),
+            OpenApiParameter(
+                name='after',
+                type=OpenApiTypes.INT,
+                description='Only records with a greater seq.',
+            ),
+            OpenApiParameter(
+                name='from',
+                type=OpenApiTypes.DATETIME,
+                description='Only rotations that started at or after.',
+            ),
+            OpenApiParameter(
+                name='to',
+                type=OpenApiTypes.DATETIME,
+                description='Only rotations that started before.',
+            ),
+            OpenApiParameter(name='asset_id', type=OpenApiTypes.STR),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                description='At most this many records.',
+            ),
+        ],
+        responses={
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+            (200, 'text/csv'): OpenApiTypes.STR,
+            400: {
+                'type': 'object',
+                'properties': {'error': {'type': 'string'}},
+            },
+        },
+    )
+    @authorized
+    def get(self, request: Request) -> StreamingHttpResponse | Response:
+        params = request.query_params
+        fmt = params.get('output') or 'ndjson'
+        try:
+            if fmt not in ('ndjson', 'csv'):
+                raise ValueError('output must be ndjson or csv')
+            try:
+                after = int(params.get('after') or 0)
+                limit = int(params['limit']) if params.get('limit') else None
+            except ValueError:
+                raise ValueError('after and limit must be integers') from None
+            if after < 0 or (limit is not None and limit < 1):
+                raise ValueError('after and limit must be positive')
+            since_ms = _epoch_ms(params.get('from'), 'from')
+            until_ms = _epoch_ms(params.get('to'), 'to')
+        except ValueError as exc:
+            return Response(
+                {'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        path = proof_of_play.ring_path(settings.get_configdir())
+        newest = proof_of_play.head(path)
+        as_csv = fmt == 'csv'
+        response = StreamingHttpResponse(
+            _astream_play_log(
+                path,
+                after,
+                newest,
+                as_csv=as_csv,
+                since_ms=since_ms,
+                until_ms=until_ms,
+                asset_id=params.get('asset_id') or None,
+                limit=limit,
+            ),
+            content_type='text/csv' if as_csv else 'application/x-ndjson',
+        )
+        response['X-Proof-Of-Play-Head'] = str(newest)
+        return response
+
+
 class IntegrationsViewV2(APIView):
     serializer_class = IntegrationsSerializerV2
 
@@ -1523,6 +1789,15 @@ class ScreenlyMigrateAssetViewV2(APIView):
         )
 
 
+_IMPORT_LISTING_PAGE_PROPERTIES: dict[str, Any] = {
+    'items': {'type': 'array', 'items': {'type': 'object'}},
+    'total': {'type': 'integer'},
+    'offset': {'type': 'integer'},
+    'next_offset': {'type': 'integer', 'nullable': True},
+    'fetched_at': {'type': 'number'},
+}
+
+
 class ImportValidateViewV2(APIView):
     """Validate an import provider's token and enumerate its media.
 
@@ -1531,6 +1806,11 @@ class ImportValidateViewV2(APIView):
     goes straight from the token field to the item picker. The token is
     not stored; each request forwards it inline. ``provider`` is the
     registry key from the URL (``yodeck``, later ``screencloud`` …).
+
+    The listing is cached (see ``lib.integrations.listings``); with a
+    ``limit`` only its first page is returned, with ``total`` and
+    ``next_offset`` for ``ImportListingViewV2`` to page through the
+    rest.
     """
 
     serializer_class = ImportValidateSerializerV2
@@ -1543,7 +1823,7 @@ class ImportValidateViewV2(APIView):
                 'type': 'object',
                 'properties': {
                     'valid': {'type': 'boolean'},
-                    'items': {'type': 'array', 'items': {'type': 'object'}},
+                    **_IMPORT_LISTING_PAGE_PROPERTIES,
                     'error': {'type': 'string', 'nullable': True},
                 },
             },
@@ -1585,8 +1865,63 @@ class ImportValidateViewV2(APIView):
                 status=status.HTTP_502_BAD_GATEWAY,
             )
 
+        listing = import_listings.store_listing(provider_impl, token, items)
+        limit = serializer.validated_data.get('limit') or len(items)
+        return Response(
+            {
+                'valid': True,
+                **import_listings.page(provider, listing, 0, limit),
+            }
+        )
+
+
+class ImportListingViewV2(APIView):
+    """One page of a provider's media listing, from the cache.
+
+    The wizard renders the first page from ``ImportValidateViewV2`` and
+    fetches the rest from here while the operator starts picking.
+    ``refresh`` brings the cached listing up to date — only the changes
+    where the provider can filter by them — before paging.
+    """
+
+    serializer_class = ImportListingSerializerV2
+
+    @extend_schema(
+        summary="Get a page of an import provider's media",
+        request=ImportListingSerializerV2,
+        responses={
+            200: {
+                'type': 'object',
+                'properties': _IMPORT_LISTING_PAGE_PROPERTIES,
+            },
+        },
+    )
+    @authorized
+    def post(self, request: Request, provider: str) -> Response:
+        provider_impl = get_provider(provider)
+        if provider_impl is None:
+            return Response(
+                {'error': 'Unknown import provider.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            listing = import_listings.get_listing(
+                provider_impl, data['token'], refresh=data['refresh']
+            )
+        except requests.RequestException:
+            logger.warning('%s listing failed', provider, exc_info=True)
+            return Response(
+                {'error': _IMPORT_NETWORK_USER_MESSAGE},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
         return Response(
-            {'valid': True, 'items': [item.as_dict() for item in items]}
+            import_listings.page(
+                provider, listing, data['offset'], data['limit']
+            )
         )
 
 
@@ -1659,3 +1994,74 @@ class ImportItemViewV2(APIView):
             )
 
         return Response({**outcome.as_dict(), 'error': None})
+
+
+_IMPORT_JOB_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'job_id': {'type': 'string'},
+        'provider': {'type': 'string'},
+        'status': {'type': 'string', 'enum': ['running', 'done']},
+        'total': {'type': 'integer'},
+        'counts': {'type': 'object'},
+        'items': {'type': 'array', 'items': {'type': 'object'}},
+    },
+}
+
+
+def _import_job_body(job: dict[str, Any]) -> dict[str, Any]:
+    return {**import_jobs.summary(job), 'items': job['items']}
+
+
+class ImportJobListViewV2(APIView):
+    """Start a bulk import job for the wizard's whole selection.
+
+    The per-item endpoint above keeps the browser in the loop for every
+    item; a job runs server-side (see ``lib.integrations.jobs``) and the
+    wizard follows it over the websocket and ``ImportJobViewV2``. The
+    token is held for the job's lifetime only and never echoed back.
+    """
+
+    serializer_class = ImportJobSerializerV2
+
+    @extend_schema(
+        summary='Start a bulk import from a provider',
+        request=ImportJobSerializerV2,
+        responses={202: _IMPORT_JOB_SCHEMA},
+    )
+    @authorized
+    def post(self, request: Request, provider: str) -> Response:
+        if get_provider(provider) is None:
+            return Response(
+                {'error': 'Unknown import provider.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = import_jobs.create_job(
+            provider,
+            serializer.validated_data['token'],
+            serializer.validated_data['remote_ids'],
+            enable=serializer.validated_data.get('enable', True),
+        )
+        # Lazy for the same reason as ``AssetRecheckViewV2``.
+        from anthias_server.celery_tasks import run_import_job
+
+        run_import_job.delay(job['job_id'])
+        return Response(_import_job_body(job), status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobViewV2(APIView):
+    """A bulk import job's progress and per-item results."""
+
+    @extend_schema(
+        summary='Get a bulk import job',
+        responses={200: _IMPORT_JOB_SCHEMA},
+    )
+    @authorized
+    def get(self, request: Request, provider: str, job_id: str) -> Response:
+        job = import_jobs.get_job(job_id)
+        if job is None or job['provider'] != provider:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(_import_job_body(job))
@@ -0,0 +1,118 @@
+"""The dashboard's asset change stream.
+
+Every committed asset write the dashboard should show is numbered: the
+writer bumps ``ASSET_SEQ_KEY`` and records ``{seq, op, asset_ids}`` in
+the capped ``ASSET_CHANGES_KEY`` list, and the same entry goes out
+over the websocket as a delta frame (``consumers.publish_asset_change``).
+A browser applies the deltas in order — re-fetching one row for an
+``updated``, the table for anything that moves rows — and remembers the
+last ``seq`` it applied. The table it rendered carries the ``seq`` it
+was read at, so deltas it already reflects are skipped; after a
+reconnect it asks for what it missed (``changes_since``) instead of
+re-fetching the table.
+
+Ops:
+
+* ``updated`` — the rows' content changed; each can be re-rendered in
+  place (its row endpoint falls back to a full refresh when it moved
+  section).
+* ``moved`` — ``play_order`` changed, so rows may have changed places.
+* ``created`` / ``deleted`` — rows added or removed.
+* ``reset`` — too many rows, or not known which (``asset_ids`` is
+  None).
+
+Same shape as the viewer's playlist change feed (``PLAYLIST_*`` in
+``anthias_server.settings``) and the same contract: best-effort, and a
+reader that can't bridge a gap from the list re-reads everything.
+"""
+
+import json
+import logging
+from typing import Any
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+ASSET_SEQ_KEY = 'anthias.assets.seq'
+ASSET_CHANGES_KEY = 'anthias.assets.changes'
+
+# Entries kept. A browser that was away for more writes than this just
+# re-fetches the table.
+ASSET_CHANGES_MAX = 200
+
+# A write naming more rows than this is recorded as a ``reset``: one
+# table fetch beats that many row fetches.
+ASSET_CHANGE_MAX_IDS = 20
+
+OPS = frozenset({'updated', 'moved', 'created', 'deleted', 'reset'})
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def record(op: str, asset_ids: list[str] | None) -> dict[str, Any] | None:
+    """Number a change and keep it for reconnecting browsers. Returns
+    the entry, or None when Redis is unreachable (the browsers' safety
+    poll covers that)."""
+    if op not in OPS:
+        raise ValueError(f'unknown asset change op {op!r}')
+    if asset_ids is not None:
+        asset_ids = sorted(set(asset_ids))
+        if len(asset_ids) > ASSET_CHANGE_MAX_IDS:
+            asset_ids = None
+    if asset_ids is None:
+        op = 'reset'
+    try:
+        r = _redis()
+        seq = int(r.incr(ASSET_SEQ_KEY))
+        entry = {'seq': seq, 'op': op, 'asset_ids': asset_ids}
+        r.lpush(ASSET_CHANGES_KEY, json.dumps(entry))
+        r.ltrim(ASSET_CHANGES_KEY, 0, ASSET_CHANGES_MAX - 1)
+    except redis.RedisError:
+        logger.warning('Could not record asset change', exc_info=True)
+        return None
+    return entry
+
+
+def current_seq() -> int:
+    """The newest ``seq``; 0 when there is none (or no Redis)."""
+    try:
+        value = _redis().get(ASSET_SEQ_KEY)
+    except redis.RedisError:
+        return 0
+    try:
+        return 0 if value is None else int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def changes_since(seq: int) -> list[dict[str, Any]] | None:
+    """Every change after ``seq``, oldest first — or None when the list
+    no longer (or doesn't yet) hold all of them, and the reader has to
+    start over from a fresh table."""
+    current = current_seq()
+    if seq > current:
+        # The counter went backwards: Redis lost its data.
+        return None
+    if seq == current:
+        return []
+    try:
+        raw_entries = _redis().lrange(ASSET_CHANGES_KEY, 0, -1)
+    except redis.RedisError:
+        return None
+    entries: dict[int, dict[str, Any]] = {}
+    for raw in raw_entries:
+        try:
+            entry = json.loads(raw)
+            entry_seq = int(entry['seq'])
+        except (TypeError, ValueError, KeyError):
+            return None
+        if seq < entry_seq <= current:
+            entries[entry_seq] = entry
+    if len(entries) != current - seq:
+        return None
+    return [entries[n] for n in sorted(entries)]
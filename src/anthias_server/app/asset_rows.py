@@ -0,0 +1,140 @@
+"""Rendered asset-table rows, cached per asset revision.
+
+The home page's table is re-rendered on every 60 s safety poll and on
+every websocket delta, and almost none of its rows change between two
+renders. Each row's HTML is kept here, keyed by a revision of
+everything the row shows: the asset's fields (the same dict the row's
+edit/preview handlers inline), which section it's in, the minute and
+the active timezone — the schedule column reads relative to now
+("Starts in 5m", "Live · ends in 3h") and naturalday's "Today" turns
+over at local midnight, so a minute-old row is re-rendered rather than
+served stale.
+
+The cache is per process and bounded (``ROW_CACHE_MAX``); a miss just
+renders the row. Rows are shared between sessions, so the toggle
+form's CSRF token is rendered as a placeholder and filled in per
+request.
+
+A long remote download's progress (``download_remote_video_asset``)
+is kept here too, in Redis rather than in the row's ``metadata``:
+writing the row every few seconds would publish a playlist revision
+per tick for a row that can't play yet, and race whatever metadata
+edit the operator makes while a multi-GB fetch runs.
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import redis
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import SafeString, mark_safe
+
+ROW_CACHE_MAX = 2000
+
+# Stands in for the CSRF token inside a cached row. Random per process
+# so no asset field can collide with it.
+_CSRF_SLOT = f'csrf-slot-{secrets.token_hex(8)}'
+
+PROGRESS_KEY_PREFIX = 'anthias.download-progress.'
+# Outlives the download's reporting interval by a wide margin, but
+# lets the figure lapse on its own if the worker dies mid-fetch.
+PROGRESS_TTL_S = 300
+
+_rows: 'OrderedDict[str, str]' = OrderedDict()
+_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def set_download_progress(
+    asset_id: str, progress: dict[str, Any] | None
+) -> None:
+    """Record how far ``asset_id``'s download got (``None`` clears
+    it). Best-effort: the row just shows the bare pill without it."""
+    key = f'{PROGRESS_KEY_PREFIX}{asset_id}'
+    try:
+        if progress is None:
+            _redis().delete(key)
+        else:
+            _redis().set(key, json.dumps(progress), ex=PROGRESS_TTL_S)
+    except redis.RedisError:
+        logger.warning(
+            'Could not record download progress for %s',
+            asset_id,
+            exc_info=True,
+        )
+
+
+def download_progress(asset_id: str) -> dict[str, Any] | None:
+    try:
+        raw = _redis().get(f'{PROGRESS_KEY_PREFIX}{asset_id}')
+        progress = None if raw is None else json.loads(raw)
+    except (redis.RedisError, ValueError):
+        return None
+    return progress if isinstance(progress, dict) else None
+
+
+def revision(
+    asset: Any,
+    is_active: bool,
+    now: float | None = None,
+    progress: dict[str, Any] | None = None,
+) -> str:
+    from anthias_server.app.templatetags.asset_filters import _to_dict
+
+    fields = json.dumps(_to_dict(asset), default=str, sort_keys=True)
+    minute = int((now if now is not None else time.time()) // 60)
+    shown = json.dumps(progress, sort_keys=True)
+    digest = hashlib.sha256(
+        f'{fields}|{is_active}|{minute}|{shown}|'
+        f'{timezone.get_current_timezone_name()}'.encode()
+    ).hexdigest()
+    return f'{asset.asset_id}:{digest}'
+
+
+def render_row(asset: Any, *, is_active: bool, csrf_token: Any) -> SafeString:
+    """``_asset_row.html`` for ``asset``, from the cache when its
+    revision was rendered before."""
+    # Only a row still processing can have a download in flight, so
+    # the rest of the table costs no Redis round-trip.
+    progress = (
+        download_progress(asset.asset_id) if asset.is_processing else None
+    )
+    key = revision(asset, is_active, progress=progress)
+    with _lock:
+        html = _rows.get(key)
+        if html is not None:
+            _rows.move_to_end(key)
+    if html is None:
+        html = render_to_string(
+            '_asset_row.html',
+            {
+                'asset': asset,
+                'is_active': is_active,
+                'csrf_token': _CSRF_SLOT,
+                'download_progress': progress,
+            },
+        )
+        with _lock:
+            _rows[key] = html
+            while len(_rows) > ROW_CACHE_MAX:
+                _rows.popitem(last=False)
+    return mark_safe(html.replace(_CSRF_SLOT, str(csrf_token or '')))
+
+
+def clear() -> None:
+    with _lock:
+        _rows.clear()
@@ -1,7 +1,9 @@
+import json
 import logging
 from typing import Any
+from urllib.parse import parse_qs
 
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.layers import get_channel_layer
 
@@ -11,20 +13,68 @@ WS_GROUP = 'ws_server'
 
 
 class AssetConsumer(AsyncWebsocketConsumer):
+    # Set by channels per connection; untyped upstream.
+    scope: dict[str, Any]
+
     async def connect(self) -> None:
         await self.channel_layer.group_add(WS_GROUP, self.channel_name)
         await self.accept()
+        # A reconnecting dashboard says which change it saw last
+        # (``/ws?since=<seq>``); replay what it missed, or tell it to
+        # start over from a fresh table when the change list can't
+        # bridge the gap.
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        try:
+            since = int(query['since'][0])
+        except (KeyError, IndexError, ValueError):
+            return
+        from anthias_server.app import asset_feed
+
+        missed = await sync_to_async(asset_feed.changes_since)(since)
+        if missed is None:
+            seq = await sync_to_async(asset_feed.current_seq)()
+            await self._send(
+                json.dumps({'type': 'asset_reset', 'seq': seq}), 'reset'
+            )
+            return
+        for entry in missed:
+            await self._send_delta(entry)
 
     async def disconnect(self, code: int) -> None:
         await self.channel_layer.group_discard(WS_GROUP, self.channel_name)
 
     async def asset_update(self, event: dict[str, Any]) -> None:
-        # Plain text frame: the client only needs to know "something
-        # changed" to fire htmx refresh-assets; carrying the full
-        # changeset over WS would duplicate the partial render path.
+        # A numbered change (``asset_feed``) goes out as a delta frame.
+        # Without one — Redis was down when it was recorded — a bare
+        # asset-id frame still nudges the client to refresh. Neither
+        # carries the rendered row: rows hold a per-session CSRF token,
+        # so the client fetches the rows a delta names itself.
+        entry = event.get('entry')
+        if entry is not None:
+            await self._send_delta(entry)
+            return
         asset_id = event.get('asset_id', '')
+        await self._send(asset_id, asset_id)
+
+    async def _send_delta(self, entry: dict[str, Any]) -> None:
+        await self._send(
+            json.dumps({'type': 'asset_delta', **entry}),
+            str(entry.get('seq', '')),
+        )
+
+    async def import_progress(self, event: dict[str, Any]) -> None:
+        # A JSON object frame, unlike the bare asset-id nudges above:
+        # the import wizard renders each item's result from it, and the
+        # dashboard's listener tells the two apart by the leading '{'.
+        payload = event.get('payload') or {}
+        await self._send(
+            json.dumps({'type': 'import_progress', **payload}),
+            payload.get('job_id', ''),
+        )
+
+    async def _send(self, text_data: str, label: str) -> None:
         try:
-            await self.send(text_data=asset_id)
+            await self.send(text_data=text_data)
         except RuntimeError as exc:
             # The browser can disconnect in the window between the
             # group_send dispatch and this send, so the ASGI server has
@@ -37,8 +87,8 @@ class AssetConsumer(AsyncWebsocketConsumer):
             # merely mentions websocket.send — still propagates instead
             # of being hidden. group_discard runs in disconnect(), so
             # this stale channel is on its way out — drop the nudge; the
-            # client's 5s poll keeps it consistent. Log at debug (with
-            # the asset_id) so the race stays diagnosable without
+            # client resumes from its last seq when it reconnects. Log at debug (with
+            # the asset or job id) so the race stays diagnosable without
             # becoming a reportable event.
             message = str(exc)
             is_send_after_close = (
@@ -51,9 +101,9 @@ class AssetConsumer(AsyncWebsocketConsumer):
             if not is_send_after_close:
                 raise
             logger.debug(
-                'asset_update: send on a closed websocket for %r; client '
+                'AssetConsumer: send on a closed websocket for %r; client '
                 'disconnected mid-broadcast',
-                asset_id,
+                label,
                 exc_info=True,
             )
 
@@ -66,18 +116,63 @@ def notify_asset_update(asset_id: str = '*') -> None:
     the affected asset_id when known; '*' is a generic "table state
     changed" sentinel for write paths that touch many rows at once
     (reorder, settings save, ...).
+
+    Coalesced (``anthias_server.coalesce``): a burst of nudges — an
+    import's worth of tasks finishing — goes out as one delta naming
+    every row.
+    """
+    from anthias_server import coalesce
+
+    coalesce.request_dashboard_update(None if asset_id == '*' else [asset_id])
+
+
+def publish_asset_change(op: str, asset_ids: list[str] | None) -> None:
+    """Number a change in the dashboard's change stream
+    (``asset_feed``) and send it to every connected browser.
+
+    The model layer calls this after every committed asset write;
+    ``notify_asset_update`` is the explicit nudge for paths that want
+    one regardless.
     """
+    from anthias_server.app import asset_feed
+
+    entry = asset_feed.record(op, asset_ids)
+    message: dict[str, Any] = {'type': 'asset_update', 'entry': entry}
+    if entry is None:
+        message = {
+            'type': 'asset_update',
+            'asset_id': asset_ids[0] if asset_ids else '*',
+        }
     layer = get_channel_layer()
     if layer is None:
         # No CHANNEL_LAYERS configured — quietly skip rather than
-        # 500ing the request. The 5s poll still keeps the table
+        # 500ing the request. The safety poll still keeps the table
         # eventually-consistent.
         return
     try:
-        async_to_sync(layer.group_send)(
-            WS_GROUP, {'type': 'asset_update', 'asset_id': asset_id}
-        )
+        async_to_sync(layer.group_send)(WS_GROUP, message)
     except Exception:
         # Redis hiccup / channel-layer outage — log and let the caller
         # carry on; the poll fallback covers correctness.
-        logger.exception('notify_asset_update failed for %s', asset_id)
+        logger.exception('publish_asset_change failed for %s', asset_ids)
+
+
+def notify_import_progress(payload: dict[str, Any]) -> None:
+    """Push a bulk import job's progress to every connected browser.
+
+    ``payload`` is ``jobs.summary()`` plus the item that just changed
+    (None for job-level changes). Same best-effort contract as
+    ``notify_asset_update``: the wizard also polls the job endpoint,
+    so a dropped frame only delays a row's update.
+    """
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(
+            WS_GROUP, {'type': 'import_progress', 'payload': payload}
+        )
+    except Exception:
+        logger.exception(
+            'notify_import_progress failed for %s', payload.get('job_id')
+        )
@@ -12,7 +12,8 @@ from django.utils import timezone
 from anthias_common.utils import get_video_duration
 from anthias_server.app.models import Asset
 from anthias_server.app.page_context import navbar as _navbar_context
-from anthias_server.settings import ViewerPublisher, settings
+from anthias_server.coalesce import request_viewer_reload
+from anthias_server.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +156,36 @@ def delete_asset_with_file(asset: Asset, *, nudge_viewer: bool = True) -> None:
     # Wake the viewer so it skips a now-deleted asset that's still on
     # screen instead of finishing its remaining ``duration`` (#2430).
     # The viewer's reload handler checks whether the currently-shown
-    # asset is still active and advances if not.
+    # asset is still active and advances if not. Coalesced, so an API
+    # client deleting rows one call at a time wakes it once.
     if nudge_viewer:
-        ViewerPublisher.get_instance().send_to_viewer('reload')
+        request_viewer_reload([asset.asset_id])
+
+
+def delete_assets_with_files(asset_ids: list[str]) -> int:
+    """``delete_asset_with_file`` for a batch: every row in one DELETE
+    (one playlist revision, one dashboard delta), then the owned files.
+    Returns how many rows were deleted. Never nudges the viewer — the
+    caller sends one reload for the whole batch.
+
+    The files go once the delete commits, so a batch that rolls back
+    can't leave rows pointing at files already removed.
+    """
+    from django.db import transaction
+
+    rows = Asset.objects.filter(asset_id__in=asset_ids)
+    uris = list(rows.values_list('uri', flat=True))
+    if not uris:
+        return 0
+    rows.delete()
+    transaction.on_commit(lambda: _remove_asset_files(uris))
+    return len(uris)
+
+
+def _remove_asset_files(uris: list[str | None]) -> None:
+    for uri in uris:
+        if uri and uri.startswith(settings['assetdir']):
+            try:
+                remove(uri)
+            except OSError as exc:
+                logger.warning('Failed to remove asset file %s: %s', uri, exc)
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('anthias_app', '0007_asset_skip_ssl_verify'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='next_probe_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='probe_successes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='probe_failures',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""Give import provenance its own indexed table.
+
+Back-fills ``import_sources`` from the ``metadata['import_source']``
+stamps the importers have been writing, so assets imported before the
+upgrade are still recognised as already imported.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_import_sources(apps, schema_editor):  # type: ignore[no-untyped-def]
+    Asset = apps.get_model('anthias_app', 'Asset')
+    ImportSource = apps.get_model('anthias_app', 'ImportSource')
+    rows = []
+    stamped = Asset.objects.filter(metadata__has_key='import_source')
+    for asset_id, metadata in stamped.values_list(
+        'asset_id', 'metadata'
+    ).iterator():
+        source = (metadata or {}).get('import_source')
+        if not isinstance(source, dict):
+            continue
+        provider = source.get('provider')
+        remote_id = source.get('remote_id')
+        if not provider or remote_id in (None, ''):
+            continue
+        rows.append(
+            ImportSource(
+                asset_id=asset_id,
+                provider=str(provider),
+                remote_id=str(remote_id),
+            )
+        )
+    ImportSource.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('anthias_app', '0008_asset_probe_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportSource',
+            fields=[
+                (
+                    'asset',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='import_source',
+                        serialize=False,
+                        to='anthias_app.asset',
+                    ),
+                ),
+                ('provider', models.TextField()),
+                ('remote_id', models.TextField()),
+                ('remote_revision', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'import_sources',
+                'indexes': [
+                    models.Index(
+                        fields=['provider', 'remote_id'],
+                        name='import_source_remote_idx',
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_import_sources, migrations.RunPython.noop
+        ),
+    ]
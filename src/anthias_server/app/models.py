@@ -1,10 +1,14 @@
 import json
 import re
+import threading
 import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Any
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.expressions import Combinable
 from django.utils import timezone
 
 ALL_DAYS = [1, 2, 3, 4, 5, 6, 7]
@@ -202,12 +206,235 @@ def _default_play_days() -> str:
     return json.dumps(ALL_DAYS)
 
 
+# The reachability sweep's bookkeeping for each probed row: when it
+# last looked, when it should look next, and the run of identical
+# verdicts that decides how far out "next" is.
+PROBE_SCHEDULE_FIELDS = (
+    'last_reachability_check',
+    'next_probe_at',
+    'probe_successes',
+    'probe_failures',
+)
+
+# Columns the viewer never reads: the reachability sweep stamps its
+# schedule fields on every row it probes, and ``md5`` is stripped from
+# the playlist dicts. Writes confined to these don't bump the playlist
+# revision.
+PLAYLIST_NEUTRAL_FIELDS = frozenset({*PROBE_SCHEDULE_FIELDS, 'md5'})
+
+# Columns that decide what the sweep probes and whether it probes the
+# row at all. The backoff was earned by the old target, so changing one
+# of them clears it and the row is due on the next sweep tick, not up
+# to ``ASSET_PROBE_MAX_INTERVAL_S`` later.
+PROBE_TARGET_FIELDS = ('uri', 'skip_ssl_verify', 'is_enabled')
+PROBE_RESET = {
+    'next_probe_at': None,
+    'probe_successes': 0,
+    'probe_failures': 0,
+}
+
+
+def _touches_playlist(fields: Iterable[str]) -> bool:
+    return not PLAYLIST_NEUTRAL_FIELDS.issuperset(fields)
+
+
+class _ChangeBatch:
+    """What the writes inside ``asset_change_batch`` changed, folded:
+    ids are None once any write named "anything"."""
+
+    def __init__(self) -> None:
+        self.playlist = False
+        self.playlist_ids: set[str] | None = set()
+        self.ops: set[str] = set()
+        self.dashboard_ids: set[str] | None = set()
+
+
+_batch = threading.local()
+
+
+def _merge_ids(
+    into: set[str] | None, asset_ids: Iterable[str] | None
+) -> set[str] | None:
+    if into is None or asset_ids is None:
+        return None
+    into.update(asset_ids)
+    return into
+
+
+@contextmanager
+def asset_change_batch() -> Iterator[None]:
+    """Send the change notifications of every asset write inside the
+    block as one playlist revision and one dashboard delta, when the
+    block exits.
+
+    Without it, a reorder or a bulk edit issued as many writes bumps
+    the revision (and wakes every dashboard) once per write. Enter it
+    inside the ``transaction.atomic`` block the writes share, so the
+    combined notifications still wait for the commit. Nests: only the
+    outermost block sends.
+    """
+    if getattr(_batch, 'changes', None) is not None:
+        yield
+        return
+    changes = _batch.changes = _ChangeBatch()
+    try:
+        yield
+    finally:
+        _batch.changes = None
+        if changes.playlist:
+            notify_playlist_change(changes.playlist_ids)
+        if changes.ops:
+            notify_dashboard_change(
+                next(iter(changes.ops)) if len(changes.ops) == 1 else 'reset',
+                changes.dashboard_ids,
+            )
+
+
+def notify_playlist_change(asset_ids: Iterable[str] | None) -> None:
+    """Publish a playlist revision once the current transaction commits.
+
+    Deferred with ``on_commit`` so the viewer can never see the new
+    revision before the rows behind it are readable; in autocommit mode
+    (every write path outside an explicit ``atomic`` block) it runs
+    immediately. Inside ``asset_change_batch`` it's folded into the
+    batch's single revision instead.
+    """
+    from anthias_server.settings import (
+        PLAYLIST_CHANGE_MAX_IDS,
+        ViewerPublisher,
+    )
+
+    batch = getattr(_batch, 'changes', None)
+    if batch is not None:
+        batch.playlist = True
+        batch.playlist_ids = _merge_ids(batch.playlist_ids, asset_ids)
+        return
+    ids = None if asset_ids is None else sorted(set(asset_ids))
+    if ids is not None and len(ids) > PLAYLIST_CHANGE_MAX_IDS:
+        ids = None
+    transaction.on_commit(
+        lambda: ViewerPublisher.get_instance().publish_playlist_change(ids)
+    )
+
+
+def notify_dashboard_change(op: str, asset_ids: Iterable[str] | None) -> None:
+    """Send a change to the dashboard's change stream once the current
+    transaction commits (``consumers.publish_asset_change``), so a
+    browser never fetches a row before the write behind it is
+    readable."""
+    from anthias_server.app.consumers import publish_asset_change
+
+    batch = getattr(_batch, 'changes', None)
+    if batch is not None:
+        batch.ops.add(op)
+        batch.dashboard_ids = _merge_ids(batch.dashboard_ids, asset_ids)
+        return
+    ids = None if asset_ids is None else list(asset_ids)
+    transaction.on_commit(lambda: publish_asset_change(op, ids))
+
+
+def _mark_files(
+    uris: Iterable[str | None], digests: Iterable[str | None] = ()
+) -> None:
+    """Hand files rows may have stopped referencing, and the blobs
+    of their ``md5``, to the orphan sweep (``anthias_server.assetsweep``)."""
+    from anthias_server import assetsweep
+
+    assetsweep.mark(uris, digests)
+
+
+def _probe_target(asset: 'Asset') -> dict[str, Any]:
+    return {
+        field: asset.__dict__[field]
+        for field in PROBE_TARGET_FIELDS
+        if field in asset.__dict__
+    }
+
+
+class AssetQuerySet(models.QuerySet['Asset']):
+    """Bumps the playlist revision for bulk writes.
+
+    ``Asset.save``/``delete`` cover single-row writes; this covers the
+    ``filter(...).update()`` / ``.delete()`` forms the Celery tasks and
+    the bulk views use, so no write path has to remember to do it.
+    """
+
+    def _changed_ids(self, limit: int) -> list[str] | None:
+        ids = list(self.values_list('asset_id', flat=True)[: limit + 1])
+        return None if len(ids) > limit else ids
+
+    def update(self, **kwargs: Any) -> int:
+        from anthias_server.settings import PLAYLIST_CHANGE_MAX_IDS
+
+        if not _touches_playlist(kwargs):
+            return super().update(**kwargs)
+        relevant = {
+            k: v for k, v in kwargs.items() if k not in PLAYLIST_NEUTRAL_FIELDS
+        }
+        candidates = self
+        if not any(
+            isinstance(v, (Combinable, dict, list)) for v in relevant.values()
+        ):
+            # Plain values: only rows where some relevant column
+            # actually differs change the playlist. This is what keeps
+            # a reachability sweep that finds every URL still up from
+            # bumping the revision on each row it stamps.
+            candidates = self.exclude(**relevant)
+        asset_ids = candidates._changed_ids(PLAYLIST_CHANGE_MAX_IDS)
+        self._reset_probe_schedule(kwargs)
+        old_files = (
+            list(self.values_list('uri', 'md5')) if 'uri' in kwargs else []
+        )
+        rows = super().update(**kwargs)
+        _mark_files(
+            (uri for uri, _ in old_files), (md5 for _, md5 in old_files)
+        )
+        if asset_ids != []:
+            notify_playlist_change(asset_ids)
+            notify_dashboard_change(
+                'moved' if 'play_order' in kwargs else 'updated', asset_ids
+            )
+        return rows
+
+    def _reset_probe_schedule(self, kwargs: dict[str, Any]) -> None:
+        target = {k: v for k, v in kwargs.items() if k in PROBE_TARGET_FIELDS}
+        if not target or any(k in kwargs for k in PROBE_RESET):
+            return
+        if any(isinstance(v, Combinable) for v in target.values()):
+            kwargs.update(PROBE_RESET)
+            return
+        # Only rows whose target actually changes: a bulk enable must
+        # not throw away the schedule of rows that were already on.
+        models.QuerySet.update(self.exclude(**target), **PROBE_RESET)
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        from anthias_server.settings import PLAYLIST_CHANGE_MAX_IDS
+
+        rows = list(self.values_list('asset_id', 'uri', 'md5'))
+        deleted = super().delete()
+        _mark_files((uri for _, uri, _ in rows), (md5 for _, _, md5 in rows))
+        if rows:
+            notify_playlist_change(
+                [asset_id for asset_id, _, _ in rows]
+                if len(rows) <= PLAYLIST_CHANGE_MAX_IDS
+                else None
+            )
+            notify_dashboard_change(
+                'deleted', [asset_id for asset_id, _, _ in rows]
+            )
+        return deleted
+
+
 class Asset(models.Model):
     asset_id = models.TextField(
         primary_key=True, default=generate_asset_id, editable=False
     )
     name = models.TextField(blank=True, null=True)
     uri = models.TextField(blank=True, null=True)
+    # Digest of the file's content as it arrived, before normalisation
+    # (``anthias_server.blobstore``). Names the shared blob for files
+    # that are stored once, and lets the normalise tasks reuse another
+    # row's result for the same source.
     md5 = models.TextField(blank=True, null=True)
     start_date = models.DateTimeField(blank=True, null=True)
     end_date = models.DateTimeField(blank=True, null=True)
@@ -231,6 +458,15 @@ class Asset(models.Model):
     play_time_to = models.TimeField(blank=True, null=True)
     is_reachable = models.BooleanField(default=True)
     last_reachability_check = models.DateTimeField(blank=True, null=True)
+    # Adaptive probe schedule, owned by the reachability sweep
+    # (``revalidate_asset_urls``): the row is probed once
+    # ``next_probe_at`` has passed (NULL means never probed, so due
+    # now). The counters hold the current run of consecutive
+    # reachable / unreachable verdicts — one of them is always 0 —
+    # and set how far the next probe is pushed out.
+    next_probe_at = models.DateTimeField(blank=True, null=True)
+    probe_successes = models.PositiveIntegerField(default=0)
+    probe_failures = models.PositiveIntegerField(default=0)
     # Per-asset bag of processing-pipeline state. Carries flags written
     # by the upload-time normalisation tasks (normalize_image_asset,
     # normalize_video_asset) — original file extension, whether a
@@ -241,12 +477,80 @@ class Asset(models.Model):
     # ``or {}`` guard.
     metadata = models.JSONField(default=dict, blank=True)
 
+    objects = AssetQuerySet.as_manager()
+
     class Meta:
         db_table = 'assets'
 
     def __str__(self) -> str:
         return str(self.name)
 
+    @classmethod
+    def from_db(cls, db: str | None, field_names: Any, values: Any) -> 'Asset':
+        instance = super().from_db(db, field_names, values)
+        # The ``uri`` as stored, so ``save`` can tell when the row lets
+        # go of its file. Kept on ``_state``: the viewer's asset dicts
+        # are the instance ``__dict__`` (``timeline.asset_to_dict``).
+        instance._state.stored_uri = instance.__dict__.get('uri')  # type: ignore[attr-defined]
+        # Likewise ``play_order``, so the dashboard is told when the
+        # row may have changed places rather than just content.
+        instance._state.stored_play_order = instance.__dict__.get(  # type: ignore[attr-defined]
+            'play_order'
+        )
+        # And the probe target, so ``save`` can clear a schedule it
+        # voids (deferred columns are left out and never compared).
+        instance._state.stored_probe_target = _probe_target(instance)  # type: ignore[attr-defined]
+        return instance
+
+    def _reset_probe_schedule(self, kwargs: dict[str, Any]) -> None:
+        stored = getattr(self._state, 'stored_probe_target', None)
+        if not stored:
+            return
+        update_fields = kwargs.get('update_fields')
+        current = _probe_target(self)
+        if not any(
+            current.get(field, value) != value
+            for field, value in stored.items()
+            if update_fields is None or field in update_fields
+        ):
+            return
+        for field, value in PROBE_RESET.items():
+            setattr(self, field, value)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *PROBE_RESET}
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        adding = self._state.adding
+        self._reset_probe_schedule(kwargs)
+        super().save(*args, **kwargs)
+        self._state.stored_probe_target = _probe_target(self)  # type: ignore[attr-defined]
+        stored_uri = getattr(self._state, 'stored_uri', None)
+        if stored_uri is not None and stored_uri != self.uri:
+            _mark_files([stored_uri], [self.md5])
+        self._state.stored_uri = self.uri  # type: ignore[attr-defined]
+        stored_play_order = getattr(self._state, 'stored_play_order', None)
+        self._state.stored_play_order = self.play_order  # type: ignore[attr-defined]
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or _touches_playlist(update_fields):
+            notify_playlist_change([self.asset_id])
+            if adding:
+                op = 'created'
+            elif stored_play_order != self.play_order:
+                op = 'moved'
+            else:
+                op = 'updated'
+            notify_dashboard_change(op, [self.asset_id])
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        asset_id = self.asset_id
+        uri = self.uri
+        md5 = self.md5
+        deleted = super().delete(*args, **kwargs)
+        _mark_files([uri], [md5])
+        notify_playlist_change([asset_id])
+        notify_dashboard_change('deleted', [asset_id])
+        return deleted
+
     def get_play_days(self) -> list[int]:
         """Parse play_days into a sorted, deduped list of ints 1-7.
 
@@ -326,3 +630,38 @@ class Asset(models.Model):
             yesterday = weekday - 1 if weekday > 1 else 7
             return yesterday in days
         return False
+
+
+class ImportSource(models.Model):
+    """Where an imported asset came from: a provider and its id there.
+
+    The importers' "already imported?" check used to look inside every
+    row's ``metadata`` JSON; this is the same provenance as its own
+    indexed table, so checking a whole listing page is one index range
+    over ``(provider, remote_id)``. ``metadata['import_source']`` is
+    still stamped alongside, for API consumers that read it.
+    ``remote_revision`` is the provider's modification stamp at import,
+    where it reports one.
+    """
+
+    asset = models.OneToOneField(
+        Asset,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='import_source',
+    )
+    provider = models.TextField()
+    remote_id = models.TextField()
+    remote_revision = models.TextField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'import_sources'
+        indexes = (
+            models.Index(
+                fields=['provider', 'remote_id'],
+                name='import_source_remote_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.provider}:{self.remote_id}'
@@ -11,10 +11,9 @@ import logging
 import os
 import zoneinfo
 from datetime import timedelta
-from os import getenv, statvfs
+from os import getenv
 from typing import Any
 
-import psutil
 from django.template.defaultfilters import filesizeformat
 
 from anthias_common import device_helper, storage_health, undervoltage
@@ -22,11 +21,9 @@ from anthias_common.board import LOW_RAM_THRESHOLD_KB
 from anthias_common.utils import (
     clamp_screen_rotation,
     connect_to_redis,
-    get_node_mac_address,
     is_balena_app,
 )
-from anthias_server.lib import diagnostics, display_power
-from anthias_server.lib.github import is_up_to_date
+from anthias_server.lib import diagnostics, display_power, system_snapshot
 from anthias_server.lib.timezone import format_utc_offset
 from anthias_server.settings import settings
 
@@ -152,7 +149,8 @@ def _blank_storage_state() -> dict[str, Any]:
 
 def _storage_state() -> dict[str, Any]:
     try:
-        return storage_health.get_state(_redis, settings.get_configdir())
+        state: dict[str, Any] = system_snapshot.get('storage')
+        return state
     except Exception:
         # Never let a diagnostic break page rendering.
         return _blank_storage_state()
@@ -318,7 +316,7 @@ def navbar() -> dict[str, Any]:
     """Shared by every page; merged into context by helpers.template()."""
     return {
         'is_balena': is_balena_app(),
-        'up_to_date': is_up_to_date(),
+        'up_to_date': system_snapshot.get('up_to_date'),
         'player_name': settings['player_name'],
         'power_warning': _power_warning(),
         'storage_warning': _storage_warning(),
@@ -347,26 +345,30 @@ def system_info() -> dict[str, Any]:
     from django.utils import timezone
     from django.utils.timesince import timesince
 
-    slash = statvfs('/')
-    virtual_memory = psutil.virtual_memory()
-    disk_total = slash.f_blocks * slash.f_frsize
-    disk_free = slash.f_bavail * slash.f_frsize
+    # Device facts come from the background-maintained snapshot
+    # (lib.system_snapshot), not sampled per render.
+    disk = system_snapshot.get('disk')
+    memory = system_snapshot.get('memory')
+    disk_total = disk['total']
+    disk_free = disk['free']
     disk_used = max(0, disk_total - disk_free)
-    uptime = timedelta(seconds=diagnostics.get_uptime())
-    device_model, device_model_detail = device_helper.get_device_model_parts()
+    uptime = timedelta(seconds=system_snapshot.get('uptime'))
+    device_model, device_model_detail = system_snapshot.get(
+        'device_model_parts'
+    )
 
-    anthias_version = diagnostics.get_anthias_version()
-    anthias_version_head = diagnostics.get_anthias_version_head()
-    anthias_version_meta = diagnostics.get_anthias_version_meta()
+    anthias_version = system_snapshot.get('anthias_version')
+    anthias_version_head = system_snapshot.get('anthias_version_head')
+    anthias_version_meta = system_snapshot.get('anthias_version_meta')
 
     # Pie-friendly breakdown — three slices that sum to total. psutil's
     # `used` already excludes buffers/cache on Linux (matches `free -m`),
     # `available` is what new processes can claim before swapping.
     # Cache estimate = total − used − free; clamped to ≥0 so kernels
     # that report differently still produce sane geometry.
-    mem_total = virtual_memory.total >> 20
-    mem_used = virtual_memory.used >> 20
-    mem_free = virtual_memory.free >> 20
+    mem_total = memory['total'] >> 20
+    mem_used = memory['used'] >> 20
+    mem_free = memory['free'] >> 20
     mem_cache = max(0, mem_total - mem_used - mem_free)
 
     def _pct(n: int, total: int) -> float:
@@ -379,7 +381,7 @@ def system_info() -> dict[str, Any]:
     # 1.5×nproc so a single runaway process doesn't drown out the
     # baseline. trend ∈ {'up', 'down', 'stable'} drives the arrow.
     cpu_count = os.cpu_count() or 1
-    load_raw = diagnostics.get_load_avg()
+    load_raw = system_snapshot.get('loadavg')
     load_1m = load_raw['1 min']
     load_5m = load_raw['5 min']
     load_15m = load_raw['15 min']
@@ -431,9 +433,9 @@ def system_info() -> dict[str, Any]:
             'total': mem_total,
             'used': mem_used,
             'free': mem_free,
-            'shared': virtual_memory.shared >> 20,
-            'buff': virtual_memory.buffers >> 20,
-            'available': virtual_memory.available >> 20,
+            'shared': memory['shared'] >> 20,
+            'buff': memory['buffers'] >> 20,
+            'available': memory['available'] >> 20,
             'cache': mem_cache,
             'used_pct': _pct(mem_used, mem_total),
             'cache_pct': _pct(mem_cache, mem_total),
@@ -449,7 +451,7 @@ def system_info() -> dict[str, Any]:
         # /proc/meminfo source host_agent reads) so the page is
         # accurate even if host_agent hasn't published yet.
         'low_ram': {
-            'active': virtual_memory.total < LOW_RAM_THRESHOLD_KB * 1024,
+            'active': memory['total'] < LOW_RAM_THRESHOLD_KB * 1024,
             'threshold_mib': LOW_RAM_THRESHOLD_KB >> 10,
         },
         # Full under-voltage detail for the System Info card. The
@@ -500,7 +502,7 @@ def system_info() -> dict[str, Any]:
         'anthias_version': anthias_version,
         'anthias_version_head': anthias_version_head,
         'anthias_version_meta': anthias_version_meta,
-        'mac_address': get_node_mac_address(),
+        'mac_address': system_snapshot.get('mac_address'),
         'host_user': getenv('HOST_USER'),
     }
 
@@ -590,6 +592,7 @@ def device_settings() -> dict[str, Any]:
         'use_24_hour_clock': settings['use_24_hour_clock'],
         'debug_logging': settings['debug_logging'],
         'prefer_dark_mode': settings['prefer_dark_mode'],
+        'prefetch_next_asset': settings['prefetch_next_asset'],
         'verify_ssl': settings['verify_ssl'],
         # Clamp on the read side so a stale conf value (e.g. an
         # old 45 from a hand-edit) doesn't leave the dropdown with no
@@ -631,7 +634,15 @@ def device_settings() -> dict[str, Any]:
     }
 
 
-def assets() -> dict[str, Any]:
+# Inactive rows rendered per "Show more" step. The Enabled section is
+# always rendered whole — it's the playlist, drag-to-reorder posts its
+# complete order — but the Inactive one is where a large library's
+# long tail (expired campaigns, disabled imports) piles up, and every
+# 5 s poll used to render all of it.
+INACTIVE_PAGE_SIZE = 100
+
+
+def assets(inactive_limit: int | None = None) -> dict[str, Any]:
     """Active + inactive asset lists for /.
 
     Partition matches what the operator can change directly from the
@@ -644,24 +655,44 @@ def assets() -> dict[str, Any]:
     because today's weekday isn't in the asset's play_days, and the
     operator would have no way to flip it back without editing the
     schedule. React's UI used the same operator-facing split.
+
+    The split and the ordering run in the database; only the first
+    ``inactive_limit`` inactive rows (``INACTIVE_PAGE_SIZE`` by
+    default) are loaded, with the section's full count alongside.
+
+    ``asset_seq`` is the dashboard change stream's position the rows
+    were read at (``asset_feed``); the browser applies only deltas
+    after it.
     """
-    from anthias_server.app.models import Asset
-
-    qs = Asset.objects.all()
-    active: list[Asset] = []
-    inactive: list[Asset] = []
-    for asset in qs:
-        if asset.is_enabled and not asset.is_processing:
-            active.append(asset)
-        else:
-            inactive.append(asset)
-    active.sort(key=lambda a: a.play_order)
-    inactive.sort(key=lambda a: a.play_order)
-    from anthias_server.app.models import REFRESH_INTERVAL_S_MAX
+    from django.db.models import Q
+
+    from anthias_server.app import asset_feed
+    from anthias_server.app.models import REFRESH_INTERVAL_S_MAX, Asset
+
+    if inactive_limit is None or inactive_limit < 1:
+        inactive_limit = INACTIVE_PAGE_SIZE
+    # Read before querying: a write landing in between is then both in
+    # the rows and re-applied as a delta (harmless), never missed.
+    asset_seq = asset_feed.current_seq()
+    is_active = Q(is_enabled=True, is_processing=False)
+    active = list(Asset.objects.filter(is_active).order_by('play_order'))
+    inactive_qs = Asset.objects.exclude(is_active).order_by('play_order')
+    inactive = list(inactive_qs[:inactive_limit])
+    inactive_count = (
+        len(inactive)
+        if len(inactive) < inactive_limit
+        else inactive_qs.count()
+    )
 
     return {
         'active_assets': active,
         'inactive_assets': inactive,
+        'active_count': len(active),
+        'inactive_count': inactive_count,
+        'inactive_hidden': inactive_count - len(inactive),
+        'inactive_limit': inactive_limit,
+        'inactive_next_limit': inactive_limit + INACTIVE_PAGE_SIZE,
+        'asset_seq': asset_seq,
         # Render the auto-refresh input's ``max`` attribute from the
         # same constant the v2 serializer / form handler use, so the
         # client-side and server-side caps can't drift.
@@ -0,0 +1,292 @@
+"""The playlist engine shared by the viewer and the server.
+
+Both ends answer the same question — "which assets play right now, and
+when does that answer next change?" — and used to answer it separately:
+the Python viewer's ``Scheduler`` kept a compiled ``ScheduleTimeline`` in
+step with the playlist change feed, while ``/api/v2/viewer/playlist``
+re-queried every enabled row, ran ``Asset.is_active()`` on each and
+approximated windowed deadlines with a 60 s cap. ``PlaylistSource`` is
+the viewer's half lifted out so the endpoint runs the very same
+evaluation, exact deadlines included.
+
+``PlaylistCache`` sits on top of it for the server: the evaluated (and
+rendered) playlist is kept per (playlist revision, settings, timeline
+segment), so a viewer polling the endpoint between changes costs a
+Redis ``GET``, a ``stat`` of ``anthias.conf`` and a bisect — and gets
+the same ETag back, which the view turns into a ``304``.
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import redis
+
+from anthias_server.app.timeline import (
+    ScheduleTimeline,
+    compile_timeline,
+    patch_timeline,
+)
+from anthias_server.settings import (
+    PLAYLIST_CHANGES_KEY,
+    PLAYLIST_EPOCH_KEY,
+    PLAYLIST_REVISION_KEY,
+    settings,
+)
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+_sysrandom = secrets.SystemRandom()
+
+
+def evaluate_playlist(
+    timeline: ScheduleTimeline, now: datetime
+) -> tuple[list[dict[str, Any]], datetime | None]:
+    """The active assets at ``now`` — shuffled when the setting says so
+    — and the next instant the active set changes."""
+    playlist, deadline = timeline.evaluate(now)
+    if settings['shuffle_playlist']:
+        _sysrandom.shuffle(playlist)
+    logger.debug(
+        'evaluate_playlist: %d assets, deadline %s',
+        len(playlist),
+        deadline,
+    )
+    return playlist, deadline
+
+
+@dataclass(frozen=True)
+class PlaylistRevision:
+    """A playlist revision: the change-feed counter and the epoch it
+    was issued in (see ``PLAYLIST_EPOCH_KEY``). Numbers from different
+    epochs say nothing about each other."""
+
+    epoch: str
+    number: int
+
+
+class PlaylistSource:
+    """A compiled timeline kept in step with the playlist change feed.
+
+    ``revision`` is the playlist revision ``timeline`` reflects; None
+    while the server's change feed is unavailable, in which case the
+    caller can't tell a current timeline from a stale one and has to
+    fall back to its own change detection (the viewer watches the
+    database files; the server recompiles per request).
+    """
+
+    def __init__(self, redis_connection: 'Redis | None' = None) -> None:
+        if redis_connection is None:
+            from anthias_common.utils import connect_to_redis
+
+            redis_connection = connect_to_redis()
+        self._redis = redis_connection
+        self.revision: PlaylistRevision | None = None
+        self.timeline: ScheduleTimeline | None = None
+
+    def get_revision(self) -> PlaylistRevision | None:
+        try:
+            # One MGET, so a flush can't slip in between the two reads
+            # and pair the old counter with a new epoch.
+            value, epoch = self._redis.mget(
+                [PLAYLIST_REVISION_KEY, PLAYLIST_EPOCH_KEY]
+            )
+            if value is not None and epoch is None:
+                # A counter published before epochs existed: give it
+                # one (NX, so every reader settles on the same token).
+                self._redis.set(
+                    PLAYLIST_EPOCH_KEY, secrets.token_hex(8), nx=True
+                )
+                value, epoch = self._redis.mget(
+                    [PLAYLIST_REVISION_KEY, PLAYLIST_EPOCH_KEY]
+                )
+        except redis.RedisError:
+            return None
+        if value is None or epoch is None:
+            return None
+        try:
+            return PlaylistRevision(epoch=epoch, number=int(value))
+        except (TypeError, ValueError):
+            return None
+
+    def recompile(self, now: datetime) -> ScheduleTimeline:
+        """Compile the timeline from the database (one query)."""
+        # Read the revision before querying: a write that lands in
+        # between then shows up as a newer revision on the next check
+        # (one redundant patch) rather than being missed.
+        self.revision = self.get_revision()
+        self.timeline = compile_timeline(now)
+        return self.timeline
+
+    def catch_up(
+        self, revision: PlaylistRevision, now: datetime
+    ) -> ScheduleTimeline:
+        """Bring the timeline to playlist ``revision``.
+
+        When every change since our revision is still in the server's
+        change list and names its rows, only those rows are re-read and
+        patched into the timeline; anything else (a gap, a full
+        invalidation, a stale timeline) falls back to a recompile.
+        """
+        asset_ids = self.changed_asset_ids(revision)
+        if (
+            asset_ids is None
+            or self.timeline is None
+            or self.timeline.is_stale(now)
+        ):
+            return self.recompile(now)
+        self.revision = revision
+        self.timeline = patch_timeline(self.timeline, asset_ids, now)
+        return self.timeline
+
+    def sync(self, now: datetime) -> ScheduleTimeline:
+        """The timeline, current as of ``now``: caught up with the
+        change feed, or recompiled when it has gone stale or there is
+        no feed to follow."""
+        revision = self.get_revision()
+        if revision is None:
+            return self.recompile(now)
+        if revision != self.revision:
+            return self.catch_up(revision, now)
+        if self.timeline is None or self.timeline.is_stale(now):
+            return self.recompile(now)
+        return self.timeline
+
+    def changed_asset_ids(self, revision: PlaylistRevision) -> set[str] | None:
+        if (
+            self.revision is None
+            or self.revision.epoch != revision.epoch
+            or revision.number <= self.revision.number
+        ):
+            # First revision seen, or Redis lost its data since (a new
+            # epoch) — the change list can't bridge that.
+            return None
+        since = self.revision.number
+        try:
+            raw_entries = self._redis.lrange(PLAYLIST_CHANGES_KEY, 0, -1)
+        except redis.RedisError:
+            return None
+
+        seen: set[int] = set()
+        asset_ids: set[str] = set()
+        for raw in raw_entries:
+            try:
+                entry = json.loads(raw)
+                entry_revision = int(entry['revision'])
+            except (TypeError, ValueError, KeyError):
+                return None
+            if not since < entry_revision <= revision.number:
+                continue
+            if entry.get('asset_ids') is None:
+                return None
+            seen.add(entry_revision)
+            asset_ids.update(entry['asset_ids'])
+        if len(seen) != revision.number - since:
+            # Entries trimmed off the list, or one not pushed yet.
+            return None
+        return asset_ids
+
+
+@dataclass(frozen=True)
+class PlaylistSnapshot:
+    """One evaluation of the playlist, as ``PlaylistCache`` hands it out.
+
+    ``rendered`` is whatever the caller's ``render`` made of the active
+    assets. ``etag`` is None when the snapshot can't be reused (no
+    playlist revision to key it on).
+    """
+
+    key: tuple[Any, ...] | None
+    etag: str | None
+    rendered: Any
+    deadline: datetime | None
+
+
+def _etag(key: tuple[Any, ...]) -> str:
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    # Weak: each process shuffles independently and the body carries
+    # its own ``now``, so two responses under one tag are equivalent
+    # rather than byte-identical.
+    return f'W/"{digest}"'
+
+
+class PlaylistCache:
+    """The server's evaluated playlist, reused until something it
+    depends on moves.
+
+    The key is (playlist revision and its epoch, ``anthias.conf``
+    signature, shuffle, timezone, next boundary): a write bumps the
+    revision, a settings save changes the file, a Redis that lost its
+    data starts a new epoch, and crossing a timeline boundary changes
+    the segment — anything else leaves the answer as it was, shuffled
+    order included. A process-wide singleton like ``ViewerPublisher``;
+    the lock keeps two request threads from patching the shared
+    timeline at once.
+    """
+
+    INSTANCE: ClassVar['PlaylistCache | None'] = None
+
+    def __init__(self) -> None:
+        if self.INSTANCE is not None:
+            raise ValueError('An instance already exists!')
+        self._lock = threading.Lock()
+        self._source = PlaylistSource()
+        self._snapshot: PlaylistSnapshot | None = None
+
+    @classmethod
+    def get_instance(cls) -> 'PlaylistCache':
+        if cls.INSTANCE is None:
+            cls.INSTANCE = PlaylistCache()
+        return cls.INSTANCE
+
+    def snapshot(
+        self,
+        now: datetime,
+        render: Callable[[list[dict[str, Any]], datetime], Any],
+    ) -> PlaylistSnapshot:
+        """The playlist at ``now``, with ``render(assets, now)`` run only
+        when the cached snapshot doesn't cover it."""
+        with self._lock:
+            # Re-read anthias.conf only if it changed on disk: an
+            # operator PATCH to /api/v2/device_settings rewrites the
+            # file from another process, and reading it on every poll
+            # is what this cache exists to avoid.
+            try:
+                conf_signature = settings.reload_if_changed()
+            except Exception:
+                logger.exception(
+                    'Failed to reload settings for viewer playlist'
+                )
+                conf_signature = None
+            timeline = self._source.sync(now)
+            key = None
+            if self._source.revision is not None:
+                key = (
+                    self._source.revision,
+                    conf_signature,
+                    bool(settings['shuffle_playlist']),
+                    timeline.timezone_name,
+                    timeline.next_boundary(now),
+                )
+            cached = self._snapshot
+            if key is not None and cached is not None and cached.key == key:
+                return cached
+
+            assets, deadline = evaluate_playlist(timeline, now)
+            snapshot = PlaylistSnapshot(
+                key=key,
+                etag=None if key is None else _etag(key),
+                rendered=render(assets, now),
+                deadline=deadline,
+            )
+            self._snapshot = snapshot
+            return snapshot
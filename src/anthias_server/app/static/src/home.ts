@@ -615,9 +615,13 @@ function installProcessingToastWatcher(): void {
   document.body.addEventListener('htmx:afterSwap', (ev) => {
     const target = (ev as CustomEvent<{ target?: Element }>).detail?.target
     if (!target) return
+    // A single-row swap (vendor.ts) targets the row itself.
     if (
       !(target instanceof Element) ||
-      !target.querySelector('tr[data-asset-id]')
+      !(
+        target.matches('tr[data-asset-id]') ||
+        target.querySelector('tr[data-asset-id]')
+      )
     ) {
       return
     }
@@ -86,38 +86,153 @@ const handleToast = (ev: Event): void => {
 }
 document.addEventListener('toast', handleToast as EventListener)
 
-// WebSocket fan-out from the Channels AssetConsumer. The server
-// triggers `htmx.trigger('body', 'refresh-assets')` indirectly: on
-// every Asset write the view fans a small message over /ws, this
-// listener picks it up and asks htmx to re-fetch the table partial
-// immediately (rather than waiting for the 5s poll). Falls back to
-// the poll if the socket isn't reachable — so this is purely an
-// optimisation, never a correctness dependency.
+// WebSocket fan-out from the Channels AssetConsumer: the dashboard's
+// asset change stream (anthias_server/app/asset_feed.py). Every
+// committed asset write arrives as a numbered delta —
+//   {"type": "asset_delta", "seq": 42, "op": "updated", "asset_ids": [...]}
+// — applied in order: an `updated` row on screen is re-fetched alone
+// (the row endpoint asks for a full refresh itself if the asset changed
+// section); anything that adds, removes or reorders rows, a gap in the
+// sequence, or an id not on screen refreshes the whole table. The table
+// carries the seq it was rendered at (data-asset-seq), so deltas it
+// already reflects are skipped, and a reconnect asks for what it missed
+// (/ws?since=<seq>) rather than re-fetching anything. The table's own
+// poll is only a long safety interval; while the socket is down, a 5 s
+// poll stands in for it.
+interface AssetDelta {
+  seq: number
+  op: 'updated' | 'moved' | 'created' | 'deleted' | 'reset'
+  asset_ids: string[] | null
+}
+
+type HtmxSocketApi = {
+  trigger: (...args: unknown[]) => void
+  ajax: (...args: unknown[]) => unknown
+}
+
 function connectAssetSocket(): void {
-  if (!('WebSocket' in window)) return
+  const htmxApi = (): HtmxSocketApi | undefined =>
+    (window as unknown as { htmx?: HtmxSocketApi }).htmx
+  let lastSeq = 0
+  let refreshTimer: number | undefined
+  let pollTimer: number | undefined
+
+  // Coalesce: a reorder arrives as one `moved` delta per row.
+  const refreshTable = (): void => {
+    if (refreshTimer !== undefined) return
+    refreshTimer = window.setTimeout(() => {
+      refreshTimer = undefined
+      htmxApi()?.trigger('body', 'refresh-assets')
+    }, 100)
+  }
+  const startPoll = (): void => {
+    if (pollTimer === undefined) {
+      pollTimer = window.setInterval(refreshTable, 5000)
+    }
+  }
+  const stopPoll = (): void => {
+    window.clearInterval(pollTimer)
+    pollTimer = undefined
+  }
+
+  const tableSeq = (): void => {
+    const seq = Number(
+      document.getElementById('asset-table')?.dataset.assetSeq,
+    )
+    if (Number.isFinite(seq) && seq > lastSeq) lastSeq = seq
+  }
+  tableSeq()
+  document.body.addEventListener('htmx:afterSwap', tableSeq)
+
+  const swapRow = (table: HTMLElement, assetId: string): boolean => {
+    const rowUrl = table.dataset.rowUrl
+    const row = table.querySelector(
+      `tr[data-asset-id="${CSS.escape(assetId)}"]`,
+    )
+    const htmx = htmxApi()
+    if (!row || !rowUrl || !htmx) return false
+    const section = row.closest('#active-rows') ? 'active' : 'inactive'
+    htmx.ajax(
+      'GET',
+      `${rowUrl.replace('__asset_id__', encodeURIComponent(assetId))}` +
+        `?section=${section}`,
+      { target: row, swap: 'outerHTML' },
+    )
+    return true
+  }
+
+  const applyDelta = (delta: AssetDelta): void => {
+    if (delta.seq <= lastSeq) return
+    const gap = lastSeq > 0 && delta.seq !== lastSeq + 1
+    lastSeq = delta.seq
+    const table = document.getElementById('asset-table')
+    if (!table) return
+    if (gap || delta.op !== 'updated' || !delta.asset_ids) {
+      refreshTable()
+      return
+    }
+    for (const assetId of delta.asset_ids) {
+      if (!swapRow(table, assetId)) {
+        refreshTable()
+        return
+      }
+    }
+  }
+
+  if (!('WebSocket' in window)) {
+    startPoll()
+    return
+  }
   const proto = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
-  const url = `${proto}//${window.location.host}/ws`
+  const base = `${proto}//${window.location.host}/ws`
   let socket: WebSocket | null = null
   let backoff = 1000
   const open = (): void => {
     try {
-      socket = new WebSocket(url)
+      socket = new WebSocket(lastSeq > 0 ? `${base}?since=${lastSeq}` : base)
     } catch {
       // URL or environment refused — give up; the poll covers it.
+      startPoll()
       return
     }
     socket.addEventListener('open', () => {
       backoff = 1000
+      stopPoll()
     })
-    socket.addEventListener('message', () => {
-      const htmx = (window as unknown as {
-        htmx?: { trigger: (...args: unknown[]) => void }
-      }).htmx
-      htmx?.trigger('body', 'refresh-assets')
+    socket.addEventListener('message', (event: MessageEvent) => {
+      const data = typeof event.data === 'string' ? event.data : ''
+      if (!data.startsWith('{')) {
+        // Bare asset-id frame: the server couldn't number the change
+        // (Redis down) — refresh rather than guess.
+        refreshTable()
+        return
+      }
+      let frame: { type?: string; seq?: number } & Record<string, unknown>
+      try {
+        frame = JSON.parse(data)
+      } catch {
+        // Malformed frame — the poll covers it.
+        return
+      }
+      if (frame.type === 'asset_delta') {
+        applyDelta(frame as unknown as AssetDelta)
+      } else if (frame.type === 'asset_reset') {
+        // The server can't replay what we missed; start over.
+        lastSeq = frame.seq ?? 0
+        refreshTable()
+      } else {
+        // Bulk-import progress for the import wizard
+        // (AssetConsumer.import_progress); re-dispatched as a DOM
+        // event for whichever page is listening.
+        document.dispatchEvent(
+          new CustomEvent('import-progress', { detail: frame }),
+        )
+      }
     })
     socket.addEventListener('close', () => {
       // Reconnect with capped exponential backoff so a transient
       // server restart doesn't leave the page stuck on poll-only.
+      startPoll()
       const delay = Math.min(backoff, 15000)
       backoff = Math.min(backoff * 2, 15000)
       window.setTimeout(open, delay)
@@ -9,6 +9,8 @@ API — keeps the row markup self-contained.
 device-settings configured `date_format` and `use_24_hour_clock`
 toggles so the table matches what the Settings page advertises
 (matches the React component's Intl.DateTimeFormat output).
+
+`asset_row` renders one table row through the per-revision row cache.
 """
 
 import json
@@ -378,3 +380,14 @@ def humanize_duration(value: Any) -> str:
             parts.append(f'{seconds}s')
         return ' '.join(parts)
     return f'{seconds}s'
+
+
+@register.simple_tag(takes_context=True)
+def asset_row(context: Any, asset: Any, is_active: bool) -> SafeString:
+    """Render ``_asset_row.html`` through the per-revision row cache
+    (``anthias_server.app.asset_rows``)."""
+    from anthias_server.app import asset_rows
+
+    return asset_rows.render_row(
+        asset, is_active=is_active, csrf_token=context.get('csrf_token')
+    )
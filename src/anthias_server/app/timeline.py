@@ -0,0 +1,361 @@
+"""Precompiled schedule timeline for the active playlist.
+
+``Asset.is_active()`` answers "is this row playable right now?" by
+re-parsing ``play_days`` and re-deriving the local weekday/time on every
+call, and nothing it computes survives to the next call. The viewer's
+scheduler used to run it for every enabled row on every DB bump *and*
+on a 60 s polling cap (day-of-week / time-of-day transitions don't show
+up in ``start_date``/``end_date``), so a 500-asset windowed playlist
+paid a full ORM query plus 500 JSON parses per minute on a Pi 3.
+
+This module does that work once per DB change instead. ``compile_timeline``
+expands every candidate row into its concrete active intervals (date
+range x play_days x play_time window, overnight wrap included) over a
+bounded look-ahead, and collects every interval edge into one sorted
+boundary list. Between two consecutive boundaries the active set cannot
+change, so evaluating the playlist at an instant is a bisect into that
+list, and the next re-evaluation deadline is simply the next boundary —
+exact, rather than "now + 60 s". When the playlist change feed names
+the rows a write touched, ``patch_timeline`` re-reads just those rows
+and splices them into the timeline already in memory.
+
+Lives next to the model (rather than in ``anthias_viewer``) so the
+server can evaluate the same timeline without importing the viewer
+package, whose ``__init__`` pulls in pydbus and runs ``django.setup()``
+at import time.
+"""
+
+import logging
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Any
+
+from django.utils import timezone
+
+from anthias_server.app.models import Asset
+
+logger = logging.getLogger(__name__)
+
+# How far ahead window intervals are expanded. Assets without a
+# day/time window contribute their exact date range no matter how far
+# out it lies; only windowed rows are truncated here, and the timeline
+# schedules its own recompile (``refresh_at``) before the truncated part
+# is needed. A week bounds the boundary list to ~14 entries per
+# windowed asset while keeping recompiles to roughly once a week on a
+# device nobody touches.
+TIMELINE_HORIZON_DAYS = 7
+
+Interval = tuple[datetime, datetime]
+
+
+def asset_to_dict(asset: Asset) -> dict[str, Any]:
+    """Playlist representation of an ``Asset`` row.
+
+    The viewer has always carried plain dicts (``__dict__`` minus the
+    ORM state and the server-side ``md5`` column) rather than model
+    instances; the timeline builds them once at compile time so
+    re-evaluating a segment never touches the ORM.
+    """
+    return {
+        k: v for k, v in asset.__dict__.items() if k not in ['_state', 'md5']
+    }
+
+
+def _local_midnight(day: date, tz: tzinfo) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min), tz)
+
+
+def _window_for_day(
+    day: date,
+    play_from: time | None,
+    play_to: time | None,
+    tz: tzinfo,
+) -> Interval | None:
+    """The interval a window that *starts* on local ``day`` covers.
+
+    Mirrors ``Asset._matches_play_window``: no (or a partial) time
+    window means the whole local day; ``from < to`` is a same-day
+    window; ``from > to`` wraps past midnight into the next day (and
+    ``play_days`` names the start day, as it does there). ``from == to``
+    matches nothing in ``_matches_play_window`` either, so it yields no
+    interval.
+    """
+    if play_from is None or play_to is None:
+        return (
+            _local_midnight(day, tz),
+            _local_midnight(day + timedelta(days=1), tz),
+        )
+    if play_from == play_to:
+        return None
+    end_day = day if play_from < play_to else day + timedelta(days=1)
+    return (
+        timezone.make_aware(datetime.combine(day, play_from), tz),
+        timezone.make_aware(datetime.combine(end_day, play_to), tz),
+    )
+
+
+def active_intervals(
+    asset: Asset,
+    since: datetime,
+    until: datetime,
+    tz: tzinfo,
+) -> list[Interval]:
+    """Sorted, merged ``[start, end)`` intervals in which ``asset`` is
+    active, covering at least ``[since, until)``.
+
+    Intervals are clipped to the asset's own ``start_date``/``end_date``.
+    They're half-open, so the asset counts as active from the
+    ``start_date`` instant itself, where ``is_active`` (strict ``<``)
+    flips a microsecond later — a difference no screen can show, and
+    it keeps every boundary an exact column value. Unwindowed assets
+    short-circuit to that single range, so ``until`` only bounds the
+    expansion of windowed ones.
+    """
+    start_date, end_date = asset.start_date, asset.end_date
+    if start_date is None or end_date is None or start_date >= end_date:
+        return []
+
+    if not asset.has_window_filter():
+        return [(start_date, end_date)]
+
+    days = set(asset.get_play_days())
+    play_from, play_to = asset.play_time_from, asset.play_time_to
+
+    # Start a day early so an overnight window that began yesterday
+    # (and is still running at ``since``) is captured.
+    lo = max(since, start_date)
+    hi = min(until, end_date)
+    day = timezone.localtime(lo, tz).date() - timedelta(days=1)
+    last_day = timezone.localtime(hi, tz).date()
+
+    intervals: list[Interval] = []
+    while day <= last_day:
+        if day.isoweekday() in days:
+            window = _window_for_day(day, play_from, play_to, tz)
+            if window is not None:
+                start = max(window[0], start_date)
+                end = min(window[1], end_date)
+                if start < end:
+                    if intervals and start <= intervals[-1][1]:
+                        # Adjacent whole days (or a window touching the
+                        # next one) are one continuous stretch.
+                        prev_start, prev_end = intervals[-1]
+                        intervals[-1] = (prev_start, max(prev_end, end))
+                    else:
+                        intervals.append((start, end))
+        day += timedelta(days=1)
+    return intervals
+
+
+@dataclass
+class TimelineEntry:
+    asset: dict[str, Any]
+    intervals: list[Interval]
+    # Where a windowed asset's truncated expansion runs out; None when
+    # ``intervals`` is the asset's complete schedule.
+    expires_at: datetime | None = None
+    starts: list[datetime] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.starts = [start for start, _ in self.intervals]
+
+    def is_active(self, now: datetime) -> bool:
+        idx = bisect_right(self.starts, now) - 1
+        return idx >= 0 and now < self.intervals[idx][1]
+
+
+@dataclass
+class ScheduleTimeline:
+    """The compiled schedule: evaluate it at any instant before
+    ``refresh_at`` without touching the database.
+
+    ``boundaries`` holds every future instant at which some asset's
+    activeness flips (plus ``refresh_at`` itself), sorted. The active
+    set for the segment the last ``evaluate`` landed in is memoised, so
+    the steady state — repeated calls inside one segment — is a single
+    bisect.
+    """
+
+    compiled_at: datetime
+    timezone_name: str
+    entries: list[TimelineEntry]
+    boundaries: list[datetime]
+    # When the truncated expansion of some windowed asset runs out and
+    # the timeline must be recompiled. None when nothing was truncated.
+    refresh_at: datetime | None
+    horizon_days: int = TIMELINE_HORIZON_DAYS
+    _segment: int = field(default=-1, init=False, repr=False)
+    _segment_assets: list[dict[str, Any]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def is_stale(self, now: datetime) -> bool:
+        """True once the timeline can no longer answer for ``now``:
+        past the expansion horizon, or compiled for a timezone other
+        than the active one (windows are local-time)."""
+        if self.refresh_at is not None and now >= self.refresh_at:
+            return True
+        return self.timezone_name != timezone.get_current_timezone_name()
+
+    def evaluate(
+        self, now: datetime
+    ) -> tuple[list[dict[str, Any]], datetime | None]:
+        """Active assets (in play order) and the next boundary after
+        ``now``. Returns a fresh list each call so callers can shuffle
+        it in place."""
+        segment = bisect_right(self.boundaries, now)
+        if segment != self._segment:
+            self._segment = segment
+            self._segment_assets = [
+                entry.asset for entry in self.entries if entry.is_active(now)
+            ]
+        return list(self._segment_assets), self._boundary(segment)
+
+    def next_boundary(self, now: datetime) -> datetime | None:
+        """The end of the segment ``now`` falls in — the ``evaluate``
+        deadline, without building the playlist."""
+        return self._boundary(bisect_right(self.boundaries, now))
+
+    def _boundary(self, segment: int) -> datetime | None:
+        if segment < len(self.boundaries):
+            return self.boundaries[segment]
+        return None
+
+
+def _is_candidate(asset: Asset, now: datetime) -> bool:
+    """The queryset filter in ``compile_timeline``, for a row in hand."""
+    return bool(
+        asset.is_enabled
+        and asset.start_date is not None
+        and asset.end_date is not None
+        and asset.end_date > now
+    )
+
+
+def _compile_entry(
+    asset: Asset, now: datetime, horizon_days: int, tz: tzinfo
+) -> TimelineEntry:
+    # Expand windowed rows from whichever is later — now or their
+    # start_date — so a windowed asset scheduled months out costs a
+    # week of intervals, not months of them.
+    since = max(now, asset.start_date or now)
+    until = since + timedelta(days=horizon_days)
+    expires_at = None
+    if (
+        asset.has_window_filter()
+        and asset.end_date is not None
+        and until < asset.end_date
+    ):
+        expires_at = until
+    return TimelineEntry(
+        asset_to_dict(asset),
+        active_intervals(asset, since, until, tz),
+        expires_at,
+    )
+
+
+def _assemble(
+    now: datetime, entries: list[TimelineEntry], horizon_days: int
+) -> ScheduleTimeline:
+    boundaries: set[datetime] = set()
+    refresh_at: datetime | None = None
+    for entry in entries:
+        for start, end in entry.intervals:
+            if start > now:
+                boundaries.add(start)
+            if end > now:
+                boundaries.add(end)
+        if entry.expires_at is not None:
+            refresh_at = (
+                entry.expires_at
+                if refresh_at is None
+                else min(refresh_at, entry.expires_at)
+            )
+
+    if refresh_at is not None:
+        boundaries = {b for b in boundaries if b < refresh_at}
+        boundaries.add(refresh_at)
+
+    logger.debug(
+        'compile_timeline: %d candidates, %d boundaries, refresh at %s',
+        len(entries),
+        len(boundaries),
+        refresh_at,
+    )
+    return ScheduleTimeline(
+        compiled_at=now,
+        timezone_name=timezone.get_current_timezone_name(),
+        entries=entries,
+        boundaries=sorted(boundaries),
+        refresh_at=refresh_at,
+        horizon_days=horizon_days,
+    )
+
+
+def compile_timeline(
+    now: datetime | None = None,
+    horizon_days: int = TIMELINE_HORIZON_DAYS,
+) -> ScheduleTimeline:
+    """Query the candidate rows once and expand them into a timeline.
+
+    Same candidate filter the playlist has always used (enabled, both
+    dates set, ``play_order``); rows whose ``end_date`` has already
+    passed can never become active again and are dropped outright.
+    """
+    if now is None:
+        now = timezone.now()
+    tz = timezone.get_current_timezone()
+
+    candidates = Asset.objects.filter(
+        is_enabled=True,
+        start_date__isnull=False,
+        end_date__isnull=False,
+        end_date__gt=now,
+    ).order_by('play_order')
+
+    entries = [
+        _compile_entry(asset, now, horizon_days, tz) for asset in candidates
+    ]
+    return _assemble(now, entries, horizon_days)
+
+
+def patch_timeline(
+    timeline: ScheduleTimeline,
+    asset_ids: Iterable[str],
+    now: datetime | None = None,
+) -> ScheduleTimeline:
+    """A copy of ``timeline`` with only ``asset_ids`` re-read.
+
+    One query for the named rows instead of every candidate: each is
+    recompiled (or dropped, if it was deleted or stopped being a
+    candidate) and the boundary list is rebuilt from the entries
+    already in memory. The caller is responsible for ``timeline`` not
+    being stale — patching never extends an expired horizon.
+    """
+    if now is None:
+        now = timezone.now()
+    tz = timezone.get_current_timezone()
+    wanted = set(asset_ids)
+
+    fresh = {
+        asset.asset_id: _compile_entry(asset, now, timeline.horizon_days, tz)
+        for asset in Asset.objects.filter(asset_id__in=wanted)
+        if _is_candidate(asset, now)
+    }
+    entries: list[TimelineEntry] = []
+    for entry in timeline.entries:
+        asset_id = entry.asset['asset_id']
+        if asset_id in wanted:
+            if asset_id in fresh:
+                entries.append(fresh.pop(asset_id))
+        else:
+            entries.append(entry)
+    # Rows that weren't in the timeline before (new, or newly
+    # enabled) go in at their play_order; the sort is stable, so ties
+    # keep their existing order and newcomers land after them — the
+    # same place the database's insertion order would put them.
+    entries.extend(fresh.values())
+    entries.sort(key=lambda entry: entry.asset['play_order'])
+    return _assemble(now, entries, timeline.horizon_days)
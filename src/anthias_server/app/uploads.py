@@ -0,0 +1,291 @@
+"""Streaming intake for file uploads.
+
+Left to itself, Django spools a multipart body to a temp file (or to
+memory under ``FILE_UPLOAD_MAX_MEMORY_SIZE``), and the upload views then
+copied that spool into ``assetdir`` — so every upload was written to the
+SD card twice before the normalise task read it a third time to hash
+it and Pillow / ffprobe opened it again to learn what it was. For a
+multi-GB video that is most of the upload-to-playable latency.
+
+``AssetUploadHandler`` is a Django upload handler that takes the
+``file_upload`` part instead: the bytes go straight into a staging file
+*inside* ``assetdir`` (so moving it to its final name is a rename, not a
+copy), hashed as they arrive, with the first ``HEAD_BYTES`` kept aside
+so the view can tell what the file is from its magic bytes and, where
+the header carries them, its pixel dimensions.
+
+Resumable (``Content-Range``) API uploads don't come through here: a
+chunk may land out of order, so neither the digest nor the header can
+be taken in flight. Those keep the existing chunk writer, and the
+serializer hashes the reassembled file.
+"""
+
+import logging
+import struct
+import uuid
+from contextlib import suppress
+from io import BytesIO
+from os import path, remove
+from typing import IO, Any
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    StopFutureHandlers,
+)
+
+from anthias_server import assetsweep, blobstore
+from anthias_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FIELD = 'file_upload'
+
+# Enough for every signature below and for the headers Pillow needs to
+# report a size — a phone JPEG's EXIF block (thumbnail included) is
+# capped at 64 KiB — and for a fast-start MP4's ``moov``/``tkhd``.
+HEAD_BYTES = 256 * 1024
+
+_FTYP_BRANDS = {
+    b'heic': ('image/heic', '.heic'),
+    b'heix': ('image/heic', '.heic'),
+    b'heim': ('image/heic', '.heic'),
+    b'heis': ('image/heic', '.heic'),
+    b'hevc': ('image/heic', '.heic'),
+    b'hevx': ('image/heic', '.heic'),
+    b'mif1': ('image/heif', '.heif'),
+    b'msf1': ('image/heif', '.heif'),
+    b'avif': ('image/avif', '.avif'),
+    b'avis': ('image/avif', '.avif'),
+    b'qt  ': ('video/quicktime', '.mov'),
+}
+
+_PREFIXES = (
+    (b'\xff\xd8\xff', ('image/jpeg', '.jpg')),
+    (b'\x89PNG\r\n\x1a\n', ('image/png', '.png')),
+    (b'GIF87a', ('image/gif', '.gif')),
+    (b'GIF89a', ('image/gif', '.gif')),
+    (b'II*\x00', ('image/tiff', '.tiff')),
+    (b'MM\x00*', ('image/tiff', '.tiff')),
+    (b'\x00\x00\x01\x00', ('image/vnd.microsoft.icon', '.ico')),
+    (b'\x00\x00\x00\x0cjP  \r\n\x87\n', ('image/jp2', '.jp2')),
+    (b'\xffO\xffQ', ('image/jp2', '.j2k')),
+    (b'FLV\x01', ('video/x-flv', '.flv')),
+    (b'\x00\x00\x01\xba', ('video/mpeg', '.mpg')),
+)
+
+# ``BM`` alone is too weak a signature; the DIB header that follows
+# the 14-byte file header opens with its own size, one of these.
+_BMP_DIB_SIZES = frozenset(
+    struct.pack('<I', size) for size in (12, 40, 52, 56, 64, 108, 124)
+)
+
+_TS_PACKET = 188
+
+
+def sniff(head: bytes) -> tuple[str, str] | None:
+    """``(mimetype, extension)`` from a file's leading bytes.
+
+    Only the formats the upload paths accept; None for anything else,
+    and for formats without a signature (TGA), which leaves the caller
+    to fall back on the filename. The content decides over the name:
+    a HEIC renamed ``photo.jpg`` is still routed through the normalise
+    pipeline rather than saved as a JPEG the viewer can't render.
+    """
+    for prefix, found in _PREFIXES:
+        if head.startswith(prefix):
+            return found
+    if head[:2] == b'BM' and head[14:18] in _BMP_DIB_SIZES:
+        return 'image/bmp', '.bmp'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp', '.webp'
+    if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        return 'video/x-msvideo', '.avi'
+    if head[4:8] == b'ftyp':
+        return _FTYP_BRANDS.get(head[8:12], ('video/mp4', '.mp4'))
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        # EBML: the DocType element says which of the two it is.
+        if b'webm' in head[:64]:
+            return 'video/webm', '.webm'
+        return 'video/x-matroska', '.mkv'
+    if all(
+        len(head) > offset and head[offset] == 0x47
+        for offset in (0, _TS_PACKET, 2 * _TS_PACKET)
+    ):
+        return 'video/mp2t', '.ts'
+    text = head[:1024].lstrip()
+    if text.startswith(b'\xef\xbb\xbf'):
+        text = text[3:].lstrip()
+    if text.startswith(b'<svg') or (
+        text.startswith(b'<?xml') and b'<svg' in head[:4096]
+    ):
+        return 'image/svg+xml', '.svg'
+    return None
+
+
+def header_dimensions(mimetype: str, head: bytes) -> tuple[int, int] | None:
+    """``(width, height)`` from the header bytes, when they carry it.
+
+    Images go through Pillow, which reads the size from the header
+    without decoding pixels. For video only MP4 / MOV are parsed — the
+    first track header (``tkhd``) with a non-zero size, which needs the
+    ``moov`` box at the front (a "fast start" file; phones and most
+    encoders write one). Anything else is None, and the caller reads
+    the stored file as it did before.
+    """
+    if mimetype.startswith('image/'):
+        from PIL import Image
+
+        try:
+            with Image.open(BytesIO(head)) as image:
+                width, height = image.size
+        except Exception:
+            # Truncated header, a format Pillow lacks a plugin for, a
+            # decompression bomb — all "unknown" here; the full-file
+            # checks downstream give each its proper answer.
+            return None
+        return int(width), int(height)
+    if mimetype in ('video/mp4', 'video/quicktime'):
+        return _tkhd_dimensions(head)
+    return None
+
+
+def _tkhd_dimensions(head: bytes) -> tuple[int, int] | None:
+    start = 0
+    while (found := head.find(b'tkhd', start)) >= 4:
+        start = found + 4
+        (size,) = struct.unpack_from('>I', head, found - 4)
+        box_end = found - 4 + size
+        if size < 92 or box_end > len(head):
+            continue
+        # Width and height close the box as 16.16 fixed point.
+        width, height = struct.unpack_from('>II', head, box_end - 8)
+        if width >> 16 and height >> 16:
+            return width >> 16, height >> 16
+    return None
+
+
+class StagedUpload(UploadedFile[bytes]):
+    """A ``file_upload`` part already written into ``assetdir``.
+
+    ``staged_path`` is where the bytes are; the view renames it into
+    place (or, for the API, hands it to the asset serializer) and calls
+    ``keep()`` so the handler's cleanup leaves it alone.
+    """
+
+    def __init__(
+        self,
+        staged_path: str,
+        name: str,
+        content_type: str,
+        size: int,
+        digest: str,
+        head: bytes,
+    ) -> None:
+        super().__init__(
+            open(staged_path, 'rb'),  # noqa: SIM115
+            name=name,
+            content_type=content_type,
+            size=size,
+        )
+        self.staged_path = staged_path
+        self.digest = digest
+        self.sniffed = sniff(head)
+        self.dimensions = (
+            header_dimensions(self.sniffed[0], head) if self.sniffed else None
+        )
+        self.kept = False
+
+    def temporary_file_path(self) -> str:
+        return self.staged_path
+
+    def keep(self) -> None:
+        self.kept = True
+
+
+class AssetUploadHandler(FileUploadHandler):
+    """Stream the ``file_upload`` part into ``assetdir`` while hashing it.
+
+    Installed ahead of Django's default handlers by the upload views;
+    every other part (form fields, a second file) falls through to
+    them untouched. The view owns the result: it must call
+    ``discard()`` once it's done, which removes the staged file unless
+    the view kept it — so a rejected upload, an auth failure after the
+    body was parsed or a dropped connection doesn't strand a partial
+    file on the card.
+    """
+
+    def __init__(self, request: Any = None) -> None:
+        super().__init__(request)
+        self._file: IO[bytes] | None = None
+        self._staged_path: str | None = None
+        # One part per request, and none once the view has discarded:
+        # a parse that failed (a full disk, or one that never ran) is
+        # re-run by the next ``request.POST`` access — Sentry's request
+        # extractor, even after the response — and must not stage a
+        # file nobody will clean up.
+        self._taken = False
+        self._hasher = blobstore.new_hasher()
+        self._head = bytearray()
+        self.upload: StagedUpload | None = None
+
+    def new_file(self, field_name: str, *args: Any, **kwargs: Any) -> None:
+        super().new_file(field_name, *args, **kwargs)
+        if field_name != UPLOAD_FIELD or self._taken:
+            return
+        self._taken = True
+        self._staged_path = path.join(
+            settings['assetdir'], f'{uuid.uuid4().hex}.tmp'
+        )
+        self._file = open(self._staged_path, 'wb')  # noqa: SIM115
+        # If this process dies mid-upload, the orphan sweep finds the
+        # staging file by this mark.
+        assetsweep.mark([self._staged_path])
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes | None:
+        if self._file is None:
+            return raw_data
+        try:
+            self._file.write(raw_data)
+        except OSError:
+            self.discard()
+            raise
+        self._hasher.update(raw_data)
+        if len(self._head) < HEAD_BYTES:
+            self._head += raw_data[: HEAD_BYTES - len(self._head)]
+        return None
+
+    def file_complete(self, file_size: int) -> StagedUpload | None:
+        if self._file is None or self._staged_path is None:
+            return None
+        self._file.close()
+        self._file = None
+        self.upload = StagedUpload(
+            self._staged_path,
+            name=self.file_name or '',
+            content_type=self.content_type or '',
+            size=file_size,
+            digest=self._hasher.hexdigest(),
+            head=bytes(self._head),
+        )
+        return self.upload
+
+    def upload_interrupted(self) -> None:
+        self.discard()
+
+    def discard(self) -> None:
+        """Remove the staged file unless the view kept it."""
+        self._taken = True
+        if self._file is not None:
+            with suppress(OSError):
+                self._file.close()
+            self._file = None
+        if self.upload is not None:
+            self.upload.close()
+            if self.upload.kept:
+                return
+        if self._staged_path is not None:
+            with suppress(FileNotFoundError):
+                remove(self._staged_path)
+            self._staged_path = None
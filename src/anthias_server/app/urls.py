@@ -50,6 +50,11 @@ urlpatterns = [
         views.assets_table_partial,
         name='assets_table',
     ),
+    path(
+        '_partials/asset-row/<str:asset_id>/',
+        views.asset_row_partial,
+        name='asset_row',
+    ),
     path(
         'review-cta/dismiss/',
         views.review_cta_dismiss,
@@ -2,10 +2,9 @@ import logging
 import re
 import tarfile
 import uuid
-from contextlib import suppress
 from datetime import datetime, time
 from mimetypes import guess_extension, guess_type
-from os import path, remove
+from os import path, remove, rename
 from typing import Any
 from urllib.parse import urlparse, urlunparse
 
@@ -20,6 +19,7 @@ from django.http import (
     StreamingHttpResponse,
 )
 from django.http.response import HttpResponseBase
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
@@ -27,6 +27,7 @@ from django.utils.http import (
     content_disposition_header,
     url_has_allowed_host_and_scheme,
 )
+from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from anthias_common.utils import (
@@ -41,6 +42,7 @@ from anthias_server.app.models import (
     clamp_refresh_interval,
     parse_header_lines,
 )
+from anthias_server.app.uploads import AssetUploadHandler
 from anthias_server.celery_tasks import reboot_anthias, shutdown_anthias
 from anthias_server.django_project.settings import is_valid_time_zone
 from anthias_server.lib import backup_helper, diagnostics
@@ -49,6 +51,10 @@ from anthias_server.lib.auth import (
     apply_auth_settings,
     authorized,
 )
+from anthias_server.lib.csrf import (
+    reject_cross_origin,
+    same_host_csrf_protect,
+)
 from anthias_server.settings import ViewerPublisher, settings
 
 from .helpers import (
@@ -214,11 +220,55 @@ def home(request: HttpRequest) -> HttpResponse:
 @authorized
 @require_http_methods(['GET'])
 def assets_table_partial(request: HttpRequest) -> HttpResponse:
-    """HTMX endpoint for the table area only — re-rendered every 5s
-    by the home page and after every successful write."""
+    """HTMX endpoint for the table area only — re-rendered by the home
+    page's 60 s safety poll and whenever a delta moves rows."""
     from django.shortcuts import render as _render
 
-    return _render(request, '_asset_table.html', page_context.assets())
+    return _render(
+        request,
+        '_asset_table.html',
+        page_context.assets(_inactive_limit(request)),
+    )
+
+
+def _inactive_limit(request: HttpRequest) -> int | None:
+    """How many Inactive rows the table on screen shows — sent by htmx
+    from the table's ``hx-headers``; None (the default page) when
+    absent or garbled."""
+    try:
+        return int(request.headers.get('X-Asset-Inactive-Limit', ''))
+    except ValueError:
+        return None
+
+
+@authorized
+@require_http_methods(['GET'])
+def asset_row_partial(request: HttpRequest, asset_id: str) -> HttpResponse:
+    """One table row, for the websocket listener's single-row swap.
+
+    ``section`` is the section the row is shown in. When the asset has
+    since left it (toggled, finished processing) or is gone, the row
+    alone can't be swapped — the counts and the other section change
+    too — so the answer is an empty 204 whose ``HX-Trigger`` asks the
+    page for a full table refresh instead.
+    """
+    from anthias_server.app import asset_rows
+    from anthias_server.app.models import Asset
+
+    asset = Asset.objects.filter(asset_id=asset_id).first()
+    is_active = (
+        asset is not None and asset.is_enabled and not asset.is_processing
+    )
+    section = 'active' if is_active else 'inactive'
+    if asset is None or request.GET.get('section') != section:
+        response = HttpResponse(status=204)
+        response['HX-Trigger'] = 'refresh-assets'
+        return response
+    return HttpResponse(
+        asset_rows.render_row(
+            asset, is_active=is_active, csrf_token=get_token(request)
+        )
+    )
 
 
 @authorized
@@ -487,33 +537,14 @@ def assets_create_app(request: HttpRequest) -> HttpResponse:
     )
 
 
-@authorized
-@require_http_methods(['POST'])
-def assets_upload(request: HttpRequest) -> HttpResponse:
-    """File upload tab. Mirrors api.views.mixins.FileAssetViewMixin.post:
-    move the upload into assetdir, create an Asset row, return the
-    table partial so HTMX can swap straight in."""
-    from datetime import timedelta
-
-    from anthias_server.app.models import Asset
-
-    # ``request.FILES`` triggers the (lazy) multipart parse, which
-    # spools the body to a temp file — on a full disk that write is
-    # where ENOSPC actually surfaces (Sentry ANTHIAS-3K). Turn it
-    # into an actionable toast instead of a 500.
-    try:
-        file_upload = request.FILES.get('file_upload')
-    except OSError as exc:
-        if not is_disk_full(exc):
-            raise
-        return _asset_table_response(request, toast=('error', DISK_FULL_ERROR))
-    if file_upload is None or not file_upload.name:
-        return _asset_table_response(
-            request, toast=('error', 'No file uploaded.')
-        )
-
-    upload_name: str = file_upload.name
+def _classify_upload(upload_name: str, client_type: str) -> str:
+    """The MIME type of an upload its bytes didn't identify.
 
+    ``uploads.sniff`` decides for every format with a signature; this
+    is the fallback for the rest (TGA has none) — the filename and the
+    browser's Content-Type. An empty or non-image/video result means
+    reject.
+    """
     # Three-step format detection so HEIC/HEIF/TIFF uploads on hosts
     # with a sparse mimetypes DB (some Pi base images don't ship
     # ``image/heic`` mappings out of the box) still classify
@@ -523,7 +554,6 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
     # image/* or video/*, take it; otherwise reject.
     from anthias_server.processing import NORMALIZE_IMAGE_EXTS
 
-    client_type = (getattr(file_upload, 'content_type', '') or '').lower()
     file_type = guess_type(upload_name)[0] or ''
 
     # Misnamed-file upgrade: if the operator renamed a HEIC to
@@ -593,6 +623,77 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
                 file_type = f'image/{ext.lstrip(".")}'
             elif ext in video_exts:
                 file_type = f'video/{ext.lstrip(".")}'
+    return file_type
+
+
+@csrf_exempt
+@authorized
+@require_http_methods(['POST'])
+def assets_upload(request: HttpRequest) -> HttpResponseBase:
+    """File upload tab. Mirrors api.views.mixins.FileAssetViewMixin.post:
+    stream the upload into assetdir, create an Asset row, return the
+    table partial so HTMX can swap straight in.
+
+    Exempt from the CSRF middleware only so the check can run after
+    ``AssetUploadHandler`` is installed: the middleware reads the token
+    out of ``request.POST`` before any view code, which would parse
+    the body with Django's spooling handlers instead.
+    ``_receive_upload`` runs the same check; the Origin / Referer half
+    of it runs here first, so a cross-site post is refused before its
+    body is written to disk.
+    """
+    rejected = reject_cross_origin(request)
+    if rejected is not None:
+        return rejected
+    handler = AssetUploadHandler(request)
+    request.upload_handlers.insert(0, handler)
+    try:
+        # ``request.FILES`` triggers the (lazy) multipart parse, which
+        # streams the body into assetdir — on a full disk that write
+        # is where ENOSPC actually surfaces (Sentry ANTHIAS-3K). Turn
+        # it into an actionable toast instead of a 500.
+        try:
+            _ = request.FILES
+        except OSError as exc:
+            if not is_disk_full(exc):
+                raise
+            return _asset_table_response(
+                request, toast=('error', DISK_FULL_ERROR)
+            )
+        return _receive_upload(request, handler)
+    finally:
+        # Whatever didn't make it into a row (a rejected type, a
+        # failed CSRF check, an exception) leaves no staged file.
+        handler.discard()
+
+
+@same_host_csrf_protect
+def _receive_upload(
+    request: HttpRequest, handler: AssetUploadHandler
+) -> HttpResponse:
+    from datetime import timedelta
+
+    from anthias_server.app.models import Asset
+
+    # The handler's own result rather than ``request.FILES``: a second
+    # ``file_upload`` part would shadow it there, spooled the old way.
+    file_upload = handler.upload
+    if file_upload is None or not file_upload.name:
+        return _asset_table_response(
+            request, toast=('error', 'No file uploaded.')
+        )
+
+    upload_name: str = file_upload.name
+
+    # The bytes decide the type where they can: a HEIC renamed
+    # ``photo.jpg`` is still a HEIC. The filename / browser heuristics
+    # only cover formats without a signature.
+    sniffed_ext = ''
+    if file_upload.sniffed is not None:
+        file_type, sniffed_ext = file_upload.sniffed
+    else:
+        client_type = (file_upload.content_type or '').lower()
+        file_type = _classify_upload(upload_name, client_type)
     if file_type.split('/')[0] not in ('image', 'video'):
         return _asset_table_response(
             request,
@@ -641,7 +742,9 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
     def _safe_ext(candidate: str) -> str:
         return candidate if _SAFE_EXT_RE.fullmatch(candidate) else ''
 
-    src_ext = _safe_ext(guess_extension(file_type) or '')
+    #
+    # A sniffed type comes with its extension and skips all three.
+    src_ext = sniffed_ext or _safe_ext(guess_extension(file_type) or '')
     if not src_ext:
         src_ext = _safe_ext(path.splitext(upload_name)[1].lower())
     if not src_ext:
@@ -658,17 +761,15 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
     # overwriting the older one.
     final_name = uuid.uuid4().hex
     final_path = path.join(settings['assetdir'], f'{final_name}{src_ext}')
-    try:
-        with open(final_path, 'wb') as f:
-            f.writelines(file_upload.chunks())
-    except OSError as exc:
-        if not is_disk_full(exc):
-            raise
-        # Don't leave a truncated file squatting on the last free
-        # bytes of an already-full disk.
-        with suppress(OSError):
-            remove(final_path)
-        return _asset_table_response(request, toast=('error', DISK_FULL_ERROR))
+    from anthias_server import blobstore
+
+    # Already on the right filesystem, hashed on the way in: moving it
+    # into place is a rename, and the digest names its content for the
+    # asset store and for the normalise task's reuse of an earlier
+    # row's result.
+    rename(file_upload.staged_path, final_path)
+    digest = file_upload.digest
+    blobstore.intern(final_path, digest)
 
     # Decide which Celery task — if any — needs to run before the
     # viewer can play the row.
@@ -690,8 +791,9 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
     is_video = mimetype == 'video'
     # Either reason earns the Celery hop: a format that needs converting
     # to WebP, or a JPEG/PNG too large for a low-RAM board to render.
+    # The header size captured during the upload spares reopening it.
     needs_image_pipeline = mimetype == 'image' and needs_image_processing(
-        final_path
+        final_path, size=file_upload.dimensions
     )
     is_processing = is_video or needs_image_pipeline
 
@@ -706,9 +808,24 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
     play_order = Asset.objects.filter(
         is_enabled=True, is_processing=False
     ).count()
+    # Stash the operator's original filename. The on-disk file is
+    # renamed to <uuid>.<ext> at upload time (see
+    # ``final_name = uuid.uuid4().hex`` above) so the operator's local
+    # filename would otherwise be lost — but the video gate's
+    # ``UnsupportedVideoCodecError`` recipe wants to quote a name the
+    # operator can paste straight into their terminal, which is the
+    # upload name, not the on-disk UUID.
+    metadata: dict[str, Any] = {'upload_name': upload_name}
+    if is_video and file_upload.dimensions is not None:
+        # Provisional until the normalise task's ffprobe replaces them
+        # with the stream's own numbers.
+        metadata['video_width'], metadata['video_height'] = (
+            file_upload.dimensions
+        )
     asset = Asset.objects.create(
         name=display_name,
         uri=final_path,
+        md5=digest,
         mimetype=mimetype,
         duration=duration,
         is_enabled=True,
@@ -716,14 +833,7 @@ def assets_upload(request: HttpRequest) -> HttpResponse:
         play_order=play_order,
         start_date=now,
         end_date=now + timedelta(days=30),
-        # Stash the operator's original filename. The on-disk file
-        # is renamed to <uuid>.<ext> at upload time (see
-        # ``final_name = uuid.uuid4().hex`` above) so the operator's
-        # local filename would otherwise be lost — but the video
-        # gate's ``UnsupportedVideoCodecError`` recipe wants to
-        # quote a name the operator can paste straight into their
-        # terminal, which is the upload name, not the on-disk UUID.
-        metadata={'upload_name': upload_name},
+        metadata=metadata,
     )
     # Route through the shared ``dispatch_normalize_*`` helpers rather
     # than ``.delay()`` directly so the
@@ -1037,21 +1147,18 @@ def assets_bulk_action(request: HttpRequest) -> HttpResponse:
         )
 
     if action == 'delete':
-        from anthias_server.app.helpers import delete_asset_with_file
+        from anthias_server.app.helpers import delete_assets_with_files
 
-        assets = list(Asset.objects.filter(asset_id__in=ids))
-        if not assets:
+        # One DELETE for the whole selection and a single viewer reload
+        # after it, rather than a row delete (and a 'reload' on the
+        # pub/sub channel) per asset.
+        count = delete_assets_with_files(ids)
+        if not count:
             return _asset_table_response(
                 request,
                 toast=('info', 'No matching assets to delete'),
             )
-        for asset in assets:
-            # Suppress the per-row viewer reload — a large batch would
-            # otherwise spam the pub/sub channel with one 'reload' per
-            # asset — and send a single reload after the batch instead.
-            delete_asset_with_file(asset, nudge_viewer=False)
         ViewerPublisher.get_instance().send_to_viewer('reload')
-        count = len(assets)
         return _asset_table_response(
             request,
             toast=(
@@ -1283,14 +1390,20 @@ def assets_bulk_update(request: HttpRequest) -> HttpResponse:
     # backends — re-applying an identical value would otherwise read as
     # zero). Shared fields touch every matched row; duration touches
     # only the non-video subset.
-    if shared:
-        base_qs.update(**shared)
+    # Both UPDATEs in one transaction, announced as one change.
+    from django.db import transaction
+
+    from anthias_server.app.models import asset_change_batch
+
     nonvideo_count = 0
-    if apply_duration:
-        nonvideo_qs = base_qs.exclude(mimetype='video')
-        nonvideo_count = nonvideo_qs.count()
-        if nonvideo_count:
-            nonvideo_qs.update(duration=new_duration)
+    with transaction.atomic(), asset_change_batch():
+        if shared:
+            base_qs.update(**shared)
+        if apply_duration:
+            nonvideo_qs = base_qs.exclude(mimetype='video')
+            nonvideo_count = nonvideo_qs.count()
+            if nonvideo_count:
+                nonvideo_qs.update(duration=new_duration)
 
     count = matched if shared else nonvideo_count
     if not count:
@@ -1480,18 +1593,17 @@ def _asset_table_response(
     "Star on GitHub / Review on G2" nudge can surface at that positive
     moment — but only once the operator has enough real content on the
     device to have gotten value (see `_maybe_offer_review_cta`)."""
-    # Fan out a refresh nudge over the WebSocket so other browsers
-    # currently looking at the home page repaint without waiting for
-    # their next 5s poll. Skipped on read endpoints (those don't call
-    # this helper at all). Failures are swallowed inside notify_asset_update.
-    from anthias_server.app.consumers import notify_asset_update
-
-    notify_asset_update()
-
+    # Other browsers looking at the home page hear about the write from
+    # the model layer, which sends each committed asset write down the
+    # dashboard's change stream (models.notify_dashboard_change).
     if request.headers.get('HX-Request'):
         from django.shortcuts import render as _render
 
-        response = _render(request, '_asset_table.html', page_context.assets())
+        response = _render(
+            request,
+            '_asset_table.html',
+            page_context.assets(_inactive_limit(request)),
+        )
         if toast is not None:
             _set_toast_header(response, toast[0], toast[1])
         if offer_review_cta:
@@ -1750,6 +1862,9 @@ def settings_save(request: HttpRequest) -> HttpResponse:
         settings['use_24_hour_clock'] = _checkbox(request, 'use_24_hour_clock')
         settings['debug_logging'] = _checkbox(request, 'debug_logging')
         settings['verify_ssl'] = _checkbox(request, 'verify_ssl')
+        settings['prefetch_next_asset'] = _checkbox(
+            request, 'prefetch_next_asset'
+        )
 
         # Restrict to the four cardinal angles via the shared
         # clamp_screen_rotation() helper. The Qt linuxfb plugin only
@@ -0,0 +1,216 @@
+"""The orphan-file sweep behind ``celery_tasks.cleanup``.
+
+``assetdir`` collects files no asset row references: the file of a
+row deleted or re-pointed elsewhere, an upload or import whose request
+died before it was renamed into place, a download's sidecars. The
+hourly ``cleanup`` used to find them by listing the whole directory and
+``stat``-ing its entries (plus a ``find`` pass for ``.tmp``) — on a
+device with tens of thousands of files, an I/O spike on the SD card
+every hour, competing with playback, to find a handful of orphans.
+
+Most orphans are made at a known moment, so the code that makes them
+says so: ``mark`` adds the file's name to a dirty set in Redis. The
+model layer marks a row's file when the row is deleted or its ``uri``
+changes; the upload and import staging paths mark their staging files
+when they create them. The hourly pass (``sweep_dirty``) looks only at
+those names: gone, referenced again or a cache copy — done; younger than
+``FRESH_S`` — kept in the set for the next pass; otherwise removed.
+
+The asset store's blobs (``anthias_server.blobstore``) ride in the same
+set, as ``.blobs/<digest>``: the model layer marks a row's ``md5``
+alongside its file, and removing a linked orphan collects its blob, so
+the hourly pass checks just those blobs rather than all of them. A
+row's remote URI marks its content-cache copy the same way; a marked
+copy no live URI uses is dropped with its record.
+
+Crashes leave files nobody marked, and a writer added later may not
+mark its own. A full pass (``sweep_all``) over the directory, and over
+the blobs and the content cache, still runs,
+but every ``FULL_SWEEP_INTERVAL_S`` rather than every hour, and at no
+more than ``FULL_SWEEP_ENTRIES_PER_S`` entries a second. Losing the
+dirty set (a Redis flush, or a set that overflowed ``DIRTY_MAX``) just
+makes the next pass a full one.
+"""
+
+import logging
+import os
+import stat
+import time
+from collections.abc import Iterable
+from os import path
+from typing import Any
+
+import redis
+
+from anthias_common import content_cache
+from anthias_server import blobstore
+from anthias_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = 'cleanup:dirty'
+LAST_FULL_KEY = 'cleanup:last-full'
+
+# An unreferenced file younger than this may still be in flight: an
+# upload still streaming into its ``.tmp``, a file renamed into place a
+# moment before its row is written, a yt-dlp download's sidecars.
+FRESH_S = 60 * 60
+
+FULL_SWEEP_INTERVAL_S = 24 * 60 * 60
+
+# Directory entries a full pass examines per second. Each unreferenced
+# entry costs a ``stat``; the pause between batches keeps a pass over a
+# large library from monopolising the card.
+FULL_SWEEP_ENTRIES_PER_S = 500
+
+# Past this many pending names, the next pass is a full one anyway and
+# the set stops growing.
+DIRTY_MAX = 10_000
+
+BLOB_MARK_PREFIX = f'{blobstore.BLOB_DIRNAME}/'
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def mark(
+    file_paths: Iterable[str | None], digests: Iterable[str | None] = ()
+) -> None:
+    """Note that each of ``file_paths``, and the blob of each of
+    ``digests``, may have become an orphan.
+
+    Only names directly in ``assetdir`` are kept (a plain prefix test;
+    anything else is for the full pass to judge), and a remote URI
+    stands for its content-cache copy. Never raises: a lost mark only
+    defers that file to the next full pass.
+    """
+    asset_dir = settings['assetdir']
+    names = []
+    for file_path in file_paths:
+        if not file_path:
+            continue
+        if path.dirname(file_path) == asset_dir:
+            names.append(path.basename(file_path))
+        elif not file_path.startswith('/'):
+            names.append(content_cache.copy_name(file_path))
+    names.extend(f'{BLOB_MARK_PREFIX}{digest}' for digest in digests if digest)
+    if not names:
+        return
+    try:
+        r = _redis()
+        r.sadd(DIRTY_KEY, *names)
+        if (r.scard(DIRTY_KEY) or 0) > DIRTY_MAX:
+            r.delete(DIRTY_KEY)
+            r.delete(LAST_FULL_KEY)
+    except redis.RedisError:
+        logger.debug('assetsweep: could not mark %s', names)
+
+
+def full_sweep_due(now: float | None = None) -> bool:
+    try:
+        last = _redis().get(LAST_FULL_KEY)
+    except redis.RedisError:
+        return True
+    if last is None:
+        return True
+    try:
+        return (now or time.time()) - float(last) >= FULL_SWEEP_INTERVAL_S
+    except (TypeError, ValueError):
+        return True
+
+
+def _sweep_one(
+    file_path: str, name: str, referenced: set[str], now: float
+) -> bool:
+    """Remove ``file_path`` if it's an orphan old enough to go. Returns
+    True when the file is an orphan too young to judge yet."""
+    if name in referenced or content_cache.is_cache_file(name):
+        return False
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        logger.warning('cleanup: could not stat %s: %s', file_path, exc)
+        return False
+    if not stat.S_ISREG(st.st_mode):
+        return False
+    if now - st.st_mtime < FRESH_S:
+        return True
+    # A linked orphan (an upload whose create request never came) may
+    # hold its blob's last asset link.
+    digest = blobstore.digest_of(file_path) if st.st_nlink > 1 else None
+    try:
+        os.remove(file_path)
+    except OSError as exc:
+        logger.warning('cleanup: could not remove %s: %s', file_path, exc)
+        return False
+    if digest is not None:
+        blobstore.collect_garbage([digest])
+    return False
+
+
+def sweep_dirty(asset_dir: str, referenced: set[str]) -> int:
+    """Judge the names marked since the last pass. Returns how many
+    were looked at. ``referenced`` holds the names of the files, and of
+    the cache copies, live rows use."""
+    r = _redis()
+    names = {
+        name.decode() if isinstance(name, bytes) else str(name)
+        for name in r.smembers(DIRTY_KEY) or ()
+    }
+    if not names:
+        return 0
+    r.srem(DIRTY_KEY, *names)
+    now = time.time()
+    blobs = {name for name in names if name.startswith(BLOB_MARK_PREFIX)}
+    copies = {name for name in names if content_cache.is_cache_file(name)}
+    for name in copies - referenced:
+        content_cache.drop_copy(name)
+    fresh = [
+        name
+        for name in names - blobs - copies
+        # A mark is a basename, but guard against a stray separator.
+        if path.basename(name) == name
+        and _sweep_one(path.join(asset_dir, name), name, referenced, now)
+    ]
+    # After the files, so a blob whose last link went just now is
+    # collected this pass.
+    blobstore.collect_garbage(
+        name.removeprefix(BLOB_MARK_PREFIX) for name in blobs
+    )
+    if fresh:
+        # One of the files kept back may still hold a marked blob.
+        r.sadd(DIRTY_KEY, *fresh, *blobs)
+    return len(names)
+
+
+def sweep_all(asset_dir: str, referenced: set[str]) -> int:
+    """Judge every regular file directly in ``asset_dir``, at the
+    throttled rate. Returns how many entries were looked at."""
+    r = _redis()
+    # Everything marked so far is covered by this pass; what turns up
+    # too fresh to judge goes back in for the hourly passes.
+    r.delete(DIRTY_KEY)
+    now = time.time()
+    fresh: list[str] = []
+    seen = 0
+    with os.scandir(asset_dir) as entries:
+        for entry in entries:
+            seen += 1
+            if seen % FULL_SWEEP_ENTRIES_PER_S == 0:
+                time.sleep(1)
+            # ``is_file`` comes from the directory listing itself, so
+            # subdirectories (``.blobs``, the cache's metadata) cost
+            # nothing.
+            if not entry.is_file():
+                continue
+            if _sweep_one(entry.path, entry.name, referenced, now):
+                fresh.append(entry.name)
+    if fresh:
+        r.sadd(DIRTY_KEY, *fresh)
+    r.set(LAST_FULL_KEY, str(time.time()))
+    return seen
@@ -0,0 +1,299 @@
+"""Content-addressed storage for the files in ``assetdir``.
+
+Every ingest path names its file after the asset (``<asset_id><ext>``),
+so the same MP4 added three times — uploaded twice and imported once
+from a provider — used to sit on the SD card three times over. This
+module keeps one copy per distinct content: ``assetdir/.blobs/<md5>``
+holds the bytes, and each asset file is a hard link to it.
+
+Hard links rather than pointing ``Asset.uri`` at the blob keep every
+consumer of the old layout working unchanged: the webview maps a local
+path to ``/anthias_assets/<basename>`` (so files have to sit directly in
+``assetdir``), ``delete_asset_with_file`` and the orphan sweep unlink
+per-asset names, and a backup archive stores a linked file once. It
+also makes the refcount the filesystem's own ``st_nlink`` — the blob's
+link plus one per asset file — which every delete path already keeps
+right, admin and bulk deletes included, with no counter to drift.
+``collect_garbage`` drops blobs whose only remaining link is their
+own: each hour only the blobs ``assetsweep`` was told about (a row
+deleted or re-pointed marks its ``md5``), and every blob in the daily
+full pass.
+
+Naming an already-linked file's content never lists ``.blobs``: a
+caller with the row's ``md5`` checks the file against that blob, and
+``intern`` notes each blob's digest in Redis under its inode for the
+callers without one. Both are confirmed with a ``stat`` of the file and
+of the blob, so a lost or stale note only costs a re-hash.
+
+Nothing here ever writes into an existing file: a dedup swaps the asset
+file for a link with ``os.replace``, and the pipelines that rewrite an
+asset (image normalisation) already stage to a sibling and replace, so
+a rewrite gives that one asset a fresh inode and leaves the others'
+bytes alone.
+
+On a filesystem without hard links (``EPERM`` / ``EXDEV`` /
+``ENOTSUP``) every call degrades to a no-op: the files stay separate
+copies, as before.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import secrets
+import time
+from collections.abc import Iterable
+from os import path
+from typing import IO, Any
+
+import redis
+
+from anthias_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# A dot-directory, like ``.content-cache``: the orphan sweep only looks
+# at regular files directly in ``assetdir``, and the webview never
+# serves blobs by their own name.
+BLOB_DIRNAME = '.blobs'
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# A leftover ``.tmp`` link from a crash mid-swap is swept after the
+# same hour ``cleanup()`` gives ``assetdir``'s own ``.tmp`` files.
+STALE_TMP_S = 60 * 60
+
+_DIGEST_RE = re.compile(r'[0-9a-f]{32}')
+
+# ``<prefix><st_dev>:<st_ino>`` -> digest of the blob with that inode.
+INODE_KEY_PREFIX = 'blobstore:inode:'
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def _inode_key(st: os.stat_result) -> str:
+    return f'{INODE_KEY_PREFIX}{st.st_dev}:{st.st_ino}'
+
+
+def _note(st: os.stat_result, digest: str) -> None:
+    try:
+        _redis().set(_inode_key(st), digest)
+    except redis.RedisError:
+        logger.debug('blobstore: could not note %s', digest)
+
+
+def _noted(st: os.stat_result) -> str | None:
+    try:
+        digest = _redis().get(_inode_key(st))
+    except redis.RedisError:
+        return None
+    if isinstance(digest, bytes):
+        digest = digest.decode()
+    return digest or None
+
+
+def _forget(st: os.stat_result) -> None:
+    try:
+        _redis().delete(_inode_key(st))
+    except redis.RedisError:
+        pass
+
+
+def new_hasher() -> 'hashlib._Hash':
+    """The digest ``Asset.md5`` and the blob names use.
+
+    MD5, as the column says: it names content on a single-tenant
+    device, where every uploader is already an authenticated operator,
+    so it's an identity check rather than a security boundary — and
+    the cheapest hash to keep up with an SD card on a Pi.
+    """
+    return hashlib.md5(usedforsecurity=False)
+
+
+def digest_file(file_path: str) -> str:
+    with open(file_path, 'rb') as f:
+        return digest_stream(f)
+
+
+def digest_stream(stream: IO[bytes]) -> str:
+    hasher = new_hasher()
+    while chunk := stream.read(HASH_CHUNK_BYTES):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def blob_dir() -> str:
+    return path.join(settings['assetdir'], BLOB_DIRNAME)
+
+
+def blob_path(digest: str) -> str:
+    if not _DIGEST_RE.fullmatch(digest):
+        raise ValueError(f'not a content digest: {digest!r}')
+    return path.join(blob_dir(), digest)
+
+
+def refcount(digest: str) -> int:
+    """How many asset files share the blob for ``digest``."""
+    try:
+        return max(os.stat(blob_path(digest)).st_nlink - 1, 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _link_into_place(source: str, target: str) -> None:
+    """Atomically make ``target`` a hard link to ``source``."""
+    staging = f'{target}.{secrets.token_hex(4)}.link.tmp'
+    os.link(source, staging)
+    try:
+        os.replace(staging, target)
+    except OSError:
+        try:
+            os.remove(staging)
+        except OSError:
+            pass
+        raise
+
+
+def intern(file_path: str, digest: str | None = None) -> str | None:
+    """Deduplicate ``file_path`` against the store.
+
+    If a blob with the same content exists, ``file_path`` becomes
+    another link to it (and its own copy is freed); otherwise the file
+    is adopted as that content's blob. ``digest`` skips re-reading the
+    file when the caller hashed it on the way in; without one, a file
+    that is already linked (an upload staged and interned by
+    ``AssetUploadHandler``, then renamed to its asset name) is named
+    from its inode's note before falling back to hashing it.
+
+    Returns the digest, or None when the file couldn't be interned —
+    it's then left exactly as it was.
+    """
+    try:
+        if digest is None:
+            digest = digest_of(file_path) or digest_file(file_path)
+        blob = blob_path(digest)
+        os.makedirs(blob_dir(), exist_ok=True)
+        st = os.stat(file_path)
+        try:
+            blob_st = os.stat(blob)
+        except FileNotFoundError:
+            blob_st = None
+
+        if blob_st is not None and path.samestat(st, blob_st):
+            _note(blob_st, digest)
+            return digest
+        if blob_st is not None and blob_st.st_size == st.st_size:
+            try:
+                _link_into_place(blob, file_path)
+                _note(blob_st, digest)
+                return digest
+            except FileNotFoundError:
+                # Collected between the stat and the link: adopt the
+                # file instead.
+                pass
+        # No blob yet, or one whose size says its bytes aren't what
+        # the name claims (truncated by a crash). Replacing it leaves
+        # any asset still linked to the old inode untouched.
+        _link_into_place(file_path, blob)
+        _note(st, digest)
+        return digest
+    except (OSError, ValueError) as exc:
+        logger.warning('blobstore: could not intern %s: %s', file_path, exc)
+        return None
+
+
+def link_copy(source: str, target: str) -> bool:
+    """Make ``target`` share ``source``'s content.
+
+    For reusing another asset's already-processed file. False (with
+    ``target`` untouched) when the link can't be made.
+    """
+    try:
+        _link_into_place(source, target)
+        return True
+    except OSError as exc:
+        logger.warning(
+            'blobstore: could not link %s to %s: %s', target, source, exc
+        )
+        return False
+
+
+def digest_of(file_path: str, digest: str | None = None) -> str | None:
+    """The digest of an already-interned file, without reading it.
+
+    ``digest`` is the caller's candidate (the row's ``md5``); without
+    one, the note ``intern`` left for the file's inode. Either is only
+    returned once the file is confirmed to be that blob's link.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    if st.st_nlink < 2:
+        return None
+    if digest is None:
+        digest = _noted(st)
+        if digest is None:
+            return None
+    try:
+        blob_st = os.stat(blob_path(digest))
+    except (OSError, ValueError):
+        return None
+    return digest if path.samestat(st, blob_st) else None
+
+
+def _collect(blob: str, st: os.stat_result) -> bool:
+    # A concurrent ``intern`` that loses this race sees
+    # FileNotFoundError on its link and adopts its file as the blob
+    # instead.
+    if st.st_nlink > 1:
+        return False
+    os.remove(blob)
+    _forget(st)
+    return True
+
+
+def collect_garbage(digests: Iterable[str] | None = None) -> int:
+    """Remove blobs no asset file links to any more. Returns the
+    number of blobs removed.
+
+    With ``digests``, only those blobs are looked at (a ``stat`` each).
+    Without, every blob is, and stale staging links go too: the full
+    pass that catches blobs whose last link went without a mark.
+    """
+    removed = 0
+    if digests is not None:
+        for digest in digests:
+            try:
+                blob = blob_path(digest)
+                removed += _collect(blob, os.stat(blob))
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as exc:
+                logger.warning(
+                    'blobstore: could not collect %s: %s', digest, exc
+                )
+    else:
+        now = time.time()
+        try:
+            entries = list(os.scandir(blob_dir()))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+                if _DIGEST_RE.fullmatch(entry.name):
+                    removed += _collect(entry.path, st)
+                elif now - st.st_mtime >= STALE_TMP_S:
+                    os.remove(entry.path)
+            except OSError as exc:
+                logger.warning(
+                    'blobstore: could not collect %s: %s', entry.path, exc
+                )
+    if removed:
+        logger.info('blobstore: collected %d unreferenced blobs', removed)
+    return removed
@@ -1,10 +1,17 @@
 import logging
 import os
+import random
 import secrets
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import zip_longest
 from os import getenv, path
 from typing import Any
+from urllib.parse import urlparse
 
 import django
 import requests
@@ -14,6 +21,7 @@ from celery.exceptions import SoftTimeLimitExceeded
 from celery.signals import worker_init, worker_ready
 from django.apps import apps as _django_apps
 from PIL import UnidentifiedImageError
+from requests.adapters import HTTPAdapter
 from tenacity import (
     RetryError,
     Retrying,
@@ -39,6 +47,7 @@ if not _django_apps.apps_ready:
 
 # Place imports that uses Django in this block.
 
+from anthias_common import content_cache, downloads
 from anthias_common.utils import (
     connect_to_redis,
     get_video_duration,
@@ -48,11 +57,13 @@ from anthias_common.utils import (
     url_fails,
 )
 from anthias_common.youtube import youtube_destination_path
-from anthias_server.app.models import Asset
+from anthias_server import assetsweep, blobstore
+from anthias_server.app.models import PROBE_SCHEDULE_FIELDS, Asset
 from anthias_server.lib import (
     diagnostics,
     display_power,
     storage_watcher,
+    system_snapshot,
     undervoltage_watcher,
 )
 from anthias_server.lib.telemetry import send_telemetry
@@ -80,12 +91,29 @@ celery = Celery(
 )
 
 
-# Sweep cadence for the asset URL re-validation job. 15 min is short
-# enough to catch a stream that's been down for a rotation or two,
-# long enough that the sweep cost (one ffprobe per stream + one HEAD
-# per HTTP asset) doesn't compound on a large playlist.
+# Base re-probe interval for an asset that answered its last probe.
+# 15 min is short enough to catch a stream that's been down for a
+# rotation or two, long enough that the probe cost (an ffprobe per
+# stream, a HEAD per HTTP asset) doesn't compound on a large playlist.
 ASSET_REVALIDATION_INTERVAL_S = 60 * 15
 
+# Adaptive schedule on top of that base. Each asset carries its own
+# ``next_probe_at``; the sweep ticks every ASSET_REVALIDATION_TICK_S
+# and probes only the rows that are due, so a tick with nothing due
+# costs one SELECT. A run of reachable verdicts doubles the interval
+# from the base up to ASSET_PROBE_MAX_INTERVAL_S — a CDN URL that has
+# answered for a day is probed every few hours, not every 15 min. An
+# unreachable verdict drops it to ASSET_PROBE_RETRY_S, doubling back
+# up to the base while the asset stays down, so a flapping intranet
+# dashboard is re-admitted within a minute or two of coming back.
+# Every interval is spread by ±ASSET_PROBE_JITTER so a fleet
+# provisioned together (or a playlist imported in one go) doesn't
+# keep probing in lockstep.
+ASSET_REVALIDATION_TICK_S = 60
+ASSET_PROBE_RETRY_S = 60
+ASSET_PROBE_MAX_INTERVAL_S = 60 * 60 * 4
+ASSET_PROBE_JITTER = 0.1
+
 # Sweep cadence for the stuck-``is_processing`` reconciler. 10 min is
 # short enough that an operator sees a hung row recover within one
 # UI sit-down. The per-tick cost is bounded by the number of stuck
@@ -156,6 +184,17 @@ ASSET_REVALIDATION_TIME_LIMIT_S = 60 * 30
 # kill-versus-catch rationale as the on-demand probe limits above.
 ASSET_REVALIDATION_SOFT_TIME_LIMIT_S = ASSET_REVALIDATION_TIME_LIMIT_S - 60
 
+# Concurrency for the sweep's probes. They are I/O-bound (HTTP round
+# trips, ffprobe waiting on a stream handshake), so a handful of
+# threads turns a sweep that used to take the *sum* of its probes
+# into one that takes roughly the slowest of them. The total cap
+# keeps a Pi's worker from opening dozens of sockets and ffprobe
+# children at once; the per-host cap keeps a playlist with many
+# assets on one origin (a CMS, a NAS) from hitting it with a burst it
+# might rate-limit, and sizes that host's connection pool.
+ASSET_REVALIDATION_MAX_WORKERS = 16
+ASSET_REVALIDATION_PER_HOST = 4
+
 # Time budget for the lightweight periodic pokes — the display-power
 # CEC query and the telemetry POST. Both ran under a bare
 # ``time_limit=30`` and share the asset probe's failure mode: the CEC
@@ -215,6 +254,21 @@ DISPLAY_POWER_STATE_TTL_S = 60 * 10
 RECONCILE_STUCK_TIME_LIMIT_S = 300
 RECONCILE_STUCK_SOFT_TIME_LIMIT_S = RECONCILE_STUCK_TIME_LIMIT_S - 30
 
+# ``inspect_media`` runs ``mediainfo.PROBE_CONCURRENCY`` probes at a
+# time, each capped at ``mediainfo.PROBE_TIMEOUT_S``; 30 min covers a
+# few hundred files off a slow card. It only warms a cache, so being
+# cut short costs the per-asset tasks their shortcut, nothing more.
+INSPECT_MEDIA_TIME_LIMIT_S = 30 * 60
+
+# One run of a bulk import job works through a slice of its items (see
+# ``integrations.jobs``) and queues the next; the limit bounds a slice
+# of multi-GB downloads on a slow uplink. The job lock outlives a
+# heartbeat gap several times over, and lapses soon enough after a
+# killed worker for ``resume_import_jobs`` to pick the job back up.
+IMPORT_JOB_TIME_LIMIT_S = 3 * 60 * 60
+IMPORT_JOB_LOCK_TTL_S = 5 * 60
+IMPORT_JOB_RESUME_INTERVAL_S = 5 * 60
+
 # Redis key for the sweep singleton lock. Whoever sets it first runs
 # the sweep; later beat ticks observe the key and exit. The TTL matches
 # the time_limit so a worker that crashes mid-sweep doesn't lock the
@@ -349,7 +403,7 @@ def setup_periodic_tasks(sender: Any, **kwargs: Any) -> None:
     # via Redis, so each device emits at most one GA event per day.
     sender.add_periodic_task(3600, send_telemetry_task.s(), name='telemetry')
     sender.add_periodic_task(
-        ASSET_REVALIDATION_INTERVAL_S,
+        ASSET_REVALIDATION_TICK_S,
         revalidate_asset_urls.s(),
         name='revalidate_asset_urls',
     )
@@ -358,6 +412,11 @@ def setup_periodic_tasks(sender: Any, **kwargs: Any) -> None:
         reconcile_stuck_processing.s(),
         name='reconcile_stuck_processing',
     )
+    sender.add_periodic_task(
+        IMPORT_JOB_RESUME_INTERVAL_S,
+        resume_import_jobs.s(),
+        name='resume_import_jobs',
+    )
     # Every minute, so a schedule boundary lands within 60s of the
     # configured time. The task itself is nearly free when the schedule
     # is disabled or the desired state has not changed.
@@ -366,6 +425,15 @@ def setup_periodic_tasks(sender: Any, **kwargs: Any) -> None:
         apply_display_power_schedule.s(),
         name='display_power_schedule',
     )
+    # Each field keeps its own cadence; the tick only re-samples the
+    # due ones. A tick the worker couldn't start before the next one
+    # is dropped rather than queued behind it.
+    sender.add_periodic_task(
+        system_snapshot.SNAPSHOT_TICK_S,
+        refresh_system_snapshot.s(),
+        name='system_snapshot',
+        expires=system_snapshot.SNAPSHOT_TICK_S,
+    )
 
 
 @worker_ready.connect
@@ -409,6 +477,29 @@ def start_storage_watcher(**kwargs: Any) -> None:
         logger.exception('Could not start the storage-health watcher.')
 
 
+@worker_ready.connect
+def take_system_snapshot_on_start(**kwargs: Any) -> None:
+    """Sample every System Info field, static ones included, so the
+    snapshot reflects the code and hardware this worker started on."""
+    try:
+        refresh_system_snapshot.delay(everything=True)
+    except Exception:
+        logger.exception('Could not queue refresh_system_snapshot.')
+
+
+@worker_ready.connect
+def resume_import_jobs_on_start(**kwargs: Any) -> None:
+    """Queue the bulk import jobs a restart interrupted.
+
+    Redis only, like the watchers above; the queued task waits for the
+    worker to start consuming like any other.
+    """
+    try:
+        resume_import_jobs.delay()
+    except Exception:
+        logger.exception('Could not queue resume_import_jobs.')
+
+
 @celery.task(
     soft_time_limit=PERIODIC_POKE_SOFT_TIME_LIMIT_S,
     time_limit=PERIODIC_POKE_TIME_LIMIT_S,
@@ -579,70 +670,126 @@ def send_telemetry_task() -> None:
         )
 
 
+@celery.task(
+    soft_time_limit=PERIODIC_POKE_SOFT_TIME_LIMIT_S,
+    time_limit=PERIODIC_POKE_TIME_LIMIT_S,
+)
+def refresh_system_snapshot(everything: bool = False) -> None:
+    """Keep the System Info / ``/api/v2/info`` snapshot current (see
+    ``lib.system_snapshot``)."""
+    system_snapshot.refresh(everything=everything)
+
+
 @celery.task
 def cleanup() -> None:
     asset_dir = settings['assetdir']
     if not path.isdir(asset_dir):
         return
 
-    # Stale upload remnants: in-progress uploads write to <uuid>.tmp and
-    # rename on commit. The 1h mtime guard avoids killing an upload that
-    # is still streaming when celery beat fires.
-    sh.find(
-        asset_dir,
-        '-name',
-        '*.tmp',
-        '-type',
-        'f',
-        '-mmin',
-        '+60',
-        '-delete',
-    )
-
     # Orphaned asset files: forum 6636 / GH #2657. Asset rows can be
     # deleted while their file lingers (e.g. URI didn't match assetdir
-    # exactly, or the file was renamed by an upgrade). Sweep anything
-    # in assetdir that no live Asset row references, with the same 1h
-    # guard so a freshly-renamed file (or in-flight yt-dlp sidecar:
-    # .part/.ytdl/.info.json) isn't removed before its row is written
-    # or its download finishes. Stale sidecars from abandoned downloads
-    # fall outside the freshness window and get swept like any other
-    # orphan.
+    # exactly, or the file was renamed by an upgrade), and uploads
+    # abandoned mid-stream leave their ``.tmp``. Anything in assetdir
+    # that no live Asset row references goes, with a 1h guard so a
+    # still-streaming upload, a freshly-renamed file or an in-flight
+    # yt-dlp sidecar (.part/.ytdl/.info.json) isn't removed before its
+    # row is written or its download finishes. Hourly, only the files,
+    # blobs and cache copies marked since the last run are examined;
+    # the whole directory, the blob store and the content cache are
+    # walked once a day, throttled (see ``assetsweep``).
     #
     # Resolve URIs through realpath so legacy rows that still reference
     # the pre-rebrand prefix (~/screenly_assets/..., now a symlink to
     # ~/anthias_assets) are recognized as live and their files aren't
-    # mistaken for orphans on upgraded installs.
+    # mistaken for orphans on upgraded installs. Resolved once per
+    # directory: every row's file sits in one of a few.
     #
     asset_dir_real = path.realpath(asset_dir)
     referenced: set[str] = set()
+    resolved_dirs: dict[str, str | None] = {}
 
     def _claim(p: str | None) -> None:
         if not p:
             return
+        parent = path.dirname(p)
+        if parent not in resolved_dirs:
+            try:
+                resolved_dirs[parent] = path.realpath(parent)
+            except OSError:
+                resolved_dirs[parent] = None
+        if resolved_dirs[parent] == asset_dir_real:
+            referenced.add(path.basename(p))
+
+    uris = {
+        uri
+        for uri in Asset.objects.values_list('uri', flat=True)
+        if uri is not None
+    }
+    for uri in uris:
+        if uri.startswith('/'):
+            _claim(uri)
+        else:
+            referenced.add(content_cache.copy_name(uri))
+    full = assetsweep.full_sweep_due()
+    if full:
+        assetsweep.sweep_all(asset_dir, referenced)
+        # Drops copies of URIs no asset uses any more (the hourly
+        # passes drop the marked ones) and re-applies the size /
+        # disk-pressure limit, which a changed content_cache_mb may
+        # have lowered. Every new copy, and the storage watcher on a
+        # full card, apply it too.
+        content_cache.enforce_limit(keep_uris=uris)
+    else:
+        # Also drops the marked cache copies and collects the marked
+        # blobs.
+        assetsweep.sweep_dirty(asset_dir, referenced)
+
+    _backfill_content_digests(asset_dir_real)
+    if full:
+        # After the orphan sweep, so a blob whose last asset file went
+        # in it is collected this pass rather than the next one.
+        blobstore.collect_garbage()
+
+
+# Bytes of not-yet-interned asset files ``cleanup()`` hashes per run.
+# Files that arrived before the asset store existed are deduplicated a
+# slice at a time rather than in one pass that would hold the worker
+# (and the SD card) for the length of a read of the whole library.
+CONTENT_DIGEST_BACKFILL_BYTES = 1024**3
+
+
+def _backfill_content_digests(asset_dir_real: str) -> None:
+    """Give finished local assets without an ``md5`` one, interning
+    their files on the way. A file the ingest path already interned is
+    named by its blob for the cost of a ``stat``."""
+    rows = list(
+        Asset.objects.filter(
+            md5__isnull=True, is_processing=False
+        ).values_list('asset_id', 'uri')
+    )
+    budget = CONTENT_DIGEST_BACKFILL_BYTES
+    for asset_id, uri in rows:
+        if not uri:
+            continue
         try:
-            if path.realpath(path.dirname(p)) == asset_dir_real:
-                referenced.add(path.basename(p))
+            if path.realpath(path.dirname(uri)) != asset_dir_real:
+                continue
+            st = os.stat(uri)
         except OSError:
-            return
-
-    for uri in Asset.objects.exclude(uri__isnull=True).values_list(
-        'uri', flat=True
-    ):
-        _claim(uri)
-    cutoff = 60 * 60  # match the .tmp guard above
-    now = time.time()
-    for entry in os.scandir(asset_dir):
-        if not entry.is_file():
-            continue
-        if entry.name in referenced:
             continue
-        try:
-            if now - entry.stat().st_mtime < cutoff:
+        digest = blobstore.digest_of(uri) if st.st_nlink > 1 else None
+        if digest is None:
+            # One file larger than the whole slice still goes through
+            # at the start of a run, or a big video never would.
+            if st.st_size > budget and budget < CONTENT_DIGEST_BACKFILL_BYTES:
                 continue
-            os.remove(entry.path)
-        except OSError as e:
-            logger.warning('cleanup: could not remove %s: %s', entry.path, e)
+            budget -= st.st_size
+            digest = blobstore.intern(uri)
+        if digest:
+            # ``md5`` is playlist-neutral: no revision bump, no reload.
+            Asset.objects.filter(asset_id=asset_id, md5__isnull=True).update(
+                md5=digest
+            )
 
 
 class _ProbeVideoTask(Task):  # type: ignore[type-arg]
@@ -669,14 +816,10 @@ class _ProbeVideoTask(Task):  # type: ignore[type-arg]
         if not asset_id:
             return
         try:
+            # The model layer's ``updated`` delta drops the row's
+            # "Processing" pill on every open dashboard; the operator
+            # then has it in its terminal state and can edit/delete it.
             Asset.objects.filter(asset_id=asset_id).update(is_processing=False)
-            # Same WS nudge the success path sends so the row drops
-            # the "Processing" pill without waiting for the 5s table
-            # poll. Operator then has the row in its terminal state
-            # and can edit/delete it.
-            from anthias_server.app.consumers import notify_asset_update
-
-            notify_asset_update(asset_id)
         except Exception:
             logger.exception(
                 'probe_video_duration on_failure cleanup failed for %s',
@@ -700,8 +843,8 @@ def probe_video_duration(asset_id: str) -> None:
     are written so the operator isn't held up by ffprobe (which can
     take several seconds on a Pi 1/Zero). The asset is marked
     ``is_processing=True`` while this task is queued; once the probe
-    completes the duration is written and the flag is cleared, which
-    drops the "Processing" pill on the next 5s table poll.
+    completes the duration is written and the flag is cleared, and the
+    write's ``updated`` delta drops the "Processing" pill.
 
     Retry policy:
       - sh.TimeoutException / sh.ErrorReturnCode / OSError → autoretry
@@ -748,15 +891,68 @@ def probe_video_duration(asset_id: str) -> None:
     Asset.objects.filter(asset_id=asset_id).update(**update)
 
     # Tell the viewer to reload its playlist now that the row is fully
-    # materialised — same trigger every other write path uses.
-    r.publish('anthias.viewer', 'reload')
+    # materialised — same (coalesced) trigger the normalize tasks use.
+    from anthias_server.coalesce import request_viewer_reload
 
-    # Push a refresh nudge over the browser-facing WebSocket so the
-    # operator sees the row stop "Processing" and pick up its real
-    # duration without waiting for the next 5s table poll.
-    from anthias_server.app.consumers import notify_asset_update
+    request_viewer_reload([asset_id])
+
+
+@celery.task(time_limit=INSPECT_MEDIA_TIME_LIMIT_S)
+def inspect_media(paths: list[str]) -> None:
+    """Warm ``mediainfo``'s probe cache for a batch of files.
+
+    Queued ahead of a batch of normalise tasks (see
+    ``processing.dispatch_normalize_videos``): the files are probed
+    several at a time here, and each per-asset task then reads its
+    answer from the cache instead of waiting on its own ffprobe. A file
+    that fails to probe is only logged — its own task probes it again
+    and records the error against the row.
+    """
+    from anthias_common import mediainfo
+
+    for file_path, result in mediainfo.probe_many(paths).items():
+        if isinstance(result, Exception):
+            logger.info(
+                'inspect_media: could not probe %s: %s', file_path, result
+            )
+
+
+@celery.task(time_limit=IMPORT_JOB_TIME_LIMIT_S)
+def run_import_job(job_id: str) -> None:
+    """Run the next slice of a bulk import job, then queue the rest.
 
-    notify_asset_update(asset_id)
+    Single-flighted per job with the same SETNX + compare-and-delete
+    lock as the sweeps below; a second run queued for the same job
+    (a resume racing a slow queue) finds the lock held and leaves it
+    to the first.
+    """
+    from anthias_server.lib.integrations import jobs
+
+    lock = jobs.lock_key(job_id)
+    token = secrets.token_hex(16)
+    if not r.set(lock, token, nx=True, ex=IMPORT_JOB_LOCK_TTL_S):
+        return
+    try:
+        more = jobs.run_job(
+            job_id, heartbeat=lambda: r.expire(lock, IMPORT_JOB_LOCK_TTL_S)
+        )
+    finally:
+        r.eval(_LOCK_RELEASE_LUA, 1, lock, token)
+    if more:
+        run_import_job.delay(job_id)
+
+
+@celery.task(
+    soft_time_limit=PERIODIC_POKE_SOFT_TIME_LIMIT_S,
+    time_limit=PERIODIC_POKE_TIME_LIMIT_S,
+)
+def resume_import_jobs() -> None:
+    """Re-queue bulk import jobs whose worker went away mid-run."""
+    from anthias_server.lib.integrations import jobs
+
+    for job_id in jobs.stalled_job_ids(IMPORT_JOB_LOCK_TTL_S):
+        logger.warning('resume_import_jobs: resuming import job %s', job_id)
+        run_import_job.delay(job_id)
 
 
 class _DownloadAssetTask(Task):  # type: ignore[type-arg]
@@ -1009,31 +1205,24 @@ def download_youtube_asset(asset_id: str, uri: str) -> None:
     # alone in the normal path.
     if not asset.uri:
         update['uri'] = location
+    # Hash (and deduplicate) while the download is still in the page
+    # cache; normalize_video_asset keys its result reuse on ``md5``.
+    digest = blobstore.intern(location)
+    if digest:
+        update['md5'] = digest
     Asset.objects.filter(asset_id=asset_id).update(**update)
 
-    # Browser-side nudge so the table picks up the resolved title +
-    # duration immediately. The "Processing" pill stays on (the row
-    # is still ``is_processing=True``) until normalize_video_asset
-    # finishes its pass and clears the flag — at which point the
-    # same _notify helper fires again from the normalize task and
-    # the pill drops. ``reload_viewer=False`` keeps this
-    # intermediate hop browser-only: the on-device viewer doesn't
-    # need to reload its playlist for a row that's still in the
-    # processing state, and the chained normalize step's _notify
-    # will publish the reload once the file is final. Saves the
-    # viewer one redundant playlist refresh on every YouTube
-    # upload — meaningful on a Pi 1/Zero where the reload
-    # rebuilds the rotation against the SD card.
-    from anthias_server.processing import (
-        _notify,
-        dispatch_normalize_video,
-    )
-
-    _notify(asset_id, reload_viewer=False)
-
+    # No nudge of our own: the update above already sent the
+    # dashboards their ``updated`` delta (title + duration), and the
+    # viewer reload waits for the chained normalize step — the row is
+    # still ``is_processing=True``, so a reload now would only be
+    # repeated moments later.
+    #
     # Hand off to ``normalize_video_asset`` so the YouTube download
     # gets the same ffprobe metadata pass (codec / dims / fps /
     # duration written into ``metadata``) as a direct file upload.
+    from anthias_server.processing import dispatch_normalize_video
+
     dispatch_normalize_video(asset_id)
 
 
@@ -1082,12 +1271,11 @@ REMOTE_VIDEO_MAX_BYTES = 5 * 1024**3
 REMOTE_VIDEO_CONNECT_TIMEOUT_S = 15
 REMOTE_VIDEO_READ_TIMEOUT_S = 60
 
-# Chunk size for the streaming download. 1 MiB is the sweet spot for
-# the Pi-class SD-card writer: smaller chunks add per-write syscall
-# overhead, larger chunks tie up RAM that could be feeding the
-# kernel page cache. Same value used elsewhere in the codebase for
-# bulk file IO.
-_REMOTE_VIDEO_CHUNK_BYTES = 1024 * 1024
+# Parallel range requests for a large download (``downloads.fetch``
+# only splits files of ``PARALLEL_MIN_BYTES`` or more, from origins
+# that support ranges). Enough to get past a CDN's per-connection
+# throttle without hogging a site uplink the player also streams on.
+REMOTE_VIDEO_PARALLEL_SEGMENTS = 4
 
 # Manifest Content-Types we explicitly reject at GET time even though
 # the upfront HEAD probe in the serializer should have caught them.
@@ -1164,48 +1352,70 @@ def _validate_remote_video_response(resp: Any, uri: str) -> None:
     )
 
 
-def _stream_remote_video_to_file(uri: str, staging: str) -> None:
-    """Fetch *uri* with the module-level session and stream it to
-    *staging*, enforcing the size cap and validating the response
-    headers. Raises ``RemoteVideoDownloadError`` on permanent
-    failures and lets transient ``OSError`` /
-    ``requests.RequestException`` (a subclass of ``OSError``)
-    propagate for the caller's ``autoretry_for``.
+def _stream_remote_video_to_file(
+    uri: str,
+    staging: str,
+    progress: downloads.Progress | None = None,
+) -> None:
+    """Fetch *uri* with the module-level session into *staging*,
+    enforcing the size cap and validating the response headers.
+    Raises ``RemoteVideoDownloadError`` on permanent failures and lets
+    transient ``OSError`` / ``requests.RequestException`` (a subclass
+    of ``OSError``) propagate for the caller's ``autoretry_for``.
+
+    Resumable (see ``anthias_common.downloads``): when the origin
+    supports ranges, a dropped connection picks up where it stopped,
+    and a ``.part`` left by an earlier attempt is continued rather
+    than refetched. Caller is responsible for removing the ``.part``
+    once it gives up on the download.
+    """
+    try:
+        downloads.fetch(
+            _session,
+            uri,
+            staging,
+            max_bytes=REMOTE_VIDEO_MAX_BYTES,
+            timeout=(
+                REMOTE_VIDEO_CONNECT_TIMEOUT_S,
+                REMOTE_VIDEO_READ_TIMEOUT_S,
+            ),
+            check_response=lambda resp: _validate_remote_video_response(
+                resp, uri
+            ),
+            segments=REMOTE_VIDEO_PARALLEL_SEGMENTS,
+            progress=progress,
+        )
+    except downloads.DownloadTooLarge:
+        raise RemoteVideoDownloadError(
+            f'download exceeded size cap of '
+            f'{REMOTE_VIDEO_MAX_BYTES} bytes for {uri!r}'
+        ) from None
+    except downloads.EmptyDownload:
+        raise RemoteVideoDownloadError(
+            f'origin returned zero bytes for {uri!r}'
+        ) from None
+
+
+def _download_progress_reporter(asset_id: str) -> downloads.Progress:
+    """Record download progress (``asset_rows.set_download_progress``)
+    so the asset table can show how far along a long fetch is.
 
-    Caller is responsible for cleaning up the partial staging file
-    on any exception path.
+    Nothing is written to the row: the figure lives in Redis and each
+    tick sends the dashboards one ``updated`` delta, leaving the
+    playlist revision and the row's metadata alone.
     """
-    with _session.get(
-        uri,
-        stream=True,
-        allow_redirects=True,
-        timeout=(
-            REMOTE_VIDEO_CONNECT_TIMEOUT_S,
-            REMOTE_VIDEO_READ_TIMEOUT_S,
-        ),
-    ) as resp:
-        _validate_remote_video_response(resp, uri)
-        written = 0
-        with open(staging, 'wb') as fh:
-            for chunk in resp.iter_content(
-                chunk_size=_REMOTE_VIDEO_CHUNK_BYTES
-            ):
-                if not chunk:
-                    # iter_content yields empty bytes for keep-alive
-                    # padding on some servers; skip rather than
-                    # treating as EOF.
-                    continue
-                written += len(chunk)
-                if written > REMOTE_VIDEO_MAX_BYTES:
-                    raise RemoteVideoDownloadError(
-                        f'download exceeded size cap of '
-                        f'{REMOTE_VIDEO_MAX_BYTES} bytes for {uri!r}'
-                    )
-                fh.write(chunk)
-        if written == 0:
-            raise RemoteVideoDownloadError(
-                f'origin returned zero bytes for {uri!r}'
-            )
+    from anthias_server.app import asset_rows
+    from anthias_server.app.consumers import notify_asset_update
+
+    def report(written: int, total: int | None) -> None:
+        percent = min(100, written * 100 // total) if total else None
+        asset_rows.set_download_progress(
+            asset_id,
+            {'bytes': written, 'total': total, 'percent': percent},
+        )
+        notify_asset_update(asset_id)
+
+    return report
 
 
 class _DownloadRemoteVideoTask(_DownloadAssetTask):
@@ -1216,6 +1426,26 @@ class _DownloadRemoteVideoTask(_DownloadAssetTask):
 
     _failure_log_prefix = 'download_remote_video_asset'
 
+    def on_failure(
+        self,
+        exc: BaseException,
+        task_id: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        einfo: Any,
+    ) -> None:
+        # Retries exhausted: nothing will resume the partial download
+        # any more, so don't leave it for the hourly sweep.
+        asset_id = args[0] if args else kwargs.get('asset_id')
+        location = (
+            Asset.objects.filter(asset_id=asset_id)
+            .values_list('uri', flat=True)
+            .first()
+        )
+        if location:
+            downloads.discard(f'{location}.part')
+        super().on_failure(exc, task_id, args, kwargs, einfo)
+
 
 @celery.task(
     base=_DownloadRemoteVideoTask,
@@ -1252,9 +1482,13 @@ def download_remote_video_asset(asset_id: str, uri: str) -> None:
       * transient network / IO hiccup → ``autoretry_for`` retries
         twice with backoff; persistent failure lands on on_failure.
 
-    Cleans up ``.part`` on every failure path so a partially-written
-    download doesn't linger as orphan content for the cleanup sweep
-    to deal with an hour later.
+    A transient failure keeps the ``.part`` (and its resume sidecar)
+    when the origin supports ranges, so the retry continues from the
+    last checkpoint instead of byte zero; every other failure path —
+    and ``on_failure`` once the retries are spent — removes it so a
+    partially-written download doesn't linger as orphan content for
+    the cleanup sweep to deal with an hour later. While the download
+    runs, ``asset_rows.download_progress`` tracks how far it got.
     """
     try:
         asset = Asset.objects.get(asset_id=asset_id)
@@ -1284,26 +1518,39 @@ def download_remote_video_asset(asset_id: str, uri: str) -> None:
     location = asset.uri
     staging = f'{location}.part'
 
-    # Stream the response, then atomically swap into place. Both
-    # phases share the cleanup contract: a partial ``.part`` left
-    # behind would otherwise wait for the hourly ``cleanup()`` sweep
-    # to clear — meanwhile an operator's next upload could trip a
-    # "disk full" if the partial was multi-GB. ``OSError`` covers
-    # both filesystem failures and ``requests.RequestException``
-    # (which is an ``IOError``/``OSError`` subclass), so the single
-    # ``except OSError`` re-raise is sufficient for the
-    # ``autoretry_for`` to pick up.
+    # Stream the response, then atomically swap into place. A
+    # partial ``.part`` left behind would otherwise wait for the
+    # hourly ``cleanup()`` sweep to clear — meanwhile an operator's
+    # next upload could trip a "disk full" if the partial was
+    # multi-GB — so it only survives a transient failure the retry can
+    # resume (the sidecar exists). ``OSError`` covers both filesystem
+    # failures and ``requests.RequestException`` (which is an
+    # ``IOError``/``OSError`` subclass), so the ``except OSError``
+    # re-raise is sufficient for the ``autoretry_for`` to pick up.
     try:
-        _stream_remote_video_to_file(uri, staging)
+        _stream_remote_video_to_file(
+            uri, staging, _download_progress_reporter(asset_id)
+        )
         os.replace(staging, location)
-    except (OSError, RemoteVideoDownloadError):
-        try:
-            os.remove(staging)
-        except OSError:
-            pass
+    except OSError:
+        if not path.exists(downloads.state_path(staging)):
+            downloads.discard(staging)
+        raise
+    except RemoteVideoDownloadError:
+        downloads.discard(staging)
         raise
 
-    metadata = dict(asset.metadata or {})
+    from anthias_server.app import asset_rows
+
+    asset_rows.set_download_progress(asset_id, None)
+    # Re-read: a long download leaves the operator plenty of time to
+    # edit the row, and the snapshot taken on entry would undo that.
+    metadata = dict(
+        Asset.objects.filter(asset_id=asset_id)
+        .values_list('metadata', flat=True)
+        .first()
+        or {}
+    )
     metadata.update(
         {
             'source': 'remote_url',
@@ -1324,19 +1571,18 @@ def download_remote_video_asset(asset_id: str, uri: str) -> None:
     # operator-set value alone.
     if not asset.uri:
         update['uri'] = location
+    # Segments arrive in parallel, so the digest is taken here rather
+    # than while streaming — same hand-off as download_youtube_asset.
+    digest = blobstore.intern(location)
+    if digest:
+        update['md5'] = digest
     Asset.objects.filter(asset_id=asset_id).update(**update)
 
-    from anthias_server.processing import (
-        _notify,
-        dispatch_normalize_video,
-    )
-
-    # Dashboard nudge so the operator's table picks up the row's
-    # progress without waiting for the 5s poll. Viewer reload is
-    # deferred to the normalize chain (same as YouTube) — the row is
-    # still ``is_processing=True`` and the on-device viewer would
-    # just reload to a row it can't display.
-    _notify(asset_id, reload_viewer=False)
+    # The update's own delta refreshes the dashboards; the viewer
+    # reload is deferred to the normalize chain (same as YouTube) —
+    # the row is still ``is_processing=True`` and the on-device viewer
+    # would just reload to a row it can't display.
+    from anthias_server.processing import dispatch_normalize_video
 
     dispatch_normalize_video(asset_id)
 
@@ -1428,18 +1674,26 @@ def shutdown_anthias() -> None:
         r.publish('hostcmd', 'shutdown')
 
 
-def _check_asset_reachability(asset: Asset) -> bool:
+def _check_asset_reachability(
+    asset: Asset, session: requests.Session | None = None
+) -> bool:
     """Return True if the asset's URI is reachable.
 
-    Local files: existence check. Remote URIs: defer to ``url_fails``,
-    which knows about both HTTP(S) and streaming (RTSP/RTMP) probes.
-    Trust ``skip_asset_check`` — operator opted out of validation.
+    Local files: existence check. Remote images the content cache
+    may hold: ``content_cache.revalidate``, which also keeps the
+    viewer's local copy current. Other remote URIs: defer to
+    ``url_fails``, which knows about both HTTP(S) and streaming
+    (RTSP/RTMP) probes. Trust ``skip_asset_check`` — operator opted
+    out of validation.
 
     TLS verification for the remote probe composes the device-wide
     ``verify_ssl`` setting with the per-asset ``skip_ssl_verify``
     override: verification is skipped when the global setting is off OR
     the asset opts out, so a trusted self-signed host isn't marked
     unreachable (which would make the viewer silently skip the asset).
+
+    ``session`` is the sweep's pooled session for the asset's host;
+    the single-asset recheck leaves it at None.
     """
     if asset.skip_asset_check:
         return True
@@ -1447,7 +1701,223 @@ def _check_asset_reachability(asset: Asset) -> bool:
     if uri.startswith('/'):
         return path.isfile(uri)
     verify_ssl = settings['verify_ssl'] and not asset.skip_ssl_verify
-    return not url_fails(uri, verify_ssl=verify_ssl)
+    if 'image' in (asset.mimetype or '') and content_cache.is_cacheable(
+        uri, asset.nocache
+    ):
+        # A conditional GET that also refreshes the copy the viewer
+        # plays, instead of a probe whose download is thrown away.
+        if session is None:
+            return content_cache.revalidate(uri, verify_ssl=verify_ssl)
+        return content_cache.revalidate(
+            uri, verify_ssl=verify_ssl, session=session
+        )
+    if session is None:
+        return not url_fails(uri, verify_ssl=verify_ssl)
+    return not url_fails(uri, verify_ssl=verify_ssl, session=session)
+
+
+# What makes two assets' probes interchangeable: the URI, the
+# effective TLS verification, and which probe runs for it (the
+# content-cache revalidation for cacheable images, ``url_fails``
+# otherwise).
+_ProbeKey = tuple[str, bool, bool]
+
+
+def _probe_key(asset: Asset) -> _ProbeKey:
+    uri = asset.uri or ''
+    return (
+        uri,
+        bool(settings['verify_ssl'] and not asset.skip_ssl_verify),
+        'image' in (asset.mimetype or '')
+        and content_cache.is_cacheable(uri, asset.nocache),
+    )
+
+
+def _probe_host(uri: str) -> str:
+    return urlparse(uri).netloc.lower()
+
+
+class _HostPool:
+    """Per-host connection pools and concurrency slots for one sweep.
+
+    Each host gets a ``requests.Session`` whose adapter keeps up to
+    ``per_host`` connections alive, so consecutive probes against the
+    same origin skip the TCP and TLS handshakes, and a semaphore of
+    the same size so no more than that many probes hit it at once.
+    """
+
+    def __init__(self, per_host: int) -> None:
+        self._per_host = per_host
+        self._lock = threading.Lock()
+        self._hosts: dict[
+            str, tuple[threading.BoundedSemaphore, requests.Session]
+        ] = {}
+
+    @contextmanager
+    def slot(self, uri: str) -> Iterator[requests.Session]:
+        host = _probe_host(uri)
+        with self._lock:
+            if host not in self._hosts:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self._per_host
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(self._per_host),
+                    session,
+                )
+            semaphore, session = self._hosts[host]
+        with semaphore:
+            yield session
+
+    def close(self) -> None:
+        with self._lock:
+            for _semaphore, session in self._hosts.values():
+                session.close()
+            self._hosts.clear()
+
+
+def _probe(pool: _HostPool, asset: Asset) -> bool:
+    uri = asset.uri or ''
+    if uri.startswith('/'):
+        return _check_asset_reachability(asset)
+    with pool.slot(uri) as session:
+        return _check_asset_reachability(asset, session=session)
+
+
+def _interleave_by_host(
+    groups: dict[_ProbeKey, list[Asset]],
+) -> list[tuple[_ProbeKey, Asset]]:
+    """One probe per key, ordered round-robin across hosts.
+
+    Workers waiting on a busy host's slots are workers not probing
+    anyone else, so submitting a big host's URLs back to back would
+    let it hold up the rest of the sweep.
+    """
+    lanes: dict[str, list[tuple[_ProbeKey, Asset]]] = {}
+    for key, assets in groups.items():
+        lanes.setdefault(_probe_host(key[0]), []).append((key, assets[0]))
+    return [
+        probe
+        for row in zip_longest(*lanes.values())
+        for probe in row
+        if probe is not None
+    ]
+
+
+def _run_probes(
+    groups: dict[_ProbeKey, list[Asset]], results: dict[_ProbeKey, bool]
+) -> None:
+    """Probe each key in ``groups`` once, filling ``results`` as
+    probes finish so a caller that is interrupted keeps what has
+    been gathered so far."""
+    if not groups:
+        return
+    pool = _HostPool(ASSET_REVALIDATION_PER_HOST)
+    executor = ThreadPoolExecutor(
+        max_workers=min(ASSET_REVALIDATION_MAX_WORKERS, len(groups)),
+        thread_name_prefix='revalidate',
+    )
+    try:
+        futures = {
+            executor.submit(_probe, pool, asset): key
+            for key, asset in _interleave_by_host(groups)
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except SoftTimeLimitExceeded:
+                # Out of budget for the whole sweep — handled by the
+                # caller. Re-raise past the blanket Exception arm that
+                # would otherwise swallow it and keep the sweep running
+                # into the hard limit.
+                raise
+            except Exception:
+                # url_fails should swallow its own exceptions, but a
+                # surprise from sh/requests shouldn't kill the whole
+                # sweep.
+                logger.exception(
+                    'revalidate_asset_urls: probe crashed for %s',
+                    ', '.join(asset.asset_id for asset in groups[key]),
+                )
+    finally:
+        # Don't wait on an interrupted sweep: drop the probes that
+        # haven't started. The ones in flight end on their own
+        # timeouts and their verdicts are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+        pool.close()
+
+
+def _backoff_s(base_s: int, cap_s: int, run: int) -> float:
+    """``base_s`` doubled for each verdict after the first in a run of
+    ``run``, capped at ``cap_s`` and jittered."""
+    # The exponent is bounded so a counter that has run for months
+    # doesn't build a huge int only to be capped.
+    interval = min(base_s << min(max(run - 1, 0), 16), cap_s)
+    return interval * random.uniform(
+        1 - ASSET_PROBE_JITTER, 1 + ASSET_PROBE_JITTER
+    )
+
+
+def _schedule_next_probe(asset: Asset, reachable: bool, now: datetime) -> None:
+    """Record a verdict in ``asset``'s schedule fields (in memory; the
+    caller writes ``PROBE_SCHEDULE_FIELDS``)."""
+    if reachable:
+        asset.probe_successes += 1
+        asset.probe_failures = 0
+        delay = _backoff_s(
+            ASSET_REVALIDATION_INTERVAL_S,
+            ASSET_PROBE_MAX_INTERVAL_S,
+            asset.probe_successes,
+        )
+    else:
+        asset.probe_failures += 1
+        asset.probe_successes = 0
+        delay = _backoff_s(
+            ASSET_PROBE_RETRY_S,
+            ASSET_REVALIDATION_INTERVAL_S,
+            asset.probe_failures,
+        )
+    asset.last_reachability_check = now
+    asset.next_probe_at = now + timedelta(seconds=delay)
+
+
+def _save_probe_results(
+    groups: dict[_ProbeKey, list[Asset]], results: dict[_ProbeKey, bool]
+) -> None:
+    """Write the sweep's verdicts in one transaction.
+
+    ``is_reachable`` is only written for the rows whose verdict
+    flipped — one UPDATE per direction — and the schedule fields for
+    every probed row go out as a single ``bulk_update``, instead of an
+    UPDATE (and, on SQLite, a journal commit) per asset. The schedule
+    fields are playlist-neutral, so a sweep that finds everything as
+    it was doesn't bump the viewer's playlist revision.
+    """
+    from django.db import transaction
+    from django.utils import timezone
+
+    flipped: dict[bool, list[str]] = {True: [], False: []}
+    probed: list[Asset] = []
+    checked_at = timezone.now()
+    for key, reachable in results.items():
+        for asset in groups[key]:
+            if asset.is_reachable != reachable:
+                flipped[reachable].append(asset.asset_id)
+            _schedule_next_probe(asset, reachable, checked_at)
+            probed.append(asset)
+    if not probed:
+        return
+    with transaction.atomic():
+        for reachable, ids in flipped.items():
+            if ids:
+                Asset.objects.filter(asset_id__in=ids).update(
+                    is_reachable=reachable
+                )
+        Asset.objects.bulk_update(probed, PROBE_SCHEDULE_FIELDS)
 
 
 @celery.task(
@@ -1455,14 +1925,25 @@ def _check_asset_reachability(asset: Asset) -> bool:
     soft_time_limit=ASSET_REVALIDATION_SOFT_TIME_LIMIT_S,
 )
 def revalidate_asset_urls() -> None:
-    """Refresh ``Asset.is_reachable`` for every enabled asset.
+    """Refresh ``Asset.is_reachable`` for the enabled assets that are
+    due a probe.
 
     Runs on the celery-beat schedule registered in
-    ``setup_periodic_tasks``. Skips disabled and in-progress assets
+    ``setup_periodic_tasks``. Only rows whose ``next_probe_at`` has
+    passed are probed, and each verdict pushes it out again (see
+    ``ASSET_REVALIDATION_TICK_S`` for the backoff). Skips disabled and
+    in-progress assets
     (an in-flight youtube_asset download can still be writing the file
     out, so a probe is meaningless until it lands). The probe itself
     is delegated to ``url_fails``, which already knows the rules for
-    streaming vs HTTP and caps RTSP probes at 15s wall-clock.
+    streaming vs HTTP and caps RTSP probes at 15s wall-clock, or for
+    remote images to the content cache's conditional GET.
+
+    Probes run concurrently on a small thread pool, at most
+    ``ASSET_REVALIDATION_PER_HOST`` at a time per host over a pooled
+    session for that host, and each distinct URI is probed once
+    however many assets use it. The verdicts are written together in
+    one transaction at the end.
 
     A Redis lock guards against overlap. A streaming-heavy playlist
     can have a worst-case sweep duration approaching the periodic
@@ -1477,6 +1958,7 @@ def revalidate_asset_urls() -> None:
     TTL expires while we're still running and a fresh sweep acquires
     the lock, our ``finally`` block must NOT delete that fresh lock.
     """
+    from django.db.models import Q
     from django.utils import timezone
 
     # SETNX with TTL and a unique token: succeeds only if the key
@@ -1495,8 +1977,15 @@ def revalidate_asset_urls() -> None:
         )
         return
 
+    groups: dict[_ProbeKey, list[Asset]] = {}
+    results: dict[_ProbeKey, bool] = {}
     try:
-        qs = Asset.objects.filter(is_enabled=True, is_processing=False)
+        qs = Asset.objects.filter(
+            Q(next_probe_at__isnull=True)
+            | Q(next_probe_at__lte=timezone.now()),
+            is_enabled=True,
+            is_processing=False,
+        )
         for asset in qs:
             if asset.skip_asset_check:
                 # No probe runs for these rows (the operator opted
@@ -1509,34 +1998,32 @@ def revalidate_asset_urls() -> None:
                 # _asset_is_displayable expects for skip_asset_check
                 # rows.
                 continue
-            try:
-                reachable = _check_asset_reachability(asset)
-            except SoftTimeLimitExceeded:
-                # Out of budget for the whole sweep — handled by the
-                # outer except below. Re-raise past the blanket
-                # Exception arm that would otherwise swallow it and
-                # keep the sweep running into the hard limit.
-                raise
-            except Exception:
-                # url_fails should swallow its own exceptions, but a
-                # surprise from sh/requests shouldn't kill the whole sweep.
-                logger.exception(
-                    'revalidate_asset_urls: probe crashed for %s',
-                    asset.asset_id,
-                )
-                continue
-            Asset.objects.filter(asset_id=asset.asset_id).update(
-                is_reachable=reachable,
-                last_reachability_check=timezone.now(),
+            # Assets sharing a URI (the same dashboard in two time
+            # slots, one image reused across playlists) share a
+            # probe.
+            groups.setdefault(_probe_key(asset), []).append(asset)
+        try:
+            _run_probes(groups, results)
+        except SoftTimeLimitExceeded:
+            # Out of budget mid-probe. Keep the verdicts gathered so
+            # far — they are as fresh as the per-row writes this
+            # sweep used to make — and let the next beat tick do
+            # the rest.
+            logger.warning(
+                'revalidate_asset_urls: sweep exceeded %ss; saving %d of '
+                '%d probe results and aborting until the next beat tick',
+                ASSET_REVALIDATION_SOFT_TIME_LIMIT_S,
+                len(results),
+                len(groups),
             )
+        _save_probe_results(groups, results)
     except SoftTimeLimitExceeded:
-        # The soft signal is delivered asynchronously, so it can fire
-        # anywhere in the loop — during a probe or during the DB
-        # update — which is why the whole sweep body is covered, not
-        # just _check_asset_reachability. Abort cleanly (the
-        # ``finally`` below releases the lock; rows updated so far
-        # keep their fresh state) instead of letting the hard limit
-        # SIGKILL the pool child. The next beat tick starts over.
+        # The soft signal is delivered asynchronously, so it can also
+        # fire while the asset list is read or the results are
+        # written (the transaction then rolls back). Abort cleanly
+        # (the ``finally`` below releases the lock) instead of
+        # letting the hard limit SIGKILL the pool child. The next
+        # beat tick starts over.
         logger.warning(
             'revalidate_asset_urls: sweep exceeded %ss; '
             'aborting until the next beat tick',
@@ -1632,7 +2119,7 @@ def reconcile_stuck_processing() -> None:
     from anthias_server.processing import (
         _set_processing_error,
         dispatch_normalize_image,
-        dispatch_normalize_video,
+        dispatch_normalize_videos,
         stamp_processing_start,
     )
 
@@ -1654,6 +2141,7 @@ def reconcile_stuck_processing() -> None:
         )
         return
 
+    stuck_videos: list[str] = []
     try:
         now = timezone.now()
         cutoff = now - timedelta(seconds=RECONCILE_STUCK_THRESHOLD_S)
@@ -1695,7 +2183,7 @@ def reconcile_stuck_processing() -> None:
                     asset.asset_id,
                     started_at.isoformat(),
                 )
-                dispatch_normalize_video(asset.asset_id)
+                stuck_videos.append(asset.asset_id)
             else:
                 # No clear task to re-dispatch — clear the flag with
                 # a logged error so the operator can interact with
@@ -1720,6 +2208,9 @@ def reconcile_stuck_processing() -> None:
                     'Processing stalled past threshold; flag cleared '
                     'by reconciler. Re-upload the asset to retry.',
                 )
+        # Batched so a backlog of stuck videos (a restore, a worker
+        # that was down for a day) is probed in parallel up front.
+        dispatch_normalize_videos(stuck_videos)
     except SoftTimeLimitExceeded:
         # A per-row Redis publish or SQLite lock wedged the sweep past
         # the soft budget. Abort this tick rather than let the hard
@@ -1755,6 +2246,11 @@ def revalidate_asset_url(asset_id: str) -> None:
     through an unreachable asset every few seconds doesn't pin the
     worker on ffprobe.
 
+    Runs regardless of the asset's ``next_probe_at`` — this is the
+    immediate path for an asset the viewer (or an operator, through
+    the recheck endpoint) needs answered now — and records its verdict
+    in the schedule like a sweep probe does.
+
     Mirrors the sweep's filtering on ``is_enabled`` /
     ``is_processing`` / ``skip_asset_check`` — probing a disabled or
     in-flight youtube_asset row would write misleading state, and
@@ -1818,9 +2314,15 @@ def revalidate_asset_url(asset_id: str) -> None:
                 'revalidate_asset_url: probe crashed for %s', asset_id
             )
             return
+        # An on-demand verdict counts towards the schedule like a
+        # sweep's: a failure here is retried soon, a success
+        # continues the backoff.
+        _schedule_next_probe(asset, reachable, timezone.now())
         Asset.objects.filter(asset_id=asset_id).update(
             is_reachable=reachable,
-            last_reachability_check=timezone.now(),
+            **{
+                field: getattr(asset, field) for field in PROBE_SCHEDULE_FIELDS
+            },
         )
     except SoftTimeLimitExceeded:
         logger.warning(
@@ -1879,10 +2381,15 @@ def normalize_image_asset(asset_id: str) -> None:
     ``FileNotFoundError`` (source file gone) and Pillow's
     ``UnidentifiedImageError`` (corrupt input). See the decorator's
     inline comment for the rationale.
+
+    An image some other row already converted from the same bytes
+    takes that row's WebP instead (``processing._reuse_processed``).
     """
     asset = processing._row_or_none(asset_id)
     if asset is None:
         return
+    if processing._reuse_processed(asset, 'image'):
+        return
     processing._run_image_normalisation(asset)
 
 
@@ -1915,9 +2422,14 @@ def normalize_video_asset(asset_id: str) -> None:
     Retry policy: OSError gets one retry (transient IO), an ffprobe
     timeout or non-zero exit is permanent and lands on on_failure
     via ``_NormalizeAssetTask``. ``time_limit=120`` is the worst-case
-    ffprobe wall-clock (``_FFPROBE_TIMEOUT_S`` is 60 s) doubled.
+    ffprobe wall-clock (``mediainfo.PROBE_TIMEOUT_S`` is 60 s) doubled.
+
+    A video some other row already probed from the same bytes takes
+    that row's results without running ffprobe again.
     """
     asset = processing._row_or_none(asset_id)
     if asset is None:
         return
+    if processing._reuse_processed(asset, 'video'):
+        return
     processing._run_video_normalisation(asset)
@@ -0,0 +1,169 @@
+"""Coalesced viewer reloads and dashboard nudges.
+
+Asset writes arrive in bursts: a playlist import finishes fifty
+normalize tasks within seconds, an API client creates assets one POST
+at a time. Each of them used to wake the viewer (a ``reload``, i.e. a
+settings re-read and an active-asset check) and fan a delta out to
+every browser, so one import meant fifty of each. The writes only need
+one of each after the burst settles.
+
+Both notifications go through a trailing-edge window per kind instead:
+
+* a request adds its asset ids to the kind's pending set in Redis (or
+  flags "everything" when it can't name them) and counts itself;
+* the first request of a window also takes the window key
+  (``SET NX``) and, ``COALESCE_WINDOW_S`` later, flushes — it claims
+  whatever is pending by then and sends *one* notification for all of
+  it. Requests from other processes (the Celery worker's children, the
+  web server) land in the same pending set, so the window is shared.
+
+The window key carries a TTL as a backstop: if the process holding it
+dies before flushing, the window lapses and the next request opens a
+new one that picks up the leftovers.
+
+Every flush is counted next to the requests it absorbed; ``stats()``
+reads both. Best-effort like the notifications themselves: when Redis
+is unreachable a request is sent straight away, uncoalesced.
+"""
+
+import logging
+import threading
+from typing import Any
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Long enough to span a burst of tasks finishing back to back, short
+# enough that an operator doesn't notice the wait.
+COALESCE_WINDOW_S = 1.0
+
+# Backstop on the window key (see module docstring).
+COALESCE_WINDOW_TTL_S = 10
+
+KINDS = ('viewer_reload', 'dashboard')
+
+_PREFIX = 'anthias.coalesce'
+
+
+def _key(kind: str, name: str) -> str:
+    return f'{_PREFIX}.{kind}.{name}'
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def request_viewer_reload(asset_ids: list[str] | None = None) -> None:
+    """Ask the viewer to reload once the current burst settles."""
+    _request('viewer_reload', asset_ids)
+
+
+def request_dashboard_update(asset_ids: list[str] | None) -> None:
+    """Send the dashboards one ``updated`` delta naming every row
+    touched in the current burst (``None``: a ``reset``)."""
+    _request('dashboard', asset_ids)
+
+
+def _request(kind: str, asset_ids: list[str] | None) -> None:
+    try:
+        r = _redis()
+        r.incr(_key(kind, 'requests'))
+        if asset_ids is None:
+            r.set(_key(kind, 'all'), '1')
+        elif asset_ids:
+            r.sadd(_key(kind, 'ids'), *asset_ids)
+        opened = r.set(
+            _key(kind, 'window'), '1', nx=True, ex=COALESCE_WINDOW_TTL_S
+        )
+    except redis.RedisError:
+        logger.warning(
+            'Could not coalesce %s; sending it now', kind, exc_info=True
+        )
+        _send(kind, asset_ids)
+        return
+    if opened:
+        _schedule(kind)
+
+
+def _schedule(kind: str) -> None:
+    if COALESCE_WINDOW_S <= 0:
+        flush(kind)
+        return
+    timer = threading.Timer(COALESCE_WINDOW_S, flush, args=(kind,))
+    timer.daemon = True
+    timer.start()
+
+
+def flush(kind: str) -> None:
+    """Close the window and send one notification for everything
+    pending. A no-op when another flush already took it all."""
+    try:
+        r = _redis()
+        # Closed first: a request landing from here on opens the next
+        # window, and whatever this flush doesn't claim is that
+        # window's to send.
+        r.delete(_key(kind, 'window'))
+        everything = bool(r.delete(_key(kind, 'all')))
+        pending = r.smembers(_key(kind, 'ids'))
+        if pending:
+            r.srem(_key(kind, 'ids'), *pending)
+        if not everything and not pending:
+            return
+        r.incr(_key(kind, 'sent'))
+    except redis.RedisError:
+        logger.warning(
+            'Could not read pending %s; sending it for everything',
+            kind,
+            exc_info=True,
+        )
+        _send(kind, None)
+        return
+    asset_ids = None if everything else sorted(pending)
+    logger.debug(
+        'Sending coalesced %s for %s',
+        kind,
+        'everything' if asset_ids is None else asset_ids,
+    )
+    _send(kind, asset_ids)
+
+
+def _send(kind: str, asset_ids: list[str] | None) -> None:
+    try:
+        if kind == 'viewer_reload':
+            from anthias_server.settings import ViewerPublisher
+
+            ViewerPublisher.get_instance().send_to_viewer('reload')
+        else:
+            from anthias_server.app.consumers import publish_asset_change
+
+            if asset_ids is None:
+                publish_asset_change('reset', None)
+            else:
+                publish_asset_change('updated', asset_ids)
+    except Exception:
+        # Runs on a timer thread as often as not, where there's no
+        # caller left to hand the error to. The viewer's file watch
+        # and the dashboards' poll cover a dropped notification.
+        logger.exception('Could not send coalesced %s', kind)
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """Per kind: requests received, notifications sent, and how many
+    requests were folded into another's notification."""
+    result: dict[str, dict[str, int]] = {}
+    try:
+        r = _redis()
+        for kind in KINDS:
+            requests = int(r.get(_key(kind, 'requests')) or 0)
+            sent = int(r.get(_key(kind, 'sent')) or 0)
+            result[kind] = {
+                'requests': requests,
+                'sent': sent,
+                'coalesced': max(0, requests - sent),
+            }
+    except (redis.RedisError, TypeError, ValueError):
+        return {}
+    return result
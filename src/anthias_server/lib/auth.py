@@ -18,7 +18,10 @@ three credential paths, each with a distinct caller and trust model:
    TTL so a chatty polling client (e.g. Anthias-CLI hitting
    ``/api/v2/info`` every few seconds) doesn't flood the log; the
    signal we care about is "this caller is still on Basic", not the
-   request rate. Pre-2826 versions of Anthias-CLI and any third-party
+   request rate. A credential that verified recently skips the
+   PBKDF2 check (see ``_BASIC_AUTH_CACHE_TTL_S``), so that polling
+   costs a primary-key lookup rather than a key derivation per call.
+   Pre-2826 versions of Anthias-CLI and any third-party
    scripts that were written against the old auth keep working
    unchanged. The bearer-token path that will eventually replace
    this is tracked as a follow-up — it needs its own UI for create /
@@ -49,8 +52,9 @@ This module's surface is:
   with a throttled ``logger.warning`` (one line per ``(user, IP,
   path)`` per ``_BASIC_AUTH_LOG_TTL_S``) so production logs surface
   the last callers still using the legacy header without being
-  flooded by chatty polling clients. Also gated by ``auth_backend``
-  (no-ops when the operator has turned auth off).
+  flooded by chatty polling clients, and a short-lived cache of
+  verified credentials. Also gated by ``auth_backend`` (no-ops when
+  the operator has turned auth off).
 * ``GatedSessionAuthentication`` — DRF's ``SessionAuthentication``
   with the same auth-backend gate so an incidental session cookie
   doesn't trigger CSRF rejection on write endpoints when auth is
@@ -65,9 +69,12 @@ This module's surface is:
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import logging
 import os.path
 import re
+import secrets
 from collections.abc import Callable
 from functools import wraps
 from typing import (
@@ -165,6 +172,83 @@ def _should_log_basic_auth_use(
     return True
 
 
+# Verified-credential cache for the Basic path. Every Basic request
+# otherwise runs a full PBKDF2 ``check_password`` — hundreds of ms of
+# CPU on a Pi 3, competing with playback, for a monitoring client that
+# polls /api/v2/info every 10s. A credential that verified recently is
+# remembered under an HMAC of ``user:password`` (the key is random per
+# process, so the table is useless outside it) together with the
+# User's pk and the password hash it verified against.
+#
+# A hit still reads the User row (one primary-key SELECT) and only
+# counts while that row is active, has the same username and still
+# carries the same hash — so a password or username change from any
+# process, including ``manage.py changepassword``, invalidates it
+# without a signal. ``apply_auth_settings`` clears the table as well.
+# Failed attempts are never cached: a guess still costs a full
+# key derivation.
+#
+# Same per-worker in-process dict as the log throttle above; a race
+# on write costs one extra verification.
+_BASIC_AUTH_CACHE_TTL_S = 300.0
+_BASIC_AUTH_CACHE_MAX = 64
+_basic_auth_cache_key = secrets.token_bytes(32)
+_basic_auth_verified: dict[str, tuple[int, str, float]] = {}
+
+
+def _basic_auth_fingerprint(username: str, password: str) -> str:
+    return hmac.new(
+        _basic_auth_cache_key,
+        f'{username}\0{password}'.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def _cached_basic_auth_user(username: str, password: str) -> User | None:
+    """The User a recent Basic verification of exactly this
+    credential returned, if it still holds; None means verify it."""
+    import time
+
+    from django.contrib.auth.models import User as UserModel
+
+    fingerprint = _basic_auth_fingerprint(username, password)
+    entry = _basic_auth_verified.get(fingerprint)
+    if entry is None:
+        return None
+    pk, stored, expiry = entry
+    if expiry <= time.monotonic():
+        _basic_auth_verified.pop(fingerprint, None)
+        return None
+    user = UserModel.objects.filter(pk=pk, is_active=True).first()
+    if (
+        user is None
+        or user.get_username() != username
+        or not hmac.compare_digest(user.password, stored)
+    ):
+        _basic_auth_verified.pop(fingerprint, None)
+        return None
+    return user
+
+
+def _remember_basic_auth(username: str, password: str, user: User) -> None:
+    import time
+
+    if len(_basic_auth_verified) >= _BASIC_AUTH_CACHE_MAX:
+        # One operator and a few scripts in practice; anything past
+        # the cap is churn, so start over rather than track recency.
+        _basic_auth_verified.clear()
+    _basic_auth_verified[_basic_auth_fingerprint(username, password)] = (
+        user.pk,
+        user.password,
+        time.monotonic() + _BASIC_AUTH_CACHE_TTL_S,
+    )
+
+
+def clear_basic_auth_cache() -> None:
+    """Forget every verified Basic credential (auth settings changed)."""
+    _basic_auth_verified.clear()
+
+
 def _build_drf_auth_classes() -> dict[str, type]:
     """Build the DRF auth classes lazily.
 
@@ -232,9 +316,14 @@ def _build_drf_auth_classes() -> dict[str, type]:
         def authenticate_credentials(  # type: ignore[no-untyped-def]
             self, userid, password, request=None
         ):
-            result = super().authenticate_credentials(
-                userid, password, request=request
-            )
+            cached = _cached_basic_auth_user(userid, password)
+            if cached is not None:
+                result = (cached, None)
+            else:
+                result = super().authenticate_credentials(
+                    userid, password, request=request
+                )
+                _remember_basic_auth(userid, password, result[0])
             # Mirror DRF's contract: success returns ``(user, None)``.
             # Only log on success so a rate of "Basic auth attempts"
             # doesn't dwarf the real signal of "Basic auth still in
@@ -332,7 +421,7 @@ def _is_safe_login_next_source(request: HttpRequest) -> bool:
       landing on the dashboard, so we drop ``next`` for unsafe
       methods.
     * **htmx partial endpoints**. The dashboard polls fragments such
-      as ``assets_table_partial`` every 5s with ``HX-Request: true``;
+      as ``assets_table_partial`` every 60s with ``HX-Request: true``;
       the operator's actual address bar still points at the parent
       page. Bouncing through ``?next=/_partials/asset-table/`` would
       land them on a bare fragment URL after sign-in instead of the
@@ -606,6 +695,7 @@ def _update_existing_operator(
 
     if changed_fields:
         operator.save(update_fields=changed_fields)
+        clear_basic_auth_cache()
 
 
 def _create_initial_operator(
@@ -642,6 +732,7 @@ def _create_initial_operator(
     )
     user.set_password(new_pwd)
     user.save()
+    clear_basic_auth_cache()
 
 
 def apply_auth_settings(
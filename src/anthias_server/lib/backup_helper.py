@@ -252,6 +252,21 @@ def recover(file_path: str) -> None:
                     member.name,
                 )
                 continue
+            if member.isfile() or member.islnk():
+                # Asset files are hard links to a shared blob
+                # (``anthias_server.blobstore``); extracting over one
+                # in place would rewrite every asset linked to it.
+                try:
+                    os.unlink(path.join(home, member.name))
+                except OSError:
+                    pass
             tar.extract(member, **extract_kwargs)
 
     remove(file_path)
+
+    # The restore swapped the database file out from under Django, so
+    # none of the model-level revision bumps fired; invalidate the
+    # viewer's playlist wholesale.
+    from anthias_server.settings import ViewerPublisher
+
+    ViewerPublisher.get_instance().publish_playlist_change(None)
@@ -40,10 +40,17 @@ from typing import TYPE_CHECKING
 from urllib.parse import urlsplit
 
 from django.core.exceptions import DisallowedHost
-from django.middleware.csrf import CsrfViewMiddleware
+from django.http import HttpResponse
+from django.middleware.csrf import (
+    REASON_BAD_ORIGIN,
+    CsrfViewMiddleware,
+    RejectRequest,
+)
+from django.utils.decorators import decorator_from_middleware
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
+    from django.http.response import HttpResponseBase
 
 
 _DEFAULT_PORTS = {'http': 80, 'https': 443}
@@ -142,3 +149,45 @@ class SameHostOriginCsrfMiddleware(CsrfViewMiddleware):
         # → 443 vs ``Host: device:8000``) is a genuinely different
         # web origin and must stay rejected.
         return {origin_port, target_port} == set(_DEFAULT_PORTS.values())
+
+
+# ``csrf_protect`` with this module's Origin rule, for a view that has
+# to be ``csrf_exempt`` from the middleware so it can set up request
+# parsing first (``app.views.assets_upload``). Django's own
+# ``csrf_protect`` would bring back the strict scheme check above.
+same_host_csrf_protect = decorator_from_middleware(
+    SameHostOriginCsrfMiddleware
+)
+
+
+def reject_cross_origin(request: HttpRequest) -> HttpResponseBase | None:
+    """The header half of ``same_host_csrf_protect``: the 403 its
+    Origin check (or, over HTTPS without an Origin, its Referer check)
+    would end in, else None.
+
+    Needs nothing from the body, so ``assets_upload`` runs it before
+    streaming a multi-GB upload onto the SD card only to throw it
+    away; the token check still follows once the body is parsed.
+    Same order and the same test-client escape hatch as
+    ``CsrfViewMiddleware.process_view``.
+    """
+    if request.method in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+        return None
+    if getattr(request, '_dont_enforce_csrf_checks', False):
+        return None
+    middleware = SameHostOriginCsrfMiddleware(lambda _: HttpResponse())
+    # ``_check_referer`` / ``_reject`` are private hooks django-stubs
+    # doesn't model, same as ``_origin_verified`` above.
+    if 'HTTP_ORIGIN' in request.META:
+        if not middleware._origin_verified(request):
+            return middleware._reject(  # type: ignore[attr-defined,no-any-return]
+                request, REASON_BAD_ORIGIN % request.META['HTTP_ORIGIN']
+            )
+    elif request.is_secure():
+        try:
+            middleware._check_referer(request)  # type: ignore[attr-defined]
+        except RejectRequest as exc:
+            return middleware._reject(  # type: ignore[attr-defined,no-any-return]
+                request, exc.reason
+            )
+    return None
@@ -8,6 +8,11 @@ Anthias depends on:
 * ``list_media``      — what's importable, and what has to be skipped?
 * ``import_item``     — pull one item in and create the Anthias ``Asset``.
 
+Two optional hooks have defaults: ``batch`` (a bulk import job wraps its
+items in it so a provider can share one login across them) and
+``list_changes`` (an incremental refresh of a cached listing; see
+``integrations.listings``).
+
 Errors follow the same split as ``lib.screenly_migration``:
 ``validate_token`` / ``list_media`` let ``requests.RequestException``
 (or a provider's transport equivalent) propagate so the view can answer
@@ -19,6 +24,8 @@ errors bubble.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -47,7 +54,9 @@ class RemoteMediaItem:
     ``importable`` is False for media Anthias has no viewer path for
     (audio, documents); ``skip_reason`` then carries the operator-facing
     explanation. ``raw`` keeps the provider's original payload so a later
-    ``import_item`` needn't re-fetch the list row.
+    ``import_item`` needn't re-fetch the list row. ``updated_at`` is the
+    remote modification time (ISO 8601), for providers that report one —
+    it's the watermark ``list_changes`` refreshes from.
     """
 
     remote_id: str
@@ -56,6 +65,7 @@ class RemoteMediaItem:
     importable: bool
     skip_reason: str | None = None
     raw: dict[str, Any] = field(default_factory=dict)
+    updated_at: str | None = None
 
     def as_dict(self) -> dict[str, Any]:
         # ``raw`` is intentionally omitted — it can carry provider
@@ -137,3 +147,30 @@ class ImportProvider(ABC):
         Raises :class:`ProviderImportError` for per-item failures;
         transport errors propagate.
         """
+
+    def list_changes(
+        self, token: str, since: str, *, workspace: str | None = None
+    ) -> list[RemoteMediaItem] | None:
+        """Items added or changed after ``since`` (the newest
+        ``updated_at`` of an earlier listing), or None when the provider
+        can't filter by change and the caller must list everything
+        again. Deleted items aren't reported; the next full listing
+        drops them.
+        """
+        return None
+
+    def batch(self, token: str) -> AbstractContextManager[None]:
+        """Scope in which several ``import_item`` calls, possibly from
+        several threads, may share one authenticated session.
+
+        The default does nothing: providers whose token goes straight
+        into a header (Yodeck) have no login to share. Providers with a
+        login exchange return ``LoginReuse.batch`` (see
+        ``integrations.http``).
+        """
+        return _no_batch()
+
+
+@contextmanager
+def _no_batch() -> Iterator[None]:
+    yield
@@ -9,11 +9,24 @@ anti-bot probe in ``anthias_common.utils.url_fails``.
 
 Every provider builds its session through :func:`new_import_session` so the
 UA policy lives in exactly one place.
+
+:class:`LoginReuse` lets a provider whose API needs a login exchange
+(Xibo's OAuth token, piSignage's JWT) share one login across the items
+of a bulk import job instead of logging in again for every item.
 """
 
 from __future__ import annotations
 
+import hashlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
 import requests
+from requests.adapters import HTTPAdapter
 
 # Neutral, non-Anthias User-Agent. See the module docstring for why we don't
 # use AnthiasSession here.
@@ -23,8 +36,82 @@ IMPORT_USER_AGENT = (
 )
 
 
+# A bulk import job runs a few items at once, each download split into
+# range segments (``ingest._DOWNLOAD_SEGMENTS``); requests' default of
+# 10 pooled connections per host would make the overflow reconnect
+# (TLS handshake included) for every request.
+_POOL_MAXSIZE = 16
+
+# How long one login is shared. Well inside the providers' own token
+# lifetimes (Xibo issues hour-long access tokens), so a long job logs
+# in again before the API starts rejecting the old one.
+LOGIN_REUSE_S = 10 * 60
+
+
 def new_import_session() -> requests.Session:
     """Return a ``requests.Session`` carrying the neutral import UA."""
     session = requests.Session()
     session.headers['User-Agent'] = IMPORT_USER_AGENT
+    adapter = HTTPAdapter(pool_maxsize=_POOL_MAXSIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
     return session
+
+
+@dataclass
+class _Batch:
+    depth: int = 0
+    login: Any = None
+    logged_in_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class LoginReuse:
+    """Share a provider's login across the items of one batch.
+
+    Outside a :meth:`batch` block :meth:`login` just calls through, so
+    the one-item endpoint keeps logging in per request and nothing
+    outlives it. Inside one, the first item logs in and the rest (on
+    any thread) reuse the result until it's ``LOGIN_REUSE_S`` old.
+    Batches are keyed by a one-way hash of the token, like
+    ScreenCloud's endpoint cache, and forgotten when the last block
+    for that token exits.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._batches: dict[str, _Batch] = {}
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @contextmanager
+    def batch(self, token: str) -> Iterator[None]:
+        key = self._key(token)
+        with self._lock:
+            self._batches.setdefault(key, _Batch()).depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry = self._batches[key]
+                entry.depth -= 1
+                if entry.depth == 0:
+                    del self._batches[key]
+
+    def login(self, token: str, do_login: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._batches.get(self._key(token))
+        if entry is None:
+            return do_login()
+        # Per-batch lock: the workers that start together wait for
+        # one login rather than each making their own.
+        with entry.lock:
+            now = time.monotonic()
+            if entry.login is None or now - entry.logged_in_at > (
+                LOGIN_REUSE_S
+            ):
+                entry.login = do_login()
+                entry.logged_in_at = now
+            return entry.login
@@ -9,8 +9,9 @@ behave identically no matter which platform the media came from:
 * creating the ``Asset`` through the same ``CreateAssetSerializerV2``
   pipeline the web UI and REST API use (rename → normalise → duration
   probe), and
-* idempotency — stamping ``Asset.metadata['import_source']`` and looking
-  it up so a re-import returns the existing row instead of duplicating.
+* idempotency — recording each asset's provenance (an ``ImportSource``
+  row, mirrored into ``Asset.metadata['import_source']``) and looking it
+  up so a re-import returns the existing row instead of duplicating.
 
 Keeping this in one place means a new provider only writes API-specific
 field mapping, and every provider's imported assets are indistinguishable
@@ -21,6 +22,7 @@ from __future__ import annotations
 
 import os
 import re
+import threading
 import uuid
 from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
@@ -28,11 +30,14 @@ from typing import Any
 from urllib.parse import urlparse
 
 import requests
+from django.db import transaction
 
+from anthias_common import downloads
 from anthias_common.utils import validate_url
+from anthias_server import assetsweep
 from anthias_server.api.helpers import AssetCreationError, persist_new_asset
 from anthias_server.api.serializers.v2 import CreateAssetSerializerV2
-from anthias_server.app.models import Asset
+from anthias_server.app.models import Asset, ImportSource
 from anthias_server.settings import settings
 
 from .base import ProviderImportError
@@ -42,8 +47,16 @@ from .base import ProviderImportError
 # rather than imported so this request-path module doesn't pull in the
 # whole Celery app.
 MAX_DOWNLOAD_BYTES = 5 * 1024**3
-_DOWNLOAD_CHUNK = 1024 * 1024
 _DOWNLOAD_TIMEOUT_S = 120.0
+# Parallel range requests for a large original; see
+# ``celery_tasks.REMOTE_VIDEO_PARALLEL_SEGMENTS``.
+_DOWNLOAD_SEGMENTS = 4
+
+# A bulk import job (``integrations.jobs``) runs several items at once.
+# Their downloads overlap freely, but creating the row is serialised:
+# ``persist_new_asset`` reads, splices and writes back the active play
+# ordering, and two interleaved splices would lose one of the inserts.
+_persist_lock = threading.Lock()
 
 
 def first_http_url(candidates: Iterable[Any]) -> str | None:
@@ -120,13 +133,34 @@ def default_window() -> tuple[datetime, datetime]:
 def find_imported_asset(provider_key: str, remote_id: str) -> Asset | None:
     """Return a previously-imported asset for this provider+remote id."""
     return Asset.objects.filter(
-        metadata__import_source__provider=provider_key,
-        metadata__import_source__remote_id=str(remote_id),
+        import_source__provider=provider_key,
+        import_source__remote_id=str(remote_id),
     ).first()
 
 
+def find_imported_assets(
+    provider_key: str, remote_ids: Iterable[str]
+) -> dict[str, str]:
+    """``remote_id -> asset_id`` for those of ``remote_ids`` already
+    imported from this provider, in one query (a listing page marks
+    its already-imported rows without a lookup per row)."""
+    ids = [str(remote_id) for remote_id in remote_ids]
+    if not ids:
+        return {}
+    found: dict[str, str] = {}
+    rows = ImportSource.objects.filter(
+        provider=provider_key, remote_id__in=ids
+    ).values_list('remote_id', 'asset_id')
+    for remote_id, asset_id in rows:
+        found.setdefault(remote_id, asset_id)
+    return found
+
+
 def _stamp_import_source(
-    asset: Asset, provider_key: str, remote_id: str
+    asset: Asset,
+    provider_key: str,
+    remote_id: str,
+    remote_revision: str | None = None,
 ) -> None:
     metadata = dict(asset.metadata or {})
     metadata['import_source'] = {
@@ -134,7 +168,16 @@ def _stamp_import_source(
         'remote_id': str(remote_id),
     }
     asset.metadata = metadata
-    asset.save(update_fields=['metadata'])
+    with transaction.atomic():
+        asset.save(update_fields=['metadata'])
+        ImportSource.objects.update_or_create(
+            asset=asset,
+            defaults={
+                'provider': provider_key,
+                'remote_id': str(remote_id),
+                'remote_revision': remote_revision,
+            },
+        )
 
 
 def _stringify_errors(errors: Any) -> str:
@@ -197,6 +240,11 @@ def _create_via_serializer(
     return persist_new_asset(serializer)
 
 
+def _check_download(response: requests.Response) -> None:
+    if not response.ok:
+        raise ProviderImportError(f'Download failed ({response.status_code}).')
+
+
 def _download_to_assetdir(
     session: requests.Session,
     url: str,
@@ -216,38 +264,37 @@ def _download_to_assetdir(
         urlparse(url).netloc.lower() == (auth_host or '').lower()
     )
     request_headers = headers if send_auth else {}
+    # A worker killed mid-download leaves these behind for the sweep.
+    assetsweep.mark([part, staged])
     try:
-        with session.get(
+        # Resumes in-call when the connection drops and the origin
+        # supports ranges (``anthias_common.downloads``), so a flaky
+        # link costs a reconnect rather than the whole original.
+        downloads.fetch(
+            session,
             url,
-            headers=request_headers,
-            stream=True,
+            part,
+            max_bytes=MAX_DOWNLOAD_BYTES,
             timeout=_DOWNLOAD_TIMEOUT_S,
-        ) as response:
-            if not response.ok:
-                raise ProviderImportError(
-                    f'Download failed ({response.status_code}).'
-                )
-            written = 0
-            with open(part, 'wb') as handle:
-                for chunk in response.iter_content(_DOWNLOAD_CHUNK):
-                    if not chunk:
-                        continue
-                    written += len(chunk)
-                    if written > MAX_DOWNLOAD_BYTES:
-                        raise ProviderImportError(
-                            'File exceeds the 5 GiB import size limit.'
-                        )
-                    handle.write(chunk)
-        if written == 0:
-            raise ProviderImportError('The provider returned an empty file.')
+            headers=request_headers,
+            check_response=_check_download,
+            segments=_DOWNLOAD_SEGMENTS,
+        )
         # Atomic move into the final staged name only once the whole body
         # landed, so a truncated download can't be handed to the serializer.
         os.replace(part, staged)
         return staged
-    except Exception:
-        _safe_unlink(part)
-        _safe_unlink(staged)
-        raise
+    except downloads.DownloadTooLarge:
+        raise ProviderImportError(
+            'File exceeds the 5 GiB import size limit.'
+        ) from None
+    except downloads.EmptyDownload:
+        raise ProviderImportError(
+            'The provider returned an empty file.'
+        ) from None
+    finally:
+        # Nothing outlives this call: the staged name is unique to it.
+        downloads.discard(part)
 
 
 def create_webpage_asset(
@@ -260,19 +307,21 @@ def create_webpage_asset(
     start_date: datetime,
     end_date: datetime,
     enable: bool,
+    remote_revision: str | None = None,
 ) -> Asset:
     """Create a webpage asset whose ``uri`` is the destination URL."""
-    asset = _create_via_serializer(
-        uri=url,
-        ext=None,
-        mimetype='webpage',
-        name=name,
-        start_date=start_date,
-        end_date=end_date,
-        duration=duration,
-        enable=enable,
-    )
-    _stamp_import_source(asset, provider_key, remote_id)
+    with _persist_lock:
+        asset = _create_via_serializer(
+            uri=url,
+            ext=None,
+            mimetype='webpage',
+            name=name,
+            start_date=start_date,
+            end_date=end_date,
+            duration=duration,
+            enable=enable,
+        )
+        _stamp_import_source(asset, provider_key, remote_id, remote_revision)
     return asset
 
 
@@ -291,6 +340,7 @@ def create_file_asset(
     enable: bool,
     headers: dict[str, str] | None = None,
     auth_host: str | None = None,
+    remote_revision: str | None = None,
 ) -> Asset:
     """Download an original file and create an image/video asset.
 
@@ -305,22 +355,24 @@ def create_file_asset(
     staged_path = _download_to_assetdir(
         session, file_url, headers or {}, ext, auth_host
     )
-    try:
-        asset = _create_via_serializer(
-            uri=staged_path,
-            ext=ext,
-            mimetype=mimetype,
-            name=name,
-            start_date=start_date,
-            end_date=end_date,
-            duration=duration,
-            enable=enable,
-        )
-    except Exception:
-        # ``prepare_asset`` renames the staged file into place only once
-        # validation passes, so on failure it's still at ``staged_path``
-        # — remove it rather than leaving an orphan for the hourly sweep.
-        _safe_unlink(staged_path)
-        raise
-    _stamp_import_source(asset, provider_key, remote_id)
+    with _persist_lock:
+        try:
+            asset = _create_via_serializer(
+                uri=staged_path,
+                ext=ext,
+                mimetype=mimetype,
+                name=name,
+                start_date=start_date,
+                end_date=end_date,
+                duration=duration,
+                enable=enable,
+            )
+        except Exception:
+            # ``prepare_asset`` renames the staged file into place only
+            # once validation passes, so on failure it's still at
+            # ``staged_path`` — remove it rather than leaving an orphan
+            # for the hourly sweep.
+            _safe_unlink(staged_path)
+            raise
+        _stamp_import_source(asset, provider_key, remote_id, remote_revision)
     return asset
@@ -0,0 +1,361 @@
+"""Bulk import jobs: a whole selection imported server-side.
+
+The wizard used to drive an import one ``import_item`` request at a
+time — a 300-item library was 300 browser round-trips, each one
+logging in to the provider again and holding an HTTP request open for
+the whole download. A job takes the selection in one request and a
+Celery task (``celery_tasks.run_import_job``) works through it:
+
+* a few items at a time (``JOB_CONCURRENCY``) on a thread pool, inside
+  the provider's ``batch`` so they share one login and one pooled
+  session;
+* every item's result written back to the job record in Redis as it
+  lands, and pushed to the browsers over the ``AssetConsumer``
+  websocket (``notify_import_progress``);
+* in slices of ``JOB_SLICE_ITEMS``: each task run takes the next slice
+  and queues the next run, so a long import never holds the worker
+  past its time limit or starves the other queued tasks.
+
+The record survives a worker restart. Items left ``pending`` or
+``running`` by a killed worker are picked up again by
+``resume_import_jobs`` (on worker start and on a beat tick, see
+``stalled_job_ids``), and the importers' own idempotency
+(``ingest.find_imported_asset``) makes re-running an item that had in
+fact finished a cheap "already imported" skip.
+
+The operator's token is kept beside the record, in Redis only, for as
+long as the job runs; it's deleted when the job finishes and expires
+with the record otherwise. It is never returned by the API.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import UTC, datetime
+from typing import Any
+
+import requests
+
+from .base import ImportProvider, ProviderImportError
+from .registry import get_provider
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY_PREFIX = 'import:job:'
+ACTIVE_JOBS_KEY = 'import:jobs:active'
+
+# A finished job's record is kept a day so a reopened wizard can still
+# show how it went; an abandoned job's token goes with it.
+JOB_TTL_S = 24 * 60 * 60
+
+# Items imported at once. Each download is itself split into range
+# segments (``ingest._DOWNLOAD_SEGMENTS``), so three keeps a slow uplink
+# busy without one item's download starving the others.
+JOB_CONCURRENCY = 3
+
+# Items per task run; see the module docstring.
+JOB_SLICE_ITEMS = 24
+
+# How often the running task calls its ``heartbeat`` while it waits on
+# the pool, so the caller can keep its job lock alive.
+HEARTBEAT_S = 30
+
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+
+ITEM_PENDING = 'pending'
+ITEM_RUNNING = 'running'
+ITEM_SUCCESS = 'success'
+ITEM_SKIPPED = 'skipped'
+ITEM_FAILED = 'failed'
+
+_UNFINISHED = (ITEM_PENDING, ITEM_RUNNING)
+
+NETWORK_ERROR_MESSAGE = (
+    "Could not reach the import provider. Check this device's internet "
+    'connection and try again.'
+)
+_TOKEN_GONE_MESSAGE = (
+    'The import was interrupted and its token has expired. Start the '
+    'import again.'
+)
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def _job_key(job_id: str) -> str:
+    return f'{JOB_KEY_PREFIX}{job_id}'
+
+
+def _token_key(job_id: str) -> str:
+    return f'{JOB_KEY_PREFIX}{job_id}:token'
+
+
+def lock_key(job_id: str) -> str:
+    """Single-flight lock the Celery task holds while it runs a job."""
+    return f'{JOB_KEY_PREFIX}{job_id}:lock'
+
+
+def _save(job: dict[str, Any]) -> None:
+    job['updated_at'] = time.time()
+    _redis().set(_job_key(job['job_id']), json.dumps(job), ex=JOB_TTL_S)
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    raw = _redis().get(_job_key(job_id))
+    if raw is None:
+        return None
+    try:
+        job: dict[str, Any] = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return job
+
+
+def summary(job: dict[str, Any]) -> dict[str, Any]:
+    """Per-status item counts, for progress bars."""
+    counts = {
+        status: 0
+        for status in (
+            ITEM_PENDING,
+            ITEM_RUNNING,
+            ITEM_SUCCESS,
+            ITEM_SKIPPED,
+            ITEM_FAILED,
+        )
+    }
+    for item in job['items']:
+        counts[item['status']] += 1
+    return {
+        'job_id': job['job_id'],
+        'provider': job['provider'],
+        'status': job['status'],
+        'total': len(job['items']),
+        'counts': counts,
+    }
+
+
+def create_job(
+    provider_key: str,
+    token: str,
+    remote_ids: Iterable[str],
+    *,
+    enable: bool = True,
+) -> dict[str, Any]:
+    """Record a new job and return it. The caller queues the task."""
+    ids = list(dict.fromkeys(str(remote_id) for remote_id in remote_ids))
+    job_id = uuid.uuid4().hex
+    job: dict[str, Any] = {
+        'job_id': job_id,
+        'provider': provider_key,
+        'enable': enable,
+        'status': JOB_RUNNING if ids else JOB_DONE,
+        'created_at': datetime.now(UTC).isoformat(),
+        'items': [
+            {
+                'remote_id': remote_id,
+                'status': ITEM_PENDING,
+                'asset_id': None,
+                'reason': None,
+                'error': None,
+            }
+            for remote_id in ids
+        ],
+    }
+    r = _redis()
+    if ids:
+        r.set(_token_key(job_id), token, ex=JOB_TTL_S)
+        r.sadd(ACTIVE_JOBS_KEY, job_id)
+    _save(job)
+    return job
+
+
+def active_job_ids() -> list[str]:
+    return sorted(_redis().smembers(ACTIVE_JOBS_KEY) or ())
+
+
+def stalled_job_ids(stale_after_s: float) -> list[str]:
+    """Active jobs nobody is running: no task holds the lock and the
+    record hasn't moved in ``stale_after_s`` (a run queued behind
+    other tasks hasn't taken the lock yet, but its predecessor saved
+    the record moments before queueing it)."""
+    r = _redis()
+    now = time.time()
+    stalled = []
+    for job_id in active_job_ids():
+        if r.exists(lock_key(job_id)):
+            continue
+        job = get_job(job_id)
+        if job is None:
+            r.srem(ACTIVE_JOBS_KEY, job_id)
+            continue
+        if now - float(job.get('updated_at') or 0) >= stale_after_s:
+            stalled.append(job_id)
+    return stalled
+
+
+def _finish(job: dict[str, Any]) -> None:
+    job['status'] = JOB_DONE
+    _save(job)
+    r = _redis()
+    r.delete(_token_key(job['job_id']))
+    r.srem(ACTIVE_JOBS_KEY, job['job_id'])
+
+
+def _notify(job: dict[str, Any], item: dict[str, Any] | None) -> None:
+    from anthias_server.app.consumers import notify_import_progress
+
+    notify_import_progress({**summary(job), 'item': item})
+
+
+def _outcome_fields(
+    provider: ImportProvider, token: str, remote_id: str, enable: bool
+) -> dict[str, Any]:
+    """Import one item; the item fields its result sets.
+
+    Same classification as ``ImportItemViewV2``: a ``ProviderImportError``
+    is a per-item failure with its own message, a transport error the
+    generic network message.
+    """
+    try:
+        outcome = provider.import_item(token, remote_id, enable=enable)
+    except ProviderImportError as error:
+        return {'status': ITEM_FAILED, 'error': error.user_message}
+    except requests.RequestException:
+        logger.warning(
+            '%s bulk import failed for %s',
+            provider.key,
+            remote_id,
+            exc_info=True,
+        )
+        return {'status': ITEM_FAILED, 'error': NETWORK_ERROR_MESSAGE}
+    except Exception:
+        logger.exception(
+            '%s bulk import crashed for %s', provider.key, remote_id
+        )
+        return {
+            'status': ITEM_FAILED,
+            'error': 'Anthias hit an unexpected error importing this item.',
+        }
+    if outcome.skipped:
+        status = ITEM_SKIPPED
+    elif outcome.success:
+        status = ITEM_SUCCESS
+    else:
+        status = ITEM_FAILED
+    return {
+        'status': status,
+        'asset_id': outcome.asset_id,
+        'reason': outcome.reason,
+    }
+
+
+def _import_in_thread(
+    provider: ImportProvider, token: str, remote_id: str, enable: bool
+) -> dict[str, Any]:
+    from django.db import connection
+
+    try:
+        return _outcome_fields(provider, token, remote_id, enable)
+    finally:
+        # Pool threads each open their own connection; close it rather
+        # than leave one per worker thread behind.
+        connection.close()
+
+
+def run_job(
+    job_id: str,
+    *,
+    heartbeat: Callable[[], object] = lambda: None,
+    max_workers: int = JOB_CONCURRENCY,
+) -> bool:
+    """Import the next slice of ``job_id``'s unfinished items.
+
+    Returns True when items remain for another run. The caller holds
+    the job's lock and refreshes it from ``heartbeat``.
+    """
+    job = get_job(job_id)
+    if job is None or job['status'] != JOB_RUNNING:
+        _redis().srem(ACTIVE_JOBS_KEY, job_id)
+        return False
+
+    unfinished = [
+        item for item in job['items'] if item['status'] in _UNFINISHED
+    ]
+    token = _redis().get(_token_key(job_id))
+    provider = get_provider(job['provider'])
+    if token is None or provider is None:
+        message = (
+            _TOKEN_GONE_MESSAGE
+            if token is None
+            else 'This import provider is not available.'
+        )
+        for item in unfinished:
+            item.update(status=ITEM_FAILED, error=message)
+        _finish(job)
+        _notify(job, None)
+        return False
+
+    batch = unfinished[:JOB_SLICE_ITEMS]
+    for item in batch:
+        item['status'] = ITEM_RUNNING
+    _save(job)
+    _notify(job, None)
+
+    def record(item: dict[str, Any], fields: dict[str, Any]) -> None:
+        item.update(fields)
+        _save(job)
+        _notify(job, item)
+
+    enable = bool(job['enable'])
+    with provider.batch(token):
+        if max_workers <= 1:
+            for item in batch:
+                record(
+                    item,
+                    _outcome_fields(
+                        provider, token, item['remote_id'], enable
+                    ),
+                )
+                heartbeat()
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(batch)),
+                thread_name_prefix=f'import-{job_id[:8]}',
+            ) as pool:
+                pending = {
+                    pool.submit(
+                        _import_in_thread,
+                        provider,
+                        token,
+                        item['remote_id'],
+                        enable,
+                    ): item
+                    for item in batch
+                }
+                while pending:
+                    done, _ = wait(
+                        pending,
+                        timeout=HEARTBEAT_S,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    # Results are recorded on this thread only, so the
+                    # job record needs no lock of its own.
+                    for future in done:
+                        record(pending.pop(future), future.result())
+                    heartbeat()
+
+    if any(item['status'] in _UNFINISHED for item in job['items']):
+        return True
+    _finish(job)
+    _notify(job, None)
+    return False
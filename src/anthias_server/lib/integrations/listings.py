@@ -0,0 +1,160 @@
+"""Cached provider media listings, served a page at a time.
+
+Every open of the import wizard's picker used to list the operator's
+whole provider library: every page of every provider endpoint, fetched
+before the first row could render, and again on the next visit. The
+listing is now kept in Redis for ``LISTING_TTL_S`` under the provider
+and a fingerprint of the token (never the token itself), and the
+wizard reads it back in pages (``page``), so re-opening the picker —
+or paging through it — costs a Redis ``GET`` instead of a provider
+round-trip per page.
+
+A refresh asks the provider for only what changed since the cached
+listing's newest ``updated_at`` (``ImportProvider.list_changes``) and
+merges it in; providers without a change filter list everything again.
+
+The cache holds what the picker shows — ids, names, types, skip
+reasons — not the provider's raw payloads; ``import_item`` fetches an
+item's detail itself. Whether a row is already imported is looked up
+per page (``ingest.find_imported_assets``), so it's current even when
+the listing is not.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+import redis
+
+from . import ingest
+from .base import ImportProvider, RemoteMediaItem
+
+logger = logging.getLogger(__name__)
+
+LISTING_KEY_PREFIX = 'import:listing:'
+
+# Long enough to cover a wizard session (pick, import, come back for
+# more); short enough that a library edited meanwhile isn't shown stale
+# for long even without a refresh.
+LISTING_TTL_S = 15 * 60
+
+PAGE_SIZE_DEFAULT = 100
+
+
+def _redis() -> Any:
+    from anthias_common.utils import connect_to_redis
+
+    return connect_to_redis()
+
+
+def listing_key(provider_key: str, token: str) -> str:
+    fingerprint = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    return f'{LISTING_KEY_PREFIX}{provider_key}:{fingerprint}'
+
+
+def _entry(item: RemoteMediaItem) -> dict[str, Any]:
+    return {**item.as_dict(), 'updated_at': item.updated_at}
+
+
+def _watermark(items: list[dict[str, Any]]) -> str | None:
+    stamps = [item['updated_at'] for item in items if item.get('updated_at')]
+    return max(stamps) if stamps else None
+
+
+def _load(key: str) -> dict[str, Any] | None:
+    try:
+        raw = _redis().get(key)
+    except redis.RedisError:
+        return None
+    if raw is None:
+        return None
+    try:
+        listing: dict[str, Any] = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return listing
+
+
+def _store(key: str, items: list[dict[str, Any]]) -> dict[str, Any]:
+    listing = {
+        'fetched_at': time.time(),
+        'watermark': _watermark(items),
+        'items': items,
+    }
+    try:
+        _redis().set(key, json.dumps(listing), ex=LISTING_TTL_S)
+    except redis.RedisError:
+        # The listing is still returned; the next page just lists again.
+        logger.debug('could not cache listing %s', key)
+    return listing
+
+
+def _merge(
+    cached: list[dict[str, Any]], changed: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Changed rows replace their cached copies in place; new ones go
+    first, as the providers list newest first."""
+    by_id = {item['remote_id']: item for item in changed}
+    merged = [by_id.pop(item['remote_id'], item) for item in cached]
+    return list(by_id.values()) + merged
+
+
+def get_listing(
+    provider: ImportProvider, token: str, *, refresh: bool = False
+) -> dict[str, Any]:
+    """The cached listing for this provider and token, fetched (or,
+    with ``refresh``, brought up to date) first when needed.
+
+    Raises what ``list_media`` / ``list_changes`` raise — transport
+    errors are the caller's to report.
+    """
+    key = listing_key(provider.key, token)
+    cached = _load(key)
+    if cached is not None and not refresh:
+        return cached
+    if cached is not None and cached.get('watermark'):
+        changed = provider.list_changes(token, cached['watermark'])
+        if changed is not None:
+            return _store(
+                key, _merge(cached['items'], [_entry(i) for i in changed])
+            )
+    items = provider.list_media(token)
+    return _store(key, [_entry(item) for item in items])
+
+
+def store_listing(
+    provider: ImportProvider, token: str, items: list[RemoteMediaItem]
+) -> dict[str, Any]:
+    """Cache a listing the caller already fetched."""
+    return _store(
+        listing_key(provider.key, token), [_entry(item) for item in items]
+    )
+
+
+def page(
+    provider_key: str,
+    listing: dict[str, Any],
+    offset: int = 0,
+    limit: int = PAGE_SIZE_DEFAULT,
+) -> dict[str, Any]:
+    """One page of ``listing``, each row marked with the asset it was
+    already imported as (``imported_asset_id``, None if it wasn't)."""
+    items = listing['items']
+    rows = [dict(item) for item in items[offset : offset + limit]]
+    imported = ingest.find_imported_assets(
+        provider_key, [row['remote_id'] for row in rows]
+    )
+    for row in rows:
+        row['imported_asset_id'] = imported.get(row['remote_id'])
+    end = offset + len(rows)
+    return {
+        'items': rows,
+        'total': len(items),
+        'offset': offset,
+        'next_offset': end if end < len(items) else None,
+        'fetched_at': listing['fetched_at'],
+    }
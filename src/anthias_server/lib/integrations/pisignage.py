@@ -22,6 +22,7 @@ needs the token are worth confirming against a live hosted account.
 from __future__ import annotations
 
 from collections.abc import Iterator
+from contextlib import AbstractContextManager
 from typing import Any
 from urllib.parse import quote
 
@@ -34,7 +35,7 @@ from .base import (
     ProviderImportError,
     RemoteMediaItem,
 )
-from .http import new_import_session
+from .http import LoginReuse, new_import_session
 
 PROVIDER_KEY = 'pisignage'
 _PISIGNAGE_DOMAIN = 'pisignage.com'
@@ -43,6 +44,8 @@ _VALIDATE_TIMEOUT_S = 15.0
 _LIST_TIMEOUT_S = 30.0
 
 _session = new_import_session()
+# Shares one login across a bulk import job's items; see ``base.batch``.
+_logins = LoginReuse()
 
 
 def _base_url(subdomain: str) -> str:
@@ -130,7 +133,7 @@ class PiSignageProvider(ImportProvider):
         'Enter your piSignage account as "subdomain:email:password". The '
         'subdomain is the "<name>" in <name>.pisignage.com, followed by your '
         'login email (or username) and password. It is used only for this '
-        'import and is never stored.'
+        'import and is discarded once it finishes.'
     )
 
     # -- token / listing ---------------------------------------------------
@@ -197,6 +200,9 @@ class PiSignageProvider(ImportProvider):
 
     # -- import ------------------------------------------------------------
 
+    def batch(self, token: str) -> AbstractContextManager[None]:
+        return _logins.batch(token)
+
     def import_item(
         self, token: str, remote_id: str, *, enable: bool = True
     ) -> ImportOutcome:
@@ -209,7 +215,9 @@ class PiSignageProvider(ImportProvider):
                 reason='Already imported.',
             )
 
-        subdomain, headers = _login_or_raise(token)
+        subdomain, headers = _logins.login(
+            token, lambda: _login_or_raise(token)
+        )
         detail = self._get_file(subdomain, headers, remote_id)
 
         dbdata = detail.get('dbdata') or {}
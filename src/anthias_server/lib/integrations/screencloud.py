@@ -77,7 +77,18 @@ _ALL_FILES = """
 query($first: Int!, $after: Cursor) {
   allFiles(first: $first, after: $after, orderBy: [CREATED_AT_DESC]) {
     pageInfo { hasNextPage endCursor }
-    nodes { id name mimetype }
+    nodes { id name mimetype updatedAt }
+  }
+}
+"""
+
+# Most recently changed first, for ``list_changes``: paging stops at the
+# first node no newer than the cached listing's watermark.
+_CHANGED_FILES = """
+query($first: Int!, $after: Cursor) {
+  allFiles(first: $first, after: $after, orderBy: [UPDATED_AT_DESC]) {
+    pageInfo { hasNextPage endCursor }
+    nodes { id name mimetype updatedAt }
   }
 }
 """
@@ -91,7 +102,16 @@ _ALL_LINKS = """
 query($first: Int!, $after: Cursor) {
   allLinks(first: $first, after: $after) {
     pageInfo { hasNextPage endCursor }
-    nodes { id name linkType }
+    nodes { id name linkType updatedAt }
+  }
+}
+"""
+
+_CHANGED_LINKS = """
+query($first: Int!, $after: Cursor) {
+  allLinks(first: $first, after: $after, orderBy: [UPDATED_AT_DESC]) {
+    pageInfo { hasNextPage endCursor }
+    nodes { id name linkType updatedAt }
   }
 }
 """
@@ -99,7 +119,7 @@ query($first: Int!, $after: Cursor) {
 _FILE_BY_ID = """
 query($id: UUID!) {
   fileById(id: $id) {
-    id name mimetype availableAt expireAt source
+    id name mimetype availableAt expireAt source updatedAt
     fileOutputsByFileId { nodes { url mimetype } }
   }
 }
@@ -107,7 +127,7 @@ query($id: UUID!) {
 
 _LINK_BY_ID = """
 query($id: UUID!) {
-  linkById(id: $id) { id name url linkType }
+  linkById(id: $id) { id name url linkType updatedAt }
 }
 """
 
@@ -242,7 +262,7 @@ class ScreenCloudProvider(ImportProvider):
         'Create an API token in ScreenCloud Studio under Account Settings '
         '→ Developer → New Token, then paste it here. The region (EU or '
         'US) is detected automatically. It is used only for this import '
-        'and is never stored.'
+        'and is discarded once it finishes.'
     )
 
     # -- token / listing ---------------------------------------------------
@@ -255,48 +275,50 @@ class ScreenCloudProvider(ImportProvider):
     def list_media(
         self, token: str, *, workspace: str | None = None
     ) -> list[RemoteMediaItem]:
+        items = [
+            _file_item(node)
+            for node in self._paginate(token, _ALL_FILES, 'allFiles')
+            if node.get('id')
+        ]
+        items.extend(
+            _link_item(node)
+            for node in self._paginate(token, _ALL_LINKS, 'allLinks')
+            if node.get('id')
+        )
+        return items
+
+    def list_changes(
+        self, token: str, since: str, *, workspace: str | None = None
+    ) -> list[RemoteMediaItem] | None:
+        watermark = _parse_dt(since)
+        if watermark is None:
+            return None
         items: list[RemoteMediaItem] = []
-        for node in self._paginate(token, _ALL_FILES, 'allFiles'):
-            remote_id = node.get('id')
-            if not remote_id:
-                continue
-            media_type = _file_media_type(node.get('mimetype'))
-            importable = media_type in ('image', 'video')
-            items.append(
-                RemoteMediaItem(
-                    remote_id=f'file:{remote_id}',
-                    name=node.get('name') or f'ScreenCloud file {remote_id}',
-                    media_type=media_type,
-                    importable=importable,
-                    skip_reason=None
-                    if importable
-                    else (
-                        f"{media_type.capitalize()} media isn't supported by "
-                        'Anthias and was skipped.'
-                    ),
-                    raw=node,
-                )
-            )
-        for node in self._paginate(token, _ALL_LINKS, 'allLinks'):
-            remote_id = node.get('id')
-            if not remote_id:
-                continue
-            importable = node.get('linkType') == _STANDARD_LINK
-            items.append(
-                RemoteMediaItem(
-                    remote_id=f'link:{remote_id}',
-                    name=node.get('name') or f'ScreenCloud link {remote_id}',
-                    media_type='webpage',
-                    importable=importable,
-                    skip_reason=None
-                    if importable
-                    else (
-                        'Internal ScreenCloud content, not a standard web '
-                        'link.'
-                    ),
-                    raw=node,
-                )
+        try:
+            for query, connection, to_item in (
+                (_CHANGED_FILES, 'allFiles', _file_item),
+                (_CHANGED_LINKS, 'allLinks', _link_item),
+            ):
+                for node in self._paginate(token, query, connection):
+                    changed = _parse_dt(node.get('updatedAt'))
+                    if changed is not None and changed <= watermark:
+                        # Newest first: everything after this is older
+                        # still. Leaving the generator stops the paging.
+                        break
+                    if node.get('id'):
+                        items.append(to_item(node))
+        except TypeError:
+            # A naive timestamp on one side of the comparison; don't
+            # guess at its zone, list everything instead.
+            return None
+        except requests.RequestException:
+            # Including a schema that can't order by ``updatedAt`` — a
+            # full listing still works, so fall back to it.
+            logger.info(
+                'ScreenCloud change listing failed; listing everything',
+                exc_info=True,
             )
+            return None
         return items
 
     def _paginate(
@@ -311,8 +333,8 @@ class ScreenCloudProvider(ImportProvider):
                     {'first': _LIST_PAGE_SIZE, 'after': after},
                 )
             except ProviderImportError as error:
-                # ``_paginate`` is only used by ``list_media``, whose caller
-                # (the validate API view) handles transport errors but not
+                # ``_paginate`` only serves the listings, whose caller
+                # (the listing API views) handles transport errors but not
                 # ``ProviderImportError`` — surface a GraphQL-level failure
                 # as a transport error so it becomes a controlled 502
                 # rather than a 500.
@@ -386,6 +408,7 @@ class ScreenCloudProvider(ImportProvider):
             start_date=start_date,
             end_date=end_date,
             enable=enable,
+            remote_revision=link.get('updatedAt') or None,
         )
         return ImportOutcome(success=True, asset_id=asset.asset_id)
 
@@ -438,10 +461,47 @@ class ScreenCloudProvider(ImportProvider):
             start_date=start_date,
             end_date=end_date,
             enable=enable,
+            remote_revision=file_obj.get('updatedAt') or None,
         )
         return ImportOutcome(success=True, asset_id=asset.asset_id)
 
 
+def _file_item(node: dict[str, Any]) -> RemoteMediaItem:
+    remote_id = node['id']
+    media_type = _file_media_type(node.get('mimetype'))
+    importable = media_type in ('image', 'video')
+    return RemoteMediaItem(
+        remote_id=f'file:{remote_id}',
+        name=node.get('name') or f'ScreenCloud file {remote_id}',
+        media_type=media_type,
+        importable=importable,
+        skip_reason=None
+        if importable
+        else (
+            f"{media_type.capitalize()} media isn't supported by "
+            'Anthias and was skipped.'
+        ),
+        raw=node,
+        updated_at=node.get('updatedAt') or None,
+    )
+
+
+def _link_item(node: dict[str, Any]) -> RemoteMediaItem:
+    remote_id = node['id']
+    importable = node.get('linkType') == _STANDARD_LINK
+    return RemoteMediaItem(
+        remote_id=f'link:{remote_id}',
+        name=node.get('name') or f'ScreenCloud link {remote_id}',
+        media_type='webpage',
+        importable=importable,
+        skip_reason=None
+        if importable
+        else 'Internal ScreenCloud content, not a standard web link.',
+        raw=node,
+        updated_at=node.get('updatedAt') or None,
+    )
+
+
 def _parse_dt(value: Any) -> Any:
     from datetime import datetime
 
@@ -25,6 +25,7 @@ the Swagger spec and worth confirming against a live CMS.
 from __future__ import annotations
 
 from collections.abc import Iterator
+from contextlib import AbstractContextManager
 from typing import Any
 from urllib.parse import urlparse
 
@@ -37,7 +38,7 @@ from .base import (
     ProviderImportError,
     RemoteMediaItem,
 )
-from .http import new_import_session
+from .http import LoginReuse, new_import_session
 
 PROVIDER_KEY = 'xibo'
 
@@ -46,6 +47,8 @@ _VALIDATE_TIMEOUT_S = 15.0
 _LIST_TIMEOUT_S = 30.0
 
 _session = new_import_session()
+# Shares one login across a bulk import job's items; see ``base.batch``.
+_logins = LoginReuse()
 
 
 def _parse_token(token: str) -> tuple[str, str, str]:
@@ -130,7 +133,7 @@ class XiboProvider(ImportProvider):
         'then enter "<cms-url> <client_id> <client_secret>" (space '
         'separated). The CMS URL is your Xibo address, e.g. '
         'https://name.xibosignage.com, or your self-hosted CMS URL. Used '
-        'only for this import and never stored.'
+        'only for this import and discarded once it finishes.'
     )
 
     # -- token / listing ---------------------------------------------------
@@ -217,6 +220,9 @@ class XiboProvider(ImportProvider):
 
     # -- import ------------------------------------------------------------
 
+    def batch(self, token: str) -> AbstractContextManager[None]:
+        return _logins.batch(token)
+
     def import_item(
         self, token: str, remote_id: str, *, enable: bool = True
     ) -> ImportOutcome:
@@ -229,7 +235,7 @@ class XiboProvider(ImportProvider):
                 reason='Already imported.',
             )
 
-        base, headers = _login_or_raise(token)
+        base, headers = _logins.login(token, lambda: _login_or_raise(token))
         matches = self._library(base, headers, {'mediaId': remote_id})
         media = (
             matches[0] if matches and isinstance(matches[0], dict) else None
@@ -197,7 +197,7 @@ class YodeckProvider(ImportProvider):
         'Create an API token in Yodeck under Account Settings → Advanced '
         'Settings → API Tokens, then paste the token value here. (You can '
         'also enter it as "<label>:<token>" if you prefer.) It is used only '
-        'for this import and is never stored.'
+        'for this import and is discarded once it finishes.'
     )
 
     # -- token / listing ---------------------------------------------------
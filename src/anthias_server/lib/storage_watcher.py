@@ -39,7 +39,7 @@ import threading
 import time
 from typing import Any
 
-from anthias_common import storage_health
+from anthias_common import content_cache, storage_health
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +133,12 @@ def _watch_loop(redis_client: Any, data_dir: str) -> None:
                 last_write_check = time.monotonic()
 
             status = state['status']
+            if status == storage_health.STATUS_FULL:
+                # The content cache is the one thing on the card that
+                # can be given back without losing anything; trim it
+                # to inside the reserve rather than waiting for the
+                # daily cleanup() pass.
+                content_cache.enforce_limit()
             if status != previous:
                 _log_status(status, state)
                 previous = status
@@ -0,0 +1,198 @@
+"""Background-maintained system snapshot behind System Info and
+``/api/v2/info``.
+
+Both surfaces used to assemble their facts on every request: the
+uptime and disk figures, a psutil memory sample, a sysfs walk for the
+storage verdict, a GitHub release comparison and — worst — the node's
+IP addresses, which on bare metal means asking the host agent over
+Redis and waiting for it to answer. Fleet monitoring polls every
+device every few seconds, so each of those ran that often too.
+
+Each fact is now a field with its own source and cadence. A Celery
+beat tick (``refresh``) re-samples the fields whose sample is older
+than their cadence and stores ``{'at': ..., 'value': ...}`` JSON under
+``anthias.system.<name>``; readers (``get``) return the stored value.
+Static fields — the release label, the board, the MAC address — have
+no cadence: the worker samples them once when it starts.
+
+Samples are kept for ``SNAPSHOT_KEEP_FACTOR`` cadences, so a reader
+never sees a value much older than its cadence even if the beat stops.
+A reader that finds no sample (a cold Redis, no worker in a dev run)
+takes one itself and stores it for the next. A source that raises is
+not cached: the exception reaches the reader, whose own fallback
+applies exactly as before.
+
+Values that depend on the request (the wall clock and timezone) or
+that are already a single Redis read (display power, the under-voltage
+latch) are not snapshotted.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from os import statvfs
+from platform import machine
+from typing import Any
+
+import psutil
+import redis
+
+from anthias_common import device_helper, storage_health, utils
+from anthias_server.lib import diagnostics, github
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY_PREFIX = 'anthias.system.'
+
+# Beat interval for ``refresh``. The fastest field cadence below is a
+# multiple of it.
+SNAPSHOT_TICK_S = 5
+
+# A sample outlives its cadence by this factor before it expires.
+SNAPSHOT_KEEP_FACTOR = 3
+
+# How long a static sample lasts without a worker restart re-taking
+# it — only matters when no worker runs.
+STATIC_KEEP_S = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class SnapshotField:
+    source: Callable[[], Any]
+    # Seconds between samples; None for a static field.
+    cadence_s: int | None
+
+
+def _device_model() -> str | int | None:
+    device_model = device_helper.parse_cpu_info().get('model')
+    if device_model is None and machine() == 'x86_64':
+        device_model = 'Generic x86_64 Device'
+    return device_model
+
+
+def _memory() -> dict[str, int]:
+    virtual_memory = psutil.virtual_memory()
+    return {
+        'total': virtual_memory.total,
+        'used': virtual_memory.used,
+        'free': virtual_memory.free,
+        'shared': virtual_memory.shared,
+        'buffers': virtual_memory.buffers,
+        'available': virtual_memory.available,
+    }
+
+
+def _disk() -> dict[str, int]:
+    slash = statvfs('/')
+    return {
+        'total': slash.f_blocks * slash.f_frsize,
+        'free': slash.f_bavail * slash.f_frsize,
+    }
+
+
+def _storage() -> dict[str, Any]:
+    from anthias_server.settings import settings
+
+    return storage_health.get_state(_redis(), settings.get_configdir())
+
+
+FIELDS: dict[str, SnapshotField] = {
+    'anthias_version': SnapshotField(
+        lambda: diagnostics.get_anthias_version(), None
+    ),
+    'anthias_version_head': SnapshotField(
+        lambda: diagnostics.get_anthias_version_head(), None
+    ),
+    'anthias_version_meta': SnapshotField(
+        lambda: diagnostics.get_anthias_version_meta(), None
+    ),
+    'device_model': SnapshotField(_device_model, None),
+    'device_model_parts': SnapshotField(
+        lambda: list(device_helper.get_device_model_parts()), None
+    ),
+    'mac_address': SnapshotField(lambda: utils.get_node_mac_address(), None),
+    'loadavg': SnapshotField(lambda: diagnostics.get_load_avg(), 5),
+    'memory': SnapshotField(_memory, 5),
+    'uptime': SnapshotField(lambda: diagnostics.get_uptime(), 30),
+    'disk': SnapshotField(_disk, 30),
+    'storage': SnapshotField(_storage, 30),
+    # is_up_to_date caches the remote tag itself; this saves the
+    # version parsing and the Redis round trips behind it.
+    'up_to_date': SnapshotField(lambda: github.is_up_to_date(), 300),
+    # Last: on bare metal this waits for the host agent to answer,
+    # and can run into the refresh task's time limit.
+    'ip_addresses': SnapshotField(lambda: utils.get_node_ip(), 60),
+}
+
+
+def _redis() -> Any:
+    return utils.connect_to_redis()
+
+
+def _keep_s(field: SnapshotField) -> int:
+    if field.cadence_s is None:
+        return STATIC_KEEP_S
+    return field.cadence_s * SNAPSHOT_KEEP_FACTOR
+
+
+def _read(name: str) -> dict[str, Any] | None:
+    try:
+        raw = _redis().get(SNAPSHOT_KEY_PREFIX + name)
+    except redis.RedisError:
+        return None
+    if raw is None:
+        return None
+    try:
+        stored = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return stored if isinstance(stored, dict) and 'value' in stored else None
+
+
+def sample(name: str) -> Any:
+    """Take a fresh sample of ``name`` and store it."""
+    field = FIELDS[name]
+    value = field.source()
+    try:
+        _redis().set(
+            SNAPSHOT_KEY_PREFIX + name,
+            json.dumps({'at': time.time(), 'value': value}),
+            ex=_keep_s(field),
+        )
+    except (redis.RedisError, TypeError, ValueError):
+        logger.warning('Could not store system field %s', name, exc_info=True)
+    return value
+
+
+def get(name: str) -> Any:
+    """The latest sample of ``name``, taking one if there is none."""
+    stored = _read(name)
+    if stored is not None:
+        return stored['value']
+    return sample(name)
+
+
+def refresh(*, everything: bool = False) -> None:
+    """Re-sample every field that is due: past its cadence, or
+    missing. ``everything`` re-samples static fields too (the worker
+    does this once at start). A failing source is logged and skipped;
+    its previous sample stays until it expires."""
+    now = time.time()
+    for name, field in FIELDS.items():
+        if not everything:
+            stored = _read(name)
+            if stored is not None:
+                if field.cadence_s is None:
+                    continue
+                try:
+                    age = now - float(stored.get('at', 0))
+                except (TypeError, ValueError):
+                    age = float('inf')
+                if age < field.cadence_s:
+                    continue
+        try:
+            sample(name)
+        except Exception:
+            logger.exception('Could not sample system field %s', name)
@@ -50,7 +50,6 @@ on a 100 MP TIFF can still pressure RAM on a 1 GB Pi 2.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import shlex
@@ -62,6 +61,7 @@ import sh
 from celery import Task
 from PIL import Image, ImageOps, UnidentifiedImageError
 
+from anthias_common import mediainfo
 from anthias_common.board import is_low_ram_device, resolve_device_key
 from anthias_server.app.models import Asset
 
@@ -156,7 +156,9 @@ def needs_image_normalisation(uri_or_filename: str) -> bool:
 DOWNSCALE_ONLY_IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png'})
 
 
-def needs_low_ram_image_downscale(uri_or_filename: str) -> bool:
+def needs_low_ram_image_downscale(
+    uri_or_filename: str, size: tuple[int, int] | None = None
+) -> bool:
     """``True`` for an over-cap JPEG/PNG upload on a low-RAM board.
 
     Complements ``needs_image_normalisation``: that one asks "does
@@ -169,7 +171,9 @@ def needs_low_ram_image_downscale(uri_or_filename: str) -> bool:
     reads the file header to learn the dimensions. ``Image.open`` is
     lazy — ``.size`` comes from the format header without decoding a
     single pixel — so the cost is one small read even for a 90 MB
-    source.
+    source. ``size`` skips even that when the caller already has the
+    dimensions (``AssetUploadHandler`` reads them off the upload as it
+    streams in); None means "read the header".
 
     Returns ``False`` (never blocks or delays an upload) when:
       * the board is not low-RAM — a Pi 4 / 5 / x86 renders these
@@ -203,6 +207,8 @@ def needs_low_ram_image_downscale(uri_or_filename: str) -> bool:
         return False
     if not is_low_ram_device():
         return False
+    if size is not None:
+        return _exceeds_low_ram_pixel_cap(*size)
     try:
         with Image.open(uri_or_filename) as image:
             width, height = image.size
@@ -218,7 +224,9 @@ def needs_low_ram_image_downscale(uri_or_filename: str) -> bool:
     return _exceeds_low_ram_pixel_cap(width, height)
 
 
-def needs_image_processing(uri_or_filename: str) -> bool:
+def needs_image_processing(
+    uri_or_filename: str, size: tuple[int, int] | None = None
+) -> bool:
     """``True`` if this image upload needs the normalisation pipeline.
 
     The union the upload paths branch on: a file earns a Celery hop
@@ -229,10 +237,11 @@ def needs_image_processing(uri_or_filename: str) -> bool:
 
     Kept separate from the two predicates so each stays independently
     testable — and so the extension-only check remains a cheap pure
-    function for callers that only care about format.
+    function for callers that only care about format. ``size`` is
+    passed through to ``needs_low_ram_image_downscale``.
     """
     return needs_image_normalisation(uri_or_filename) or (
-        needs_low_ram_image_downscale(uri_or_filename)
+        needs_low_ram_image_downscale(uri_or_filename, size)
     )
 
 
@@ -318,6 +327,32 @@ def dispatch_normalize_video(asset_id: str) -> None:
     normalize_video_asset.delay(asset_id)
 
 
+def dispatch_normalize_videos(asset_ids: list[str]) -> None:
+    """``dispatch_normalize_video`` for a batch of rows.
+
+    The per-asset tasks run one at a time on the worker, each blocked
+    on its own ffprobe. A batch first gets one ``inspect_media`` task
+    that probes every file over ``mediainfo``'s bounded pool, so the
+    per-asset tasks behind it find their answer in the probe cache.
+    Ordering isn't load-bearing: a normalise task that runs first just
+    probes (and caches) its file itself.
+    """
+    from anthias_server.celery_tasks import inspect_media
+
+    if len(asset_ids) > 1:
+        uris = [
+            uri
+            for uri in Asset.objects.filter(asset_id__in=asset_ids)
+            .values_list('uri', flat=True)
+            .iterator()
+            if uri and path.isfile(uri)
+        ]
+        if len(uris) > 1:
+            inspect_media.delay(uris)
+    for asset_id in asset_ids:
+        dispatch_normalize_video(asset_id)
+
+
 def dispatch_pending_normalize(serializer: Any, asset_id: str) -> None:
     """Branch on ``serializer._pending_normalize`` and dispatch.
 
@@ -479,47 +514,30 @@ def _set_processing_error(
     )
 
 
-def _notify(asset_id: str, *, reload_viewer: bool = True) -> None:
-    """Browser refresh nudge, plus optional viewer playlist reload.
-
-    Two notification kinds, both best-effort:
-
-    * **Browser** — ``notify_asset_update`` posts to the dashboard
-      WebSocket so the operator's table picks up the new
-      title/duration/state without waiting for the 5s poll. Always
-      fires.
-    * **Viewer** — Redis-publish ``anthias.viewer:reload`` so the
-      on-device viewer reloads its playlist. Only fires when the
-      row has reached its terminal state — i.e. ``is_processing``
-      just cleared and the file at ``Asset.uri`` is the one the
-      viewer should play. Setting ``reload_viewer=False`` lets
-      intermediate hops (e.g. ``download_youtube_asset`` writing
-      the title before chaining into ``normalize_video_asset``)
-      update the dashboard without churning the viewer through a
-      reload it's only going to do again moments later.
-
-    The publisher and notifier are imported lazily so this module
-    stays importable from contexts that don't carry the Channels /
-    Redis runtime (test collection on hosts without those wired up).
-    """
-    from anthias_server.app.consumers import notify_asset_update
+def _notify(asset_id: str) -> None:
+    """Ask the on-device viewer to reload its playlist, now that the
+    row has reached its terminal state — ``is_processing`` just
+    cleared and the file at ``Asset.uri`` is the one it should play.
 
-    if reload_viewer:
-        from anthias_common.utils import connect_to_redis
+    Best-effort, and coalesced (``anthias_server.coalesce``), so a
+    batch of rows finishing together costs one reload. The dashboard
+    needs no nudge from here: the write that finished the row went
+    through ``AssetQuerySet.update``, which already sends its
+    ``updated`` delta once the transaction commits.
+
+    Imported lazily so this module stays importable from contexts
+    that don't carry the Redis runtime (test collection on hosts
+    without it wired up).
+    """
+    from anthias_server.coalesce import request_viewer_reload
 
-        try:
-            connect_to_redis().publish('anthias.viewer', 'reload')
-        except Exception:
-            # The viewer poll picks up the change ~1 tick later; a
-            # Redis flake here doesn't block the operator from
-            # seeing the new asset.
-            logger.exception('normalize task: viewer reload publish failed')
     try:
-        notify_asset_update(asset_id)
+        request_viewer_reload([asset_id])
     except Exception:
-        logger.exception(
-            'normalize task: notify_asset_update failed for %s', asset_id
-        )
+        # The viewer poll picks up the change ~1 tick later; a Redis
+        # flake here doesn't block the operator from seeing the new
+        # asset.
+        logger.exception('normalize task: viewer reload publish failed')
 
 
 # ---------------------------------------------------------------------------
@@ -1013,6 +1031,12 @@ def _run_image_normalisation(asset: Asset) -> None:
                 src_uri,
             )
 
+    # Share storage with any other asset whose processed output came
+    # out byte-identical (the same photo uploaded twice).
+    from anthias_server import blobstore
+
+    blobstore.intern(final_uri)
+
     metadata = dict(asset.metadata or {})
     metadata['original_ext'] = src_ext
     # ``converted`` means "the bytes were re-encoded to a different
@@ -1043,33 +1067,17 @@ def _run_image_normalisation(asset: Asset) -> None:
 # ---------------------------------------------------------------------------
 
 
-# Wall-clock cap on the ffprobe call. A working ffprobe answers in
-# under a second on small files; 60s covers a stalled-IO worst case
-# and stops a hung process from blocking the worker indefinitely.
-_FFPROBE_TIMEOUT_S = 60
-
-
 def _ffprobe_streams(input_path: str) -> dict[str, Any]:
     """Return ffprobe's parsed JSON for ``input_path``.
 
-    Uses ``-v error -show_format -show_streams -print_format json`` so
-    we get a single document containing both container metadata and
-    every stream's codec_name. Any non-zero exit (corrupt file, no
-    streams, format detection refused) raises and the caller decides
-    whether to error the row or fall back to the transcode branch.
+    The shared ``mediainfo.probe``: ``-show_format -show_streams`` in a
+    single document, cached by file identity, so the duration lookups
+    and a retry of this task don't run ffprobe again on the same
+    bytes. Any non-zero exit (corrupt file, no streams, format
+    detection refused) raises and the caller decides whether to error
+    the row or fall back to the transcode branch.
     """
-    out = sh.ffprobe(
-        '-v',
-        'error',
-        '-show_format',
-        '-show_streams',
-        '-print_format',
-        'json',
-        input_path,
-        _timeout=_FFPROBE_TIMEOUT_S,
-    )
-    parsed: dict[str, Any] = json.loads(str(out))
-    return parsed
+    return mediainfo.probe(input_path)
 
 
 def _ffprobe_summary(input_path: str) -> dict[str, Any]:
@@ -1620,3 +1628,130 @@ def _run_video_normalisation(asset: Asset) -> None:
     raise UnsupportedVideoCodecError(
         message, recipe=recipe, handbrake=handbrake
     )
+
+
+# ---------------------------------------------------------------------------
+# Reusing an earlier result for content already processed
+# ---------------------------------------------------------------------------
+
+
+# What ``_run_image_normalisation`` records about its output; carried
+# over with the file when an earlier row's result is reused.
+_IMAGE_RESULT_KEYS = (
+    'original_ext',
+    'converted',
+    'downscaled',
+    'original_resolution',
+)
+
+
+def _processed_donor(asset: Asset, digest: str, kind: str) -> Asset | None:
+    """A finished row whose source had the same content as ``asset``'s,
+    whose result is still on disk and still valid on this board."""
+    from anthias_server.settings import settings
+
+    assetdir = path.realpath(settings['assetdir'])
+    candidates = (
+        Asset.objects.filter(md5=digest, mimetype=kind, is_processing=False)
+        .exclude(asset_id=asset.asset_id)
+        .order_by('asset_id')
+    )
+    for donor in candidates:
+        metadata = donor.metadata or {}
+        donor_uri = donor.uri or ''
+        if metadata.get('error_message') or not path.isfile(donor_uri):
+            continue
+        if path.dirname(path.realpath(donor_uri)) != assetdir:
+            continue
+        if kind == 'image' and needs_image_processing(donor_uri):
+            # Never processed here (a legacy row, or one restored from
+            # a board without the low-RAM downscale).
+            continue
+        if kind == 'video':
+            # The gate's verdict is the board's, not the file's: a row
+            # restored from another device's backup may hold a codec
+            # this one can't decode.
+            codec = (metadata.get('video_codec') or '').lower()
+            if not donor.duration or codec not in _hw_decoded_codecs():
+                continue
+            if _exceeds_low_ram_pixel_cap(
+                metadata.get('video_width'), metadata.get('video_height')
+            ):
+                continue
+        return donor
+    return None
+
+
+def _reuse_processed(asset: Asset, kind: str) -> bool:
+    """Finish ``asset`` from an earlier row with the same source content.
+
+    Entry step of both normalisation tasks. Records the source digest
+    in ``Asset.md5`` (unless the ingest path already did),
+    and when another finished row started from the same bytes, links
+    its output into place and copies what the pipeline recorded about
+    it — skipping the WebP conversion / downscale / ffprobe entirely.
+    Otherwise interns the source so a duplicate upload shares storage
+    with its original, and returns False for the pipeline to run.
+    """
+    asset_id = asset.asset_id
+    src_uri = asset.uri or ''
+    if not src_uri or not path.isfile(src_uri):
+        # The pipeline raises the proper FileNotFoundError.
+        return False
+    from anthias_server import blobstore
+
+    if not asset.md5:
+        # The ingest paths intern what they write (so the blob's inode
+        # note names it); only a row from before the store gets read
+        # in full.
+        try:
+            asset.md5 = blobstore.digest_of(src_uri) or (
+                blobstore.digest_file(src_uri)
+            )
+        except OSError:
+            logger.warning('normalize: could not hash %s', src_uri)
+            return False
+        Asset.objects.filter(asset_id=asset_id).update(md5=asset.md5)
+
+    donor = _processed_donor(asset, asset.md5, kind)
+    if donor is None:
+        blobstore.intern(src_uri, asset.md5)
+        return False
+
+    donor_uri = donor.uri or ''
+    final_uri = src_uri
+    if kind == 'image':
+        final_uri = path.splitext(src_uri)[0] + path.splitext(donor_uri)[1]
+    if not blobstore.link_copy(donor_uri, final_uri):
+        return False
+    if final_uri != src_uri:
+        try:
+            os.remove(src_uri)
+        except OSError:
+            logger.exception('normalize: removing original %s failed', src_uri)
+
+    metadata = dict(asset.metadata or {})
+    metadata.pop('error_message', None)
+    donor_metadata = donor.metadata or {}
+    result_keys = (
+        _IMAGE_RESULT_KEYS if kind == 'image' else _VIDEO_METADATA_KEYS
+    )
+    for key in result_keys:
+        if key in donor_metadata:
+            metadata[key] = donor_metadata[key]
+    update: dict[str, Any] = {
+        'uri': final_uri,
+        'mimetype': kind,
+        'is_processing': False,
+        'metadata': metadata,
+    }
+    if kind == 'video':
+        update['duration'] = donor.duration
+    Asset.objects.filter(asset_id=asset_id).update(**update)
+    logger.info(
+        'normalize: %s reuses the processed result of %s',
+        asset_id,
+        donor.asset_id,
+    )
+    _notify(asset_id)
+    return True
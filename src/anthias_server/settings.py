@@ -1,8 +1,9 @@
 import configparser
 import json
 import logging
+import secrets
 from collections import UserDict
-from os import getenv, path
+from os import getenv, path, stat
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from anthias_common.errors import ReplyTimeoutError
@@ -15,6 +16,32 @@ logger = logging.getLogger(__name__)
 VIEWER_CHANNEL = 'anthias.viewer'
 REPLY_KEY_PREFIX = 'anthias.reply.'
 
+# Playlist change feed. Every committed write that can alter what the
+# viewer plays bumps ``PLAYLIST_REVISION_KEY`` (INCR, so it only ever
+# moves forward) and records which rows it touched in the capped
+# ``PLAYLIST_CHANGES_KEY`` list. The viewer's Scheduler compares the
+# revision instead of stat()ing the SQLite files, so writes to other
+# tables — or to asset columns it never reads — no longer force a
+# rebuild; and a revision whose change entries are all still in the
+# list is applied by re-reading just those rows. Keys rather than a
+# pub/sub message so a viewer that was restarting (or resubscribing)
+# when the write landed still sees it on its next check.
+PLAYLIST_REVISION_KEY = 'anthias.playlist.revision'
+# A random token set (NX) alongside the counter. If Redis loses its
+# data the INCR starts again from 1, and a client holding an old
+# revision would sooner or later see that same number describe a
+# different playlist; the epoch goes with it, so a revision is only
+# ever compared within the epoch it was issued in.
+PLAYLIST_EPOCH_KEY = 'anthias.playlist.epoch'
+PLAYLIST_CHANGES_KEY = 'anthias.playlist.changes'
+# Entries kept in the change list. A viewer that falls further behind
+# than this just rebuilds from the database, which is always correct.
+PLAYLIST_CHANGES_MAX = 50
+# A write touching more rows than this (a reorder, a bulk toggle) is
+# recorded as a full invalidation rather than an id list; re-reading
+# that many rows one patch at a time buys nothing over a rebuild.
+PLAYLIST_CHANGE_MAX_IDS = 20
+
 CONFIG_DIR = '.anthias/'
 CONFIG_FILE = 'anthias.conf'
 DEFAULTS = {
@@ -69,6 +96,16 @@ DEFAULTS = {
         'shuffle_playlist': False,
         'verify_ssl': True,
         'default_assets': False,
+        # Warm the next asset while the current one is on screen (see
+        # anthias_viewer/prefetch.py). The budget caps what one
+        # lookahead may download or read ahead, in MB; 0 picks a
+        # board-appropriate default (smaller on low-RAM boards).
+        'prefetch_next_asset': True,
+        'prefetch_budget_mb': 0,
+        # On-device copies of remote images (see
+        # anthias_common/content_cache.py), in MB; 0 turns the cache
+        # off and lets the next cleanup() reclaim what it held.
+        'content_cache_mb': 512,
     },
 }
 CONFIGURABLE_SETTINGS = DEFAULTS['viewer'].copy()
@@ -109,6 +146,8 @@ class AnthiasSettings(UserDict[str, Any]):
             )
         self.home = home
         self.conf_file = self.get_configfile()
+        # (mtime, size) of anthias.conf as of the last ``load``.
+        self._loaded_signature: tuple[int, int] | None = None
 
         if not path.isfile(self.conf_file):
             logger.error(
@@ -163,6 +202,10 @@ class AnthiasSettings(UserDict[str, Any]):
     def load(self) -> None:
         """Loads the latest settings from anthias.conf into memory."""
         logger.debug('Reading config-file...')
+        # Stat before reading, so a write racing the read leaves the
+        # signature behind and the next ``reload_if_changed`` reads
+        # again.
+        self._loaded_signature = self._conf_signature()
         config = configparser.ConfigParser()
         config.read(self.conf_file)
 
@@ -170,6 +213,25 @@ class AnthiasSettings(UserDict[str, Any]):
             for field, default in list(defaults.items()):
                 self._get(config, section, field, default)
 
+    def _conf_signature(self) -> tuple[int, int] | None:
+        try:
+            st = stat(self.conf_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload_if_changed(self) -> tuple[int, int] | None:
+        """Re-read anthias.conf only if it changed on disk since the
+        last ``load``, and return its (mtime, size) signature.
+
+        For hot read paths that need another process's ``save`` to show
+        up promptly but can't afford to parse the file on every call.
+        """
+        signature = self._conf_signature()
+        if signature != self._loaded_signature:
+            self.load()
+        return signature
+
     def use_defaults(self) -> None:
         for defaults in list(DEFAULTS.items()):
             for field, default in list(defaults[1].items()):
@@ -216,6 +278,32 @@ class ViewerPublisher:
     def send_to_viewer(self, msg: str) -> None:
         self._redis.publish(VIEWER_CHANNEL, f'viewer {msg}')
 
+    def publish_playlist_change(self, asset_ids: list[str] | None) -> None:
+        """Bump the playlist revision and log which rows changed.
+
+        ``asset_ids=None`` means "anything may have changed" and makes
+        the viewer rebuild from the database. Best-effort: a Redis
+        outage must not fail the write that triggered it, and the
+        viewer falls back to watching the database files while the
+        revision key is unreadable.
+        """
+        import redis
+
+        try:
+            # Before the INCR, so a counter restarted from 1 never
+            # shows up under the epoch the lost one was issued in.
+            self._redis.set(PLAYLIST_EPOCH_KEY, secrets.token_hex(8), nx=True)
+            revision = self._redis.incr(PLAYLIST_REVISION_KEY)
+            entry = json.dumps({'revision': revision, 'asset_ids': asset_ids})
+            self._redis.lpush(PLAYLIST_CHANGES_KEY, entry)
+            self._redis.ltrim(
+                PLAYLIST_CHANGES_KEY, 0, PLAYLIST_CHANGES_MAX - 1
+            )
+        except redis.RedisError:
+            logger.warning(
+                'Could not publish playlist revision', exc_info=True
+            )
+
 
 class ReplySender:
     """Push a JSON reply onto a per-correlation-ID list. Used by the viewer
@@ -5,10 +5,11 @@ import subprocess
 import sys
 from collections import deque
 from collections.abc import Callable
+from dataclasses import dataclass
 from glob import glob
 from os import getenv, path
 from signal import SIGALRM, signal
-from threading import Lock
+from threading import Lock, Thread
 from time import monotonic, sleep, time
 from typing import Any
 from urllib.parse import urlparse, urlunparse
@@ -19,7 +20,12 @@ import redis.exceptions
 import requests
 import sh as sh
 
-from anthias_common import smart, storage_health
+from anthias_common import (
+    playback_metrics,
+    proof_of_play,
+    smart,
+    storage_health,
+)
 from anthias_common.board import is_low_ram_device
 from anthias_common.http import get_anthias_product_token
 from anthias_server.lib import cec, cec_client
@@ -34,10 +40,13 @@ from anthias_viewer.constants import STANDBY_SCREEN as STANDBY_SCREEN
 from anthias_viewer.media_player import MediaPlayerProxy
 from anthias_viewer.playback import (
     navigate_to_asset,
+    note_skip,
     play_loop,
     skip_asset,
     stop_loop,
+    take_skip_reason,
 )
+from anthias_viewer.prefetch import AssetPrefetcher
 from anthias_viewer.utils import (
     command_not_found,
     get_skip_event,
@@ -131,6 +140,14 @@ HOME: str | None = None
 
 scheduler: Any = None
 
+# Warms the upcoming asset while the current one plays; owned by the
+# asset_loop thread, which calls resolve()/warm() once per asset.
+prefetcher = AssetPrefetcher()
+
+# Proof-of-play recorder, opened by setup(); None until then, so the
+# loop records nothing when driven without it (tests, tooling).
+play_log: proof_of_play.Recorder | None = None
+
 # Rotation last applied to the display, in degrees (0/90/180/270). On
 # linuxfb boards this is what we baked into QT_QPA_PLATFORM the last
 # time AnthiasViewer launched; on Wayland boards it's the wlr-randr
@@ -785,6 +802,7 @@ def blank_display() -> None:
         _apply_wlr_power(False)
     # Wake the main thread out of any in-progress asset sleep so it
     # reaches the blanked branch (and the black repaint) promptly.
+    note_skip('blank')
     get_skip_event().set()
 
 
@@ -795,6 +813,7 @@ def unblank_display() -> None:
         _apply_wlr_power(True)
     display_blanked = False
     loop_is_stopped = False
+    note_skip('unblank')
     get_skip_event().set()
 
 
@@ -877,6 +896,37 @@ BROWSER_POLL_INTERVAL_SECONDS = 0.25
 # Grace period to let a SIGTERM'd webview exit before we SIGKILL it.
 BROWSER_TERMINATE_GRACE_SECONDS = 3
 
+# Warm-spare webview, opt-in with ``WEBVIEW_STANDBY=1`` in the viewer's
+# environment. A respawn otherwise leaves the screen dark for the whole
+# Wayland-socket wait, Qt/QtWebEngine init and D-Bus handshake. The
+# spare is a second AnthiasViewer started with
+# ``ANTHIAS_WEBVIEW_STANDBY=1``: it builds its window and web profile,
+# registers ``/Anthias``, queues for the ``anthias.viewer`` name and
+# keeps its window unmapped, then prints the ready line. When the live
+# webview's bus connection drops -- it crashed, or we reaped it -- the
+# bus hands the name to the spare, which shows itself and prints the
+# usual handshake line; load_browser() then adopts it instead of
+# spawning, and a fresh spare is started in the background.
+#
+# Only under cage: an unmapped second client is free there, whereas on
+# eglfs/linuxfb the live webview holds the DRM master / framebuffer a
+# second Qt process would need. That also means the linuxfb/eglfs
+# rotation bounce can't use a spare -- it needs a process started with
+# the new rotation anyway. A spare launched with other settings (the
+# dark-mode bounce changes the env) is discarded, never promoted.
+WEBVIEW_STANDBY_ENV = 'ANTHIAS_WEBVIEW_STANDBY'
+WEBVIEW_STANDBY_READY_LINE = 'Anthias standby ready'
+# Let the live webview and its first asset settle before a second
+# QtWebEngine starts competing with them for CPU and I/O.
+WEBVIEW_STANDBY_SPAWN_DELAY_SECONDS = 30
+# A spare holds a whole idle QtWebEngine (~150-250 MB resident), so it
+# is only started on boards above the low-RAM cut (board.is_low_ram_
+# device) that also have this much MemAvailable at the time.
+WEBVIEW_STANDBY_MIN_AVAILABLE_KB = 768 * 1024
+# How long a promotion waits for the spare to take the bus name and
+# show itself before falling back to a normal spawn.
+WEBVIEW_STANDBY_PROMOTE_TIMEOUT_SECONDS = 2
+
 
 class WebviewLaunchError(RuntimeError):
     """A single AnthiasViewer launch exited or never handshook.
@@ -1227,6 +1277,10 @@ def load_browser(
     # over.
     current_browser_skip_ssl = False
 
+    if _promote_standby_webview():
+        _schedule_standby_webview()
+        return
+
     # Retry the spawn with capped exponential backoff so a board that
     # intermittently crashes during Qt/WebEngine init self-heals on a
     # later launch instead of propagating out into a restart loop.
@@ -1278,6 +1332,7 @@ def load_browser(
                 attempt,
                 max_attempts,
             )
+        _schedule_standby_webview()
         return
 
     # Every attempt failed — surface the last error (the caller, and the
@@ -1289,6 +1344,168 @@ def load_browser(
     ) from last_error
 
 
+@dataclass
+class _StandbyWebview:
+    proc: Any
+    output: _BoundedWebviewOutput
+    # The env it was launched with (minus the standby flag), to tell
+    # whether it still matches what a fresh spawn would get.
+    env: dict[str, str]
+
+
+# Owned under ``_standby_lock``: the spare is started on a background
+# thread and promoted or discarded on the asset_loop thread.
+_standby: _StandbyWebview | None = None
+_standby_thread: Thread | None = None
+_standby_lock = Lock()
+
+
+def _standby_enabled() -> bool:
+    return (
+        string_to_bool(getenv('WEBVIEW_STANDBY', '0'))
+        and _wayland_socket_path() is not None
+    )
+
+
+def _mem_available_kb() -> int | None:
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def _standby_has_headroom() -> bool:
+    if is_low_ram_device():
+        return False
+    available = _mem_available_kb()
+    return (
+        available is not None and available >= WEBVIEW_STANDBY_MIN_AVAILABLE_KB
+    )
+
+
+def _spawn_standby_webview() -> None:
+    """Start a spare AnthiasViewer and publish it once it is ready.
+    Runs on the standby thread; never raises."""
+    global _standby
+    if not _standby_has_headroom():
+        logger.info(
+            'Not starting a standby webview: less than %d MB available',
+            WEBVIEW_STANDBY_MIN_AVAILABLE_KB // 1024,
+        )
+        return
+    env = _build_webview_env()
+    output = _BoundedWebviewOutput()
+    try:
+        proc = sh.Command('AnthiasViewer')(
+            _bg=True,
+            _bg_exc=False,
+            _err_to_out=True,
+            _out=output,
+            _env={**env, WEBVIEW_STANDBY_ENV: '1'},
+        )
+    except sh.CommandNotFound:
+        return
+    deadline = monotonic() + BROWSER_STARTUP_TIMEOUT_SECONDS
+    while monotonic() < deadline:
+        if WEBVIEW_STANDBY_READY_LINE in output.text():
+            with _standby_lock:
+                _standby = _StandbyWebview(proc, output, env)
+            logger.info('Standby webview ready')
+            return
+        if not proc.is_alive():
+            logger.warning(
+                'Standby webview exited before it was ready: %s',
+                output.text(),
+            )
+            return
+        sleep(BROWSER_POLL_INTERVAL_SECONDS)
+    _terminate_webview(proc)
+    logger.warning(
+        'Standby webview was not ready within %ds',
+        BROWSER_STARTUP_TIMEOUT_SECONDS,
+    )
+
+
+def _standby_worker(delay: float) -> None:
+    sleep(delay)
+    try:
+        _spawn_standby_webview()
+    except Exception:
+        logger.exception('Could not start a standby webview')
+
+
+def _schedule_standby_webview(
+    delay: float = WEBVIEW_STANDBY_SPAWN_DELAY_SECONDS,
+) -> None:
+    """Start a spare in the background unless one is ready or on its
+    way. No-op unless the warm-spare mode is on."""
+    global _standby_thread
+    if not _standby_enabled():
+        return
+    with _standby_lock:
+        if _standby is not None or (
+            _standby_thread is not None and _standby_thread.is_alive()
+        ):
+            return
+        _standby_thread = Thread(
+            target=_standby_worker,
+            args=(delay,),
+            name='webview-standby',
+            daemon=True,
+        )
+        _standby_thread.start()
+
+
+def _discard_stale_standby() -> None:
+    """Reap the spare if it is dead or was launched with settings that
+    no longer apply, so it can never take the screen."""
+    global _standby
+    with _standby_lock:
+        spare = _standby
+    if spare is None:
+        return
+    if spare.proc.is_alive() and spare.env == _build_webview_env():
+        return
+    with _standby_lock:
+        if _standby is spare:
+            _standby = None
+    logger.info('Discarding a standby webview that no longer applies')
+    _terminate_webview(spare.proc)
+
+
+def _promote_standby_webview() -> bool:
+    """Adopt the spare as ``browser``. False when there is no usable
+    spare, and the caller spawns as usual.
+
+    The caller has reaped the previous webview (or it crashed), so the
+    bus is handing the spare the ``anthias.viewer`` name; it shows
+    itself and prints the handshake line once it owns it.
+    """
+    global _standby, browser, _webview_output
+    _discard_stale_standby()
+    with _standby_lock:
+        spare, _standby = _standby, None
+    if spare is None:
+        return False
+    deadline = monotonic() + WEBVIEW_STANDBY_PROMOTE_TIMEOUT_SECONDS
+    while monotonic() < deadline:
+        if BROWSER_HANDSHAKE_LINE in spare.output.text():
+            browser = spare.proc
+            _webview_output = spare.output
+            logger.info('Promoted the standby webview')
+            return True
+        if not spare.proc.is_alive():
+            break
+        sleep(BROWSER_POLL_INTERVAL_SECONDS)
+    logger.warning('Standby webview did not take over; spawning a fresh one')
+    _terminate_webview(spare.proc)
+    return False
+
+
 # D-Bus error codes that mean "the AnthiasViewer process is gone", as
 # opposed to a method-level failure from a live process. Matched by
 # substring on the exception message — the same convention as the
@@ -1363,6 +1580,7 @@ def _send_to_webview(send: Callable[[], Any]) -> None:
         backoff_cap=BROWSER_SPAWN_INLINE_BACKOFF_CAP_SECONDS,
         startup_timeout=BROWSER_SPAWN_INLINE_TIMEOUT_SECONDS,
     )
+    playback_metrics.increment('webview_respawns', 'mid_call')
     send()
 
 
@@ -1529,6 +1747,9 @@ def view_webpage(
     global current_browser_skip_ssl
 
     headers = headers or {}
+    # Load latency includes a respawn when one is needed first: that
+    # wait is on screen too.
+    started = monotonic()
 
     if nocache:
         uri = _cache_busted_url(uri)
@@ -1542,6 +1763,7 @@ def view_webpage(
             backoff_cap=BROWSER_SPAWN_INLINE_BACKOFF_CAP_SECONDS,
             startup_timeout=BROWSER_SPAWN_INLINE_TIMEOUT_SECONDS,
         )
+        playback_metrics.increment('webview_respawns', 'between_assets')
     # Hand the per-asset headers to the webview BEFORE loadPage so the
     # C++ interceptor has them when the navigation fires. Always sent
     # (empty {} for header-less assets) so switching away from a
@@ -1564,6 +1786,9 @@ def view_webpage(
                 lambda: browser_bus.loadPage(uri, skip_ssl_verify),
                 lambda: browser_bus.loadPage(uri),
             )
+            playback_metrics.observe(
+                'load_ms', 'web', (monotonic() - started) * 1000
+            )
             current_browser_url = uri
             # Store a copy, not the caller's dict: aliasing it would let a
             # later in-place mutation of that dict silently change the
@@ -1636,6 +1861,7 @@ def view_webpage(
 def view_image(uri: str, skip_ssl_verify: bool = False) -> None:
     global current_browser_url, current_browser_skip_ssl
 
+    started = monotonic()
     if browser is None or not browser.is_alive():
         # Mid-playback respawn on the asset_loop thread: small, short
         # budget so a persistent crash can't freeze the loop for minutes
@@ -1645,6 +1871,7 @@ def view_image(uri: str, skip_ssl_verify: bool = False) -> None:
             backoff_cap=BROWSER_SPAWN_INLINE_BACKOFF_CAP_SECONDS,
             startup_timeout=BROWSER_SPAWN_INLINE_TIMEOUT_SECONDS,
         )
+        playback_metrics.increment('webview_respawns', 'between_assets')
     # Value comparison (matches view_webpage): an ``is not`` identity
     # check would only short-circuit when the asset_loop happens to
     # pass the same str object on consecutive ticks, which a JSON-
@@ -1658,6 +1885,12 @@ def view_image(uri: str, skip_ssl_verify: bool = False) -> None:
             lambda: browser_bus.loadImage(uri, skip_ssl_verify),
             lambda: browser_bus.loadImage(uri),
         )
+        # 'null' is view_video clearing the image behind a video, not
+        # an asset going on screen.
+        if uri != 'null':
+            playback_metrics.observe(
+                'load_ms', 'image', (monotonic() - started) * 1000
+            )
         current_browser_url = uri
         current_browser_skip_ssl = skip_ssl_verify
     # debug, not info: this fires on every rotation tick — including the
@@ -1671,20 +1904,28 @@ def view_image(uri: str, skip_ssl_verify: bool = False) -> None:
         logger.info(_webview_output.text())
 
 
-def view_video(uri: str, duration: int | str) -> None:
+def view_video(uri: str, duration: int | str) -> bool:
+    """Play ``uri`` for ``duration`` seconds; True if a skip cut it
+    short."""
     logger.debug('Displaying video %s for %s ', uri, duration)
     media_player = MediaPlayerProxy.get_instance()
 
+    started = monotonic()
     media_player.set_asset(uri, duration)
     media_player.play()
+    playback_metrics.observe(
+        'load_ms', 'video', (monotonic() - started) * 1000
+    )
 
     view_image('null')
 
+    skipped = False
     try:
         skip_event = get_skip_event()
         skip_event.clear()
         if skip_event.wait(timeout=int(duration)):
             logger.info('Skip detected during video playback, stopping video')
+            skipped = True
             media_player.stop()
         else:
             pass
@@ -1695,6 +1936,7 @@ def view_video(uri: str, duration: int | str) -> None:
         )
 
     media_player.stop()
+    return skipped
 
 
 def load_settings() -> None:
@@ -1813,6 +2055,7 @@ def _maybe_reapply_rotation() -> None:
     # asset's full duration elapses.
     _last_applied_rotation = rotation
     _rotation_bounce_pending = True
+    note_skip('display_settings')
     get_skip_event().set()
 
 
@@ -1852,6 +2095,7 @@ def _maybe_reapply_dark_mode() -> None:
     )
     _last_applied_dark_mode = prefer_dark
     _rotation_bounce_pending = True
+    note_skip('display_settings')
     get_skip_event().set()
 
 
@@ -2213,6 +2457,9 @@ def _consume_pending_rotation_bounce() -> None:
         return
     _rotation_bounce_pending = False
     logger.info('Consuming pending rotation bounce on main thread')
+    # A spare launched before the change would otherwise take the
+    # bus name -- and the screen -- the moment the webview below exits.
+    _discard_stale_standby()
     if browser is not None:
         try:
             browser.terminate()
@@ -2255,6 +2502,7 @@ def _skip_if_current_asset_inactive() -> None:
             'Current asset %s is no longer active; signalling skip',
             current_id,
         )
+        note_skip('asset_inactive')
         get_skip_event().set()
 
 
@@ -2340,6 +2588,40 @@ def _trigger_asset_recheck(asset_id: str | None) -> None:
         )
 
 
+def _play_kind(mimetype: str) -> str:
+    if 'image' in mimetype:
+        return 'image'
+    if 'web' in mimetype:
+        return 'web'
+    if 'video' in mimetype or 'streaming' in mimetype:
+        return 'video'
+    return ''
+
+
+def _record_play(
+    asset: dict[str, Any],
+    started_ms: int,
+    started: float,
+    outcome: str,
+    skip_reason: str = '',
+) -> None:
+    """Append one rotation to the proof-of-play log. ``started`` is the
+    ``monotonic()`` reading taken alongside ``started_ms``."""
+    if play_log is None:
+        return
+    try:
+        play_log.record(
+            asset.get('asset_id') or '',
+            start_ms=started_ms,
+            end_ms=started_ms + round((monotonic() - started) * 1000),
+            outcome=outcome,
+            skip_reason=skip_reason,
+            kind=_play_kind(asset.get('mimetype') or ''),
+        )
+    except ValueError:
+        logger.warning('Could not record proof of play', exc_info=True)
+
+
 def asset_loop(scheduler: Any) -> None:
     global _empty_playlist_logged, _unavailable_asset_logged
     # Issue #2856 — consume any pending rotation bounce queued by the
@@ -2408,6 +2690,11 @@ def asset_loop(scheduler: Any) -> None:
         logger.debug('Asset URI %s', uri)
         watchdog()
 
+        # Swap in the copy warmed while the previous asset was on
+        # screen (if any), then start warming the one after this.
+        play_uri = prefetcher.resolve(asset)
+        prefetcher.warm(scheduler.peek_next_asset())
+
         # Effective SSL policy for this asset: the C++ webview should
         # skip certificate verification when the operator disabled it
         # device-wide (settings['verify_ssl'] off) OR opted this asset
@@ -2419,53 +2706,75 @@ def asset_loop(scheduler: Any) -> None:
             asset.get('skip_ssl_verify')
         )
 
-        if 'image' in mime:
-            view_image(uri, skip_ssl_verify=skip_ssl)
-        elif 'web' in mime:
-            # Per-asset auto-refresh — feature #2813. ``metadata`` is a
-            # JSONField (defaults to {}); the column was historically
-            # nullable so be defensive. Anything non-int / out-of-range
-            # is rejected on write by the v2 serializer + the page-form
-            # handler, but a hand-crafted DB row could still slip a
-            # garbage value through, so clamp on read here too via the
-            # shared helper. The C++ webview's setReloadInterval also
-            # clamps, but doing it here means we don't pay the D-Bus
-            # round-trip for an obviously bogus value.
-            metadata = asset.get('metadata') or {}
-            interval = clamp_refresh_interval(
-                metadata.get('refresh_interval_s')
-            )
-            # Per-asset custom request headers (#2215). Sanitised on read
-            # for the same reason as the interval: a hand-crafted DB row
-            # could hold junk, and the C++ interceptor trusts what it's
-            # handed, so this is the last gate before the wire.
-            headers = normalize_asset_headers(metadata.get('headers'))
-            view_webpage(
-                uri,
-                reload_interval_s=interval,
-                nocache=bool(asset.get('nocache')),
-                headers=headers,
-                skip_ssl_verify=skip_ssl,
-            )
-        elif 'video' in mime or 'streaming' in mime:
-            # ``'video' or 'streaming' in mime`` parses as ``'video'
-            # or ('streaming' in mime)`` — the truthy literal short-
-            # circuits and the branch runs for every mimetype, making
-            # the ``else: Unknown MimeType`` arm below unreachable.
-            view_video(uri, duration)
-        else:
-            logger.error('Unknown MimeType %s', mime)
-
-        if 'image' in mime or 'web' in mime:
-            logger.info('Sleeping for %s', duration)
-            skip_event = get_skip_event()
-            skip_event.clear()
-            if skip_event.wait(timeout=duration):
-                # Skip was triggered, continue immediately to next iteration
-                logger.info('Skip detected, moving to next asset immediately')
+        # Proof of play: wall-clock start for the record, monotonic for
+        # its length so an NTP step mid-asset can't skew it. Anything
+        # raised while showing the asset is recorded as a failure.
+        started_ms, started = int(time() * 1000), monotonic()
+        shown, skipped = True, False
+        outcome = 'failed'
+        try:
+            if 'image' in mime:
+                view_image(play_uri, skip_ssl_verify=skip_ssl)
+            elif 'web' in mime:
+                # Per-asset auto-refresh — feature #2813. ``metadata`` is a
+                # JSONField (defaults to {}); the column was historically
+                # nullable so be defensive. Anything non-int / out-of-range
+                # is rejected on write by the v2 serializer + the page-form
+                # handler, but a hand-crafted DB row could still slip a
+                # garbage value through, so clamp on read here too via the
+                # shared helper. The C++ webview's setReloadInterval also
+                # clamps, but doing it here means we don't pay the D-Bus
+                # round-trip for an obviously bogus value.
+                metadata = asset.get('metadata') or {}
+                interval = clamp_refresh_interval(
+                    metadata.get('refresh_interval_s')
+                )
+                # Per-asset custom request headers (#2215). Sanitised on read
+                # for the same reason as the interval: a hand-crafted DB row
+                # could hold junk, and the C++ interceptor trusts what it's
+                # handed, so this is the last gate before the wire.
+                headers = normalize_asset_headers(metadata.get('headers'))
+                view_webpage(
+                    uri,
+                    reload_interval_s=interval,
+                    nocache=bool(asset.get('nocache')),
+                    headers=headers,
+                    skip_ssl_verify=skip_ssl,
+                )
+            elif 'video' in mime or 'streaming' in mime:
+                # ``'video' or 'streaming' in mime`` parses as ``'video'
+                # or ('streaming' in mime)`` — the truthy literal short-
+                # circuits and the branch runs for every mimetype, making
+                # the ``else: Unknown MimeType`` arm below unreachable.
+                skipped = view_video(play_uri, duration)
             else:
-                # Duration elapsed normally, continue to next asset
-                pass
+                logger.error('Unknown MimeType %s', mime)
+                shown = False
+
+            if 'image' in mime or 'web' in mime:
+                logger.info('Sleeping for %s', duration)
+                skip_event = get_skip_event()
+                skip_event.clear()
+                if skip_event.wait(timeout=duration):
+                    # Skip was triggered, move on to the next asset now
+                    logger.info(
+                        'Skip detected, moving to next asset immediately'
+                    )
+                    skipped = True
+                else:
+                    # Duration elapsed normally, continue to next asset
+                    pass
+            if shown:
+                outcome = 'skipped' if skipped else 'completed'
+        finally:
+            reason = take_skip_reason()
+            _record_play(
+                asset,
+                started_ms,
+                started,
+                outcome,
+                reason if outcome == 'skipped' else '',
+            )
 
     else:
         # Same journal-budget problem as the empty-playlist arm above, but
@@ -2491,6 +2800,9 @@ def asset_loop(scheduler: Any) -> None:
                 asset['uri'],
             )
             _unavailable_asset_logged = asset_key
+            # Once per offender, like the log line: the retries every
+            # 0.5s would otherwise fill the ring in hours.
+            _record_play(asset, int(time() * 1000), monotonic(), 'unavailable')
         if not _asset_is_local_file(asset):
             _trigger_asset_recheck(asset.get('asset_id'))
         skip_event = get_skip_event()
@@ -2506,7 +2818,7 @@ def asset_loop(scheduler: Any) -> None:
 
 
 def setup() -> None:
-    global HOME, browser_bus
+    global HOME, browser_bus, play_log
     HOME = getenv('HOME')
     if not HOME:
         logger.error('No HOME variable')
@@ -2515,6 +2827,10 @@ def setup() -> None:
         # or we can create a new class that extends Exception.
         sys.exit(1)
 
+    play_log = proof_of_play.Recorder(
+        proof_of_play.ring_path(settings.get_configdir())
+    )
+
     # Skip event is now handled via threading instead of signals
     signal(SIGALRM, sigalrm)
 
@@ -49,15 +49,26 @@ What lives in-process here instead:
   whatever the previous asset left on /dev/fb0, so the visible
   framebuffer is zeroed once at startup.
 
+* **Playback stats** — with ``--stats-file``, the helper writes what
+  it saw to that file as JSON when it exits: when the first frame
+  prerolled (``ASYNC_DONE``), how long each fallback loop (seek or
+  restart, below) stalled, ``fbdevsink``'s rendered/dropped tallies
+  and how many frames its QoS messages reported dropped as late. The parent
+  reads it after stop() and records it (``anthias_common.
+  playback_metrics``); the helper itself stays free of Redis.
+
 ``gi``/GStreamer imports happen inside ``main()`` so the module stays
 importable on dev hosts without PyGObject (the unit tests exercise the
 pure helpers below).
 """
 
 import argparse
+import json
 import logging
+import os
 import signal
 import sys
+import time
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -209,9 +220,22 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     )
     parser.add_argument('--audio-device', default='')
     parser.add_argument('--fb-device', default=FB_DEVICE)
+    parser.add_argument('--stats-file', default='')
     return parser.parse_args(argv)
 
 
+def write_stats(path: str, stats: dict[str, Any]) -> None:
+    """Write ``stats`` to ``path`` as JSON, atomically: the parent
+    must never read half a file."""
+    tmp_path = f'{path}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.warning('could not write stats to %s', path, exc_info=True)
+
+
 def build_sink_description(args: argparse.Namespace) -> str:
     """gst-parse description for playbin's ``video-sink`` bin.
 
@@ -234,7 +258,8 @@ def build_sink_description(args: argparse.Namespace) -> str:
         f'capsfilter name=fit_caps '
         f'caps={build_fit_caps_string(args.fb_format)}'
     )
-    parts.append(f'fbdevsink device={args.fb_device}')
+    # Named so the stats can read the sink's rendered/dropped tallies.
+    parts.append(f'fbdevsink device={args.fb_device} name=fb_sink')
     return ' ! '.join(parts)
 
 
@@ -265,7 +290,28 @@ def main(argv: list[str] | None = None) -> int:
     loop = GLib.MainLoop()
     # ``playbin`` is the live pipeline; ``audio`` records whether it
     # was built with an audio branch; ``exit`` is the process result.
-    state: dict[str, Any] = {'playbin': None, 'audio': False, 'exit': 0}
+    # ``looping_since`` marks a fallback loop in flight (EOS seen, the
+    # next preroll not yet done). ``fb_sink`` is the live pipeline's
+    # fbdevsink and ``qos_dropped`` the drop total its last QoS
+    # message reported.
+    state: dict[str, Any] = {
+        'playbin': None,
+        'video_sink': None,
+        'fb_sink': None,
+        'qos_dropped': 0,
+        'audio': False,
+        'exit': 0,
+        'looping_since': None,
+    }
+    # Written to --stats-file on exit; see the module docstring.
+    stats: dict[str, Any] = {
+        'started_at': time.time(),
+        'first_frame_at': None,
+        'loop_gaps_ms': [],
+        'rendered': None,
+        'dropped': None,
+        'late': 0,
+    }
 
     def audio_device_usable(device: str) -> bool:
         """Pre-flight the ALSA device before wiring it into playbin.
@@ -335,7 +381,27 @@ def main(argv: list[str] | None = None) -> int:
         # thread — property set only, no state changes here.
         element.set_property('uri', args.uri)
 
+    def read_sink_stats() -> None:
+        # GstBaseSink's ``stats`` structure, read while the pipeline is
+        # still up. Best effort: an older GStreamer has no such
+        # property, and the QoS tallies then stand in.
+        video_sink = state['video_sink']
+        if video_sink is None:
+            return
+        try:
+            sink_stats = video_sink.get_by_name('fb_sink').get_property(
+                'stats'
+            )
+            ok_rendered, rendered = sink_stats.get_uint64('rendered')
+            ok_dropped, dropped = sink_stats.get_uint64('dropped')
+        except Exception:
+            return
+        if ok_rendered and ok_dropped:
+            stats['rendered'] = int(rendered)
+            stats['dropped'] = int(dropped)
+
     def teardown(playbin: Any) -> None:
+        read_sink_stats()
         playbin.get_bus().remove_signal_watch()
         playbin.set_state(Gst.State.NULL)
 
@@ -389,6 +455,9 @@ def main(argv: list[str] | None = None) -> int:
         bus.connect('message', on_bus_message)
 
         state['playbin'] = playbin
+        state['video_sink'] = video_sink
+        state['fb_sink'] = video_sink.get_by_name('fb_sink')
+        state['qos_dropped'] = 0
         state['audio'] = with_audio
         if (
             playbin.set_state(Gst.State.PLAYING)
@@ -429,12 +498,41 @@ def main(argv: list[str] | None = None) -> int:
             logger.error('pipeline error: %s (%s)', err, debug)
             state['exit'] = 1
             loop.quit()
+        elif message.type == Gst.MessageType.ASYNC_DONE:
+            if message.src != playbin:
+                return True
+            # Preroll done: the first frame is at the sink.
+            if stats['first_frame_at'] is None:
+                stats['first_frame_at'] = time.time()
+            if state['looping_since'] is not None:
+                stats['loop_gaps_ms'].append(
+                    round((time.monotonic() - state['looping_since']) * 1000)
+                )
+                state['looping_since'] = None
+        elif message.type == Gst.MessageType.QOS:
+            # Only the sink's QoS speaks for frames that reached it
+            # late: ``videorate``'s drop-only mode posts its own for
+            # the frames it discards on purpose.
+            if message.src != state['fb_sink']:
+                return True
+            fmt, processed, dropped = message.parse_qos_stats()
+            if fmt == Gst.Format.BUFFERS:
+                # ``dropped`` is the sink's running total, reset on
+                # each flush (a seek loop), so count what it grew by.
+                total, seen = int(dropped), state['qos_dropped']
+                stats['late'] += total - seen if total >= seen else total
+                state['qos_dropped'] = total
+                # Stand-ins for when the sink's own stats can't be
+                # read at teardown; cumulative, so the latest wins.
+                stats['qos_processed'] = int(processed)
+                stats['qos_dropped'] = int(dropped)
         elif message.type == Gst.MessageType.EOS:
             # about-to-finish normally pre-queues the next loop and
             # EOS never fires. Some sources can't pre-queue; fall back
             # to a flushing seek, then to a full restart for the
             # non-seekable remainder.
             logger.info('EOS — looping via flush seek')
+            state['looping_since'] = time.monotonic()
             if not playbin.seek_simple(
                 Gst.Format.TIME,
                 Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT,
@@ -466,6 +564,13 @@ def main(argv: list[str] | None = None) -> int:
     finally:
         if state['playbin'] is not None:
             teardown(state['playbin'])
+        if args.stats_file:
+            if stats['rendered'] is None and 'qos_processed' in stats:
+                stats['rendered'] = stats['qos_processed']
+                stats['dropped'] = stats['qos_dropped']
+            stats.pop('qos_processed', None)
+            stats.pop('qos_dropped', None)
+            write_stats(args.stats_file, stats)
     return int(state['exit'])
 
 
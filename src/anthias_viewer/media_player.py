@@ -1,13 +1,16 @@
+import json
 import logging
 import os
 import re
 import signal
 import subprocess
 import sys
+import tempfile
 import time
 from typing import Any, ClassVar
 from urllib.parse import quote
 
+from anthias_common import playback_metrics
 from anthias_common.board import ARM64_DEVICE_TYPES
 from anthias_common.device_helper import get_device_type
 from anthias_common.utils import clamp_screen_rotation
@@ -531,6 +534,65 @@ class MediaPlayer:
         raise NotImplementedError
 
 
+# Where the webview's VideoView writes its playback stats
+# (``openStatsLog`` in src/anthias_webview/src/videoview.cpp). It
+# appends a ``STOP`` line before ``stopVideo`` returns, so the line for
+# the clip that just ended is already there when the D-Bus call does.
+WEBVIEW_STATS_LOG = '/data/.anthias/playback-stats.log'
+
+# Enough of the log's tail to span one clip: the 1 Hz SAMPLE lines run
+# ~120 bytes each, and only the last one before STOP is needed.
+_WEBVIEW_STATS_TAIL_BYTES = 16 * 1024
+
+_STATS_ELAPSED_RE = re.compile(r'\belapsed_ms=(-?\d+)')
+_STATS_RENDERED_RE = re.compile(r'\bframes-rendered=(\d+)')
+_STATS_DROPPED_RE = re.compile(r'\bdropped=(-?\d+)')
+
+
+def _read_webview_stop_stats(
+    uri: str, path: str
+) -> dict[str, int | None] | None:
+    """The elapsed time and frame counts the webview logged when it
+    stopped playing ``uri``, or None when there is no such line.
+
+    ``elapsed_ms`` runs from when the media loaded, not from
+    ``playVideo``. ``dropped`` comes from the last ``SAMPLE`` line
+    before ``STOP`` (the ``STOP`` line doesn't carry it). It is None
+    when the webview couldn't estimate it, which it reports as -1.
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - _WEBVIEW_STATS_TAIL_BYTES))
+            lines = f.read().decode('utf-8', 'replace').splitlines()
+    except OSError:
+        return None
+    stop_at = None
+    for index in range(len(lines) - 1, -1, -1):
+        if ' STOP ' in lines[index] and f'uri={uri} ' in lines[index]:
+            stop_at = index
+            break
+    if stop_at is None:
+        return None
+    stop_line = lines[stop_at]
+    elapsed = _STATS_ELAPSED_RE.search(stop_line)
+    rendered = _STATS_RENDERED_RE.search(stop_line)
+    dropped: int | None = None
+    for line in reversed(lines[:stop_at]):
+        if ' LOADFILE ' in line:
+            break
+        if ' SAMPLE ' in line:
+            match = _STATS_DROPPED_RE.search(line)
+            if match and int(match.group(1)) >= 0:
+                dropped = int(match.group(1))
+            break
+    return {
+        'elapsed_ms': int(elapsed.group(1)) if elapsed else None,
+        'rendered': int(rendered.group(1)) if rendered else None,
+        'dropped': dropped,
+    }
+
+
 def _marshal_dbus_options(options: dict[str, Any]) -> dict[str, Any]:
     """Wrap each value as a ``GLib.Variant`` for pydbus.
 
@@ -621,6 +683,9 @@ class MPVMediaPlayer(MediaPlayer):
         # today; the asset_loop sleeps for ``duration``) can still
         # answer without a D-Bus round-trip.
         self._playing: bool = False
+        # Wall clock at the last successful playVideo, for the
+        # time-to-first-frame estimate recorded on stop().
+        self._play_started: float | None = None
 
     def set_asset(self, uri: str, duration: int | str) -> None:
         self.uri = uri
@@ -652,6 +717,7 @@ class MPVMediaPlayer(MediaPlayer):
                 lambda: bus.playVideo(self.uri, _marshal_dbus_options(options))
             )
             self._playing = True
+            self._play_started = time.time()
         except Exception:
             # pydbus surfaces transport / signature errors as
             # generic exceptions. Log + clear local state so a
@@ -669,6 +735,32 @@ class MPVMediaPlayer(MediaPlayer):
             _call_webview(lambda: bus.stopVideo())
         except Exception:
             logger.exception('MPVMediaPlayer.stop failed')
+            return
+        self._record_stats()
+
+    def _record_stats(self) -> None:
+        play_started, self._play_started = self._play_started, None
+        if play_started is None:
+            return
+        run_ms = (time.time() - play_started) * 1000
+        stop_stats = _read_webview_stop_stats(self.uri, WEBVIEW_STATS_LOG)
+        if stop_stats is None:
+            return
+        elapsed_ms = stop_stats['elapsed_ms']
+        # The webview times playback from when the media loaded; the
+        # rest of the run is the wait before it. Unknown (-1) when it
+        # never loaded at all.
+        first_frame_ms = (
+            max(0.0, run_ms - elapsed_ms)
+            if elapsed_ms is not None and elapsed_ms >= 0
+            else None
+        )
+        playback_metrics.record_video(
+            'qtmultimedia',
+            first_frame_ms=first_frame_ms,
+            rendered=stop_stats['rendered'],
+            dropped=stop_stats['dropped'],
+        )
 
     def is_playing(self) -> bool:
         return self._playing
@@ -793,6 +885,12 @@ class GstFbdevMediaPlayer(MediaPlayer):
         self.uri: str = ''
         self._proc: subprocess.Popen[bytes] | None = None
         self._fb_w, self._fb_h, self._fb_fmt = _fb_geometry()
+        # The helper writes its playback stats here on exit (see
+        # gst_fbdev_player.py); stop() reads and records them.
+        self._stats_file = os.path.join(
+            tempfile.gettempdir(), f'anthias-gst-stats-{os.getpid()}.json'
+        )
+        self._play_started: float | None = None
 
     def set_asset(self, uri: str, duration: int | str) -> None:
         del duration  # the asset_loop owns the on-screen duration
@@ -824,6 +922,8 @@ class GstFbdevMediaPlayer(MediaPlayer):
             str(_screen_rotation()),
             '--audio-device',
             get_alsa_audio_device(),
+            '--stats-file',
+            self._stats_file,
         ]
 
     def play(self) -> None:
@@ -835,6 +935,7 @@ class GstFbdevMediaPlayer(MediaPlayer):
         # non-zero on a pipeline error so a persistent failure doesn't
         # spin. start_new_session puts it in its own process group so
         # stop() kills the GStreamer threads with it.
+        self._play_started = time.time()
         try:
             self._proc = subprocess.Popen(
                 argv,
@@ -876,6 +977,33 @@ class GstFbdevMediaPlayer(MediaPlayer):
             except (ProcessLookupError, OSError):
                 pass
         self._proc = None
+        self._record_stats()
+
+    def _record_stats(self) -> None:
+        play_started, self._play_started = self._play_started, None
+        try:
+            with open(self._stats_file) as f:
+                stats = json.load(f)
+            os.remove(self._stats_file)
+        except (OSError, ValueError):
+            # No file: the helper was SIGKILLed, or never got as far
+            # as starting its loop. Nothing to record.
+            return
+        first_frame_at = stats.get('first_frame_at')
+        first_frame_ms = (
+            max(0.0, (first_frame_at - play_started) * 1000)
+            if isinstance(first_frame_at, (int, float))
+            and play_started is not None
+            else None
+        )
+        playback_metrics.record_video(
+            'gst-fbdev',
+            first_frame_ms=first_frame_ms,
+            rendered=stats.get('rendered'),
+            dropped=stats.get('dropped'),
+            late=stats.get('late'),
+            loop_gaps_ms=stats.get('loop_gaps_ms'),
+        )
 
     def is_playing(self) -> bool:
         return self._proc is not None and self._proc.poll() is None
@@ -4,20 +4,39 @@ from typing import Any
 # Global event for instant asset switching
 skip_event = threading.Event()
 
+# Why skip_event was last set, for the proof-of-play log (one of
+# anthias_common.proof_of_play.SKIP_REASONS). Whoever signals a skip
+# notes the reason first; asset_loop takes it when a wait ends early.
+skip_reason = ''
+
+
+def note_skip(reason: str) -> None:
+    global skip_reason
+    skip_reason = reason
+
+
+def take_skip_reason() -> str:
+    global skip_reason
+    reason, skip_reason = skip_reason, ''
+    return reason
+
 
 def skip_asset(scheduler: Any, back: bool = False) -> None:
     if back is True:
         scheduler.reverse = True
+    note_skip('previous' if back else 'next')
     skip_event.set()
 
 
 def navigate_to_asset(scheduler: Any, asset_id: str) -> None:
     scheduler.extra_asset = asset_id
+    note_skip('navigate')
     skip_event.set()
 
 
 def stop_loop(scheduler: Any) -> bool:
-    skip_asset(scheduler)
+    note_skip('stop')
+    skip_event.set()
     return True
 
 
@@ -0,0 +1,148 @@
+"""Lookahead warm-up for the asset the Scheduler will play next.
+
+``asset_loop`` used to start loading an asset only once the previous
+one had finished, so every transition paid the whole fetch on screen: a
+remote image was downloaded by the webview at the moment it was asked
+to show it, and a local video's first reads came cold off the SD card.
+While asset N is displayed, the prefetcher now takes a peek at N+1
+(``Scheduler.peek_next_asset`` — nothing is advanced) and warms it on a
+background thread:
+
+* remote images are brought up to date in the on-device content cache
+  (``anthias_common.content_cache``), and the swap hands the webview
+  the local copy — it is served from the device's own
+  ``/anthias_assets/`` route, so the boundary costs a loopback fetch
+  and a decode instead of a WAN round trip;
+* local images and videos are read ahead into the page cache
+  (``posix_fadvise(WILLNEED)``), which is what a cold SD card needs.
+
+Web pages are left alone: the webview already loads a page into its
+hidden second ``QWebEngineView`` and only swaps once it has finished,
+so the previous page stays on screen until the new one is ready.
+Streams (RTSP/RTMP) have nothing to fetch ahead of time.
+
+Gated by the ``prefetch_next_asset`` setting and bounded by a byte
+budget (``prefetch_budget_mb``, 0 meaning the board default) that is
+tighter on low-RAM boards: nothing larger than the budget is
+downloaded, and no more than the budget is read ahead. Playing from
+the cache is not gated by it: a copy the reachability sweep stored is
+played whether or not the lookahead is on.
+"""
+
+import logging
+import os
+import threading
+from time import sleep
+from typing import Any
+
+import requests
+
+from anthias_common import content_cache
+from anthias_common.board import is_low_ram_device
+from anthias_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Budget when ``prefetch_budget_mb`` is left at 0. A 1080p JPEG/PNG is a
+# few MB, so either leaves room for any reasonable still; the low-RAM
+# figure keeps a ~1 GB board from holding a large video's head in page
+# cache on top of QtWebEngine.
+DEFAULT_BUDGET_MB = 64
+LOW_RAM_BUDGET_MB = 16
+
+# Let the asset that just went on screen have the link (and the SD
+# card) to itself for a moment before warming the next one.
+PREFETCH_START_DELAY_S = 1.0
+
+
+def prefetch_budget_bytes() -> int:
+    """The byte budget for one lookahead; 0 when prefetch is off."""
+    if not settings['prefetch_next_asset']:
+        return 0
+    budget_mb = int(settings['prefetch_budget_mb'])
+    if budget_mb <= 0:
+        budget_mb = (
+            LOW_RAM_BUDGET_MB if is_low_ram_device() else DEFAULT_BUDGET_MB
+        )
+    return budget_mb * 1024 * 1024
+
+
+def _is_cached_image(asset: dict[str, Any]) -> bool:
+    return 'image' in (
+        asset.get('mimetype') or ''
+    ) and content_cache.is_cacheable(
+        asset.get('uri') or '', bool(asset.get('nocache'))
+    )
+
+
+class AssetPrefetcher:
+    """Warms one upcoming asset at a time on a daemon thread.
+
+    ``warm`` is called from ``asset_loop`` as each asset goes on
+    screen; ``resolve`` is called when the next one is about to be
+    shown and swaps in the cached local copy if there is one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._session: requests.Session | None = None
+
+    def warm(self, asset: dict[str, Any] | None) -> None:
+        if asset is None or prefetch_budget_bytes() == 0:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                # Still busy with the previous lookahead (a long
+                # download behind a short asset); don't pile up.
+                return
+            self._thread = threading.Thread(
+                target=self._warm, args=(dict(asset),), daemon=True
+            )
+            self._thread.start()
+
+    def resolve(self, asset: dict[str, Any]) -> str:
+        """The URI to display ``asset`` from: the cached copy when
+        there is one, its own URI otherwise."""
+        uri: str = asset['uri']
+        if _is_cached_image(asset):
+            return content_cache.cached_path(uri) or uri
+        return uri
+
+    def _warm(self, asset: dict[str, Any]) -> None:
+        sleep(PREFETCH_START_DELAY_S)
+        budget = prefetch_budget_bytes()
+        uri = asset.get('uri') or ''
+        mimetype = asset.get('mimetype') or ''
+        try:
+            if uri.startswith('/'):
+                if 'image' in mimetype or 'video' in mimetype:
+                    _read_ahead(uri, budget)
+            elif _is_cached_image(asset):
+                if self._session is None:
+                    self._session = requests.Session()
+                content_cache.revalidate(
+                    uri,
+                    verify_ssl=bool(
+                        settings['verify_ssl']
+                        and not asset.get('skip_ssl_verify')
+                    ),
+                    max_bytes=budget,
+                    session=self._session,
+                )
+        except Exception:
+            # Warming is an optimisation; the swap falls back to the
+            # original URI, so log and move on.
+            logger.warning('Prefetch of %s failed', uri, exc_info=True)
+
+
+def _read_ahead(file_path: str, budget: int) -> None:
+    """Ask the kernel to pull the head of ``file_path`` into the page
+    cache. Asynchronous — returns as soon as the readahead is queued."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, budget, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
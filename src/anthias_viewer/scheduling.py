@@ -1,23 +1,21 @@
 import logging
-import secrets
-from datetime import datetime, timedelta
+from datetime import datetime
 from os import path
 from typing import Any
 
 from django.utils import timezone
 
 from anthias_server.app.models import Asset
+from anthias_server.app.playlist import (
+    PlaylistRevision,
+    PlaylistSource,
+    evaluate_playlist,
+)
+from anthias_server.app.timeline import ScheduleTimeline, compile_timeline
 from anthias_server.settings import settings
 
 logger = logging.getLogger(__name__)
 
-# Re-evaluate windowed playlists at most this often. Day-of-week and
-# time-of-day boundaries don't show up in start_date/end_date, so we
-# need a polling cap to ensure transitions are picked up.
-WINDOWED_DEADLINE_CAP_SECONDS = 60
-
-_sysrandom = secrets.SystemRandom()
-
 
 def get_specific_asset(asset_id: str) -> dict[str, Any] | None:
     logger.info('Getting specific asset')
@@ -29,92 +27,21 @@ def get_specific_asset(asset_id: str) -> dict[str, Any] | None:
         return None
 
 
-def _asset_to_dict(asset: Asset) -> dict[str, Any]:
-    return {
-        k: v for k, v in asset.__dict__.items() if k not in ['_state', 'md5']
-    }
-
-
 def generate_asset_list() -> tuple[list[dict[str, Any]], datetime | None]:
     """Build the playlist plus a deadline for the next re-evaluation.
 
-    Active assets are filtered by Asset.is_active() (which now applies
-    day-of-week and time-of-day windows on top of the existing date
-    range and is_enabled checks). is_active() is evaluated once per
-    asset against a shared `now` so the playlist filter and deadline
-    computation always agree on activeness.
-
-    Deadline is the soonest of:
-      - any inactive asset's start_date,
-      - any active asset's end_date,
-      - now + WINDOWED_DEADLINE_CAP_SECONDS, if any asset has a window
-        filter (those transitions don't show up in date columns).
+    Compiles a fresh ``ScheduleTimeline`` (one query) and evaluates it
+    at ``now``. The deadline is the exact next instant at which any
+    asset's activeness flips — a start/end date or a day-of-week /
+    time-of-day window edge — rather than the old 60 s polling cap for
+    windowed playlists. ``Scheduler`` keeps the compiled timeline around
+    (in a ``PlaylistSource``, shared with ``/api/v2/viewer/playlist``)
+    and re-evaluates it on deadline ticks without going back to the DB;
+    this wrapper is the one-shot form.
     """
     logger.info('Generating asset-list...')
     now = timezone.now()
-
-    candidates = list(
-        Asset.objects.filter(
-            is_enabled=True,
-            start_date__isnull=False,
-            end_date__isnull=False,
-        ).order_by('play_order')
-    )
-
-    active_flags = [a.is_active(now=now) for a in candidates]
-    playlist = [
-        _asset_to_dict(a) for a, ok in zip(candidates, active_flags) if ok
-    ]
-
-    if settings['shuffle_playlist']:
-        _sysrandom.shuffle(playlist)
-
-    deadline = _compute_deadline(candidates, active_flags, now)
-    logger.debug(
-        'generate_asset_list: %d assets, deadline %s',
-        len(playlist),
-        deadline,
-    )
-    return playlist, deadline
-
-
-def _compute_deadline(
-    assets: list[Asset],
-    active_flags: list[bool],
-    now: datetime,
-) -> datetime | None:
-    """Soonest future moment when the playlist might need re-evaluating.
-
-    Past boundaries are dropped so a long-ago start_date on an asset
-    that's currently inactive (e.g. blocked by its play_days filter)
-    doesn't pin the deadline to "always overdue" and cause
-    refresh_playlist() to fire on every tick.
-    """
-    candidates: list[datetime] = []
-    has_windowed = False
-
-    for asset, is_active in zip(assets, active_flags):
-        boundary = asset.end_date if is_active else asset.start_date
-        if boundary and boundary > now:
-            candidates.append(boundary)
-        # Cap only matters while the asset is in its date range — the
-        # day/time window can't change activeness before start_date or
-        # after end_date, so future/expired windowed assets should rely
-        # on their date boundary alone, not periodic polling.
-        if (
-            asset.has_window_filter()
-            and asset.start_date is not None
-            and asset.end_date is not None
-            and asset.start_date < now < asset.end_date
-        ):
-            has_windowed = True
-
-    if has_windowed:
-        candidates.append(
-            now + timedelta(seconds=WINDOWED_DEADLINE_CAP_SECONDS)
-        )
-
-    return min(candidates) if candidates else None
+    return evaluate_playlist(compile_timeline(now), now)
 
 
 class Scheduler:
@@ -128,8 +55,24 @@ class Scheduler:
         self.index: int = 0
         self.reverse: bool = False
         self.last_update_db_mtime: float = 0
+
+        from anthias_common.utils import connect_to_redis
+
+        self._redis = connect_to_redis()
+        self.source = PlaylistSource(self._redis)
         self.update_playlist()
 
+    @property
+    def timeline(self) -> ScheduleTimeline | None:
+        return self.source.timeline
+
+    @property
+    def playlist_revision(self) -> PlaylistRevision | None:
+        """Playlist revision the current timeline reflects; None while
+        the server's change feed is unavailable and we're watching the
+        database files instead."""
+        return self.source.revision
+
     def get_next_asset(self) -> dict[str, Any] | None:
         logger.debug('get_next_asset')
 
@@ -177,6 +120,14 @@ class Scheduler:
         self.current_asset_id = current_asset.get('asset_id')
         return current_asset
 
+    def peek_next_asset(self) -> dict[str, Any] | None:
+        """The asset ``get_next_asset`` would return next, without
+        advancing. A best guess for the prefetcher: a skip back, an
+        operator jump, or a playlist change can still make it wrong."""
+        if self.extra_asset is not None or self.reverse or not self.assets:
+            return None
+        return self.assets[self.index % len(self.assets)]
+
     def refresh_playlist(self) -> None:
         logger.debug('refresh_playlist')
         time_cur = timezone.now()
@@ -188,26 +139,91 @@ class Scheduler:
             time_cur,
         )
 
-        if self.get_db_mtime() > self.last_update_db_mtime:
+        revision = self.get_playlist_revision()
+        if revision is not None:
+            if revision != self.playlist_revision:
+                logger.debug('playlist revision %s', revision)
+                self.apply_playlist_changes(revision)
+                return
+        elif self.get_db_mtime() > self.last_update_db_mtime:
             logger.debug('updating playlist due to database modification')
             self.update_playlist()
-        elif settings['shuffle_playlist'] and self.counter >= 5:
+            return
+
+        if settings['shuffle_playlist'] and self.counter >= 5:
             # End-of-cycle reshuffle: the current play-through is over,
             # so it's safe to take the freshly shuffled order.
-            self.update_playlist(allow_reshuffle=True)
+            self.advance_timeline(allow_reshuffle=True)
         elif self.deadline and self.deadline <= time_cur:
-            self.update_playlist()
+            self.advance_timeline()
 
     def update_playlist(self, *, allow_reshuffle: bool = False) -> None:
+        """Recompile the timeline from the database and apply it.
+
+        The only path that queries ``Asset`` rows; reserved for an
+        actual DB change (or a timeline that has gone stale). Deadline
+        ticks go through ``advance_timeline`` instead.
+        """
         logger.debug('update_playlist')
-        self.last_update_db_mtime = self.get_db_mtime()
-        (new_assets, new_deadline) = generate_asset_list()
+        now = timezone.now()
+        # Stat before querying, for the same reason the revision is
+        # read first: a write landing in between is seen next time
+        # rather than missed.
+        db_mtime = self.get_db_mtime()
+        timeline = self.source.recompile(now)
+        if self.playlist_revision is None:
+            self.last_update_db_mtime = db_mtime
+        self._apply_playlist(
+            *evaluate_playlist(timeline, now),
+            allow_reshuffle=allow_reshuffle,
+        )
+
+    def apply_playlist_changes(self, revision: PlaylistRevision) -> None:
+        """Catch up to playlist ``revision`` — patching just the rows
+        the change feed names when it can (see
+        ``PlaylistSource.catch_up``)."""
+        now = timezone.now()
+        # catch_up may fall back to a recompile; see update_playlist.
+        db_mtime = self.get_db_mtime()
+        timeline = self.source.catch_up(revision, now)
+        if self.playlist_revision is None:
+            self.last_update_db_mtime = db_mtime
+        self._apply_playlist(
+            *evaluate_playlist(timeline, now),
+            allow_reshuffle=False,
+        )
+
+    def get_playlist_revision(self) -> PlaylistRevision | None:
+        return self.source.get_revision()
 
+    def advance_timeline(self, *, allow_reshuffle: bool = False) -> None:
+        """Re-evaluate the compiled timeline at ``now`` — no DB access.
+
+        A deadline is a precomputed boundary, so crossing it only moves
+        us to the next segment of the timeline. Falls back to a full
+        recompile when there's no timeline yet, or it has run past its
+        expansion horizon or was compiled for another timezone.
+        """
+        now = timezone.now()
+        if self.timeline is None or self.timeline.is_stale(now):
+            self.update_playlist(allow_reshuffle=allow_reshuffle)
+            return
+        self._apply_playlist(
+            *evaluate_playlist(self.timeline, now),
+            allow_reshuffle=allow_reshuffle,
+        )
+
+    def _apply_playlist(
+        self,
+        new_assets: list[dict[str, Any]],
+        new_deadline: datetime | None,
+        *,
+        allow_reshuffle: bool,
+    ) -> None:
         if settings['shuffle_playlist'] and not allow_reshuffle:
-            # generate_asset_list() reshuffles on every call, so list
-            # equality would always fail and disrupt the play-through
-            # whenever the cap-driven refresh fires (~60s for windowed
-            # assets). Compare by membership only here; legitimate
+            # Every evaluation reshuffles, so list equality would always
+            # fail and disrupt the play-through whenever a deadline
+            # fires. Compare by membership only here; legitimate
             # reshuffles (end-of-cycle, counter >= 5) opt in via
             # allow_reshuffle.
             current_ids = sorted(a['asset_id'] for a in self.assets)
@@ -240,6 +256,11 @@ class Scheduler:
         )
 
     def get_db_mtime(self) -> float:
+        # Fallback change detection, used only while the playlist
+        # revision key is unreadable (Redis down, or no write has
+        # published a revision yet). It can't tell an asset edit from a
+        # session write, so every write to any table triggers a rebuild.
+        #
         # Newest mtime across the SQLite database and its WAL sidecars.
         #
         # Since the DB is opened with journal_mode=WAL (#3015), commits
@@ -122,13 +122,21 @@ int main(int argc, char *argv[])
 
     QApplication::setOverrideCursor(QCursor(Qt::BlankCursor));
 
+    // Warm spare (see WEBVIEW_STANDBY_ENV in src/anthias_viewer/
+    // __init__.py): build everything, keep the window unmapped, and
+    // queue for the bus name behind the live webview.
+    const bool standby = qgetenv("ANTHIAS_WEBVIEW_STANDBY") == "1";
+
     MainWindow *window = new MainWindow();
     // Show fullscreen exactly once, here, after the window is fully
     // constructed. Previously the MainWindow ctor also called
     // showFullScreen(), so the window was shown twice — under
     // cage/wayland that double-commit triggered wlroots' "A configure
     // is scheduled for an uninitialized xdg_surface" warning at startup.
-    window->showFullScreen();
+    // A standby window is shown on promotion instead, below.
+    if (!standby) {
+        window->showFullScreen();
+    }
 
     QDBusConnection connection = QDBusConnection::sessionBus();
 
@@ -149,6 +157,46 @@ int main(int argc, char *argv[])
     }
     qDebug() << "WebView connected to D-bus";
 
+    if (standby) {
+        // The bus hands the queued name over the moment the live
+        // webview's connection drops; that is the promotion.
+        const QString self = connection.baseService();
+        auto *watcher = new QDBusServiceWatcher(
+            "anthias.viewer", connection,
+            QDBusServiceWatcher::WatchForOwnerChange, &app);
+        QObject::connect(
+            watcher, &QDBusServiceWatcher::serviceOwnerChanged, window,
+            [window, self](const QString &, const QString &,
+                           const QString &newOwner) {
+                if (newOwner != self || window->isVisible()) {
+                    return;
+                }
+                window->showFullScreen();
+                // Same handshake line as a normal start: the Python
+                // side waits for it to adopt this process.
+                qInfo() << "Anthias service start";
+            });
+
+        const QDBusReply<QDBusConnectionInterface::RegisterServiceReply>
+            reply = connection.interface()->registerService(
+                "anthias.viewer",
+                QDBusConnectionInterface::QueueService,
+                QDBusConnectionInterface::DontAllowReplacement);
+        if (!reply.isValid()) {
+            qWarning() << qPrintable(reply.error().message());
+            return 1;
+        }
+        if (reply.value() != QDBusConnectionInterface::ServiceQueued) {
+            // Nothing to stand by for: the live webview is already
+            // gone and the viewer is spawning a normal one, which
+            // this process must not race for the name.
+            qWarning() << "No live webview to stand by for";
+            return 1;
+        }
+        qInfo() << "Anthias standby ready";
+        return app.exec();
+    }
+
     if (!connection.registerService("anthias.viewer")) {
         qWarning() << qPrintable(connection.lastError().message());
         return 1;
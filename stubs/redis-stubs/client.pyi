@@ -12,6 +12,7 @@ class PubSub:
 class Redis:
     def __init__(self, *args: Any, **kwargs: Any) -> None: ...
     def get(self, name: Any) -> str | None: ...
+    def mget(self, keys: Any, *args: Any) -> list[str | None]: ...
     def set(
         self, name: Any, value: Any, *args: Any, **kwargs: Any
     ) -> bool: ...
@@ -19,10 +20,14 @@ class Redis:
         self, name: Any, time: int, *args: Any, **kwargs: Any
     ) -> bool: ...
     def delete(self, *names: Any) -> int: ...
+    def incr(self, name: Any, amount: int = ...) -> int: ...
     def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any: ...
     def publish(self, channel: Any, message: Any, **kwargs: Any) -> int: ...
     def pubsub(self, **kwargs: Any) -> PubSub: ...
     def rpush(self, name: Any, *values: Any) -> int: ...
+    def lpush(self, name: Any, *values: Any) -> int: ...
+    def ltrim(self, name: Any, start: int, end: int) -> bool: ...
+    def lrange(self, name: Any, start: int, end: int) -> list[str]: ...
     # `lpop`'s real signature is overloaded on `count` (single value vs
     # list). Anthias only ever calls the no-count form, so the stub
     # only models that — anyone reaching for `count` later should add
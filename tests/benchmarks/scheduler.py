@@ -0,0 +1,463 @@
+"""Benchmarks for the viewer's scheduling hot path.
+
+The unit tests in ``tests/test_scheduler.py`` and ``tests/test_timeline.py``
+pin down *what* the Scheduler plays; nothing watched how long it takes
+to work that out, so a change that made a 1k-asset playlist
+recompile ten times slower would sail through CI. This runner seeds
+synthetic playlists (10 / 100 / 1k / 10k assets with a mix of
+unwindowed, day-of-week, same-day and overnight windows, future
+starts and expired rows) into an in-memory SQLite database and times
+the paths the viewer walks on every tick:
+
+* ``Asset.is_active`` / ``Asset._matches_play_window`` across the table;
+* ``compile_timeline`` — the one query plus window expansion behind
+  ``generate_asset_list`` and ``Scheduler.update_playlist``;
+* ``ScheduleTimeline.evaluate`` on a fresh segment (the active set and
+  the next deadline — what ``_compute_deadline`` used to work out per
+  tick) and inside an already-evaluated one;
+* ``patch_timeline`` for a single changed row;
+* ``Scheduler.update_playlist`` with shuffle off and on, and
+  ``Scheduler.advance_timeline`` with shuffle on (the membership
+  comparison in ``_apply_playlist``).
+
+Each benchmark reports per-call latency (min / median / p95 / mean),
+the peak and retained Python allocations of one call (``tracemalloc``)
+and the number of SQL queries it issued. Wall-clock ``now`` is pinned
+and the seed is fixed, so two runs on one machine see the same
+playlists and can be compared::
+
+    python -m tests.benchmarks.scheduler --output before.json
+    # ...change something...
+    python -m tests.benchmarks.scheduler --compare before.json
+
+``--compare`` exits non-zero when a median regresses past
+``--threshold``. Latencies are only comparable on the same machine;
+query counts and allocations are comparable anywhere.
+
+Host isolation (``ENVIRONMENT=test``, the gi/pydbus stubs, the fake
+Redis) comes from the repository-root ``conftest.py``, so this runs
+wherever the unit suite does — no Docker, Redis or D-Bus needed.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, time, timedelta
+from pathlib import Path
+from time import perf_counter, perf_counter_ns
+from typing import Any
+from unittest import mock
+
+SIZES = (10, 100, 1000, 10000)
+SEED = 2026
+
+# A Wednesday afternoon: inside some same-day windows, outside the
+# overnight ones, so both sides of ``_matches_play_window`` run.
+NOW = datetime(2026, 1, 7, 13, 30, tzinfo=UTC)
+
+# Timed calls per benchmark, and the wall-clock budget after which a
+# slow one (10k assets) stops early once it has MIN_ROUNDS samples.
+ROUNDS = 25
+MIN_ROUNDS = 5
+MAX_SECONDS = 10.0
+
+# Median ratio (current / baseline) past which ``--compare`` reports
+# a regression.
+REGRESSION_THRESHOLD = 1.25
+
+RESULTS_SCHEMA = 1
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class BenchResult:
+    name: str
+    size: int
+    rounds: int
+    min_us: float
+    median_us: float
+    p95_us: float
+    mean_us: float
+    alloc_peak_kib: float
+    alloc_retained_kib: float
+    queries: int
+
+
+def seed_assets(count: int, seed: int = SEED) -> None:
+    """Replace the asset table with ``count`` synthetic rows.
+
+    The mix is fixed by ``seed``: about half unwindowed, the rest split
+    between day-of-week filters, same-day and overnight time windows;
+    a tenth start in the future, a twentieth have already ended and a
+    tenth are disabled.
+    """
+    from anthias_server.app.models import Asset
+
+    rng = random.Random(seed)
+    Asset.objects.all().delete()
+
+    rows = []
+    for i in range(count):
+        start = NOW - timedelta(days=rng.randint(1, 30))
+        end = NOW + timedelta(days=rng.randint(1, 90))
+        roll = rng.random()
+        if roll < 0.1:
+            start = NOW + timedelta(hours=rng.randint(1, 240))
+            end = start + timedelta(days=rng.randint(1, 30))
+        elif roll < 0.15:
+            end = NOW - timedelta(hours=rng.randint(1, 48))
+
+        play_days = [1, 2, 3, 4, 5, 6, 7]
+        play_from = play_to = None
+        kind = rng.random()
+        if kind < 0.2:
+            play_days = sorted(rng.sample(range(1, 8), rng.randint(1, 6)))
+        elif kind < 0.4:
+            play_from = time(rng.randint(6, 11), rng.choice((0, 30)))
+            play_to = time(rng.randint(12, 20), rng.choice((0, 15, 45)))
+        elif kind < 0.5:
+            play_days = sorted(rng.sample(range(1, 8), rng.randint(2, 7)))
+            play_from = time(rng.randint(20, 23))
+            play_to = time(rng.randint(2, 6))
+
+        rows.append(
+            Asset(
+                asset_id=f'bench-{i:05d}',
+                name=f'Asset {i}',
+                uri=f'https://example.com/{i}.png',
+                mimetype='image',
+                duration=10,
+                is_enabled=rng.random() >= 0.1,
+                start_date=start,
+                end_date=end,
+                play_order=i,
+                play_days=json.dumps(play_days),
+                play_time_from=play_from,
+                play_time_to=play_to,
+            )
+        )
+    Asset.objects.bulk_create(rows, batch_size=500)
+
+
+@contextmanager
+def pinned_clock() -> Iterator[None]:
+    """Freeze ``timezone.now`` at ``NOW`` (a plain function, so the
+    patch itself adds no measurable cost to the timed calls)."""
+    from django.utils import timezone
+
+    with mock.patch.object(timezone, 'now', lambda: NOW):
+        yield
+
+
+def measure(
+    name: str,
+    size: int,
+    fn: Callable[[], object],
+    *,
+    rounds: int = ROUNDS,
+    max_seconds: float = MAX_SECONDS,
+) -> BenchResult:
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    # Warm-up: first-call imports, compiled query caches.
+    fn()
+
+    with CaptureQueriesContext(connection) as captured:
+        fn()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        retained = fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del retained
+
+    gc.collect()
+    timings_ns: list[int] = []
+    stop_at = perf_counter() + max_seconds
+    for _ in range(max(rounds, 1)):
+        started = perf_counter_ns()
+        fn()
+        timings_ns.append(perf_counter_ns() - started)
+        if len(timings_ns) >= MIN_ROUNDS and perf_counter() > stop_at:
+            break
+
+    timings_us = sorted(t / 1000 for t in timings_ns)
+    p95_index = min(len(timings_us) - 1, round(0.95 * (len(timings_us) - 1)))
+    return BenchResult(
+        name=name,
+        size=size,
+        rounds=len(timings_us),
+        min_us=round(timings_us[0], 2),
+        median_us=round(statistics.median(timings_us), 2),
+        p95_us=round(timings_us[p95_index], 2),
+        mean_us=round(statistics.fmean(timings_us), 2),
+        alloc_peak_kib=round((peak - before) / 1024, 2),
+        alloc_retained_kib=round((after - before) / 1024, 2),
+        queries=len(captured.captured_queries),
+    )
+
+
+def _benchmarks() -> list[tuple[str, Callable[[], Callable[[], object]]]]:
+    """``(name, setup)`` pairs; ``setup`` runs untimed against the
+    seeded table and returns the callable to time."""
+    from django.utils import timezone
+
+    from anthias_server.app.models import Asset
+    from anthias_server.app.timeline import compile_timeline, patch_timeline
+    from anthias_server.settings import settings
+    from anthias_viewer.scheduling import Scheduler, generate_asset_list
+
+    def is_active() -> Callable[[], object]:
+        assets = list(Asset.objects.all())
+        return lambda: [asset.is_active(now=NOW) for asset in assets]
+
+    def matches_play_window() -> Callable[[], object]:
+        assets = list(Asset.objects.all())
+        local = timezone.localtime(NOW)
+        return lambda: [asset._matches_play_window(local) for asset in assets]
+
+    def compile_() -> Callable[[], object]:
+        return lambda: compile_timeline(NOW)
+
+    def evaluate_new_segment() -> Callable[[], object]:
+        timeline = compile_timeline(NOW)
+
+        def run() -> object:
+            timeline._segment = -1
+            return timeline.evaluate(NOW)
+
+        return run
+
+    def evaluate_same_segment() -> Callable[[], object]:
+        timeline = compile_timeline(NOW)
+        timeline.evaluate(NOW)
+        return lambda: timeline.evaluate(NOW)
+
+    def patch_one() -> Callable[[], object]:
+        timeline = compile_timeline(NOW)
+        changed = list(
+            Asset.objects.order_by('play_order').values_list(
+                'asset_id', flat=True
+            )[:1]
+        )
+        return lambda: patch_timeline(timeline, changed, NOW)
+
+    def scheduler(
+        method: Callable[[Scheduler], Callable[[], object]], *, shuffle: bool
+    ) -> Callable[[], Callable[[], object]]:
+        def setup() -> Callable[[], object]:
+            settings['shuffle_playlist'] = shuffle
+            return method(Scheduler())
+
+        return setup
+
+    return [
+        ('asset.is_active', is_active),
+        ('asset.matches_play_window', matches_play_window),
+        ('timeline.compile', compile_),
+        ('timeline.evaluate[new_segment]', evaluate_new_segment),
+        ('timeline.evaluate[same_segment]', evaluate_same_segment),
+        ('timeline.patch[1_row]', patch_one),
+        ('generate_asset_list', lambda: generate_asset_list),
+        (
+            'scheduler.update_playlist',
+            scheduler(lambda s: s.update_playlist, shuffle=False),
+        ),
+        (
+            'scheduler.update_playlist[shuffle]',
+            scheduler(lambda s: s.update_playlist, shuffle=True),
+        ),
+        (
+            'scheduler.advance_timeline[shuffle]',
+            scheduler(lambda s: s.advance_timeline, shuffle=True),
+        ),
+    ]
+
+
+def run_suite(
+    sizes: Sequence[int] = SIZES,
+    *,
+    rounds: int = ROUNDS,
+    max_seconds: float = MAX_SECONDS,
+    only: str | None = None,
+) -> list[BenchResult]:
+    """Seed each size in turn and run every benchmark (or those whose
+    name contains ``only``) against it. Needs a configured, migrated
+    database; ``main`` provides one when run from the command line."""
+    from anthias_server.settings import settings
+
+    results = []
+    with (
+        pinned_clock(),
+        mock.patch.dict(settings, {'shuffle_playlist': False}),
+    ):
+        for size in sizes:
+            seed_assets(size)
+            for name, setup in _benchmarks():
+                if only is not None and only not in name:
+                    continue
+                result = measure(
+                    name,
+                    size,
+                    setup(),
+                    rounds=rounds,
+                    max_seconds=max_seconds,
+                )
+                print(_format_row(result), file=sys.stderr, flush=True)
+                results.append(result)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def results_document(results: Sequence[BenchResult]) -> dict[str, Any]:
+    return {
+        'schema': RESULTS_SCHEMA,
+        'meta': {
+            'commit': _git_commit(),
+            'created_at': datetime.now(UTC).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'seed': SEED,
+            'now': NOW.isoformat(),
+        },
+        'results': [asdict(result) for result in results],
+    }
+
+
+def compare(
+    baseline: dict[str, Any],
+    results: Sequence[BenchResult],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> list[str]:
+    """One line per benchmark present in both runs; returns the lines
+    for medians that regressed past ``threshold`` (or whose query count
+    went up, which is a regression on any machine)."""
+    previous = {
+        (row['name'], row['size']): row for row in baseline.get('results', [])
+    }
+    regressions = []
+    for result in results:
+        old = previous.get((result.name, result.size))
+        if old is None:
+            continue
+        ratio = result.median_us / old['median_us'] if old['median_us'] else 1
+        line = (
+            f'{result.name:<38} {result.size:>6}  '
+            f'{old["median_us"]:>12.1f} -> {result.median_us:>12.1f} us '
+            f'x{ratio:.2f}  queries {old["queries"]} -> {result.queries}'
+        )
+        regressed = ratio > threshold or result.queries > old['queries']
+        if regressed:
+            regressions.append(line)
+        print(('REGRESSED ' if regressed else '          ') + line)
+    return regressions
+
+
+def _format_row(result: BenchResult) -> str:
+    return (
+        f'{result.name:<38} {result.size:>6}  '
+        f'median {result.median_us:>12.1f} us  '
+        f'p95 {result.p95_us:>12.1f} us  '
+        f'peak {result.alloc_peak_kib:>10.1f} KiB  '
+        f'queries {result.queries}'
+    )
+
+
+def _setup_django() -> None:
+    """Configure Django against a private in-memory SQLite database
+    and migrate it."""
+    os.environ['ANTHIAS_TEST_DB_PATH'] = ':memory:'
+    os.environ.setdefault(
+        'DJANGO_SETTINGS_MODULE', 'anthias_server.django_project.settings'
+    )
+    sys.path[:0] = [str(REPO_ROOT), str(REPO_ROOT / 'src')]
+    import django
+    from django.core.management import call_command
+
+    # The unit suite's host isolation: ENVIRONMENT=test, gi/pydbus
+    # stubs and the fake Redis are all applied at import time.
+    import conftest  # noqa: F401
+
+    django.setup()
+    call_command('migrate', verbosity=0)
+    # Keep per-call INFO logging ("Generating asset-list...") out of
+    # both the output and the timings.
+    logging.disable(logging.INFO)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Benchmark the viewer scheduling hot path.'
+    )
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(size) for size in SIZES),
+        help='comma-separated playlist sizes (default: %(default)s)',
+    )
+    parser.add_argument('--rounds', type=int, default=ROUNDS)
+    parser.add_argument('--max-seconds', type=float, default=MAX_SECONDS)
+    parser.add_argument(
+        '--only', help='run only benchmarks whose name contains this'
+    )
+    parser.add_argument(
+        '--output', type=Path, help='write the results as JSON here'
+    )
+    parser.add_argument(
+        '--compare', type=Path, help='a previous --output to compare with'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=REGRESSION_THRESHOLD
+    )
+    args = parser.parse_args(argv)
+
+    _setup_django()
+    results = run_suite(
+        [int(size) for size in args.sizes.split(',') if size],
+        rounds=args.rounds,
+        max_seconds=args.max_seconds,
+        only=args.only,
+    )
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(results_document(results), indent=2) + '\n'
+        )
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -868,3 +868,79 @@ def test_auth_disabled_ignores_drf_authenticators(
     # but explicitly NOT 403 (the CSRF rejection we're guarding
     # against). The view dispatches and the auth/CSRF gate is silent.
     assert response.status_code != 403
+
+
+@pytest.mark.django_db
+def test_basic_auth_verification_is_cached(authed_operator: User) -> None:
+    """A polling client pays for PBKDF2 once, not on every request."""
+    auth._basic_auth_verified.clear()
+    creds = b64encode(f'alice:{_PWD_TOKEN_USER}'.encode()).decode('ascii')
+    client = Client()
+    with (
+        _enable_auth(),
+        patch.object(
+            User,
+            'check_password',
+            autospec=True,
+            side_effect=User.check_password,
+        ) as verify,
+    ):
+        for _ in range(3):
+            response = client.get(
+                '/api/v2/assets', HTTP_AUTHORIZATION=f'Basic {creds}'
+            )
+            assert response.status_code == 200
+    assert verify.call_count == 1
+
+
+@pytest.mark.django_db
+def test_basic_auth_cache_drops_changed_password(
+    authed_operator: User,
+) -> None:
+    """A password change made anywhere — not only through
+    ``apply_auth_settings`` — stops the old credential at once."""
+    auth._basic_auth_verified.clear()
+    creds = b64encode(f'alice:{_PWD_TOKEN_USER}'.encode()).decode('ascii')
+    client = Client()
+    with _enable_auth():
+        response = client.get(
+            '/api/v2/assets', HTTP_AUTHORIZATION=f'Basic {creds}'
+        )
+        assert response.status_code == 200
+
+        authed_operator.set_password(_PWD_NEW)
+        authed_operator.save()
+        response = client.get(
+            '/api/v2/assets', HTTP_AUTHORIZATION=f'Basic {creds}'
+        )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_basic_auth_cache_ignores_failures(authed_operator: User) -> None:
+    auth._basic_auth_verified.clear()
+    creds = b64encode(f'alice:{_PWD_WRONG}'.encode()).decode('ascii')
+    with _enable_auth():
+        response = Client().get(
+            '/api/v2/assets', HTTP_AUTHORIZATION=f'Basic {creds}'
+        )
+    assert response.status_code == 401
+    assert auth._basic_auth_verified == {}
+
+
+@pytest.mark.django_db
+def test_apply_auth_settings_clears_basic_auth_cache() -> None:
+    operator = _make_operator()
+    auth._remember_basic_auth('alice', _PWD_OLD, operator)
+
+    apply_auth_settings(
+        _request_with_user(operator),
+        new_auth_backend='auth_basic',
+        current_pwd=_PWD_OLD,
+        new_username='alice',
+        new_pwd=_PWD_NEW,
+        new_pwd_confirm=_PWD_NEW,
+        prev_auth_backend='auth_basic',
+    )
+
+    assert auth._basic_auth_verified == {}
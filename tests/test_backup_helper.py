@@ -66,6 +66,30 @@ def test_recover(backup_home: str) -> None:
     assert not path.isfile(file_path)
 
 
+def test_recover_does_not_write_through_shared_links(
+    backup_home: str,
+) -> None:
+    """Asset files are hard links to a shared blob; restoring one must
+    replace the link, not rewrite every file sharing its inode."""
+    assets = path.join(backup_home, 'anthias_assets')
+    restored = path.join(assets, 'a.png')
+    with open(restored, 'w') as f:
+        f.write('from the backup')
+    archive_name = create_backup()
+
+    os.remove(restored)
+    with open(restored, 'w') as f:
+        f.write('current')
+    twin = path.join(assets, 'b.png')
+    os.link(restored, twin)
+
+    recover(path.join(backup_home, static_dir, archive_name))
+    with open(restored) as f:
+        assert f.read() == 'from the backup'
+    with open(twin) as f:
+        assert f.read() == 'current'
+
+
 def test_backup_archive_name_falls_back_on_empty_name() -> None:
     dt = datetime(2016, 7, 19, 12, 42, 12, tzinfo=UTC)
     with mock.patch(
@@ -0,0 +1,50 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+from anthias_server.app.models import Asset
+from tests.benchmarks.scheduler import (
+    compare,
+    results_document,
+    run_suite,
+    seed_assets,
+)
+
+
+@pytest.mark.django_db
+def test_seeding_is_reproducible() -> None:
+    seed_assets(50)
+    first = list(Asset.objects.order_by('asset_id').values())
+    seed_assets(50)
+    assert list(Asset.objects.order_by('asset_id').values()) == first
+    assert Asset.objects.exclude(play_time_from=None).exists()
+    assert Asset.objects.filter(is_enabled=False).exists()
+
+
+@pytest.mark.django_db
+def test_suite_runs_and_counts_queries() -> None:
+    """Keeps the runner from rotting; the smallest size, one round."""
+    results = run_suite([10], rounds=1, max_seconds=0)
+    queries = {result.name: result.queries for result in results}
+    assert queries['timeline.compile'] == 1
+    assert queries['timeline.evaluate[new_segment]'] == 0
+    assert queries['scheduler.advance_timeline[shuffle]'] == 0
+    assert all(result.median_us > 0 for result in results)
+
+    document = json.loads(json.dumps(results_document(results)))
+    assert document['schema'] == 1
+    assert len(document['results']) == len(results)
+
+
+@pytest.mark.django_db
+def test_compare_flags_slower_medians_and_extra_queries() -> None:
+    results = run_suite([10], rounds=1, max_seconds=0, only='compile')
+    (result,) = results
+    baseline = results_document(results)
+
+    assert compare(baseline, [result]) == []
+    slower = replace(result, median_us=result.median_us * 2)
+    assert len(compare(baseline, [slower])) == 1
+    chattier = replace(result, queries=result.queries + 1)
+    assert len(compare(baseline, [chattier])) == 1
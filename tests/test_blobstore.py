@@ -0,0 +1,140 @@
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from anthias_server import blobstore
+from anthias_server.settings import settings
+
+
+@pytest.fixture
+def assetdir(tmp_path: Path) -> Iterator[Path]:
+    with mock.patch.dict(settings, {'assetdir': str(tmp_path)}):
+        yield tmp_path
+
+
+def _write(assetdir: Path, name: str, body: bytes) -> str:
+    target = assetdir / name
+    target.write_bytes(body)
+    return str(target)
+
+
+def test_identical_files_share_one_blob(assetdir: Path) -> None:
+    first = _write(assetdir, 'a.mp4', b'same bytes')
+    second = _write(assetdir, 'b.mp4', b'same bytes')
+
+    digest = blobstore.intern(first)
+    assert blobstore.intern(second) == digest
+    assert digest == blobstore.digest_file(first)
+    assert os.path.samefile(first, second)
+    assert blobstore.refcount(digest) == 2
+    assert Path(second).read_bytes() == b'same bytes'
+
+
+def test_different_content_is_kept_apart(assetdir: Path) -> None:
+    first = _write(assetdir, 'a.mp4', b'one')
+    second = _write(assetdir, 'b.mp4', b'two')
+    assert blobstore.intern(first) != blobstore.intern(second)
+    assert not os.path.samefile(first, second)
+
+
+def test_digest_of_reads_the_inode_note(assetdir: Path) -> None:
+    asset_file = _write(assetdir, 'a.png', b'pixels')
+    assert blobstore.digest_of(asset_file) is None
+    digest = blobstore.intern(asset_file)
+    with (
+        mock.patch.object(blobstore, 'digest_file') as digest_file,
+        mock.patch('os.scandir') as scandir,
+    ):
+        assert blobstore.digest_of(asset_file) == digest
+    digest_file.assert_not_called()
+    scandir.assert_not_called()
+
+
+def test_digest_of_confirms_the_candidate(assetdir: Path) -> None:
+    """A row's ``md5`` names the file only while the file is still
+    that blob's link; a lost note just means no answer."""
+    asset_file = _write(assetdir, 'a.png', b'pixels')
+    digest = blobstore.intern(asset_file)
+    assert digest is not None
+    blobstore._redis().delete(
+        blobstore._inode_key(os.stat(blobstore.blob_path(digest)))
+    )
+
+    assert blobstore.digest_of(asset_file) is None
+    assert blobstore.digest_of(asset_file, digest) == digest
+    os.replace(_write(assetdir, 'a.png.tmp', b'pixels'), asset_file)
+    assert blobstore.digest_of(asset_file, digest) is None
+
+
+def test_garbage_collection_follows_the_last_link(assetdir: Path) -> None:
+    first = _write(assetdir, 'a.mp4', b'same bytes')
+    second = _write(assetdir, 'b.mp4', b'same bytes')
+    digest = blobstore.intern(first)
+    assert digest is not None
+    blobstore.intern(second)
+
+    os.remove(first)
+    assert blobstore.collect_garbage() == 0
+    assert blobstore.refcount(digest) == 1
+
+    os.remove(second)
+    assert blobstore.collect_garbage() == 1
+    assert not os.path.exists(blobstore.blob_path(digest))
+
+
+def test_marked_collection_looks_only_at_the_given_blobs(
+    assetdir: Path,
+) -> None:
+    kept = _write(assetdir, 'a.mp4', b'kept')
+    gone = _write(assetdir, 'b.mp4', b'gone')
+    unmarked = _write(assetdir, 'c.mp4', b'unmarked')
+    digests = [blobstore.intern(f) for f in (kept, gone, unmarked)]
+    assert None not in digests
+    os.remove(gone)
+    os.remove(unmarked)
+
+    with mock.patch('os.scandir') as scandir:
+        assert blobstore.collect_garbage([d for d in digests[:2] if d]) == 1
+    scandir.assert_not_called()
+    assert [blobstore.refcount(d) for d in digests if d] == [1, 0, 0]
+    assert os.path.exists(blobstore.blob_path(str(digests[2])))
+    assert blobstore.collect_garbage() == 1
+
+
+def test_stale_staging_links_are_swept(assetdir: Path) -> None:
+    os.makedirs(blobstore.blob_dir())
+    fresh = Path(blobstore.blob_dir(), 'x.link.tmp')
+    stale = Path(blobstore.blob_dir(), 'y.link.tmp')
+    fresh.write_bytes(b'')
+    stale.write_bytes(b'')
+    old = time.time() - 2 * blobstore.STALE_TMP_S
+    os.utime(stale, (old, old))
+
+    blobstore.collect_garbage()
+    assert fresh.exists()
+    assert not stale.exists()
+
+
+def test_rewriting_one_asset_leaves_its_twin_alone(assetdir: Path) -> None:
+    """The pipelines replace rather than write in place, which is what
+    keeps a shared inode safe."""
+    first = _write(assetdir, 'a.jpg', b'original')
+    second = _write(assetdir, 'b.jpg', b'original')
+    blobstore.intern(first)
+    blobstore.intern(second)
+
+    staging = _write(assetdir, 'a.jpg.tmp', b'downscaled')
+    os.replace(staging, first)
+    assert Path(second).read_bytes() == b'original'
+
+
+def test_filesystem_without_links_leaves_files_alone(assetdir: Path) -> None:
+    asset_file = _write(assetdir, 'a.mp4', b'bytes')
+    with mock.patch('os.link', side_effect=PermissionError('no links')):
+        assert blobstore.intern(asset_file) is None
+    assert Path(asset_file).read_bytes() == b'bytes'
+    assert os.stat(asset_file).st_nlink == 1
@@ -1,5 +1,6 @@
 import os
 import tempfile
+import threading
 import time
 from collections.abc import Iterator
 from os import path
@@ -7,12 +8,21 @@ from typing import Any
 from unittest import mock
 
 import pytest
+import requests
 from celery.exceptions import SoftTimeLimitExceeded
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 import anthias_server.celery_tasks as celery_tasks_module
+from anthias_server import assetsweep, blobstore
+from anthias_server.app import asset_rows
 from anthias_server.app.models import Asset
 from anthias_server.celery_tasks import (
+    ASSET_PROBE_MAX_INTERVAL_S,
+    ASSET_PROBE_RETRY_S,
+    ASSET_REVALIDATION_INTERVAL_S,
     ASSET_REVALIDATION_LOCK_KEY,
+    ASSET_REVALIDATION_PER_HOST,
     DISPLAY_POWER_STATE_KEY,
     DISPLAY_POWER_STATE_TTL_S,
     apply_display_power_schedule,
@@ -153,6 +163,137 @@ def test_stale_ytdl_sidecar_is_removed(asset_dir: str) -> None:
     assert not path.exists(stale_info)
 
 
+@pytest.mark.django_db
+def test_content_cache_copies_are_left_to_the_cache(asset_dir: str) -> None:
+    """Cached copies aren't referenced by any row (the row keeps its
+    remote URI), so the orphan sweep must skip them and hand the
+    cache the live URIs to evict against instead."""
+    copy = _touch(asset_dir, 'cache-abc.png', age_seconds=2 * 60 * 60)
+    _make_asset('remote', 'https://example.com/a.png')
+    with mock.patch('anthias_common.content_cache.enforce_limit') as enforce:
+        cleanup.apply()
+    assert path.exists(copy)
+    enforce.assert_called_once_with(keep_uris={'https://example.com/a.png'})
+
+
+@pytest.mark.django_db
+def test_hourly_cleanup_drops_only_marked_cache_copies(asset_dir: str) -> None:
+    """Between full passes the cache isn't walked: a copy goes when
+    the last row using its URI goes, and not while another still
+    does."""
+    from anthias_common import content_cache
+
+    cleanup.apply()
+    shared = 'https://example.com/shared.png'
+    gone = 'https://example.com/gone.png'
+    for asset_id, uri in (('a', shared), ('b', shared), ('c', gone)):
+        _make_asset(asset_id, uri)
+    copies = {
+        uri: _touch(asset_dir, content_cache.copy_name(uri))
+        for uri in (shared, gone)
+    }
+    Asset.objects.filter(asset_id__in=['a', 'c']).delete()
+
+    with mock.patch.object(content_cache, 'enforce_limit') as enforce:
+        cleanup.apply()
+    enforce.assert_not_called()
+    assert path.exists(copies[shared])
+    assert not path.exists(copies[gone])
+
+
+@pytest.mark.django_db
+def test_cleanup_deduplicates_and_collects_blobs(asset_dir: str) -> None:
+    """Rows from before the asset store get an ``md5`` and share one
+    copy; a blob is collected once no asset file links to it."""
+    first = _touch(asset_dir, 'first.png')
+    second = _touch(asset_dir, 'second.png')
+    _make_asset('first', first)
+    _make_asset('second', second)
+
+    cleanup.apply()
+    digests = set(Asset.objects.values_list('md5', flat=True))
+    assert len(digests) == 1
+    (digest,) = digests
+    assert digest is not None
+    assert path.samefile(first, second)
+    assert blobstore.refcount(digest) == 2
+
+    Asset.objects.all().delete()
+    os.remove(first)
+    os.remove(second)
+    # An hourly run: the deleted rows marked their blob, so it goes
+    # without a pass over the whole store.
+    with mock.patch.object(
+        blobstore, 'collect_garbage', wraps=blobstore.collect_garbage
+    ) as collect_garbage:
+        cleanup.apply()
+    assert not path.exists(blobstore.blob_path(digest))
+    assert all(call.args for call in collect_garbage.call_args_list)
+
+
+@pytest.mark.django_db
+def test_abandoned_upload_takes_its_blob_with_it(asset_dir: str) -> None:
+    """An upload interned while staged whose create request never came
+    holds its blob's only asset link; sweeping it collects the blob."""
+    cleanup.apply()
+    staged = _touch(asset_dir, 'abandoned.tmp')
+    digest = blobstore.intern(staged)
+    assert digest is not None
+    _set_mtime(staged, 2 * 60 * 60)
+    assetsweep.mark([staged])
+
+    cleanup.apply()
+    assert not path.exists(staged)
+    assert not path.exists(blobstore.blob_path(digest))
+
+
+@pytest.mark.django_db
+def test_hourly_cleanup_only_looks_at_marked_files(asset_dir: str) -> None:
+    """After the first (full) pass, an hourly run judges only the
+    files marked since; the rest wait for the next full pass."""
+    cleanup.apply()
+    assert not assetsweep.full_sweep_due()
+
+    unmarked = _touch(asset_dir, 'unmarked.png', age_seconds=2 * 60 * 60)
+    gone = _touch(asset_dir, 'gone.png', age_seconds=2 * 60 * 60)
+    _make_asset('gone', gone)
+    Asset.objects.get(asset_id='gone').delete()
+    repointed = _touch(asset_dir, 'before.png', age_seconds=2 * 60 * 60)
+    _make_asset('repointed', repointed)
+    Asset.objects.filter(asset_id='repointed').update(
+        uri=path.join(asset_dir, 'after.png')
+    )
+    fresh = _touch(asset_dir, 'fresh.tmp')
+    assetsweep.mark([fresh])
+
+    with mock.patch.object(assetsweep, 'sweep_all') as sweep_all:
+        cleanup.apply()
+    sweep_all.assert_not_called()
+    assert not path.exists(gone)
+    assert not path.exists(repointed)
+    assert path.exists(unmarked)
+    assert path.exists(fresh)
+    # Too young to judge: still marked for the next run.
+    assert assetsweep._redis().smembers(assetsweep.DIRTY_KEY) == {'fresh.tmp'}
+
+    later = time.time() + assetsweep.FULL_SWEEP_INTERVAL_S
+    with mock.patch('anthias_server.assetsweep.time.time', return_value=later):
+        assert assetsweep.full_sweep_due()
+
+
+@pytest.mark.django_db
+def test_full_cleanup_is_throttled(asset_dir: str) -> None:
+    for n in range(5):
+        _touch(asset_dir, f'orphan{n}.png', age_seconds=2 * 60 * 60)
+    with (
+        mock.patch.object(assetsweep, 'FULL_SWEEP_ENTRIES_PER_S', 2),
+        mock.patch('anthias_server.assetsweep.time.sleep') as sleep,
+    ):
+        cleanup.apply()
+    assert sleep.call_count == 2
+    assert not [name for name in os.listdir(asset_dir) if 'orphan' in name]
+
+
 def test_cleanup_returns_when_assetdir_missing() -> None:
     """cleanup() bails early if settings['assetdir'] doesn't exist."""
     nonexistent = '/tmp/nonexistent-anthias-cleanup-dir-xyz'
@@ -442,13 +583,16 @@ def _make_revalidation_asset(
 
 
 @pytest.fixture
-def eager_celery() -> None:
+def eager_celery() -> Iterator[None]:
     """
     Periodic sweep flips Asset.is_reachable based on url_fails. The probe
     itself is exercised by tests/test_utils.py — here we cover the
     dispatch shape: which assets get probed, what gets written back, and
     how exceptions are contained so a single bad asset can't kill the
     sweep.
+
+    The content cache is switched off so the remote image rows below
+    go through url_fails; the cached path is covered separately.
     """
     celeryapp.conf.update(
         CELERY_ALWAYS_EAGER=True,
@@ -456,6 +600,8 @@ def eager_celery() -> None:
         CELERY_BROKER_URL='',
     )
     Asset.objects.all().delete()
+    with mock.patch.dict(settings, {'content_cache_mb': 0}):
+        yield
 
 
 @pytest.mark.django_db
@@ -513,6 +659,40 @@ def test_sweep_skips_ssl_verification_per_asset(eager_celery: None) -> None:
     assert verify_by_url['https://intranet.example/x.png'] is False
 
 
+@pytest.mark.django_db
+def test_sweep_revalidates_cached_images(eager_celery: None) -> None:
+    """With the content cache on, a remote image is probed by the
+    cache's conditional GET (which refreshes the viewer's copy) rather
+    than url_fails; a ``nocache`` image still goes through url_fails."""
+    _make_revalidation_asset('cached', uri='https://example.com/a.png')
+    nocache = _make_revalidation_asset(
+        'nocache', uri='https://example.com/b.png', is_reachable=False
+    )
+    Asset.objects.filter(asset_id=nocache.asset_id).update(nocache=True)
+
+    with (
+        mock.patch.dict(
+            settings, {'content_cache_mb': 64, 'verify_ssl': True}
+        ),
+        mock.patch(
+            'anthias_common.content_cache.revalidate',
+            return_value=False,
+        ) as revalidate,
+        mock.patch(
+            'anthias_server.celery_tasks.url_fails', return_value=False
+        ) as url_fails,
+    ):
+        revalidate_asset_urls.apply()
+
+    revalidate.assert_called_once()
+    assert revalidate.call_args.args == ('https://example.com/a.png',)
+    assert revalidate.call_args.kwargs['verify_ssl'] is True
+    url_fails.assert_called_once()
+    assert url_fails.call_args.args[0] == 'https://example.com/b.png'
+    assert not Asset.objects.get(asset_id='cached').is_reachable
+    assert Asset.objects.get(asset_id='nocache').is_reachable
+
+
 @pytest.mark.django_db
 def test_sweep_updates_last_reachability_check(eager_celery: None) -> None:
     from django.utils import timezone
@@ -569,6 +749,10 @@ def test_sweep_skips_skip_asset_check_assets_entirely(
 @pytest.mark.django_db
 def test_sweep_local_file_existence_check(eager_celery: None) -> None:
     """Local URIs short-circuit url_fails and check the filesystem."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
     with tempfile.NamedTemporaryFile(delete=False) as fh:
         local = fh.name
     try:
@@ -580,7 +764,11 @@ def test_sweep_local_file_existence_check(eager_celery: None) -> None:
     finally:
         os.unlink(local)
 
-    # Same row, file now gone — sweep should mark it unreachable.
+    # Same row, file now gone — once it is due again the sweep should
+    # mark it unreachable.
+    Asset.objects.filter(asset_id='a1').update(
+        next_probe_at=timezone.now() - timedelta(seconds=1)
+    )
     revalidate_asset_urls.apply()
     assert not Asset.objects.get(asset_id='a1').is_reachable
 
@@ -593,7 +781,11 @@ def test_sweep_probe_exception_does_not_kill_sweep(
     _make_revalidation_asset('boom', uri='https://example.com/boom')
     _make_revalidation_asset('ok', uri='https://example.com/ok')
 
-    def fake_url_fails(url: str, verify_ssl: bool | None = None) -> bool:
+    def fake_url_fails(
+        url: str,
+        verify_ssl: bool | None = None,
+        session: requests.Session | None = None,
+    ) -> bool:
         if 'boom' in url:
             raise RuntimeError('synthetic')
         return False
@@ -609,6 +801,255 @@ def test_sweep_probe_exception_does_not_kill_sweep(
     assert Asset.objects.get(asset_id='ok').last_reachability_check is not None
 
 
+@pytest.mark.django_db
+def test_sweep_probes_a_shared_uri_once(eager_celery: None) -> None:
+    """Assets pointing at the same URI share one probe and all get
+    its verdict."""
+    _make_revalidation_asset('a', uri='https://example.com/same')
+    _make_revalidation_asset('b', uri='https://example.com/same')
+    _make_revalidation_asset('c', uri='https://example.com/other')
+
+    with mock.patch(
+        'anthias_server.celery_tasks.url_fails', return_value=True
+    ) as m:
+        revalidate_asset_urls.apply()
+
+    assert sorted(call.args[0] for call in m.call_args_list) == [
+        'https://example.com/other',
+        'https://example.com/same',
+    ]
+    assert not Asset.objects.filter(is_reachable=True).exists()
+
+
+@pytest.mark.django_db
+def test_sweep_probes_concurrently_within_the_per_host_cap(
+    eager_celery: None,
+) -> None:
+    """Probes overlap, but never more than ``ASSET_REVALIDATION_PER_HOST``
+    against one host, and each host's probes share one session."""
+    for i in range(ASSET_REVALIDATION_PER_HOST * 3):
+        _make_revalidation_asset(f'busy{i}', uri=f'https://busy.example/{i}')
+    _make_revalidation_asset('quiet', uri='https://quiet.example/x')
+
+    lock = threading.Lock()
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    sessions: dict[str, set[int]] = {}
+
+    def fake_url_fails(
+        url: str,
+        verify_ssl: bool | None = None,
+        session: requests.Session | None = None,
+    ) -> bool:
+        host = url.split('/')[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            sessions.setdefault(host, set()).add(id(session))
+        time.sleep(0.05)
+        with lock:
+            in_flight[host] -= 1
+        return False
+
+    with mock.patch(
+        'anthias_server.celery_tasks.url_fails', side_effect=fake_url_fails
+    ):
+        revalidate_asset_urls.apply()
+
+    assert peak['busy.example'] == ASSET_REVALIDATION_PER_HOST
+    assert len(sessions['busy.example']) == 1
+    assert sessions['busy.example'] != sessions['quiet.example']
+    assert (
+        Asset.objects.filter(last_reachability_check__isnull=True).count() == 0
+    )
+
+
+@pytest.mark.django_db
+def test_sweep_writes_verdicts_in_one_batch(eager_celery: None) -> None:
+    """One UPDATE per verdict, not one per asset."""
+    for i in range(3):
+        _make_revalidation_asset(f'up{i}', uri=f'https://example.com/up{i}')
+        _make_revalidation_asset(
+            f'down{i}', uri=f'https://example.com/down{i}'
+        )
+
+    with (
+        mock.patch(
+            'anthias_server.celery_tasks.url_fails',
+            side_effect=lambda url, **kwargs: 'down' in url,
+        ),
+        CaptureQueriesContext(connection) as queries,
+    ):
+        revalidate_asset_urls.apply()
+
+    updates = [
+        q['sql'] for q in queries if q['sql'].startswith('UPDATE "assets"')
+    ]
+    assert len(updates) == 2
+    assert set(
+        Asset.objects.filter(is_reachable=False).values_list(
+            'asset_id', flat=True
+        )
+    ) == {'down0', 'down1', 'down2'}
+
+
+@pytest.mark.django_db
+def test_sweep_only_probes_due_assets(eager_celery: None) -> None:
+    """Rows whose ``next_probe_at`` is still ahead are left for a later
+    tick; never-probed rows (NULL) are due straight away."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    _make_revalidation_asset('new', uri='https://example.com/new')
+    _make_revalidation_asset('due', uri='https://example.com/due')
+    _make_revalidation_asset('later', uri='https://example.com/later')
+    now = timezone.now()
+    Asset.objects.filter(asset_id='due').update(
+        next_probe_at=now - timedelta(seconds=1)
+    )
+    Asset.objects.filter(asset_id='later').update(
+        next_probe_at=now + timedelta(minutes=5)
+    )
+
+    with mock.patch(
+        'anthias_server.celery_tasks.url_fails', return_value=False
+    ) as m:
+        revalidate_asset_urls.apply()
+
+    assert sorted(call.args[0] for call in m.call_args_list) == [
+        'https://example.com/due',
+        'https://example.com/new',
+    ]
+    later = Asset.objects.get(asset_id='later')
+    assert later.last_reachability_check is None
+    assert later.probe_successes == 0
+
+
+@pytest.mark.django_db
+def test_changing_the_probe_target_clears_the_schedule() -> None:
+    """A new ``uri``, TLS opt-out or re-enable is due on the next sweep,
+    not whenever the old target's backoff says; other edits keep it."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    backed_off = {
+        'next_probe_at': timezone.now() + timedelta(hours=4),
+        'probe_successes': 6,
+    }
+    for asset_id in ('uri', 'ssl', 'enable', 'name', 'bulk-on', 'bulk-off'):
+        _make_revalidation_asset(asset_id, is_enabled=asset_id != 'bulk-off')
+    Asset.objects.update(**backed_off)
+
+    asset = Asset.objects.get(asset_id='uri')
+    asset.uri = 'https://example.com/y.png'
+    asset.save()
+    asset = Asset.objects.get(asset_id='ssl')
+    asset.skip_ssl_verify = True
+    asset.save(update_fields=['skip_ssl_verify'])
+    asset = Asset.objects.get(asset_id='name')
+    asset.name = 'renamed'
+    asset.save()
+    Asset.objects.filter(asset_id='enable').update(is_enabled=False)
+    Asset.objects.filter(asset_id__startswith='bulk').update(is_enabled=True)
+
+    schedules = {
+        a.asset_id: (a.next_probe_at is None, a.probe_successes)
+        for a in Asset.objects.all()
+    }
+    assert schedules == {
+        'uri': (True, 0),
+        'ssl': (True, 0),
+        'enable': (True, 0),
+        'name': (False, 6),
+        'bulk-on': (False, 6),
+        'bulk-off': (True, 0),
+    }
+
+
+def _schedule(asset: Asset, *verdicts: bool) -> list[float]:
+    """Feed ``verdicts`` through the scheduler without jitter and return
+    the interval each one picked, in seconds."""
+    from django.utils import timezone
+
+    now = timezone.now()
+    intervals = []
+    with mock.patch(
+        'anthias_server.celery_tasks.random.uniform', return_value=1.0
+    ):
+        for reachable in verdicts:
+            celery_tasks_module._schedule_next_probe(asset, reachable, now)
+            assert asset.last_reachability_check == now
+            assert asset.next_probe_at is not None
+            intervals.append((asset.next_probe_at - now).total_seconds())
+    return intervals
+
+
+def test_stable_asset_backs_off_to_the_cap() -> None:
+    asset = Asset(asset_id='a1')
+    intervals = _schedule(asset, *[True] * 8)
+    base = ASSET_REVALIDATION_INTERVAL_S
+    assert intervals[:3] == [base, base * 2, base * 4]
+    assert intervals[-1] == ASSET_PROBE_MAX_INTERVAL_S
+    assert intervals == sorted(intervals)
+    assert (asset.probe_successes, asset.probe_failures) == (8, 0)
+
+
+def test_failing_asset_is_retried_fast() -> None:
+    asset = Asset(asset_id='a1')
+    intervals = _schedule(asset, *[True] * 5, *[False] * 6, True)
+    assert intervals[5:8] == [
+        ASSET_PROBE_RETRY_S,
+        ASSET_PROBE_RETRY_S * 2,
+        ASSET_PROBE_RETRY_S * 4,
+    ]
+    # Down for a while: back to the base cadence, no slower.
+    assert intervals[10] == ASSET_REVALIDATION_INTERVAL_S
+    # Recovery restarts the backoff from the base.
+    assert intervals[11] == ASSET_REVALIDATION_INTERVAL_S
+    assert (asset.probe_successes, asset.probe_failures) == (1, 0)
+
+
+def test_probe_intervals_are_jittered() -> None:
+    from django.utils import timezone
+
+    now = timezone.now()
+    offsets = set()
+    for i in range(20):
+        asset = Asset(asset_id=f'a{i}')
+        celery_tasks_module._schedule_next_probe(asset, True, now)
+        assert asset.next_probe_at is not None
+        offset = (asset.next_probe_at - now).total_seconds()
+        assert 0.9 * ASSET_REVALIDATION_INTERVAL_S <= offset
+        assert offset <= 1.1 * ASSET_REVALIDATION_INTERVAL_S
+        offsets.add(offset)
+    assert len(offsets) > 1
+
+
+@pytest.mark.django_db
+def test_steady_sweep_writes_only_the_schedule(eager_celery: None) -> None:
+    """When no verdict flips, the sweep's only write is the batched
+    schedule update."""
+    for i in range(3):
+        _make_revalidation_asset(f'a{i}', uri=f'https://example.com/{i}')
+
+    with (
+        mock.patch(
+            'anthias_server.celery_tasks.url_fails', return_value=False
+        ),
+        CaptureQueriesContext(connection) as queries,
+    ):
+        revalidate_asset_urls.apply()
+
+    updates = [
+        q['sql'] for q in queries if q['sql'].startswith('UPDATE "assets"')
+    ]
+    assert len(updates) == 1
+    assert '"is_reachable"' not in updates[0]
+    assert set(Asset.objects.values_list('probe_successes', flat=True)) == {1}
+
+
 @pytest.mark.django_db
 def test_sweep_lock_prevents_overlap(eager_celery: None) -> None:
     """A second beat tick that fires while a sweep is running must
@@ -673,10 +1114,11 @@ def test_sweep_lock_released_after_clean_run(eager_celery: None) -> None:
 
 
 @pytest.fixture
-def eager_celery_recheck() -> None:
+def eager_celery_recheck() -> Iterator[None]:
     """
     On-demand single-asset probe. Cooldown- and concurrency-safe via
     an atomic Redis SETNX lock per asset (TTL = RECHECK_COOLDOWN_S).
+    Content cache off, as in ``eager_celery``.
     """
     celeryapp.conf.update(
         CELERY_ALWAYS_EAGER=True,
@@ -684,6 +1126,8 @@ def eager_celery_recheck() -> None:
         CELERY_BROKER_URL='',
     )
     Asset.objects.all().delete()
+    with mock.patch.dict(settings, {'content_cache_mb': 0}):
+        yield
 
 
 def _make_recheck_asset(**kwargs: object) -> Asset:
@@ -719,6 +1163,36 @@ def test_recheck_flips_is_reachable(eager_celery_recheck: None) -> None:
     assert not Asset.objects.get(asset_id='a1').is_reachable
 
 
+@pytest.mark.django_db
+def test_recheck_probes_now_and_schedules_a_fast_retry(
+    eager_celery_recheck: None,
+) -> None:
+    """The on-demand path ignores ``next_probe_at`` and feeds its
+    verdict into the schedule."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    _make_recheck_asset(
+        next_probe_at=timezone.now() + timedelta(hours=1), probe_successes=3
+    )
+    with mock.patch(
+        'anthias_server.celery_tasks.url_fails', return_value=True
+    ) as m:
+        revalidate_asset_url.apply(args=('a1',))
+    m.assert_called_once()
+
+    asset = Asset.objects.get(asset_id='a1')
+    assert not asset.is_reachable
+    assert (asset.probe_successes, asset.probe_failures) == (0, 1)
+    assert asset.next_probe_at is not None
+    assert asset.last_reachability_check is not None
+    retry_in = (
+        asset.next_probe_at - asset.last_reachability_check
+    ).total_seconds()
+    assert retry_in <= ASSET_PROBE_RETRY_S * 1.1
+
+
 @pytest.mark.django_db
 def test_recheck_lock_prevents_back_to_back_probes(
     eager_celery_recheck: None,
@@ -932,11 +1406,12 @@ def fake_youtube_dl() -> Iterator[mock.MagicMock]:
 @pytest.mark.django_db
 def test_download_youtube_asset_success_chains_into_normalize_video(
     fake_youtube_dl: mock.MagicMock,
+    django_capture_on_commit_callbacks: Any,
 ) -> None:
     """Happy path: extract_info returns populated info; the YouTube
     task writes title + duration + ``metadata['source']`` /
-    ``metadata['source_url']``, fires the browser-side notify hop,
-    and dispatches ``normalize_video_asset`` so the per-board codec
+    ``metadata['source_url']``, which the dashboards hear about as
+    one ``updated`` delta, and dispatches ``normalize_video_asset`` so the per-board codec
     grid runs on the downloaded file. ``is_processing`` deliberately
     stays True — normalize clears it once its probe + (optional)
     transcode finishes, giving the operator a single Processing →
@@ -954,9 +1429,13 @@ def test_download_youtube_asset_success_chains_into_normalize_video(
         mock.patch(
             'anthias_server.app.consumers.notify_asset_update'
         ) as mock_notify,
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as mock_publish,
         mock.patch(
             'anthias_server.processing.dispatch_normalize_video'
         ) as mock_dispatch_normalize,
+        django_capture_on_commit_callbacks(execute=True),
     ):
         download_youtube_asset('yt-1', 'https://www.youtube.com/watch?v=abc')
 
@@ -971,8 +1450,9 @@ def test_download_youtube_asset_success_chains_into_normalize_video(
     assert a.metadata['source'] == 'youtube'
     assert a.metadata['source_url'] == 'https://www.youtube.com/watch?v=abc'
 
-    # Browser-side notify fires so the dashboard picks up the title.
-    mock_notify.assert_called_once_with('yt-1')
+    # The write's own delta is the dashboard's only nudge.
+    mock_publish.assert_called_once_with('updated', ['yt-1'])
+    mock_notify.assert_not_called()
     # Viewer reload publish does NOT — the row is still
     # is_processing=True, so the on-device viewer would just reload
     # to a row it can't display anyway. The chained
@@ -1146,7 +1626,9 @@ def test_download_youtube_asset_failure_propagates_for_on_failure(
 
 
 @pytest.mark.django_db
-def test_download_youtube_asset_on_failure_writes_error_metadata() -> None:
+def test_download_youtube_asset_on_failure_writes_error_metadata(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
     """When Celery declares the task failed, is_processing must
     flip back to False AND ``metadata.error_message`` must carry the
     exception type + message so the asset table renders the "Failed"
@@ -1159,6 +1641,10 @@ def test_download_youtube_asset_on_failure_writes_error_metadata() -> None:
         mock.patch(
             'anthias_server.app.consumers.notify_asset_update'
         ) as mock_notify,
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as mock_publish,
+        django_capture_on_commit_callbacks(execute=True),
     ):
         download_youtube_asset.on_failure(
             RuntimeError('404 Not Found'),
@@ -1172,7 +1658,8 @@ def test_download_youtube_asset_on_failure_writes_error_metadata() -> None:
     # Same shape as _NormalizeAssetTask.on_failure: ExceptionType: msg.
     assert 'RuntimeError' in a.metadata['error_message']
     assert '404 Not Found' in a.metadata['error_message']
-    mock_notify.assert_called_once_with('yt-1')
+    mock_publish.assert_called_once_with('updated', ['yt-1'])
+    mock_notify.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -1363,10 +1850,11 @@ def remote_video_asset_dir() -> Iterator[str]:
 @pytest.mark.django_db
 def test_download_remote_video_asset_success_chains_into_normalize(
     remote_video_asset_dir: str,
+    django_capture_on_commit_callbacks: Any,
 ) -> None:
     """Happy path: requests streams a small payload to the row's
     persisted ``uri``, metadata gets stamped with ``source='remote_url'``
-    and ``source_url``, the dashboard notify fires, and
+    and ``source_url``, the dashboards get one ``updated`` delta, and
     ``normalize_video_asset`` is dispatched so the per-board codec
     gate runs. ``is_processing`` stays True across the chain — the
     chained normalize_video clears it once ffprobe finishes."""
@@ -1383,6 +1871,10 @@ def test_download_remote_video_asset_success_chains_into_normalize(
         mock.patch(
             'anthias_server.app.consumers.notify_asset_update'
         ) as mock_notify,
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as mock_publish,
+        django_capture_on_commit_callbacks(execute=True),
     ):
         download_remote_video_asset('rv-1', 'https://example.com/clip.mp4')
 
@@ -1400,7 +1892,8 @@ def test_download_remote_video_asset_success_chains_into_normalize(
     # the YouTube lifecycle for a single Processing → Done arc.
     assert a.is_processing is True
     mock_dispatch_normalize.assert_called_once_with('rv-1')
-    mock_notify.assert_called_once_with('rv-1')
+    mock_publish.assert_called_once_with('updated', ['rv-1'])
+    mock_notify.assert_not_called()
 
 
 @pytest.mark.django_db
@@ -1650,6 +2143,7 @@ def test_download_remote_video_asset_refuses_row_with_empty_uri(
 @pytest.mark.django_db
 def test_download_remote_video_asset_on_failure_writes_error_metadata(
     remote_video_asset_dir: str,
+    django_capture_on_commit_callbacks: Any,
 ) -> None:
     """When Celery declares the task failed, is_processing must flip
     back to False AND ``metadata.error_message`` must carry the
@@ -1657,9 +2151,15 @@ def test_download_remote_video_asset_on_failure_writes_error_metadata(
     pill — same operator-visible contract as YouTube / normalize
     failures."""
     _make_remote_video_asset(remote_video_asset_dir)
-    with mock.patch(
-        'anthias_server.app.consumers.notify_asset_update'
-    ) as mock_notify:
+    with (
+        mock.patch(
+            'anthias_server.app.consumers.notify_asset_update'
+        ) as mock_notify,
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as mock_publish,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
         download_remote_video_asset.on_failure(
             RuntimeError('connection refused'),
             task_id='t-1',
@@ -1671,7 +2171,111 @@ def test_download_remote_video_asset_on_failure_writes_error_metadata(
     assert a.is_processing is False
     assert 'RuntimeError' in a.metadata['error_message']
     assert 'connection refused' in a.metadata['error_message']
-    mock_notify.assert_called_once_with('rv-1')
+    mock_publish.assert_called_once_with('updated', ['rv-1'])
+    mock_notify.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_download_progress_leaves_the_row_alone(
+    remote_video_asset_dir: str,
+    _mock_redis: Any,
+) -> None:
+    """A progress tick goes to Redis and out as one dashboard nudge:
+    no playlist revision, no rewrite of the metadata the operator may
+    be editing meanwhile."""
+    from anthias_server.celery_tasks import _download_progress_reporter
+    from anthias_server.settings import PLAYLIST_REVISION_KEY
+
+    _make_remote_video_asset(remote_video_asset_dir)
+    Asset.objects.filter(asset_id='rv-1').update(metadata={'note': 'mine'})
+    revision = _mock_redis.get(PLAYLIST_REVISION_KEY)
+
+    with (
+        mock.patch(
+            'anthias_server.app.consumers.notify_asset_update'
+        ) as notify,
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as publish,
+    ):
+        _download_progress_reporter('rv-1')(420, 1000)
+
+    assert asset_rows.download_progress('rv-1') == {
+        'bytes': 420,
+        'total': 1000,
+        'percent': 42,
+    }
+    notify.assert_called_once_with('rv-1')
+    publish.assert_not_called()
+    assert _mock_redis.get(PLAYLIST_REVISION_KEY) == revision
+    assert Asset.objects.get(asset_id='rv-1').metadata == {'note': 'mine'}
+
+
+@pytest.mark.django_db
+def test_download_remote_video_asset_resumes_on_retry(
+    remote_video_asset_dir: str,
+) -> None:
+    """A connection dropped mid-body keeps the ``.part`` and its resume
+    sidecar for the Celery retry, which continues with a ``Range``
+    request instead of starting over; ``on_failure`` removes both once
+    the retries are spent."""
+    _make_remote_video_asset(remote_video_asset_dir)
+    payload = b'0123456789' * 10
+    dest = path.join(remote_video_asset_dir, 'rv-1.mp4')
+    headers = {
+        'Content-Type': 'video/mp4',
+        'Content-Length': str(len(payload)),
+        'Accept-Ranges': 'bytes',
+        'ETag': '"v1"',
+    }
+
+    def dropped(chunk_size: int) -> Iterator[bytes]:
+        yield payload[:40]
+        raise requests.exceptions.ConnectionError('reset by peer')
+
+    first = _fake_response(body=payload)
+    first.headers = headers
+    first.iter_content = dropped
+    rest = _fake_response(body=payload[40:], status_code=206)
+    rest.headers = {
+        **headers,
+        'Content-Length': '60',
+        'Content-Range': 'bytes 40-99/100',
+    }
+
+    with (
+        mock.patch('anthias_common.downloads.RESUME_ATTEMPTS', 0),
+        mock.patch(
+            'anthias_server.celery_tasks._session.get',
+            side_effect=[first, rest],
+        ) as fake_get,
+        mock.patch('anthias_server.processing.dispatch_normalize_video'),
+        mock.patch('anthias_server.app.consumers.notify_asset_update'),
+    ):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            download_remote_video_asset('rv-1', 'https://example.com/c.mp4')
+        assert path.exists(f'{dest}.part')
+        assert path.exists(f'{dest}.part.state')
+
+        download_remote_video_asset('rv-1', 'https://example.com/c.mp4')
+
+    assert fake_get.call_args.kwargs['headers']['Range'] == 'bytes=40-99'
+    with open(dest, 'rb') as fh:
+        assert fh.read() == payload
+    assert not path.exists(f'{dest}.part.state')
+    assert asset_rows.download_progress('rv-1') is None
+
+    with open(f'{dest}.part', 'wb') as part:
+        part.write(b'partial')
+    with mock.patch('anthias_server.app.consumers.notify_asset_update'):
+        download_remote_video_asset.on_failure(
+            OSError('gave up'),
+            task_id='t-1',
+            args=('rv-1', 'https://example.com/c.mp4'),
+            kwargs={},
+            einfo=None,
+        )
+    assert not path.exists(f'{dest}.part')
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,120 @@
+"""Tests for the coalescing notification layer (``anthias_server.coalesce``)."""
+
+from typing import Any
+from unittest import mock
+
+import pytest
+import redis
+
+from anthias_server import coalesce
+
+
+@pytest.fixture
+def scheduled(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Open windows stay open until the test flushes them by hand."""
+    monkeypatch.setattr(coalesce, 'COALESCE_WINDOW_S', 1.0)
+    windows: list[str] = []
+    monkeypatch.setattr(coalesce, '_schedule', windows.append)
+    return windows
+
+
+def test_burst_of_reloads_sends_one(scheduled: list[str]) -> None:
+    with mock.patch(
+        'anthias_server.settings.ViewerPublisher.send_to_viewer'
+    ) as send_to_viewer:
+        for n in range(50):
+            coalesce.request_viewer_reload([f'asset-{n}'])
+        send_to_viewer.assert_not_called()
+        assert scheduled == ['viewer_reload']
+
+        coalesce.flush('viewer_reload')
+
+    send_to_viewer.assert_called_once_with('reload')
+    assert coalesce.stats()['viewer_reload'] == {
+        'requests': 50,
+        'sent': 1,
+        'coalesced': 49,
+    }
+
+
+def test_dashboard_update_names_every_row(scheduled: list[str]) -> None:
+    with mock.patch(
+        'anthias_server.app.consumers.publish_asset_change'
+    ) as publish:
+        for asset_id in ('b', 'a', 'b', 'c'):
+            coalesce.request_dashboard_update([asset_id])
+        coalesce.flush('dashboard')
+
+    publish.assert_called_once_with('updated', ['a', 'b', 'c'])
+
+
+def test_unnamed_rows_make_a_reset(scheduled: list[str]) -> None:
+    with mock.patch(
+        'anthias_server.app.consumers.publish_asset_change'
+    ) as publish:
+        coalesce.request_dashboard_update(['a'])
+        coalesce.request_dashboard_update(None)
+        coalesce.flush('dashboard')
+
+    publish.assert_called_once_with('reset', None)
+
+
+def test_flush_opens_the_next_window(scheduled: list[str]) -> None:
+    with mock.patch(
+        'anthias_server.settings.ViewerPublisher.send_to_viewer'
+    ) as send_to_viewer:
+        coalesce.request_viewer_reload(['a'])
+        coalesce.flush('viewer_reload')
+        # A second flush for the same window finds nothing to send.
+        coalesce.flush('viewer_reload')
+        assert send_to_viewer.call_count == 1
+
+        coalesce.request_viewer_reload(['a'])
+        coalesce.flush('viewer_reload')
+
+    assert scheduled == ['viewer_reload', 'viewer_reload']
+    assert send_to_viewer.call_count == 2
+
+
+def test_kinds_have_separate_windows(scheduled: list[str]) -> None:
+    coalesce.request_viewer_reload(['a'])
+    coalesce.request_dashboard_update(['a'])
+    coalesce.request_viewer_reload(['b'])
+
+    assert scheduled == ['viewer_reload', 'dashboard']
+
+
+def test_window_flushes_on_a_timer(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(coalesce, 'COALESCE_WINDOW_S', 1.0)
+    with mock.patch('anthias_server.coalesce.threading.Timer') as timer:
+        coalesce.request_viewer_reload(['a'])
+        coalesce.request_viewer_reload(['b'])
+
+    timer.assert_called_once_with(1.0, coalesce.flush, args=('viewer_reload',))
+    timer.return_value.start.assert_called_once_with()
+
+
+def test_sent_straight_away_without_redis(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    broken: Any = mock.MagicMock()
+    broken.incr.side_effect = redis.ConnectionError('down')
+    broken.get.side_effect = redis.ConnectionError('down')
+    monkeypatch.setattr(coalesce, '_redis', lambda: broken)
+    with mock.patch(
+        'anthias_server.app.consumers.publish_asset_change'
+    ) as publish:
+        coalesce.request_dashboard_update(['a'])
+
+    publish.assert_called_once_with('updated', ['a'])
+    assert coalesce.stats() == {}
+
+
+def test_send_errors_are_swallowed(scheduled: list[str]) -> None:
+    with mock.patch(
+        'anthias_server.settings.ViewerPublisher.send_to_viewer',
+        side_effect=redis.ConnectionError('down'),
+    ):
+        coalesce.request_viewer_reload(['a'])
+        # Should not raise: the flush runs on a timer thread.
+        coalesce.flush('viewer_reload')
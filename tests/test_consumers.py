@@ -1,8 +1,11 @@
 import asyncio
+import json
+from typing import Any
 from unittest import mock
 
 import pytest
 
+from anthias_server.app import asset_feed
 from anthias_server.app.consumers import AssetConsumer
 
 
@@ -70,3 +73,113 @@ def test_asset_update_reraises_non_close_websocket_send_error() -> None:
         pytest.raises(RuntimeError, match='websocket.accept'),
     ):
         asyncio.run(consumer.asset_update({'asset_id': 'abc123'}))
+
+
+def test_asset_update_sends_numbered_delta() -> None:
+    consumer = AssetConsumer()
+    send = mock.AsyncMock()
+    entry = {'seq': 7, 'op': 'updated', 'asset_ids': ['abc123']}
+
+    with mock.patch.object(consumer, 'send', send):
+        asyncio.run(consumer.asset_update({'entry': entry}))
+
+    frame = json.loads(send.await_args_list[0].kwargs['text_data'])
+    assert frame == {'type': 'asset_delta', **entry}
+
+
+def test_feed_replays_changes_since() -> None:
+    first = asset_feed.record('updated', ['b', 'a', 'a'])
+    asset_feed.record('moved', ['a'])
+    asset_feed.record('created', [f'id-{n}' for n in range(50)])
+    assert first == {'seq': 1, 'op': 'updated', 'asset_ids': ['a', 'b']}
+
+    missed = asset_feed.changes_since(1)
+    assert missed is not None
+    assert [(e['seq'], e['op']) for e in missed] == [
+        (2, 'moved'),
+        (3, 'reset'),
+    ]
+    assert missed[1]['asset_ids'] is None
+    assert asset_feed.changes_since(3) == []
+    # Ahead of the counter (Redis lost its data): start over.
+    assert asset_feed.changes_since(9) is None
+
+
+def test_feed_gap_means_start_over() -> None:
+    with mock.patch.object(asset_feed, 'ASSET_CHANGES_MAX', 2):
+        for _ in range(3):
+            asset_feed.record('updated', ['a'])
+    assert asset_feed.changes_since(0) is None
+    assert [e['seq'] for e in asset_feed.changes_since(1) or []] == [2, 3]
+
+
+def _connect(consumer: AssetConsumer, query: bytes) -> None:
+    consumer.scope = {'query_string': query}
+    consumer.channel_layer = mock.AsyncMock()
+    consumer.channel_name = 'test'
+    with mock.patch.object(consumer, 'accept', mock.AsyncMock()):
+        asyncio.run(consumer.connect())
+
+
+def test_reconnect_resumes_from_seq() -> None:
+    for asset_id in ('a', 'b', 'c'):
+        asset_feed.record('updated', [asset_id])
+    consumer = AssetConsumer()
+    send = mock.AsyncMock()
+    with mock.patch.object(consumer, 'send', send):
+        _connect(consumer, b'since=1')
+    frames = [json.loads(c.kwargs['text_data']) for c in send.await_args_list]
+    assert [(f['seq'], f['asset_ids']) for f in frames] == [
+        (2, ['b']),
+        (3, ['c']),
+    ]
+
+
+def test_reconnect_past_the_list_is_told_to_reset() -> None:
+    asset_feed.record('updated', ['a'])
+    consumer = AssetConsumer()
+    send = mock.AsyncMock()
+    with mock.patch.object(consumer, 'send', send):
+        _connect(consumer, b'since=5')
+    send.assert_awaited_once_with(
+        text_data=json.dumps({'type': 'asset_reset', 'seq': 1})
+    )
+
+
+def test_first_connect_replays_nothing() -> None:
+    asset_feed.record('updated', ['a'])
+    consumer = AssetConsumer()
+    send = mock.AsyncMock()
+    with mock.patch.object(consumer, 'send', send):
+        _connect(consumer, b'')
+    send.assert_not_awaited()
+
+
+@pytest.mark.django_db
+def test_model_writes_publish_ops(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    from anthias_server.app.models import Asset
+
+    with (
+        mock.patch(
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as publish,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        Asset.objects.create(asset_id='a', name='A')
+        asset = Asset.objects.get(asset_id='a')
+        asset.name = 'Renamed'
+        asset.save()
+        asset.play_order = 3
+        asset.save()
+        Asset.objects.filter(asset_id='a').update(play_order=1)
+        Asset.objects.filter(asset_id='a').delete()
+
+    assert [c.args for c in publish.call_args_list] == [
+        ('created', ['a']),
+        ('updated', ['a']),
+        ('moved', ['a']),
+        ('moved', ['a']),
+        ('deleted', ['a']),
+    ]
@@ -0,0 +1,292 @@
+import os
+import time
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+import requests
+
+from anthias_common import content_cache
+from anthias_server.settings import settings
+
+URI = 'https://example.com/poster.jpg'
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def assetdir(tmp_path: Path) -> Any:
+    with (
+        mock.patch.dict(
+            settings, {'assetdir': str(tmp_path), 'content_cache_mb': 1}
+        ),
+        # Plenty of room unless a test says otherwise.
+        mock.patch(
+            'anthias_common.storage_health.disk_headroom',
+            return_value=100 * MB,
+        ),
+    ):
+        yield tmp_path
+
+
+def _response(
+    status: int = 200,
+    body: bytes = b'jpegbytes',
+    headers: dict[str, str] | None = None,
+) -> mock.MagicMock:
+    response = mock.MagicMock()
+    response.status_code = status
+    response.ok = status < 400
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response.iter_content.return_value = [
+        body[i : i + 4] for i in range(0, len(body), 4)
+    ]
+    return response
+
+
+def _session(*responses: mock.MagicMock) -> mock.MagicMock:
+    session = mock.MagicMock()
+    session.get.return_value.__enter__.side_effect = list(responses)
+    return session
+
+
+def _store(
+    uri: str = URI, body: bytes = b'jpegbytes', /, **headers: str
+) -> mock.MagicMock:
+    session = _session(_response(body=body, headers=headers))
+    assert content_cache.revalidate(uri, verify_ssl=True, session=session)
+    return session
+
+
+def test_freshness_follows_cache_control() -> None:
+    now = 1_000_000.0
+    assert content_cache.freshness({'Cache-Control': 'no-store'}, now) is None
+    assert content_cache.freshness({'Cache-Control': 'no-cache'}, now) == now
+    assert (
+        content_cache.freshness({'Cache-Control': 'public, max-age=600'}, now)
+        == now + 600
+    )
+
+
+def test_freshness_uses_expires_relative_to_date() -> None:
+    headers = {
+        'Date': 'Mon, 05 Jan 2026 12:00:00 GMT',
+        'Expires': 'Mon, 05 Jan 2026 13:00:00 GMT',
+    }
+    assert content_cache.freshness(headers, 50.0) == 50.0 + 3600
+
+
+def test_freshness_heuristic_is_capped() -> None:
+    now = time.time()
+    ancient = {'Last-Modified': 'Thu, 01 Jan 2015 00:00:00 GMT'}
+    assert (
+        content_cache.freshness(ancient, now)
+        == now + content_cache.HEURISTIC_FRESHNESS_MAX_S
+    )
+    assert content_cache.freshness({}, now) == now
+
+
+def test_image_is_stored_and_played_locally(assetdir: Path) -> None:
+    _store(ETag='"v1"')
+    local = content_cache.cached_path(URI)
+    assert local is not None
+    assert os.path.dirname(local) == str(assetdir)
+    assert os.path.basename(local).startswith(content_cache.CACHE_PREFIX)
+    assert local.endswith('.jpg')
+    assert Path(local).read_bytes() == b'jpegbytes'
+    assert not os.path.exists(local + '.tmp')
+
+
+def test_fresh_copy_needs_no_request(assetdir: Path) -> None:
+    _store(**{'Cache-Control': 'max-age=3600'})
+    session = _session()
+    assert content_cache.revalidate(URI, verify_ssl=True, session=session)
+    session.get.assert_not_called()
+
+
+def test_stale_copy_is_revalidated_conditionally(assetdir: Path) -> None:
+    last_modified = 'Mon, 05 Jan 2026 12:00:00 GMT'
+    _store(
+        ETag='"v1"',
+        **{'Cache-Control': 'no-cache', 'Last-Modified': last_modified},
+    )
+
+    session = _session(
+        _response(304, body=b'', headers={'Cache-Control': 'max-age=60'})
+    )
+    assert content_cache.revalidate(URI, verify_ssl=True, session=session)
+
+    sent = session.get.call_args.kwargs['headers']
+    assert sent['If-None-Match'] == '"v1"'
+    assert sent['If-Modified-Since'] == last_modified
+    entry = content_cache.load_entry(URI)
+    assert entry is not None
+    assert entry.is_fresh(time.time())
+    assert entry.etag == '"v1"'
+    # The 304 kept the body that was already there.
+    local = content_cache.cached_path(URI)
+    assert local is not None
+    assert Path(local).read_bytes() == b'jpegbytes'
+
+
+def test_changed_content_replaces_the_copy(assetdir: Path) -> None:
+    _store(ETag='"v1"', **{'Cache-Control': 'no-cache'})
+    _store(URI, b'newer', ETag='"v2"')
+    local = content_cache.cached_path(URI)
+    assert local is not None
+    assert Path(local).read_bytes() == b'newer'
+
+
+def test_no_store_is_not_kept(assetdir: Path) -> None:
+    _store(**{'Cache-Control': 'no-store'})
+    assert content_cache.cached_path(URI) is None
+    assert os.listdir(assetdir) == []
+
+
+def test_body_over_the_limit_is_not_kept(assetdir: Path) -> None:
+    session = _session(_response(body=b'x' * 64))
+    assert content_cache.revalidate(
+        URI, verify_ssl=True, max_bytes=16, session=session
+    )
+    assert content_cache.cached_path(URI) is None
+    assert os.listdir(assetdir) == []
+
+
+def test_nothing_is_written_under_disk_pressure(assetdir: Path) -> None:
+    with mock.patch(
+        'anthias_common.storage_health.disk_headroom', return_value=-1
+    ):
+        _store()
+    assert content_cache.cached_path(URI) is None
+
+
+def test_error_status_is_unreachable(assetdir: Path) -> None:
+    session = _session(_response(404))
+    assert not content_cache.revalidate(URI, verify_ssl=True, session=session)
+
+
+def test_unreachable_origin_keeps_a_cached_copy_showable(
+    assetdir: Path,
+) -> None:
+    session = mock.MagicMock()
+    session.get.side_effect = requests.exceptions.ConnectionError()
+    assert not content_cache.revalidate(URI, verify_ssl=True, session=session)
+
+    _store(**{'Cache-Control': 'no-cache'})
+    assert content_cache.revalidate(URI, verify_ssl=True, session=session)
+
+
+def test_verification_follows_the_flag(assetdir: Path) -> None:
+    session = _store()
+    assert session.get.call_args.kwargs['verify'] is not False
+    content_cache.drop(URI)
+    session = _session(_response())
+    content_cache.revalidate(URI, verify_ssl=False, session=session)
+    assert session.get.call_args.kwargs['verify'] is False
+
+
+def test_cacheability() -> None:
+    with mock.patch.dict(settings, {'content_cache_mb': 1}):
+        assert content_cache.is_cacheable(URI)
+        assert not content_cache.is_cacheable(URI, nocache=True)
+        assert not content_cache.is_cacheable('rtsp://camera.local/live')
+        assert not content_cache.is_cacheable('/data/local.png')
+    with mock.patch.dict(settings, {'content_cache_mb': 0}):
+        assert not content_cache.is_cacheable(URI)
+
+
+def _age(file_path: str, seconds: float) -> None:
+    then = time.time() - seconds
+    os.utime(file_path, (then, then))
+
+
+def test_least_recently_played_is_evicted_first(assetdir: Path) -> None:
+    old, new = 'https://example.com/old.png', 'https://example.com/new.png'
+    _store(old, b'o' * (MB // 2 + 1))
+    _age(content_cache.body_path(old), 60)
+    _store(new, b'n' * (MB // 2 + 1))
+    # Storing ``new`` pushed the cache past 1 MB and ``old`` had the
+    # older mtime, so it went.
+    assert content_cache.cached_path(old) is None
+    assert content_cache.cached_path(new) is not None
+
+
+def test_writes_inside_the_limit_do_not_list_the_directory(
+    assetdir: Path,
+) -> None:
+    a, b = 'https://example.com/a.png', 'https://example.com/b.png'
+    # The first write finds no running total and reconciles it.
+    _store(a, b'a' * 100)
+    with mock.patch.object(
+        content_cache, 'enforce_limit', wraps=content_cache.enforce_limit
+    ) as enforce:
+        _store(b, b'b' * 200)
+        _store(a, b'a' * 50)
+        enforce.assert_not_called()
+        content_cache.drop(b)
+        assert int(content_cache._redis().get(content_cache.SIZE_KEY)) == 50
+
+        # Redis lost the total: the next write counts again.
+        content_cache._redis().delete(content_cache.SIZE_KEY)
+        _store(b, b'b' * 200)
+        enforce.assert_called_once_with()
+    assert int(content_cache._redis().get(content_cache.SIZE_KEY)) == 250
+
+
+def test_playing_a_copy_refreshes_its_place(assetdir: Path) -> None:
+    a, b = 'https://example.com/a.png', 'https://example.com/b.png'
+    _store(a, b'a' * (MB // 3))
+    _store(b, b'b' * (MB // 3))
+    _age(content_cache.body_path(a), 3600)
+    _age(content_cache.body_path(b), 1800)
+    assert content_cache.cached_path(a) is not None  # played: now newest
+
+    with mock.patch.object(
+        content_cache, 'cache_limit_bytes', return_value=MB // 2
+    ):
+        content_cache.enforce_limit()
+    assert content_cache.cached_path(a) is not None
+    assert content_cache.cached_path(b) is None
+
+
+def test_disk_pressure_gives_space_back(assetdir: Path) -> None:
+    _store(URI, b'x' * 1000)
+    with mock.patch(
+        'anthias_common.storage_health.disk_headroom', return_value=-500
+    ):
+        freed = content_cache.enforce_limit()
+    assert freed == 1000
+    assert content_cache.cached_path(URI) is None
+
+
+def test_copies_no_asset_uses_are_evicted(assetdir: Path) -> None:
+    other = 'https://example.com/gone.png'
+    _store()
+    _store(other)
+    content_cache.enforce_limit(keep_uris={URI})
+    assert content_cache.cached_path(URI) is not None
+    assert content_cache.cached_path(other) is None
+    assert len(os.listdir(assetdir / content_cache.META_DIRNAME)) == 1
+
+
+def test_orphans_are_tidied(assetdir: Path) -> None:
+    _store()
+    os.remove(content_cache.body_path(URI))
+    young = assetdir / f'{content_cache.CACHE_PREFIX}young.png'
+    stale = assetdir / f'{content_cache.CACHE_PREFIX}stale.png'
+    young.write_bytes(b'x')
+    stale.write_bytes(b'x')
+    _age(str(stale), 2 * content_cache.ORPHAN_GRACE_S)
+
+    content_cache.enforce_limit()
+
+    assert os.listdir(assetdir / content_cache.META_DIRNAME) == []
+    assert young.exists()
+    assert not stale.exists()
+
+
+def test_body_record_mismatch_is_not_played(assetdir: Path) -> None:
+    _store()
+    Path(content_cache.body_path(URI)).write_bytes(b'half')
+    assert content_cache.cached_path(URI) is None
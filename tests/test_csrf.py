@@ -9,12 +9,18 @@ bad / missing tokens must still fail.
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client
 from django.urls import reverse
 
+from anthias_server.app.models import Asset
+from anthias_server.settings import settings as anthias_settings
+
 if TYPE_CHECKING:
     from pytest_django.fixtures import Settings
 
@@ -247,3 +253,52 @@ def test_trusted_origin_does_not_open_other_hosts(
         HTTP_ORIGIN=_HTTP_CROSS_HOST_ORIGIN,
     )
     assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_upload_view_keeps_the_same_host_rule(tmp_path: Path) -> None:
+    """``assets_upload`` is exempt from the middleware so it can stream
+    the body itself; its own check must apply the same Origin rule and
+    remove the staged file when it rejects."""
+    client = Client(enforce_csrf_checks=True)
+    token = _seed_csrf_cookie(client, 'anthias.local')
+    upload = SimpleUploadedFile('a.png', b'\x89PNG\r\n\x1a\n')
+    with mock.patch.dict(anthias_settings, {'assetdir': str(tmp_path)}):
+        rejected = client.post(
+            reverse('anthias_app:assets_upload'),
+            data={'file_upload': upload},
+            HTTP_HOST='anthias.local',
+            HTTP_ORIGIN=_HTTP_CROSS_HOST_ORIGIN,
+        )
+        assert rejected.status_code == 403
+        assert list(tmp_path.iterdir()) == []
+
+        upload.seek(0)
+        accepted = client.post(
+            reverse('anthias_app:assets_upload'),
+            data={'file_upload': upload, 'csrfmiddlewaretoken': token},
+            HTTP_HOST='anthias.local',
+            HTTP_ORIGIN=_HTTPS_SAME_HOST_ORIGIN,
+        )
+    assert accepted.status_code == 302
+    assert Asset.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_upload_refuses_a_cross_site_origin_before_reading_the_body() -> None:
+    """The Origin check needs no body, so a cross-site post is turned
+    away before ``AssetUploadHandler`` would stream it onto disk."""
+    client = Client(enforce_csrf_checks=True)
+    _seed_csrf_cookie(client, 'anthias.local')
+    upload = SimpleUploadedFile('a.png', b'\x89PNG\r\n\x1a\n')
+    with mock.patch(
+        'anthias_server.app.views.AssetUploadHandler'
+    ) as upload_handler:
+        response = client.post(
+            reverse('anthias_app:assets_upload'),
+            data={'file_upload': upload},
+            HTTP_HOST='anthias.local',
+            HTTP_ORIGIN=_HTTP_CROSS_HOST_ORIGIN,
+        )
+    assert response.status_code == 403
+    upload_handler.assert_not_called()
@@ -0,0 +1,198 @@
+import re
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+import requests
+
+from anthias_common import downloads
+
+URL = 'https://cdn.example.com/clip.mp4'
+
+
+class _Origin:
+    """A fake ``requests.Session`` serving one file, honouring
+    ``Range``/``If-Range`` the way a CDN does. ``drop_after`` cuts the
+    first response's body after that many bytes."""
+
+    def __init__(
+        self,
+        body: bytes,
+        *,
+        etag: str | None = '"v1"',
+        ranges: bool = True,
+        drop_after: int | None = None,
+    ) -> None:
+        self.body = body
+        self.etag = etag
+        self.ranges = ranges
+        self.drop_after = drop_after
+        self.requests: list[dict[str, str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs: Any) -> mock.MagicMock:
+        headers = kwargs.get('headers') or {}
+        with self._lock:
+            self.requests.append(headers)
+            drop_after, self.drop_after = self.drop_after, None
+
+        response_headers = {'Content-Type': 'video/mp4'}
+        if self.etag:
+            response_headers['ETag'] = self.etag
+        if self.ranges:
+            response_headers['Accept-Ranges'] = 'bytes'
+        status, body = 200, self.body
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)?', headers.get('Range', ''))
+        if (
+            match
+            and self.ranges
+            and headers.get('If-Range') in (None, self.etag)
+        ):
+            start = int(match.group(1))
+            end = int(match.group(2) or len(self.body) - 1)
+            status, body = 206, self.body[start : end + 1]
+            response_headers['Content-Range'] = (
+                f'bytes {start}-{end}/{len(self.body)}'
+            )
+        response_headers['Content-Length'] = str(len(body))
+
+        def iter_content(chunk_size: int) -> Iterator[bytes]:
+            for i in range(0, len(body), 4):
+                if drop_after is not None and i >= drop_after:
+                    raise requests.exceptions.ConnectionError('dropped')
+                yield body[i : i + 4]
+
+        response = mock.MagicMock()
+        response.status_code = status
+        response.ok = status < 400
+        response.headers = requests.structures.CaseInsensitiveDict(
+            response_headers
+        )
+        response.iter_content = iter_content
+        response.__enter__.return_value = response
+        response.__exit__.return_value = False
+        return response
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff() -> Iterator[None]:
+    with mock.patch.object(downloads, 'RESUME_BACKOFF_S', 0):
+        yield
+
+
+def _fetch(origin: _Origin, part: Path, **kwargs: Any) -> int:
+    kwargs.setdefault('max_bytes', 1024)
+    return downloads.fetch(
+        origin,  # type: ignore[arg-type]
+        URL,
+        str(part),
+        timeout=5,
+        **kwargs,
+    )
+
+
+def test_plain_download(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(b'0123456789' * 10)
+    assert _fetch(origin, part) == 100
+    assert part.read_bytes() == origin.body
+    assert not Path(downloads.state_path(str(part))).exists()
+    assert origin.requests[0]['Accept-Encoding'] == 'identity'
+
+
+def test_dropped_connection_resumes_with_a_range(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(b'0123456789' * 10, drop_after=40)
+    assert _fetch(origin, part) == 100
+    assert part.read_bytes() == origin.body
+    assert origin.requests[1]['Range'] == 'bytes=40-99'
+    assert origin.requests[1]['If-Range'] == '"v1"'
+
+
+def test_a_later_call_resumes_from_the_sidecar(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(b'0123456789' * 10, drop_after=40)
+    with (
+        mock.patch.object(downloads, 'RESUME_ATTEMPTS', 0),
+        pytest.raises(requests.exceptions.ConnectionError),
+    ):
+        _fetch(origin, part)
+    assert Path(downloads.state_path(str(part))).exists()
+
+    assert _fetch(origin, part) == 100
+    assert part.read_bytes() == origin.body
+    assert origin.requests[1]['Range'] == 'bytes=40-99'
+    assert not Path(downloads.state_path(str(part))).exists()
+
+
+def test_a_changed_file_is_refetched_whole(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(b'a' * 100, drop_after=40)
+    with (
+        mock.patch.object(downloads, 'RESUME_ATTEMPTS', 0),
+        pytest.raises(requests.exceptions.ConnectionError),
+    ):
+        _fetch(origin, part)
+
+    origin.body, origin.etag = b'b' * 100, '"v2"'
+    assert _fetch(origin, part) == 100
+    # The If-Range didn't match, so nothing of v1 survives.
+    assert part.read_bytes() == b'b' * 100
+
+
+def test_large_files_are_fetched_in_parallel_segments(
+    tmp_path: Path,
+) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(bytes(range(256)) * 4)
+    with mock.patch.object(downloads, 'PARALLEL_MIN_BYTES', 512):
+        assert _fetch(origin, part, max_bytes=4096, segments=4) == 1024
+    assert part.read_bytes() == origin.body
+    ranges = sorted(r['Range'] for r in origin.requests if 'Range' in r)
+    assert ranges == [
+        'bytes=0-255',
+        'bytes=256-511',
+        'bytes=512-767',
+        'bytes=768-1023',
+    ]
+
+
+def test_origin_without_ranges_is_not_resumed(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(b'x' * 100, ranges=False, drop_after=40)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _fetch(origin, part)
+    assert len(origin.requests) == 1
+    assert not Path(downloads.state_path(str(part))).exists()
+
+
+def test_announced_size_over_the_cap_is_refused(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    with pytest.raises(downloads.DownloadTooLarge):
+        _fetch(_Origin(b'x' * 100), part, max_bytes=50)
+
+
+def test_short_body_is_incomplete(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    origin = _Origin(b'x' * 100, ranges=False)
+    real_get = origin.get
+
+    def short(url: str, **kwargs: Any) -> mock.MagicMock:
+        response = real_get(url, **kwargs)
+        response.headers['Content-Length'] = '200'
+        return response
+
+    origin.get = short  # type: ignore[method-assign]
+    with pytest.raises(downloads.IncompleteDownload):
+        _fetch(origin, part)
+
+
+def test_progress_is_reported(tmp_path: Path) -> None:
+    part = tmp_path / 'clip.mp4.part'
+    progress = mock.Mock()
+    with mock.patch.object(downloads, 'PROGRESS_INTERVAL_S', 0):
+        _fetch(_Origin(b'x' * 100), part, progress=progress)
+    assert progress.call_args.args == (100, 100)
@@ -11,8 +11,10 @@ the loop's error/EOS/rebuild logic is exercised without a real
 GStreamer runtime.
 """
 
+import json
 import logging
 import sys
+from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -49,6 +51,9 @@ def _make_gst() -> MagicMock:
     Gst.StateChangeReturn.FAILURE = 'FAILURE'
     Gst.MessageType.ERROR = 'ERROR'
     Gst.MessageType.EOS = 'EOS'
+    Gst.MessageType.ASYNC_DONE = 'ASYNC_DONE'
+    Gst.MessageType.QOS = 'QOS'
+    Gst.Format.BUFFERS = 'BUFFERS'
     Gst.EventType.CAPS = 'CAPS'
     Gst.PadProbeReturn.OK = 'PROBE_OK'
     Gst.PadProbeType.EVENT_DOWNSTREAM = 'EVENT_DOWNSTREAM'
@@ -394,3 +399,86 @@ def test_sigterm_quits_loop() -> None:
 
     _run(ctx, ARGV, driver)
     ctx.loop.quit.assert_called()
+
+
+# --------------------------------------------------------------------------
+# --stats-file
+# --------------------------------------------------------------------------
+
+
+def test_stats_file_records_first_frame_gaps_and_late_frames(
+    tmp_path: Path,
+) -> None:
+    ctx = _harness()
+    ctx.playbin.seek_simple.return_value = True
+    # No GstBaseSink ``stats`` property: the QoS tallies stand in.
+    ctx.video_sink.get_by_name.return_value.get_property.side_effect = (
+        TypeError('no stats property')
+    )
+    stats_file = tmp_path / 'stats.json'
+
+    def driver(ctx: SimpleNamespace) -> None:
+        on_message = _connected(ctx.bus, 'message')
+
+        def message(kind: str, src: Any = ctx.playbin) -> MagicMock:
+            return MagicMock(src=src, type=kind)
+
+        # A child element's preroll is not the pipeline's.
+        on_message(ctx.bus, message('ASYNC_DONE', src=MagicMock()))
+        on_message(ctx.bus, message('ASYNC_DONE'))
+        fb_sink = ctx.video_sink.get_by_name.return_value
+        # videorate's deliberate drops are not late frames.
+        rate_qos = message('QOS', src=MagicMock())
+        rate_qos.parse_qos_stats.return_value = ('BUFFERS', 240, 50)
+        on_message(ctx.bus, rate_qos)
+        qos = message('QOS', src=fb_sink)
+        qos.parse_qos_stats.return_value = ('BUFFERS', 200, 1)
+        on_message(ctx.bus, qos)
+        # A running total: only the growth counts.
+        qos.parse_qos_stats.return_value = ('BUFFERS', 240, 2)
+        on_message(ctx.bus, qos)
+        on_message(ctx.bus, message('EOS'))
+        on_message(ctx.bus, message('ASYNC_DONE'))
+        # The loop's flush reset the sink's total.
+        qos.parse_qos_stats.return_value = ('BUFFERS', 30, 1)
+        on_message(ctx.bus, qos)
+
+    with patch(
+        'anthias_viewer.gst_fbdev_player.time.time', return_value=1000.5
+    ):
+        assert _run(ctx, ARGV + ['--stats-file', str(stats_file)], driver) == 0
+
+    stats = json.loads(stats_file.read_text())
+    assert stats['first_frame_at'] == 1000.5
+    assert len(stats['loop_gaps_ms']) == 1
+    assert stats['loop_gaps_ms'][0] >= 0
+    assert stats['late'] == 3
+    assert stats['rendered'] == 30
+    assert stats['dropped'] == 1
+
+
+def test_stats_file_prefers_the_sink_tallies(tmp_path: Path) -> None:
+    ctx = _harness()
+    sink_stats = MagicMock()
+    sink_stats.get_uint64.side_effect = lambda field: (
+        True,
+        {'rendered': 1500, 'dropped': 4}[field],
+    )
+    fb_sink = ctx.video_sink.get_by_name.return_value
+    fb_sink.get_property.return_value = sink_stats
+    stats_file = tmp_path / 'stats.json'
+
+    assert _run(ctx, ARGV + ['--stats-file', str(stats_file)]) == 0
+
+    ctx.video_sink.get_by_name.assert_any_call('fb_sink')
+    fb_sink.get_property.assert_called_with('stats')
+    stats = json.loads(stats_file.read_text())
+    assert (stats['rendered'], stats['dropped']) == (1500, 4)
+    assert stats['first_frame_at'] is None
+
+
+def test_no_stats_file_unless_asked(tmp_path: Path) -> None:
+    ctx = _harness()
+    with patch.object(mod, 'write_stats') as write_stats:
+        assert _run(ctx, ARGV) == 0
+    write_stats.assert_not_called()
@@ -1,7 +1,9 @@
+import json
 import logging
 import signal
 import sys
 from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -1034,6 +1036,63 @@ def test_stop_kills_process_group(gstfb: _GstFixtures) -> None:
     assert gstfb.player._proc is None
 
 
+def test_build_command_passes_stats_file(gstfb: _GstFixtures) -> None:
+    gstfb.player.uri = 'file:///test/video.mp4'
+    cmd = gstfb.player._build_command()
+    assert _flag(cmd, '--stats-file') == gstfb.player._stats_file
+
+
+def test_stop_records_the_helper_stats(
+    gstfb: _GstFixtures, tmp_path: Path
+) -> None:
+    stats_file = tmp_path / 'stats.json'
+    stats_file.write_text(
+        json.dumps(
+            {
+                'first_frame_at': 1000.75,
+                'loop_gaps_ms': [30],
+                'rendered': 880,
+                'dropped': 2,
+                'late': 6,
+            }
+        )
+    )
+    gstfb.player._stats_file = str(stats_file)
+    gstfb.player._play_started = 1000.0
+    fake_proc = MagicMock()
+    fake_proc.poll.return_value = 0
+    gstfb.player._proc = fake_proc
+    with patch(
+        'anthias_viewer.media_player.playback_metrics.record_video'
+    ) as record_video:
+        gstfb.player.stop()
+
+    record_video.assert_called_once_with(
+        'gst-fbdev',
+        first_frame_ms=750.0,
+        rendered=880,
+        dropped=2,
+        late=6,
+        loop_gaps_ms=[30],
+    )
+    # Consumed, so the next clip can't pick it up again.
+    assert not stats_file.exists()
+
+
+def test_stop_without_stats_records_nothing(
+    gstfb: _GstFixtures, tmp_path: Path
+) -> None:
+    # A SIGKILLed helper leaves no file behind.
+    gstfb.player._stats_file = str(tmp_path / 'missing.json')
+    gstfb.player._proc = MagicMock()
+    gstfb.player._proc.poll.return_value = 0
+    with patch(
+        'anthias_viewer.media_player.playback_metrics.record_video'
+    ) as record_video:
+        gstfb.player.stop()
+    record_video.assert_not_called()
+
+
 def test_is_playing_false_when_process_exited(gstfb: _GstFixtures) -> None:
     fake_proc = MagicMock()
     fake_proc.poll.return_value = 0  # exited
@@ -1447,3 +1506,65 @@ class TestPlayRoutesThroughWebviewWrapper:
         mpv.player.play()
         mpv.mock_bus.playVideo.assert_called_once()
         assert mpv.player.is_playing() is True
+
+
+_STATS_LOG = """\
+2026-10-18T10:00:00Z LOADFILE uri=/data/a.mp4 options={audio-device=hdmi}
+2026-10-18T10:00:01Z SAMPLE position-ms=900 frames-delivered=27 \
+frames-forwarded=27 frames-rendered=26 expected=27 dropped=0
+2026-10-18T10:00:02Z SAMPLE position-ms=1900 frames-delivered=55 \
+frames-forwarded=55 frames-rendered=54 expected=57 dropped=2
+2026-10-18T10:00:02Z STOP uri=/data/a.mp4 elapsed_ms=1950 \
+frames-delivered=56 frames-forwarded=56 frames-rendered=55 position-ms=1940
+2026-10-18T10:00:03Z LOADFILE uri=/data/b.mp4 options={}
+2026-10-18T10:00:04Z STOP uri=/data/b.mp4 elapsed_ms=-1 \
+frames-delivered=0 frames-forwarded=0 frames-rendered=0 position-ms=0
+""".replace('\\\n', '')
+
+
+def test_read_webview_stop_stats(tmp_path: Path) -> None:
+    log = tmp_path / 'playback-stats.log'
+    log.write_text(_STATS_LOG)
+
+    assert media_player_module._read_webview_stop_stats(
+        '/data/a.mp4', str(log)
+    ) == {'elapsed_ms': 1950, 'rendered': 55, 'dropped': 2}
+    # Never loaded, no SAMPLE line: nothing is made up.
+    assert media_player_module._read_webview_stop_stats(
+        '/data/b.mp4', str(log)
+    ) == {'elapsed_ms': -1, 'rendered': 0, 'dropped': None}
+    assert (
+        media_player_module._read_webview_stop_stats('/data/c.mp4', str(log))
+        is None
+    )
+    assert (
+        media_player_module._read_webview_stop_stats(
+            '/data/a.mp4', str(tmp_path / 'missing.log')
+        )
+        is None
+    )
+
+
+def test_mpv_stop_records_the_webview_stats(
+    mpv: _MPVFixtures, tmp_path: Path
+) -> None:
+    log = tmp_path / 'playback-stats.log'
+    log.write_text(_STATS_LOG)
+    mpv.player.set_asset('/data/a.mp4', 10)
+    with (
+        patch.object(media_player_module, 'WEBVIEW_STATS_LOG', str(log)),
+        patch(
+            'anthias_viewer.media_player.playback_metrics.record_video'
+        ) as record_video,
+        patch(
+            'anthias_viewer.media_player.time.time',
+            side_effect=[100.0, 102.5],
+        ),
+    ):
+        mpv.player.play()
+        mpv.player.stop()
+
+    # 2.5 s on screen, 1.95 s of it after the media loaded.
+    record_video.assert_called_once_with(
+        'qtmultimedia', first_frame_ms=550.0, rendered=55, dropped=2
+    )
@@ -0,0 +1,131 @@
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+import sh
+
+from anthias_common import mediainfo
+from anthias_common.utils import get_video_duration
+
+PROBED = {
+    'streams': [{'codec_type': 'video', 'codec_name': 'h264'}],
+    'format': {'duration': '5.570000'},
+}
+
+
+def _clip(tmp_path: Path, body: bytes = b'not really a video') -> str:
+    target = tmp_path / 'clip.mp4'
+    target.write_bytes(body)
+    return str(target)
+
+
+def test_probe_is_cached_by_file_identity(tmp_path: Path) -> None:
+    clip = _clip(tmp_path)
+    with mock.patch.object(
+        mediainfo, 'run_ffprobe', return_value=PROBED
+    ) as run:
+        assert mediainfo.probe(clip) == PROBED
+        assert mediainfo.probe(clip) == PROBED
+    run.assert_called_once_with(clip)
+
+
+def test_linked_files_share_a_probe(tmp_path: Path) -> None:
+    clip = _clip(tmp_path)
+    twin = str(tmp_path / 'twin.mp4')
+    os.link(clip, twin)
+    with mock.patch.object(
+        mediainfo, 'run_ffprobe', return_value=PROBED
+    ) as run:
+        mediainfo.probe(clip)
+        mediainfo.probe(twin)
+    assert run.call_count == 1
+
+
+def test_rewritten_file_is_probed_again(tmp_path: Path) -> None:
+    clip = _clip(tmp_path)
+    with mock.patch.object(
+        mediainfo, 'run_ffprobe', return_value=PROBED
+    ) as run:
+        mediainfo.probe(clip)
+        Path(clip).write_bytes(b'a different, longer body')
+        mediainfo.probe(clip)
+    assert run.call_count == 2
+
+
+def test_missing_file_is_probed_uncached(tmp_path: Path) -> None:
+    missing = str(tmp_path / 'gone.mp4')
+    assert mediainfo.cache_key(missing) is None
+    err = sh.ErrorReturnCode_1('ffprobe', b'', b'No such file')
+    with (
+        mock.patch.object(mediainfo, 'run_ffprobe', side_effect=err),
+        pytest.raises(sh.ErrorReturnCode_1),
+    ):
+        mediainfo.probe(missing)
+
+
+def test_probe_many_runs_in_parallel_and_keeps_errors(tmp_path: Path) -> None:
+    paths = []
+    for name in ('a', 'b', 'c'):
+        target = tmp_path / f'{name}.mp4'
+        target.write_bytes(name.encode())
+        paths.append(str(target))
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_probe(file_path: str) -> dict[str, Any]:
+        # Every probe waits for the other two: only a pool of three
+        # gets past the barrier.
+        barrier.wait()
+        if file_path.endswith('b.mp4'):
+            raise sh.ErrorReturnCode_1('ffprobe', b'', b'corrupt')
+        return PROBED
+
+    with mock.patch.object(mediainfo, 'run_ffprobe', side_effect=fake_probe):
+        results = mediainfo.probe_many(paths + paths[:1], max_workers=3)
+
+    assert list(results) == paths
+    assert results[paths[0]] == PROBED
+    assert isinstance(results[paths[1]], sh.ErrorReturnCode_1)
+    assert results[paths[2]] == PROBED
+
+
+@pytest.mark.parametrize(
+    'fmt,expected',
+    [
+        ({'duration': '5.57'}, timedelta(seconds=5.57)),
+        ({'duration': 'N/A'}, None),
+        ({'duration': 'nan'}, None),
+        ({}, None),
+    ],
+)
+def test_duration(fmt: dict[str, str], expected: timedelta | None) -> None:
+    assert mediainfo.duration({'format': fmt}) == expected
+
+
+def test_get_video_duration_reads_the_shared_probe(tmp_path: Path) -> None:
+    clip = _clip(tmp_path)
+    with mock.patch.object(
+        mediainfo, 'run_ffprobe', return_value=PROBED
+    ) as run:
+        mediainfo.probe(clip)
+        assert get_video_duration(clip) == timedelta(seconds=5.57)
+    run.assert_called_once()
+
+
+def test_get_video_duration_without_ffprobe(tmp_path: Path) -> None:
+    with mock.patch.object(
+        mediainfo, 'run_ffprobe', side_effect=sh.CommandNotFound('ffprobe')
+    ):
+        assert get_video_duration(_clip(tmp_path)) is None
+
+
+def test_get_video_duration_bad_format(tmp_path: Path) -> None:
+    err = sh.ErrorReturnCode_1('ffprobe', b'', b'Invalid data')
+    with (
+        mock.patch.object(mediainfo, 'run_ffprobe', side_effect=err),
+        pytest.raises(RuntimeError, match='Bad video format'),
+    ):
+        get_video_duration(_clip(tmp_path))
@@ -0,0 +1,143 @@
+"""Tests for the playback metrics store
+(``anthias_common.playback_metrics``) and its v2 endpoint."""
+
+from typing import Any
+from unittest import mock
+
+import pytest
+import redis
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from anthias_common import playback_metrics
+
+
+def test_observe_fills_buckets_and_summary() -> None:
+    for value_ms in (30, 80, 80, 400, 45000):
+        playback_metrics.observe('load_ms', 'image', value_ms)
+
+    image = playback_metrics.read()['histograms']['load_ms']['image']
+
+    assert image['count'] == 5
+    assert image['sum_ms'] == 30 + 80 + 80 + 400 + 45000
+    assert image['mean_ms'] == round((30 + 80 + 80 + 400 + 45000) / 5)
+    # Cumulative: every bucket counts the samples at or under it.
+    assert image['buckets']['50'] == 1
+    assert image['buckets']['100'] == 3
+    assert image['buckets']['250'] == 3
+    assert image['buckets']['500'] == 4
+    assert image['buckets']['30000'] == 4
+    assert image['buckets']['+Inf'] == 5
+    assert image['p50_ms'] == 100
+    # The slowest sample is past the last bound.
+    assert image['p95_ms'] is None
+
+
+def test_unrecorded_series_read_as_zero() -> None:
+    metrics = playback_metrics.read()
+
+    web = metrics['histograms']['load_ms']['web']
+    assert web['count'] == 0
+    assert web['mean_ms'] is None
+    assert web['p50_ms'] is None
+    assert metrics['counters']['webview_respawns'] == {
+        'mid_call': 0,
+        'between_assets': 0,
+    }
+    assert metrics['buckets_ms'] == list(playback_metrics.BUCKETS_MS)
+
+
+def test_record_video_leaves_out_what_the_player_could_not_tell() -> None:
+    playback_metrics.record_video(
+        'gst-fbdev',
+        first_frame_ms=620,
+        rendered=900,
+        dropped=3,
+        late=5,
+        loop_gaps_ms=[40, 1200],
+    )
+    playback_metrics.record_video(
+        'qtmultimedia', first_frame_ms=None, rendered=450, dropped=None
+    )
+
+    metrics = playback_metrics.read()
+    counters = metrics['counters']
+    histograms = metrics['histograms']
+    assert counters['videos'] == {'gst-fbdev': 1, 'qtmultimedia': 1}
+    assert counters['frames_rendered'] == {
+        'gst-fbdev': 900,
+        'qtmultimedia': 450,
+    }
+    assert counters['frames_dropped'] == {'gst-fbdev': 3, 'qtmultimedia': 0}
+    assert counters['frames_late'] == {'gst-fbdev': 5, 'qtmultimedia': 0}
+    assert histograms['first_frame_ms']['gst-fbdev']['count'] == 1
+    assert histograms['first_frame_ms']['qtmultimedia']['count'] == 0
+    assert histograms['loop_gap_ms']['gst-fbdev']['count'] == 2
+
+
+def test_unknown_series_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        playback_metrics.observe('load_ms', 'audio', 10)
+    with pytest.raises(ValueError):
+        playback_metrics.increment('frames_dropped', 'mpv')
+
+
+def test_reset_clears_everything() -> None:
+    playback_metrics.observe('load_ms', 'video', 300)
+    playback_metrics.increment('webview_respawns', 'mid_call')
+
+    playback_metrics.reset()
+
+    metrics = playback_metrics.read()
+    assert metrics['histograms']['load_ms']['video']['count'] == 0
+    assert metrics['counters']['webview_respawns']['mid_call'] == 0
+
+
+def test_redis_errors_cost_the_sample_only(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    broken: Any = mock.MagicMock()
+    broken.hincrby.side_effect = redis.ConnectionError('down')
+    broken.hgetall.side_effect = redis.ConnectionError('down')
+    monkeypatch.setattr(playback_metrics, '_redis', lambda: broken)
+
+    # Neither raises on the asset_loop thread.
+    playback_metrics.observe('load_ms', 'web', 120)
+    playback_metrics.increment('webview_respawns', 'between_assets')
+    assert playback_metrics.read() == {}
+
+
+@pytest.mark.django_db
+def test_endpoint_reports_metrics_with_the_board() -> None:
+    playback_metrics.observe('load_ms', 'web', 700)
+    with mock.patch(
+        'anthias_server.lib.system_snapshot.get',
+        return_value='Raspberry Pi 3 Model B Rev 1.2',
+    ):
+        response = APIClient().get(reverse('api:playback_metrics_v2'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['device_model'] == 'Raspberry Pi 3 Model B Rev 1.2'
+    web = response.data['histograms']['load_ms']['web']
+    assert web['count'] == 1
+    assert web['buckets']['1000'] == 1
+
+
+@pytest.mark.django_db
+def test_endpoint_delete_resets() -> None:
+    playback_metrics.increment('frames_dropped', 'gst-fbdev', 7)
+
+    response = APIClient().delete(reverse('api:playback_metrics_v2'))
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    counters = playback_metrics.read()['counters']
+    assert counters['frames_dropped']['gst-fbdev'] == 0
+
+
+@pytest.mark.django_db
+def test_endpoint_without_redis_is_unavailable() -> None:
+    with mock.patch.object(playback_metrics, 'read', return_value={}):
+        response = APIClient().get(reverse('api:playback_metrics_v2'))
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
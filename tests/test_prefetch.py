@@ -0,0 +1,149 @@
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from anthias_server.settings import settings
+from anthias_viewer import prefetch
+from anthias_viewer.prefetch import (
+    DEFAULT_BUDGET_MB,
+    LOW_RAM_BUDGET_MB,
+    AssetPrefetcher,
+    prefetch_budget_bytes,
+)
+
+MB = 1024 * 1024
+
+IMAGE_URI = 'https://example.com/poster.jpg'
+
+
+@pytest.fixture
+def assetdir(tmp_path: Path) -> Any:
+    with mock.patch.dict(
+        settings,
+        {
+            'assetdir': str(tmp_path),
+            'prefetch_next_asset': True,
+            'prefetch_budget_mb': 0,
+            'content_cache_mb': 64,
+            'verify_ssl': True,
+        },
+    ):
+        yield tmp_path
+
+
+def _image(uri: str = IMAGE_URI, **overrides: Any) -> dict[str, Any]:
+    asset: dict[str, Any] = {
+        'asset_id': 'img',
+        'uri': uri,
+        'mimetype': 'image',
+        'nocache': False,
+        'skip_ssl_verify': False,
+    }
+    asset.update(overrides)
+    return asset
+
+
+def _warm_now(prefetcher: AssetPrefetcher, asset: dict[str, Any]) -> None:
+    """Run the lookahead on the test thread, without the start delay."""
+    with mock.patch.object(prefetch, 'sleep'):
+        prefetcher._warm(asset)
+
+
+@pytest.mark.parametrize(
+    ('low_ram', 'expected_mb'),
+    [(False, DEFAULT_BUDGET_MB), (True, LOW_RAM_BUDGET_MB)],
+)
+def test_budget_defaults_by_board(
+    assetdir: Path, low_ram: bool, expected_mb: int
+) -> None:
+    with mock.patch.object(
+        prefetch, 'is_low_ram_device', return_value=low_ram
+    ):
+        assert prefetch_budget_bytes() == expected_mb * MB
+
+
+def test_budget_setting_overrides_board_default(assetdir: Path) -> None:
+    with mock.patch.dict(settings, {'prefetch_budget_mb': 5}):
+        assert prefetch_budget_bytes() == 5 * MB
+
+
+def test_disabled_prefetch_has_no_budget(assetdir: Path) -> None:
+    with mock.patch.dict(settings, {'prefetch_next_asset': False}):
+        assert prefetch_budget_bytes() == 0
+        with mock.patch('anthias_viewer.prefetch.threading.Thread') as thread:
+            AssetPrefetcher().warm(_image())
+    thread.assert_not_called()
+
+
+def test_resolve_without_a_cached_copy_is_the_asset_uri(
+    assetdir: Path,
+) -> None:
+    assert AssetPrefetcher().resolve(_image()) == IMAGE_URI
+
+
+def test_resolve_plays_the_cached_copy(assetdir: Path) -> None:
+    with mock.patch(
+        'anthias_common.content_cache.cached_path', return_value='/c/img.jpg'
+    ):
+        assert AssetPrefetcher().resolve(_image()) == '/c/img.jpg'
+
+
+def test_resolve_bypasses_the_cache_for_nocache(assetdir: Path) -> None:
+    with mock.patch(
+        'anthias_common.content_cache.cached_path', return_value='/c/img.jpg'
+    ) as cached_path:
+        resolved = AssetPrefetcher().resolve(_image(nocache=True))
+    assert resolved == IMAGE_URI
+    cached_path.assert_not_called()
+
+
+def test_remote_image_is_revalidated_within_budget(assetdir: Path) -> None:
+    with (
+        mock.patch.object(prefetch, 'prefetch_budget_bytes', return_value=MB),
+        mock.patch('anthias_common.content_cache.revalidate') as revalidate,
+    ):
+        _warm_now(AssetPrefetcher(), _image())
+    revalidate.assert_called_once()
+    assert revalidate.call_args.args == (IMAGE_URI,)
+    assert revalidate.call_args.kwargs['max_bytes'] == MB
+    assert revalidate.call_args.kwargs['verify_ssl'] is True
+
+
+def test_skip_ssl_verify_is_honoured(assetdir: Path) -> None:
+    with mock.patch('anthias_common.content_cache.revalidate') as revalidate:
+        _warm_now(AssetPrefetcher(), _image(skip_ssl_verify=True))
+    assert revalidate.call_args.kwargs['verify_ssl'] is False
+
+
+def test_a_failed_lookahead_is_contained(assetdir: Path) -> None:
+    with mock.patch(
+        'anthias_common.content_cache.revalidate', side_effect=OSError('boom')
+    ):
+        _warm_now(AssetPrefetcher(), _image())
+
+
+@pytest.mark.parametrize(
+    'asset',
+    [
+        _image(nocache=True),
+        _image('https://example.com', mimetype='webpage'),
+        _image('rtsp://camera.local/live', mimetype='streaming'),
+    ],
+)
+def test_nothing_to_fetch_ahead(assetdir: Path, asset: dict[str, Any]) -> None:
+    with mock.patch('anthias_common.content_cache.revalidate') as revalidate:
+        _warm_now(AssetPrefetcher(), asset)
+    revalidate.assert_not_called()
+
+
+def test_local_video_is_read_ahead(assetdir: Path) -> None:
+    video = assetdir / 'clip.mp4'
+    video.write_bytes(b'\0' * 16)
+    with (
+        mock.patch.object(prefetch, 'prefetch_budget_bytes', return_value=MB),
+        mock.patch.object(prefetch, '_read_ahead') as read_ahead,
+    ):
+        _warm_now(AssetPrefetcher(), _image(str(video), mimetype='video'))
+    read_ahead.assert_called_once_with(str(video), MB)
@@ -48,7 +48,7 @@ import pytest
 import sh
 from PIL import Image, ImageOps, UnidentifiedImageError
 
-from anthias_server import processing
+from anthias_server import blobstore, processing
 from anthias_server.app.models import Asset
 from anthias_server.settings import settings as anthias_settings
 
@@ -2493,6 +2493,43 @@ def test_dispatch_normalize_video_stamps_processing_started_at() -> None:
     datetime.fromisoformat(a.metadata['processing_started_at'])
 
 
+@pytest.mark.django_db
+def test_dispatch_normalize_videos_probes_the_batch_first(
+    tmp_path: Path,
+) -> None:
+    """A batch queues one ``inspect_media`` over every file that's on
+    disk, then the usual per-asset task for each row."""
+    for name in ('one', 'two', 'gone'):
+        uri = tmp_path / f'{name}.mp4'
+        if name != 'gone':
+            uri.write_bytes(b'video')
+        Asset.objects.create(
+            asset_id=name,
+            name=name,
+            uri=str(uri),
+            mimetype='video',
+            duration=10,
+            is_processing=True,
+        )
+    with (
+        mock.patch('anthias_server.celery_tasks.inspect_media.delay') as probe,
+        mock.patch(
+            'anthias_server.celery_tasks.normalize_video_asset.delay'
+        ) as normalize,
+    ):
+        processing.dispatch_normalize_videos(['one', 'two', 'gone'])
+    probe.assert_called_once()
+    assert sorted(probe.call_args.args[0]) == [
+        str(tmp_path / 'one.mp4'),
+        str(tmp_path / 'two.mp4'),
+    ]
+    assert [c.args[0] for c in normalize.call_args_list] == [
+        'one',
+        'two',
+        'gone',
+    ]
+
+
 class _FakeSerializer:
     """Stand-in for the four API serializer classes — the dispatch
     helper only reads ``_pending_normalize``, so a minimal duck type
@@ -2565,61 +2602,37 @@ def test_dispatch_pending_normalize_handles_missing_attribute() -> None:
 
 
 def test_notify_swallows_publish_errors() -> None:
-    """Redis flake during the viewer reload publish must not block
-    the browser-side notify (or vice-versa). Both are best-effort."""
-    fake_redis = mock.MagicMock()
-    fake_redis.publish.side_effect = RuntimeError('redis flake')
-    with (
-        mock.patch(
-            'anthias_common.utils.connect_to_redis', return_value=fake_redis
-        ),
-        mock.patch(
-            'anthias_server.app.consumers.notify_asset_update'
-        ) as notify,
+    """A Redis flake during the viewer reload publish must not fail
+    the task that finished the row; the viewer's own poll catches up."""
+    with mock.patch(
+        'anthias_server.coalesce.request_viewer_reload',
+        side_effect=RuntimeError('redis flake'),
     ):
         processing._notify('asset-1')
-    notify.assert_called_once_with('asset-1')
 
 
-def test_notify_swallows_notify_errors() -> None:
-    fake_redis = mock.MagicMock()
+def test_notify_leaves_the_dashboard_to_the_model_layer() -> None:
+    """The write that finished the row already sent its ``updated``
+    delta; a second, coalesced nudge would make every open tab fetch
+    the row twice."""
     with (
-        mock.patch(
-            'anthias_common.utils.connect_to_redis', return_value=fake_redis
-        ),
-        mock.patch(
-            'anthias_server.app.consumers.notify_asset_update',
-            side_effect=RuntimeError('channels flake'),
-        ),
-    ):
-        # Should not raise.
-        processing._notify('asset-1')
-    # The viewer-reload publish ran first and succeeded; the
-    # subsequent notify failure was caught.
-    fake_redis.publish.assert_called_once()
-
-
-def test_notify_browser_only_skips_viewer_reload() -> None:
-    """Intermediate hops that leave is_processing=True (e.g. the
-    YouTube task before chaining into normalize_video) call
-    ``_notify(..., reload_viewer=False)`` so the on-device viewer
-    doesn't reload its playlist for a row that's still mid-flight.
-    The browser-side update still fires so the dashboard picks up
-    the new title/duration immediately."""
-    fake_redis = mock.MagicMock()
-    with (
-        mock.patch(
-            'anthias_common.utils.connect_to_redis', return_value=fake_redis
-        ),
+        mock.patch('anthias_server.coalesce.request_viewer_reload'),
         mock.patch(
             'anthias_server.app.consumers.notify_asset_update'
         ) as browser_notify,
     ):
-        processing._notify('asset-1', reload_viewer=False)
-    # Viewer publish never happened.
-    fake_redis.publish.assert_not_called()
-    # Browser nudge still went out.
-    browser_notify.assert_called_once_with('asset-1')
+        processing._notify('asset-1')
+    browser_notify.assert_not_called()
+
+
+def test_notify_reload_reaches_the_viewer() -> None:
+    """The reload goes out on the viewer's topic. A bare ``reload``
+    (no ``viewer`` prefix) is dropped by ``ViewerSubscriber``."""
+    with mock.patch(
+        'anthias_server.settings.ViewerPublisher.send_to_viewer'
+    ) as send_to_viewer:
+        processing._notify('asset-1')
+    send_to_viewer.assert_called_once_with('reload')
 
 
 # ---------------------------------------------------------------------------
@@ -2820,3 +2833,108 @@ def test_prepare_asset_skips_pipeline_for_jpeg_upload(
     ):
         assert serializer.is_valid(), serializer.errors
     assert serializer._pending_normalize is None
+
+
+# ---------------------------------------------------------------------------
+# Reusing an earlier row's result for the same source content
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_image_with_already_converted_content_reuses_the_webp(
+    asset_dir: str,
+) -> None:
+    first_src = _write_image(path.join(asset_dir, 'first.tiff'), 'TIFF')
+    second_src = path.join(asset_dir, 'second.tiff')
+    shutil.copyfile(first_src, second_src)
+    first = _make_processing_asset('img-first', first_src)
+    second = _make_processing_asset('img-second', second_src)
+
+    with mock.patch.object(processing, '_notify'):
+        assert processing._reuse_processed(first, 'image') is False
+        processing._run_image_normalisation(first)
+        with mock.patch.object(
+            processing, '_convert_image_to_webp'
+        ) as convert:
+            assert processing._reuse_processed(second, 'image') is True
+    convert.assert_not_called()
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert second.md5 == first.md5
+    assert second.uri == path.join(asset_dir, 'second.webp')
+    assert not path.exists(second_src)
+    assert os.path.samefile(first.uri or '', second.uri)
+    assert second.is_processing is False
+    assert second.metadata['original_ext'] == '.tiff'
+    assert second.metadata['converted'] is True
+
+
+@pytest.mark.django_db
+def test_video_with_already_probed_content_skips_ffprobe(
+    asset_dir: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv('DEVICE_TYPE', 'pi4-64')
+    donor_uri = path.join(asset_dir, 'donor.mp4')
+    Path(donor_uri).write_bytes(b'not really a video')
+    Asset.objects.create(
+        asset_id='vid-donor',
+        name='donor',
+        uri=donor_uri,
+        md5=blobstore.digest_file(donor_uri),
+        mimetype='video',
+        duration=12,
+        metadata={'video_codec': 'h264', 'video_width': 32},
+    )
+    src = path.join(asset_dir, 'again.mp4')
+    shutil.copyfile(donor_uri, src)
+    asset = _make_processing_asset('vid-again', src, mimetype='video')
+
+    with (
+        mock.patch.object(processing, '_notify'),
+        mock.patch.object(processing, '_ffprobe_summary') as probe,
+    ):
+        assert processing._reuse_processed(asset, 'video') is True
+    probe.assert_not_called()
+
+    asset.refresh_from_db()
+    assert asset.is_processing is False
+    assert asset.duration == 12
+    assert asset.metadata['video_codec'] == 'h264'
+    assert os.path.samefile(src, donor_uri)
+
+
+@pytest.mark.django_db
+def test_failed_or_foreign_results_are_not_reused(
+    asset_dir: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv('DEVICE_TYPE', 'pi4-64')
+    donor_uri = path.join(asset_dir, 'donor.mkv')
+    Path(donor_uri).write_bytes(b'hevc-ish bytes')
+    digest = blobstore.digest_file(donor_uri)
+    Asset.objects.create(
+        asset_id='vid-failed',
+        name='failed',
+        uri=donor_uri,
+        md5=digest,
+        mimetype='video',
+        duration=5,
+        metadata={'video_codec': 'h264', 'error_message': 'nope'},
+    )
+    Asset.objects.create(
+        asset_id='vid-prores',
+        name='prores',
+        uri=donor_uri,
+        md5=digest,
+        mimetype='video',
+        duration=5,
+        metadata={'video_codec': 'prores'},
+    )
+    src = path.join(asset_dir, 'again.mkv')
+    shutil.copyfile(donor_uri, src)
+    asset = _make_processing_asset('vid-again', src, mimetype='video')
+
+    assert processing._reuse_processed(asset, 'video') is False
+    # Not reused, but recorded and interned for the next upload.
+    assert Asset.objects.get(asset_id='vid-again').md5 == digest
+    assert blobstore.refcount(digest) == 1
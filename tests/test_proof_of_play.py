@@ -0,0 +1,286 @@
+"""Tests for the proof-of-play ring (``anthias_common.proof_of_play``)
+and its v2 export."""
+
+import asyncio
+import csv
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from anthias_common import proof_of_play
+
+# 2026-01-01T00:00:00Z
+_T0_MS = 1767225600000
+
+
+def _record(
+    recorder: proof_of_play.Recorder, n: int, **overrides: Any
+) -> None:
+    for i in range(n):
+        fields: dict[str, Any] = {
+            'start_ms': _T0_MS + i * 10_000,
+            'end_ms': _T0_MS + i * 10_000 + 9_500,
+            'outcome': 'completed',
+            'kind': 'image',
+        }
+        fields.update(overrides)
+        recorder.record(
+            overrides.get('asset_id', f'asset-{i}'),
+            **{k: v for k, v in fields.items() if k != 'asset_id'},
+        )
+
+
+@pytest.fixture
+def ring(tmp_path: Path) -> Any:
+    recorder = proof_of_play.Recorder(
+        proof_of_play.ring_path(str(tmp_path)), capacity=8
+    )
+    yield recorder
+    recorder.close()
+
+
+def test_records_round_trip(ring: proof_of_play.Recorder) -> None:
+    seq = ring.record(
+        'a1b2c3d4e5f60718293a4b5c6d7e8f90',
+        start_ms=_T0_MS,
+        end_ms=_T0_MS + 4_250,
+        outcome='skipped',
+        skip_reason='navigate',
+        kind='video',
+    )
+
+    assert seq == 1
+    assert proof_of_play.head(ring.path) == 1
+    [record] = proof_of_play.iter_records(ring.path)
+    assert record.as_dict() == {
+        'seq': 1,
+        'asset_id': 'a1b2c3d4e5f60718293a4b5c6d7e8f90',
+        'kind': 'video',
+        'started_at': '2026-01-01T00:00:00.000Z',
+        'ended_at': '2026-01-01T00:00:04.250Z',
+        'duration_ms': 4250,
+        'outcome': 'skipped',
+        'skip_reason': 'navigate',
+    }
+
+
+def test_ring_keeps_the_newest_capacity_records(
+    ring: proof_of_play.Recorder,
+) -> None:
+    _record(ring, 20)
+
+    seqs = [r.seq for r in proof_of_play.iter_records(ring.path)]
+    assert seqs == list(range(13, 21))
+    assert os.path.getsize(ring.path) == (
+        proof_of_play.HEADER_SIZE + 8 * proof_of_play.RECORD_SIZE
+    )
+    # A cursor inside the kept window returns only what follows it.
+    assert [r.seq for r in proof_of_play.iter_records(ring.path, 18)] == [
+        19,
+        20,
+    ]
+
+
+def test_read_batch_pages_by_seq(ring: proof_of_play.Recorder) -> None:
+    _record(ring, 11)
+
+    records, cursor = proof_of_play.read_batch(ring.path, 0, count=5)
+    # 1-3 were overwritten; the batch starts at the oldest kept.
+    assert [r.seq for r in records] == [4, 5, 6, 7, 8]
+    assert cursor == 8
+    records, cursor = proof_of_play.read_batch(ring.path, cursor, count=5)
+    assert [r.seq for r in records] == [9, 10, 11]
+    assert cursor == 11
+    assert proof_of_play.read_batch(ring.path, cursor) == ([], 11)
+
+
+def test_reopened_ring_continues_where_it_stopped(
+    ring: proof_of_play.Recorder,
+) -> None:
+    _record(ring, 3)
+    ring.close()
+
+    # An existing ring keeps the capacity it was created with.
+    reopened = proof_of_play.Recorder(ring.path, capacity=1024)
+    try:
+        assert (
+            reopened.record(
+                'x', start_ms=_T0_MS, end_ms=_T0_MS, outcome='unavailable'
+            )
+            == 4
+        )
+        assert reopened.capacity == 8
+    finally:
+        reopened.close()
+    assert [r.seq for r in proof_of_play.iter_records(ring.path)] == [
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_foreign_file_is_replaced(tmp_path: Path) -> None:
+    path = proof_of_play.ring_path(str(tmp_path))
+    Path(path).write_bytes(b'not a ring' * 10)
+
+    recorder = proof_of_play.Recorder(path, capacity=4)
+    try:
+        assert (
+            recorder.record(
+                'x', start_ms=_T0_MS, end_ms=_T0_MS, outcome='completed'
+            )
+            == 1
+        )
+    finally:
+        recorder.close()
+    assert [r.asset_id for r in proof_of_play.iter_records(path)] == ['x']
+
+
+def test_half_written_slot_is_skipped(ring: proof_of_play.Recorder) -> None:
+    _record(ring, 3)
+    # What a reader sees while the writer is mid-way through slot 2.
+    offset = proof_of_play.HEADER_SIZE + proof_of_play.RECORD_SIZE
+    with open(ring.path, 'r+b') as f:
+        f.seek(offset)
+        f.write(b'\0' * 8)
+
+    assert [r.seq for r in proof_of_play.iter_records(ring.path)] == [1, 3]
+
+
+def test_unknown_labels_are_rejected(ring: proof_of_play.Recorder) -> None:
+    with pytest.raises(ValueError):
+        ring.record('x', start_ms=0, end_ms=0, outcome='played')
+    with pytest.raises(ValueError):
+        ring.record(
+            'x', start_ms=0, end_ms=0, outcome='skipped', skip_reason='bored'
+        )
+    assert proof_of_play.head(ring.path) == 0
+
+
+def test_unwritable_ring_drops_records(tmp_path: Path) -> None:
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    recorder = proof_of_play.Recorder(str(blocker / 'proof-of-play.ring'))
+
+    for _ in range(2):
+        assert (
+            recorder.record('x', start_ms=0, end_ms=0, outcome='completed')
+            is None
+        )
+    recorder.close()
+
+
+def test_flush_syncs_only_when_there_is_something_new(
+    ring: proof_of_play.Recorder,
+) -> None:
+    _record(ring, 1)
+
+    with mock.patch('anthias_common.proof_of_play.os.fsync') as fsync:
+        ring.flush()
+        ring.flush()
+
+    fsync.assert_called_once()
+
+
+def test_missing_ring_reads_empty(tmp_path: Path) -> None:
+    path = proof_of_play.ring_path(str(tmp_path))
+
+    assert proof_of_play.head(path) == 0
+    assert list(proof_of_play.iter_records(path)) == []
+
+
+@pytest.fixture
+def exported(tmp_path: Path) -> Any:
+    """A ring in the configdir the endpoint reads: assets a and b
+    alternating, ten seconds apart."""
+    from anthias_server.settings import settings
+
+    recorder = proof_of_play.Recorder(
+        proof_of_play.ring_path(str(tmp_path)), capacity=64
+    )
+    for i in range(6):
+        recorder.record(
+            'a' if i % 2 == 0 else 'b',
+            start_ms=_T0_MS + i * 10_000,
+            end_ms=_T0_MS + i * 10_000 + 10_000,
+            outcome='completed',
+            kind='web',
+        )
+    recorder.close()
+    with mock.patch.object(
+        settings, 'get_configdir', return_value=str(tmp_path)
+    ):
+        yield
+
+
+def _export(**params: Any) -> Any:
+    return APIClient().get(reverse('api:proof_of_play_v2'), params)
+
+
+def _body(response: Any) -> bytes:
+    # An async stream, drained the way the ASGI handler does.
+    assert response.is_async is True
+
+    async def drain() -> list[bytes]:
+        return [part async for part in aiter(response)]
+
+    return b''.join(asyncio.run(drain()))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('exported')
+def test_export_streams_ndjson() -> None:
+    response = _export(after=2, asset_id='a')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert response['X-Proof-Of-Play-Head'] == '6'
+    lines = _body(response).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row['seq'] for row in rows] == [3, 5]
+    assert rows[0]['started_at'] == '2026-01-01T00:00:20.000Z'
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('exported')
+def test_export_streams_csv_in_a_time_range() -> None:
+    response = _export(
+        output='csv',
+        **{'from': '2026-01-01T00:00:10Z', 'to': '2026-01-01T00:00:40'},
+    )
+
+    assert response['Content-Type'] == 'text/csv'
+    body = _body(response).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [row['seq'] for row in rows] == ['2', '3', '4']
+    assert list(rows[0]) == list(proof_of_play.CSV_FIELDS)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('exported')
+def test_export_limit() -> None:
+    response = _export(limit=2)
+
+    lines = _body(response).decode().splitlines()
+    assert [json.loads(line)['seq'] for line in lines] == [1, 2]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'params',
+    [{'output': 'xml'}, {'after': 'x'}, {'limit': '0'}, {'from': 'May'}],
+)
+def test_export_rejects_bad_parameters(params: dict[str, str]) -> None:
+    response = _export(**params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'error' in response.data
@@ -3,15 +3,21 @@ import os
 from collections.abc import Iterator
 from datetime import UTC, datetime, time, timedelta
 from typing import Any
+from unittest import mock
 
 import pytest
 import time_machine
 from django.utils import timezone
 
 from anthias_server.app.models import Asset
-from anthias_server.settings import settings
+from anthias_server.settings import (
+    PLAYLIST_CHANGES_KEY,
+    PLAYLIST_EPOCH_KEY,
+    PLAYLIST_REVISION_KEY,
+    ViewerPublisher,
+    settings,
+)
 from anthias_viewer.scheduling import (
-    WINDOWED_DEADLINE_CAP_SECONDS,
     Scheduler,
     generate_asset_list,
 )
@@ -40,6 +46,9 @@ ASSET_X = {
     'play_time_to': None,
     'is_reachable': True,
     'last_reachability_check': None,
+    'next_probe_at': None,
+    'probe_successes': 0,
+    'probe_failures': 0,
     'metadata': {},
 }
 
@@ -64,6 +73,9 @@ ASSET_Y = {
     'play_time_to': None,
     'is_reachable': True,
     'last_reachability_check': None,
+    'next_probe_at': None,
+    'probe_successes': 0,
+    'probe_failures': 0,
     'metadata': {},
 }
 
@@ -86,6 +98,9 @@ ASSET_Z = {
     'play_time_to': None,
     'is_reachable': True,
     'last_reachability_check': None,
+    'next_probe_at': None,
+    'probe_successes': 0,
+    'probe_failures': 0,
     'metadata': {},
 }
 
@@ -108,6 +123,9 @@ ASSET_TOMORROW = {
     'play_time_to': None,
     'is_reachable': True,
     'last_reachability_check': None,
+    'next_probe_at': None,
+    'probe_successes': 0,
+    'probe_failures': 0,
     'metadata': {},
 }
 
@@ -171,6 +189,23 @@ def test_get_next_asset_should_be_y_and_x(
     assert [expected_y, expected_x] == [ASSET_Y, ASSET_X]
 
 
+@pytest.mark.django_db
+def test_peek_next_asset_does_not_advance(
+    restore_shuffle_setting: None,
+) -> None:
+    _create_assets([ASSET_X, ASSET_Y])
+    scheduler = Scheduler()
+
+    assert scheduler.get_next_asset() == ASSET_Y
+    assert scheduler.peek_next_asset() == ASSET_X
+    assert scheduler.peek_next_asset() == ASSET_X
+    assert scheduler.get_next_asset() == ASSET_X
+
+    # A pending jump or skip-back makes the next asset unknowable.
+    scheduler.reverse = True
+    assert scheduler.peek_next_asset() is None
+
+
 @pytest.mark.django_db
 def test_get_next_asset_missing_extra_asset_warns_and_falls_back(
     restore_shuffle_setting: None,
@@ -407,18 +442,33 @@ def test_unscheduled_asset_unchanged() -> None:
 
 
 @pytest.mark.django_db
-def test_windowed_cap_applies_when_any_asset_has_window() -> None:
-    # An asset with a play_days filter should cap the deadline at
-    # ~ now + WINDOWED_DEADLINE_CAP_SECONDS, even if its date
-    # boundaries are far out.
+def test_windowed_deadline_is_next_window_boundary() -> None:
+    # A play_days filter used to cap the deadline at now + 60s so the
+    # day flip got polled for. The compiled timeline knows the exact
+    # boundary instead: Monday-only at Mon noon flips at Tue 00:00.
     Asset.objects.create(**_scheduled_asset(play_days='[1]'))
     with time_machine.travel(_aware(2026, 1, 5, 12, 0)):
-        now = timezone.now()
         _, deadline = generate_asset_list()
-        assert deadline is not None
-        cap = now + timedelta(seconds=WINDOWED_DEADLINE_CAP_SECONDS)
-        # Allow tiny clock drift; deadline should be at the cap.
-        assert abs((deadline - cap).total_seconds()) <= 1
+    assert deadline == _aware(2026, 1, 6, 0, 0)
+
+
+@pytest.mark.django_db
+def test_time_window_deadline_tracks_window_edges() -> None:
+    Asset.objects.create(
+        **_scheduled_asset(
+            play_time_from=time(9, 0),
+            play_time_to=time(17, 0),
+        ),
+    )
+    with time_machine.travel(_aware(2026, 1, 5, 6, 0)):
+        assets, deadline = generate_asset_list()
+    assert assets == []
+    assert deadline == _aware(2026, 1, 5, 9, 0)
+
+    with time_machine.travel(_aware(2026, 1, 5, 10, 0)):
+        assets, deadline = generate_asset_list()
+    assert [a['asset_id'] for a in assets] == ['abc123']
+    assert deadline == _aware(2026, 1, 5, 17, 0)
 
 
 @pytest.mark.django_db
@@ -578,9 +628,11 @@ def test_cap_driven_refresh_preserves_shuffle_play_through(
 def test_shuffle_refresh_picks_up_field_edits_when_membership_unchanged(
     restore_shuffle_setting: None,
 ) -> None:
-    """With shuffle on and membership unchanged, the cap-driven refresh
-    must still surface DB-driven field edits (e.g. duration) on the
-    next play-through — order is preserved, contents are refreshed."""
+    """With shuffle on and membership unchanged, a DB-change-driven
+    refresh must still surface field edits (e.g. duration) on the next
+    play-through — order is preserved, contents are refreshed."""
+    from unittest import mock
+
     settings['shuffle_playlist'] = True
     Asset.objects.create(**_scheduled_asset(asset_id='a', play_days='[1]'))
     Asset.objects.create(**_scheduled_asset(asset_id='b'))
@@ -593,9 +645,191 @@ def test_shuffle_refresh_picks_up_field_edits_when_membership_unchanged(
         target.duration = 999
         target.save()
 
-        scheduler.deadline = timezone.now() - timedelta(seconds=1)
-        scheduler.refresh_playlist()
+        # The test DB isn't settings['database'], so stand in for the
+        # mtime bump the save would cause on a device.
+        with mock.patch.object(
+            Scheduler,
+            'get_db_mtime',
+            return_value=scheduler.last_update_db_mtime + 1,
+        ):
+            scheduler.refresh_playlist()
 
     assert [x['asset_id'] for x in scheduler.assets] == original_order
     refreshed = next(x for x in scheduler.assets if x['asset_id'] == 'b')
     assert refreshed['duration'] == 999
+
+
+@pytest.mark.django_db
+def test_deadline_refresh_does_not_query_the_database(
+    restore_shuffle_setting: None,
+    django_assert_num_queries: Any,
+) -> None:
+    """Crossing a window boundary re-evaluates the compiled timeline;
+    only a DB change (or a stale timeline) goes back to the ORM."""
+    Asset.objects.create(**_scheduled_asset(asset_id='a', play_days='[1]'))
+    Asset.objects.create(**_scheduled_asset(asset_id='b'))
+
+    with time_machine.travel(_aware(2026, 1, 5, 12, 0), tick=False) as t:
+        scheduler = Scheduler()
+        assert {x['asset_id'] for x in scheduler.assets} == {'a', 'b'}
+        assert scheduler.deadline == _aware(2026, 1, 6, 0, 0)
+
+        t.move_to(_aware(2026, 1, 6, 0, 0))
+        with django_assert_num_queries(0):
+            scheduler.refresh_playlist()
+
+    assert [x['asset_id'] for x in scheduler.assets] == ['b']
+    # Next flip is the following Monday.
+    assert scheduler.deadline == _aware(2026, 1, 12, 0, 0)
+
+
+@pytest.mark.django_db
+def test_stale_timeline_is_recompiled_on_deadline(
+    restore_shuffle_setting: None,
+) -> None:
+    """Past the expansion horizon the timeline can't answer any more,
+    so a deadline tick falls back to recompiling from the DB."""
+    Asset.objects.create(**_scheduled_asset(asset_id='a', play_days='[1]'))
+
+    with time_machine.travel(_aware(2026, 1, 5, 12, 0), tick=False) as t:
+        scheduler = Scheduler()
+        first = scheduler.timeline
+        assert first is not None
+        assert first.refresh_at is not None
+
+        t.move_to(first.refresh_at)
+        scheduler.deadline = first.refresh_at
+        scheduler.refresh_playlist()
+
+    assert scheduler.timeline is not first
+
+
+# The change-feed tests below need real commits: revisions are published
+# from ``transaction.on_commit``, which never fires inside the rolled-back
+# transaction a plain ``django_db`` test runs in.
+@pytest.mark.django_db(transaction=True)
+def test_unrelated_asset_writes_do_not_rebuild_the_playlist(
+    restore_shuffle_setting: None,
+    django_assert_num_queries: Any,
+) -> None:
+    """A reachability stamp, or an ``is_reachable`` write that doesn't
+    change the value, leaves the playlist revision alone — so the
+    Scheduler neither rebuilds nor queries."""
+    Asset.objects.create(**_scheduled_asset(asset_id='a'))
+    scheduler = Scheduler()
+    revision = scheduler.playlist_revision
+    assert revision is not None
+
+    Asset.objects.filter(asset_id='a').update(
+        is_reachable=True,
+        last_reachability_check=timezone.now(),
+    )
+    assert scheduler.get_playlist_revision() == revision
+    with django_assert_num_queries(0):
+        scheduler.refresh_playlist()
+
+    Asset.objects.filter(asset_id='a').update(is_reachable=False)
+    new_revision = scheduler.get_playlist_revision()
+    assert new_revision is not None
+    assert new_revision.number == revision.number + 1
+    assert new_revision.epoch == revision.epoch
+
+
+@pytest.mark.django_db(transaction=True)
+def test_single_asset_edit_is_patched_without_recompiling(
+    restore_shuffle_setting: None,
+    django_assert_num_queries: Any,
+) -> None:
+    Asset.objects.create(**_scheduled_asset(asset_id='a', play_order=0))
+    Asset.objects.create(**_scheduled_asset(asset_id='b', play_order=1))
+    scheduler = Scheduler()
+
+    Asset.objects.filter(asset_id='b').update(duration=999)
+    Asset.objects.create(**_scheduled_asset(asset_id='c', play_order=2))
+    Asset.objects.filter(asset_id='a').delete()
+
+    with (
+        mock.patch(
+            'anthias_server.app.playlist.compile_timeline'
+        ) as compile_timeline,
+        django_assert_num_queries(1),
+    ):
+        scheduler.refresh_playlist()
+
+    compile_timeline.assert_not_called()
+    assert [x['asset_id'] for x in scheduler.assets] == ['b', 'c']
+    assert scheduler.assets[0]['duration'] == 999
+    assert scheduler.playlist_revision == scheduler.get_playlist_revision()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_gap_in_change_feed_falls_back_to_recompile(
+    restore_shuffle_setting: None,
+) -> None:
+    Asset.objects.create(**_scheduled_asset(asset_id='a'))
+    scheduler = Scheduler()
+
+    Asset.objects.filter(asset_id='a').update(duration=999)
+    # The entry was trimmed off the list before the viewer caught up.
+    scheduler._redis.delete(PLAYLIST_CHANGES_KEY)
+
+    first = scheduler.timeline
+    scheduler.refresh_playlist()
+    assert scheduler.timeline is not first
+    assert scheduler.assets[0]['duration'] == 999
+
+
+@pytest.mark.django_db(transaction=True)
+def test_a_new_epoch_falls_back_to_recompile(
+    restore_shuffle_setting: None,
+) -> None:
+    """Redis lost its data and the counter came back at the number the
+    viewer holds: the epoch tells the two apart."""
+    Asset.objects.create(**_scheduled_asset(asset_id='a'))
+    scheduler = Scheduler()
+    revision = scheduler.playlist_revision
+    assert revision is not None
+
+    scheduler._redis.delete(
+        PLAYLIST_REVISION_KEY, PLAYLIST_EPOCH_KEY, PLAYLIST_CHANGES_KEY
+    )
+    Asset.objects.filter(asset_id='a').update(duration=999)
+    for _ in range(revision.number - 1):
+        ViewerPublisher.get_instance().publish_playlist_change(None)
+    current = scheduler.get_playlist_revision()
+    assert current is not None
+    assert current.number == revision.number
+    assert current.epoch != revision.epoch
+
+    first = scheduler.timeline
+    scheduler.refresh_playlist()
+    assert scheduler.timeline is not first
+    assert scheduler.assets[0]['duration'] == 999
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_mtime_is_the_fallback_without_a_revision(
+    restore_shuffle_setting: None,
+) -> None:
+    Asset.objects.create(**_scheduled_asset(asset_id='a'))
+    scheduler = Scheduler()
+    scheduler._redis.delete(PLAYLIST_REVISION_KEY)
+
+    with mock.patch.object(
+        Scheduler, 'update_playlist', autospec=True
+    ) as update_playlist:
+        with mock.patch.object(
+            Scheduler,
+            'get_db_mtime',
+            return_value=scheduler.last_update_db_mtime,
+        ):
+            scheduler.refresh_playlist()
+        update_playlist.assert_not_called()
+
+        with mock.patch.object(
+            Scheduler,
+            'get_db_mtime',
+            return_value=scheduler.last_update_db_mtime + 1,
+        ):
+            scheduler.refresh_playlist()
+        update_playlist.assert_called_once()
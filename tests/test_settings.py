@@ -165,3 +165,21 @@ def test_save_settings(settings_env: None) -> None:
             assert settings['verify_ssl'] is True
             # no out of thin air changes?
             assert settings['audio_output'] == 'hdmi'
+
+
+def test_reload_if_changed_rereads_only_a_changed_file(
+    settings_env: None,
+) -> None:
+    with fake_settings(settings1) as (_mod_settings, settings):
+        signature = settings.reload_if_changed()
+        assert signature is not None
+
+        settings['default_duration'] = 99
+        assert settings.reload_if_changed() == signature
+        # Unchanged on disk: the in-memory value stands.
+        assert settings['default_duration'] == 99
+
+        with open(CONFIG_FILE, 'a') as f:
+            f.write('\n')
+        assert settings.reload_if_changed() != signature
+        assert settings['default_duration'] == 45
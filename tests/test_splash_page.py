@@ -111,7 +111,7 @@ def test_resolve_reads_from_redis_cache(bare_metal_no_pending: None) -> None:
         ),
         mock.patch.object(v2_views.r, 'publish'),
         mock.patch(
-            'anthias_server.api.views.v2.get_node_ip',
+            'anthias_common.utils.get_node_ip',
             side_effect=AssertionError('must not block on get_node_ip'),
         ),
     ):
@@ -151,7 +151,7 @@ def test_resolve_publishes_refresh_on_cache_miss(
         mock.patch.object(v2_views.r, 'get', return_value=None),
         mock.patch.object(v2_views.r, 'publish') as m_publish,
         mock.patch(
-            'anthias_server.api.views.v2.get_node_ip',
+            'anthias_common.utils.get_node_ip',
             side_effect=AssertionError('must not block on get_node_ip'),
         ),
     ):
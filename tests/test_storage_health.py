@@ -665,6 +665,45 @@ class TestWriteCheck:
         assert result['reason'] == storage_health.REASON_CORRUPT
 
 
+class TestDiskHeadroom:
+    @staticmethod
+    def _statvfs(total_blocks: int, free_blocks: int) -> Any:
+        stat = mock.Mock()
+        stat.f_frsize = 4096
+        stat.f_blocks = total_blocks
+        stat.f_bavail = free_blocks
+        return stat
+
+    def test_reserve_is_a_share_of_a_large_filesystem(self) -> None:
+        # 40 GB with 10 GB free: the 10% reserve (4 GB) beats the floor.
+        gb = 1024**3 // 4096
+        with mock.patch(
+            'os.statvfs', return_value=self._statvfs(40 * gb, 10 * gb)
+        ):
+            assert storage_health.disk_headroom('/data') == 6 * 1024**3
+
+    def test_small_filesystem_keeps_the_floor(self) -> None:
+        mb = 1024**2 // 4096
+        with mock.patch(
+            'os.statvfs', return_value=self._statvfs(1000 * mb, 300 * mb)
+        ):
+            headroom = storage_health.disk_headroom('/data')
+        floor = storage_health.DISCRETIONARY_RESERVE_MIN_BYTES
+        assert headroom == 300 * 1024**2 - floor
+
+    def test_pressure_is_negative(self) -> None:
+        mb = 1024**2 // 4096
+        with mock.patch(
+            'os.statvfs', return_value=self._statvfs(10_000 * mb, 100 * mb)
+        ):
+            headroom = storage_health.disk_headroom('/data')
+        assert headroom is not None
+        assert headroom < 0
+
+    def test_unstatable_directory_is_none(self, tmp_path: Any) -> None:
+        assert storage_health.disk_headroom(str(tmp_path / 'gone')) is None
+
+
 class TestRecordCheck:
     def test_healthy_device_reports_ok(
         self, sysfs: Any, tmp_path: Any, fake_redis: Any
@@ -212,6 +212,36 @@ class TestWatchLoop:
         ]
         assert len(failing) == 1
 
+    def test_a_full_card_trims_the_content_cache(
+        self, monkeypatch: Any
+    ) -> None:
+        results = [_state(), _state(status=storage_health.STATUS_FULL)]
+
+        def _record(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+            return results.pop(0)
+
+        def _sleep(_seconds: float) -> None:
+            if not results:
+                raise _Stop
+
+        enforce = mock.MagicMock()
+        monkeypatch.setattr(
+            storage_health, 'record_check', mock.MagicMock(side_effect=_record)
+        )
+        monkeypatch.setattr(
+            'anthias_server.lib.storage_watcher.content_cache.enforce_limit',
+            enforce,
+        )
+        monkeypatch.setattr(
+            'anthias_server.lib.storage_watcher.time.sleep', _sleep
+        )
+
+        redis = mock.MagicMock()
+        with pytest.raises(_Stop):
+            storage_watcher._watch_loop(redis, '/data')
+
+        enforce.assert_called_once_with()
+
     def test_a_failed_pass_backs_off_rather_than_spinning(
         self, monkeypatch: Any
     ) -> None:
@@ -0,0 +1,127 @@
+"""Tests for the background-maintained system snapshot
+(``anthias_server.lib.system_snapshot``)."""
+
+import json
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from anthias_server.lib import system_snapshot
+
+
+@pytest.fixture
+def fields(monkeypatch: pytest.MonkeyPatch) -> dict[str, mock.Mock]:
+    """Swap the real sources for counting stubs: one static field, one
+    fast and one slow periodic field."""
+    sources = {
+        'board': mock.Mock(return_value='Raspberry Pi 4'),
+        'load': mock.Mock(return_value={'15 min': 0.5}),
+        'release': mock.Mock(return_value=True),
+    }
+    monkeypatch.setattr(
+        system_snapshot,
+        'FIELDS',
+        {
+            'board': system_snapshot.SnapshotField(sources['board'], None),
+            'load': system_snapshot.SnapshotField(sources['load'], 5),
+            'release': system_snapshot.SnapshotField(sources['release'], 300),
+        },
+    )
+    return sources
+
+
+def _age(name: str, seconds: float, fake: Any) -> None:
+    key = system_snapshot.SNAPSHOT_KEY_PREFIX + name
+    stored = json.loads(fake.get(key))
+    stored['at'] -= seconds
+    fake.set(key, json.dumps(stored))
+
+
+def test_get_reads_the_stored_sample(fields: dict[str, mock.Mock]) -> None:
+    system_snapshot.refresh(everything=True)
+
+    assert system_snapshot.get('load') == {'15 min': 0.5}
+    assert system_snapshot.get('board') == 'Raspberry Pi 4'
+    assert fields['load'].call_count == 1
+    assert fields['board'].call_count == 1
+
+
+def test_get_samples_on_a_miss(fields: dict[str, mock.Mock]) -> None:
+    assert system_snapshot.get('load') == {'15 min': 0.5}
+    assert system_snapshot.get('load') == {'15 min': 0.5}
+
+    # The first reader took the sample; the second read it back.
+    assert fields['load'].call_count == 1
+
+
+def test_refresh_skips_fresh_fields(fields: dict[str, mock.Mock]) -> None:
+    system_snapshot.refresh(everything=True)
+    system_snapshot.refresh()
+
+    for source in fields.values():
+        assert source.call_count == 1
+
+
+def test_refresh_resamples_by_cadence(
+    fields: dict[str, mock.Mock], _mock_redis: Any
+) -> None:
+    system_snapshot.refresh(everything=True)
+    for name in fields:
+        _age(name, 60, _mock_redis)
+    fields['load'].return_value = {'15 min': 1.5}
+
+    system_snapshot.refresh()
+
+    # Past its 5 s cadence; the 300 s field and the static one are not.
+    assert fields['load'].call_count == 2
+    assert fields['release'].call_count == 1
+    assert fields['board'].call_count == 1
+    assert system_snapshot.get('load') == {'15 min': 1.5}
+
+
+def test_everything_resamples_static_fields(
+    fields: dict[str, mock.Mock],
+) -> None:
+    system_snapshot.refresh(everything=True)
+    system_snapshot.refresh(everything=True)
+
+    assert fields['board'].call_count == 2
+
+
+def test_samples_expire_after_their_keep(
+    fields: dict[str, mock.Mock], _mock_redis: Any
+) -> None:
+    with mock.patch.object(_mock_redis, 'set', wraps=_mock_redis.set) as s:
+        system_snapshot.refresh(everything=True)
+
+    keep = {c.args[0]: c.kwargs['ex'] for c in s.call_args_list}
+    prefix = system_snapshot.SNAPSHOT_KEY_PREFIX
+    assert keep == {
+        prefix + 'board': system_snapshot.STATIC_KEEP_S,
+        prefix + 'load': 5 * system_snapshot.SNAPSHOT_KEEP_FACTOR,
+        prefix + 'release': 300 * system_snapshot.SNAPSHOT_KEEP_FACTOR,
+    }
+
+
+def test_failing_source_is_not_cached(fields: dict[str, mock.Mock]) -> None:
+    fields['load'].side_effect = OSError('no /proc/loadavg')
+
+    # refresh logs and moves on to the next field.
+    system_snapshot.refresh(everything=True)
+    assert fields['release'].call_count == 1
+
+    # A reader sees the error, so its own fallback applies.
+    with pytest.raises(OSError):
+        system_snapshot.get('load')
+
+    fields['load'].side_effect = None
+    assert system_snapshot.get('load') == {'15 min': 0.5}
+
+
+def test_unstorable_sample_is_still_returned(
+    fields: dict[str, mock.Mock],
+) -> None:
+    fields['load'].return_value = object()
+
+    assert system_snapshot.get('load') is fields['load'].return_value
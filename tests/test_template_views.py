@@ -20,7 +20,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from anthias_common import storage_health
-from anthias_server.app import page_context
+from anthias_server.app import asset_rows, page_context
 from anthias_server.app.models import DURATION_S_MAX, Asset
 from anthias_server.app.templatetags.asset_filters import to_json
 from anthias_server.settings import settings
@@ -173,6 +173,30 @@ def test_asset_row_renders_error_pill_when_processing_failed(
     )
 
 
+@pytest.mark.django_db
+def test_asset_row_shows_download_progress(client: Client) -> None:
+    """A remote download in flight shows how far it got; a processing
+    row without a known total shows the bare pill."""
+    for asset_id, progress in (
+        ('downloading', {'bytes': 420, 'total': 1000, 'percent': 42}),
+        ('unsized', {'bytes': 420, 'total': None, 'percent': None}),
+    ):
+        Asset.objects.create(
+            asset_id=asset_id,
+            name=asset_id,
+            uri=f'/data/anthias_assets/{asset_id}.mp4',
+            mimetype='video',
+            duration=0,
+            is_processing=True,
+            play_order=0,
+        )
+        asset_rows.set_download_progress(asset_id, progress)
+    body = client.get(reverse('anthias_app:assets_table')).content.decode()
+    assert body.count('Processing 42%') == 1
+    assert 'Processing None' not in body
+    assert body.count('</i>Processing</span>') == 1
+
+
 @pytest.mark.django_db
 def test_asset_row_no_error_pill_when_metadata_clean(
     client: Client, asset: Asset
@@ -185,6 +209,82 @@ def test_asset_row_no_error_pill_when_metadata_clean(
     assert 'activity-toggle' in body
 
 
+@pytest.mark.django_db
+def test_inactive_section_is_paged(client: Client, asset: Asset) -> None:
+    for n in range(5):
+        Asset.objects.create(
+            asset_id=f'off-{n}', name=f'off {n}', play_order=n
+        )
+    with mock.patch.object(page_context, 'INACTIVE_PAGE_SIZE', 2):
+        ctx = page_context.assets()
+        assert [a.asset_id for a in ctx['inactive_assets']] == [
+            'off-0',
+            'off-1',
+        ]
+        assert (ctx['inactive_count'], ctx['inactive_hidden']) == (5, 3)
+        body = client.get(reverse('anthias_app:assets_table')).content
+        assert b'Show more (3 hidden)' in body
+        assert b'5 items' in body
+        # The table's hx-headers carries the expanded limit back.
+        more = client.get(
+            reverse('anthias_app:assets_table'),
+            HTTP_X_ASSET_INACTIVE_LIMIT='4',
+        ).content
+    assert b'off-3' in more and b'off-4' not in more
+    assert b'Show more (1 hidden)' in more
+
+
+@pytest.mark.django_db
+def test_asset_rows_are_cached_per_revision(
+    client: Client, asset: Asset
+) -> None:
+    from django.template.loader import render_to_string
+
+    from anthias_server.app import asset_rows
+
+    asset_rows.clear()
+    with (
+        mock.patch(
+            'anthias_server.app.asset_rows.render_to_string',
+            wraps=render_to_string,
+        ) as render,
+        # Pin the minute the revision is bucketed by.
+        mock.patch(
+            'anthias_server.app.asset_rows.time.time', return_value=60.0
+        ),
+    ):
+        client.get(reverse('anthias_app:assets_table'))
+        again = client.get(reverse('anthias_app:assets_table')).content
+        assert render.call_count == 1
+        Asset.objects.filter(asset_id=asset.asset_id).update(name='Renamed')
+        renamed = client.get(reverse('anthias_app:assets_table')).content
+        assert render.call_count == 2
+    assert b'Renamed' in renamed
+    # The cached row still carries a real CSRF token, not the slot.
+    assert b'csrf-slot-' not in again
+    assert b'name="csrfmiddlewaretoken"' in again
+
+
+@pytest.mark.django_db
+def test_asset_row_partial(client: Client, asset: Asset) -> None:
+    url = reverse('anthias_app:asset_row', args=[asset.asset_id])
+    response = client.get(url, {'section': 'active'})
+    assert response.status_code == 200
+    body = response.content.decode()
+    assert body.lstrip().startswith('<tr data-asset-id="')
+    assert (asset.name or '') in body
+
+    # Moved to the other section, or gone: ask for a full refresh.
+    moved = client.get(url, {'section': 'inactive'})
+    assert moved.status_code == 204
+    assert moved['HX-Trigger'] == 'refresh-assets'
+    gone = client.get(
+        reverse('anthias_app:asset_row', args=['nope']),
+        {'section': 'inactive'},
+    )
+    assert gone.status_code == 204
+
+
 # ---------------------------------------------------------------------------
 # Page-context helpers — lightweight unit tests that bypass the HTTP
 # layer so coverage of the tiny pure-Python functions doesn't depend on
@@ -2377,7 +2477,7 @@ def test_assets_upload_rejects_unknown_extension(client: Client) -> None:
 
 @pytest.mark.django_db
 def test_assets_upload_disk_full_shows_toast_not_500(client: Client) -> None:
-    """ENOSPC while copying the upload into assetdir must surface as
+    """ENOSPC while staging the upload in assetdir must surface as
     the disk-full toast on the table partial, with no row persisted
     — not an unhandled 500 (Sentry ANTHIAS-3K)."""
     import errno
@@ -2385,7 +2485,7 @@ def test_assets_upload_disk_full_shows_toast_not_500(client: Client) -> None:
     from django.core.files.uploadedfile import SimpleUploadedFile
 
     with mock.patch(
-        'anthias_server.app.views.open',
+        'anthias_server.app.uploads.open',
         side_effect=OSError(errno.ENOSPC, 'No space left on device'),
         create=True,
     ):
@@ -2449,14 +2549,16 @@ def test_assets_upload_disk_full_during_write_cleans_up_partial(
     from django.core.files.uploadedfile import SimpleUploadedFile
 
     write_fails = mock.mock_open()
-    # The view streams chunks via f.writelines(...); that is where the
-    # simulated ENOSPC must surface.
-    write_fails.return_value.writelines.side_effect = OSError(
+    # The upload handler streams chunks via f.write(...) (hashing each
+    # on the way); that is where the simulated ENOSPC must surface.
+    write_fails.return_value.write.side_effect = OSError(
         errno.ENOSPC, 'No space left on device'
     )
     with (
-        mock.patch('anthias_server.app.views.open', write_fails, create=True),
-        mock.patch('anthias_server.app.views.remove') as mock_remove,
+        mock.patch(
+            'anthias_server.app.uploads.open', write_fails, create=True
+        ),
+        mock.patch('anthias_server.app.uploads.remove') as mock_remove,
     ):
         response = client.post(
             reverse('anthias_app:assets_upload'),
@@ -2518,24 +2620,24 @@ def test_settings_recover_invalid_archive_warns_not_error(
 
 @pytest.mark.django_db
 def test_write_endpoint_fires_websocket_notify(
-    client: Client, asset: Asset
+    client: Client, asset: Asset, django_capture_on_commit_callbacks: Any
 ) -> None:
-    """Every successful write goes through _asset_table_response which
-    must fan a refresh nudge over the Channels group so connected
-    browsers repaint without waiting for the 5s poll."""
+    """A committed write is sent down the dashboard's change stream so
+    connected browsers repaint the row without waiting for the poll."""
     with (
         mock.patch(
-            'anthias_server.app.consumers.notify_asset_update'
-        ) as notify_mock,
+            'anthias_server.app.consumers.publish_asset_change'
+        ) as publish_mock,
         mock.patch(
             'anthias_server.settings.ViewerPublisher.send_to_viewer',
             return_value=None,
         ),
+        django_capture_on_commit_callbacks(execute=True),
     ):
         client.post(
             reverse('anthias_app:assets_toggle', args=[asset.asset_id])
         )
-    notify_mock.assert_called()
+    publish_mock.assert_called_once_with('updated', [asset.asset_id])
 
 
 @pytest.mark.parametrize(
@@ -2827,6 +2929,101 @@ def test_assets_upload_jpeg_skips_normalization(client: Client) -> None:
     video_delay.assert_not_called()
 
 
+@pytest.mark.django_db
+def test_assets_upload_stores_identical_content_once(
+    client: Client, tmp_path: Any
+) -> None:
+    """The upload is hashed as it's written; a second upload of the
+    same bytes becomes a link to the first's blob."""
+    import hashlib
+    import os
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    body = b'\xff\xd8\xff\xe0\x00\x10JFIF'
+    with (
+        mock.patch.dict(settings, {'assetdir': str(tmp_path)}),
+        mock.patch(
+            'anthias_server.settings.ViewerPublisher.send_to_viewer',
+            return_value=None,
+        ),
+    ):
+        for _ in range(2):
+            client.post(
+                reverse('anthias_app:assets_upload'),
+                data={
+                    'file_upload': SimpleUploadedFile(
+                        'photo.jpg', body, content_type='image/jpeg'
+                    ),
+                },
+            )
+
+    first, second = Asset.objects.filter(mimetype='image')
+    assert first.md5 == second.md5 == hashlib.md5(body).hexdigest()
+    assert first.uri != second.uri
+    assert os.path.samefile(first.uri or '', second.uri or '')
+
+
+@pytest.mark.django_db
+def test_assets_upload_streams_into_assetdir(
+    client: Client, tmp_path: Any
+) -> None:
+    """The upload lands in assetdir under its final name with no spool
+    copy left behind, typed by its bytes rather than its filename."""
+    import os
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    body = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+    with (
+        mock.patch.dict(settings, {'assetdir': str(tmp_path)}),
+        mock.patch(
+            'anthias_server.settings.ViewerPublisher.send_to_viewer',
+            return_value=None,
+        ),
+        mock.patch(
+            'django.core.files.uploadhandler.TemporaryFileUploadHandler'
+            '.new_file'
+        ) as spool,
+    ):
+        client.post(
+            reverse('anthias_app:assets_upload'),
+            data={
+                'file_upload': SimpleUploadedFile(
+                    'export.dat', body, content_type='application/octet-stream'
+                ),
+            },
+        )
+
+    spool.assert_not_called()
+    created = Asset.objects.get(mimetype='image')
+    assert created.uri and created.uri.endswith('.png')
+    assert sorted(os.listdir(tmp_path)) == [
+        '.blobs',
+        os.path.basename(created.uri),
+    ]
+
+
+@pytest.mark.django_db
+def test_assets_upload_rejection_leaves_no_staged_file(
+    client: Client, tmp_path: Any
+) -> None:
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    with mock.patch.dict(settings, {'assetdir': str(tmp_path)}):
+        client.post(
+            reverse('anthias_app:assets_upload'),
+            data={
+                'file_upload': SimpleUploadedFile(
+                    'notes.txt', b'plain text', content_type='text/plain'
+                ),
+            },
+        )
+
+    assert Asset.objects.count() == 0
+    assert list(tmp_path.iterdir()) == []
+
+
 # ---------------------------------------------------------------------------
 # Schedule-window template filter (status dot + relative phrasing)
 
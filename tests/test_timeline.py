@@ -0,0 +1,191 @@
+from datetime import datetime, time, timedelta
+from typing import Any
+
+import pytest
+from django.utils import timezone
+
+from anthias_server.app.models import Asset
+from anthias_server.app.timeline import (
+    TIMELINE_HORIZON_DAYS,
+    active_intervals,
+    compile_timeline,
+    patch_timeline,
+)
+
+
+def _aware(
+    year: int, month: int, day: int, hour: int = 0, minute: int = 0
+) -> datetime:
+    return timezone.make_aware(
+        datetime(year, month, day, hour, minute),  # noqa: DTZ001
+        timezone.get_current_timezone(),
+    )
+
+
+def _asset(asset_id: str, **overrides: Any) -> Asset:
+    fields: dict[str, Any] = {
+        'asset_id': asset_id,
+        'name': asset_id,
+        'uri': 'https://example.com',
+        'mimetype': 'web',
+        'duration': 10,
+        'is_enabled': True,
+        'start_date': _aware(2025, 1, 1),
+        'end_date': _aware(2027, 1, 1),
+        'play_days': '[1, 2, 3, 4, 5, 6, 7]',
+    }
+    fields.update(overrides)
+    return Asset(**fields)
+
+
+def test_unwindowed_asset_is_its_date_range() -> None:
+    asset = _asset('a')
+    tz = timezone.get_current_timezone()
+    now = _aware(2026, 1, 5, 12)
+    assert active_intervals(asset, now, now + timedelta(days=7), tz) == [
+        (asset.start_date, asset.end_date)
+    ]
+
+
+def test_consecutive_play_days_merge_into_one_interval() -> None:
+    asset = _asset('a', play_days='[1, 2]')
+    tz = timezone.get_current_timezone()
+    now = _aware(2026, 1, 5, 12)  # Monday
+    intervals = active_intervals(asset, now, now + timedelta(days=7), tz)
+    assert intervals[0] == (_aware(2026, 1, 5), _aware(2026, 1, 7))
+    assert intervals[1][0] == _aware(2026, 1, 12)
+
+
+def test_overnight_window_spans_midnight() -> None:
+    asset = _asset(
+        'a',
+        play_days='[1]',
+        play_time_from=time(22, 0),
+        play_time_to=time(6, 0),
+    )
+    tz = timezone.get_current_timezone()
+    now = _aware(2026, 1, 6, 2)  # Tue 02:00, inside Monday's window
+    intervals = active_intervals(asset, now, now + timedelta(days=7), tz)
+    assert intervals[0] == (_aware(2026, 1, 5, 22), _aware(2026, 1, 6, 6))
+
+
+def test_intervals_are_clipped_to_the_date_range() -> None:
+    asset = _asset(
+        'a',
+        play_time_from=time(9, 0),
+        play_time_to=time(17, 0),
+        start_date=_aware(2026, 1, 5, 12),
+        end_date=_aware(2026, 1, 6, 10),
+    )
+    tz = timezone.get_current_timezone()
+    now = _aware(2026, 1, 5, 8)
+    assert active_intervals(asset, now, now + timedelta(days=7), tz) == [
+        (_aware(2026, 1, 5, 12), _aware(2026, 1, 5, 17)),
+        (_aware(2026, 1, 6, 9), _aware(2026, 1, 6, 10)),
+    ]
+
+
+@pytest.mark.django_db
+def test_timeline_agrees_with_is_active() -> None:
+    """Walk a week in 15-minute steps across a mix of windows and check
+    the compiled timeline against ``Asset.is_active`` at every step.
+
+    Date bounds sit off the step grid: the timeline treats intervals as
+    ``[start, end)`` while ``is_active`` excludes the exact
+    ``start_date`` instant, a one-microsecond difference nobody sees.
+    """
+    rows = [
+        _asset('plain'),
+        _asset('weekdays', play_days='[1, 2, 3, 4, 5]'),
+        _asset('office', play_time_from=time(9), play_time_to=time(17)),
+        _asset(
+            'night',
+            play_days='[5, 6]',
+            play_time_from=time(22),
+            play_time_to=time(3),
+        ),
+        _asset(
+            'brief',
+            start_date=_aware(2026, 1, 6, 13, 5),
+            end_date=_aware(2026, 1, 8, 11),
+            play_time_from=time(10, 30),
+            play_time_to=time(14, 45),
+        ),
+        _asset('future', start_date=_aware(2026, 1, 9, 7, 5)),
+        _asset('disabled', is_enabled=False),
+    ]
+    for row in rows:
+        row.save()
+
+    start = _aware(2026, 1, 5)
+    timeline = compile_timeline(start)
+    db_rows = list(Asset.objects.order_by('play_order'))
+
+    step = start
+    while step < start + timedelta(days=TIMELINE_HORIZON_DAYS):
+        active, deadline = timeline.evaluate(step)
+        expected = {a.asset_id for a in db_rows if a.is_active(now=step)}
+        assert {a['asset_id'] for a in active} == expected, step
+        assert deadline is not None
+        assert deadline > step
+        step += timedelta(minutes=15)
+
+
+@pytest.mark.django_db
+def test_expired_assets_are_not_compiled() -> None:
+    _asset(
+        'old',
+        start_date=_aware(2024, 1, 1),
+        end_date=_aware(2024, 2, 1),
+    ).save()
+    timeline = compile_timeline(_aware(2026, 1, 5))
+    assert timeline.entries == []
+    assert timeline.boundaries == []
+    assert timeline.refresh_at is None
+
+
+@pytest.mark.django_db
+def test_windowed_asset_schedules_a_recompile() -> None:
+    _asset('a', play_days='[1]').save()
+    now = _aware(2026, 1, 5, 12)
+    timeline = compile_timeline(now)
+    assert timeline.refresh_at == now + timedelta(days=TIMELINE_HORIZON_DAYS)
+    assert timeline.boundaries[-1] == timeline.refresh_at
+    assert not timeline.is_stale(now)
+    assert timeline.is_stale(timeline.refresh_at)
+
+
+@pytest.mark.django_db
+def test_timeline_goes_stale_when_timezone_changes() -> None:
+    _asset('a').save()
+    now = _aware(2026, 1, 5, 12)
+    timeline = compile_timeline(now)
+    timezone.activate('Pacific/Auckland')
+    try:
+        assert timeline.is_stale(now)
+    finally:
+        timezone.deactivate()
+
+
+@pytest.mark.django_db
+def test_patched_timeline_matches_a_fresh_compile() -> None:
+    _asset('a', play_order=0).save()
+    _asset('b', play_order=1, play_days='[2]').save()
+    _asset('c', play_order=2).save()
+    now = _aware(2026, 1, 5, 12)
+    timeline = compile_timeline(now)
+
+    Asset.objects.filter(asset_id='a').update(play_order=3)
+    Asset.objects.filter(asset_id='b').update(play_days='[1]')
+    Asset.objects.filter(asset_id='c').update(is_enabled=False)
+    _asset(
+        'd', play_order=1, play_time_from=time(13), play_time_to=time(14)
+    ).save()
+
+    patched = patch_timeline(timeline, ['a', 'b', 'c', 'd'], now)
+    fresh = compile_timeline(now)
+    assert [e.asset for e in patched.entries] == [
+        e.asset for e in fresh.entries
+    ]
+    assert patched.boundaries == fresh.boundaries
+    assert patched.refresh_at == fresh.refresh_at
@@ -0,0 +1,59 @@
+import struct
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from anthias_server.app import uploads
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new('RGB', (width, height)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _mp4_head(width: int, height: int) -> bytes:
+    ftyp = struct.pack('>I', 20) + b'ftypisom' + b'\x00' * 8
+    # A version-0 track header: 84 bytes of fields, then width/height
+    # as 16.16 fixed point.
+    tkhd = (
+        b'tkhd' + b'\x00' * 76 + struct.pack('>II', width << 16, height << 16)
+    )
+    moov = b'moov' + struct.pack('>I', len(tkhd) + 4) + tkhd
+    return ftyp + struct.pack('>I', len(moov) + 4) + moov
+
+
+@pytest.mark.parametrize(
+    ('head', 'expected'),
+    [
+        (b'\xff\xd8\xff\xe0\x00\x10JFIF', ('image/jpeg', '.jpg')),
+        (b'\x89PNG\r\n\x1a\n', ('image/png', '.png')),
+        (b'RIFF\x00\x00\x00\x00WEBPVP8 ', ('image/webp', '.webp')),
+        (b'\x00\x00\x00\x18ftypheic', ('image/heic', '.heic')),
+        (b'\x00\x00\x00\x18ftypavif', ('image/avif', '.avif')),
+        (b'\x00\x00\x00\x14ftypqt  ', ('video/quicktime', '.mov')),
+        (b'\x00\x00\x00\x18ftypmp42', ('video/mp4', '.mp4')),
+        (b'\x1a\x45\xdf\xa3\x9f\x42\x82\x84webm', ('video/webm', '.webm')),
+        (b'<?xml version="1.0"?>\n<svg xmlns=""/>', ('image/svg+xml', '.svg')),
+        (b'BM' + b'\x00' * 12 + b'\x28\x00\x00\x00', ('image/bmp', '.bmp')),
+        (b'BMW is not a bitmap', None),
+        (b'plain text', None),
+    ],
+)
+def test_sniff(head: bytes, expected: tuple[str, str] | None) -> None:
+    assert uploads.sniff(head) == expected
+
+
+def test_image_dimensions_come_from_the_header() -> None:
+    head = _png(640, 360)
+    assert uploads.header_dimensions('image/png', head) == (640, 360)
+    assert uploads.header_dimensions('image/png', head[:10]) is None
+
+
+def test_video_dimensions_come_from_the_track_header() -> None:
+    head = _mp4_head(1920, 1080)
+    assert uploads.sniff(head) == ('video/mp4', '.mp4')
+    assert uploads.header_dimensions('video/mp4', head) == (1920, 1080)
+    # ``moov`` at the end of the file: nothing to read yet.
+    assert uploads.header_dimensions('video/mp4', head[:40]) is None
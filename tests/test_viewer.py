@@ -9,14 +9,27 @@ from unittest import mock
 import pytest
 
 import anthias_viewer as viewer
+from anthias_common import proof_of_play
 from anthias_server.app.models import DURATION_S_MAX
 from anthias_server.settings import settings
+from anthias_viewer import playback
 from anthias_viewer.scheduling import Scheduler
 from anthias_viewer.utils import get_skip_event
 
 logging.disable(logging.CRITICAL)
 
 
+@pytest.fixture(autouse=True)
+def _idle_prefetcher() -> Iterator[mock.Mock]:
+    """Keep ``asset_loop`` tests from spawning lookahead threads: the
+    prefetcher hands back each asset's own URI and warms nothing.
+    ``tests/test_prefetch.py`` covers the real one."""
+    prefetcher = mock.Mock(name='prefetcher')
+    prefetcher.resolve.side_effect = lambda asset: asset['uri']
+    with mock.patch.object(viewer, 'prefetcher', prefetcher):
+        yield prefetcher
+
+
 class _ViewerFixtures:
     u: Any
     m_scheduler: mock.Mock
@@ -47,6 +60,9 @@ def viewer_fixtures(
     # wait is a no-op. The dedicated _wait_for_wayland_socket tests set
     # their own env and don't use this fixture.
     monkeypatch.delenv('WAYLAND_DISPLAY', raising=False)
+    # setup() opens the proof-of-play ring under the configdir; keep
+    # it (and its flusher thread) out of the developer's ~/.anthias.
+    monkeypatch.setattr(proof_of_play, 'Recorder', mock.Mock(name='Recorder'))
     fixtures = _ViewerFixtures()
     original_splash_delay = viewer.SPLASH_DELAY
     viewer.SPLASH_DELAY = 0
@@ -85,6 +101,8 @@ def viewer_fixtures(
         yield fixtures
     finally:
         fixtures.u.SPLASH_DELAY = original_splash_delay
+        # Whatever setup() opened must not record the later tests.
+        fixtures.u.play_log = None
 
 
 def noop(*a: Any, **k: Any) -> None:
@@ -93,15 +111,13 @@ def noop(*a: Any, **k: Any) -> None:
 
 @mock.patch('anthias_viewer.constants.SERVER_WAIT_TIMEOUT', 0)
 def test_empty(viewer_fixtures: _ViewerFixtures) -> None:
-    m_asset_list = mock.Mock()
-    m_asset_list.return_value = ([], None)
+    m_compile = mock.Mock()
+    m_compile.return_value.evaluate.return_value = ([], None)
 
-    with mock.patch(
-        'anthias_viewer.scheduling.generate_asset_list', m_asset_list
-    ):
+    with mock.patch('anthias_server.app.playlist.compile_timeline', m_compile):
         viewer_fixtures.u.scheduler = Scheduler()
 
-        m_asset_list.assert_called_once()
+        m_compile.assert_called_once()
 
 
 @mock.patch('pydbus.SessionBus', mock.MagicMock())
@@ -309,6 +325,174 @@ def test_spawn_webview_once_missing_binary(
         viewer_fixtures.p_cmd.stop()
 
 
+# ---------------------------------------------------------------------------
+# Warm-spare webview
+# ---------------------------------------------------------------------------
+
+_SPARE_ENV = {'QT_QPA_PLATFORM': 'wayland', 'ANTHIAS_UA_TOKEN': 'Anthias/x'}
+
+
+@pytest.fixture
+def spare() -> Iterator[Any]:
+    """A ready spare launched with ``_SPARE_ENV``, which is also what a
+    fresh spawn would get."""
+    proc = mock.Mock(name='spare')
+    proc.is_alive.return_value = True
+    output = viewer._BoundedWebviewOutput()
+    output('Anthias standby ready\n')
+    standby = viewer._StandbyWebview(proc, output, dict(_SPARE_ENV))
+    with (
+        mock.patch.object(viewer, '_standby', standby),
+        mock.patch.object(
+            viewer, '_build_webview_env', return_value=dict(_SPARE_ENV)
+        ),
+        mock.patch.object(viewer, 'browser', None),
+    ):
+        yield standby
+
+
+def test_load_browser_promotes_the_standby(
+    viewer_fixtures: _ViewerFixtures, spare: Any
+) -> None:
+    # The bus handed it the name, so it has shown itself.
+    spare.output('Anthias service start\n')
+
+    viewer_fixtures.p_cmd.start()
+    viewer_fixtures.p_sleep.start()
+    try:
+        viewer.load_browser()
+    finally:
+        viewer_fixtures.p_sleep.stop()
+        viewer_fixtures.p_cmd.stop()
+
+    viewer_fixtures.m_cmd.assert_not_called()
+    assert viewer.browser is spare.proc
+    assert viewer._standby is None
+
+
+def test_load_browser_spawns_when_the_standby_does_not_take_over(
+    viewer_fixtures: _ViewerFixtures, spare: Any
+) -> None:
+    fresh = mock.Mock(name='fresh')
+    spare.proc.is_alive.side_effect = [True, False]
+    _capture_out_sink(viewer_fixtures, fresh, seed='Anthias service start')
+
+    viewer_fixtures.p_cmd.start()
+    viewer_fixtures.p_sleep.start()
+    try:
+        with mock.patch.object(
+            viewer, 'WEBVIEW_STANDBY_PROMOTE_TIMEOUT_SECONDS', 0
+        ):
+            viewer.load_browser()
+    finally:
+        viewer_fixtures.p_sleep.stop()
+        viewer_fixtures.p_cmd.stop()
+
+    spare.proc.terminate.assert_called_once()
+    assert viewer.browser is fresh
+
+
+def test_stale_standby_is_discarded_before_a_bounce(spare: Any) -> None:
+    live = mock.Mock(name='live')
+    spare.proc.is_alive.side_effect = [True, False]
+
+    with (
+        # Dark mode was toggled after the spare started.
+        mock.patch.object(
+            viewer,
+            '_build_webview_env',
+            return_value=dict(_SPARE_ENV, ANTHIAS_PREFER_DARK_MODE='1'),
+        ),
+        mock.patch.object(viewer, 'browser', live),
+        mock.patch.object(viewer, '_rotation_bounce_pending', True),
+    ):
+        viewer._consume_pending_rotation_bounce()
+
+    spare.proc.terminate.assert_called_once()
+    live.terminate.assert_called_once()
+    assert viewer._standby is None
+
+
+def test_spawn_standby_publishes_a_ready_spare(
+    viewer_fixtures: _ViewerFixtures,
+) -> None:
+    proc = mock.Mock(name='spare')
+    proc.is_alive.return_value = True
+    _capture_out_sink(viewer_fixtures, proc, seed='Anthias standby ready')
+
+    viewer_fixtures.p_cmd.start()
+    try:
+        with (
+            mock.patch.object(viewer, '_standby', None),
+            mock.patch.object(
+                viewer, '_standby_has_headroom', return_value=True
+            ),
+            mock.patch.object(
+                viewer, '_build_webview_env', return_value=dict(_SPARE_ENV)
+            ),
+        ):
+            viewer._spawn_standby_webview()
+            published = viewer._standby
+    finally:
+        viewer_fixtures.p_cmd.stop()
+
+    launch_env = viewer_fixtures.m_cmd.return_value.call_args.kwargs['_env']
+    assert launch_env == dict(_SPARE_ENV, ANTHIAS_WEBVIEW_STANDBY='1')
+    assert published is not None
+    assert published.proc is proc
+    # Compared against fresh spawns, which don't carry the flag.
+    assert published.env == _SPARE_ENV
+
+
+def test_standby_is_not_spawned_without_headroom(
+    viewer_fixtures: _ViewerFixtures,
+) -> None:
+    viewer_fixtures.p_cmd.start()
+    try:
+        with (
+            mock.patch.object(viewer, 'is_low_ram_device', return_value=False),
+            mock.patch(
+                'builtins.open',
+                mock.mock_open(read_data='MemAvailable:     524288 kB\n'),
+            ),
+        ):
+            viewer._spawn_standby_webview()
+    finally:
+        viewer_fixtures.p_cmd.stop()
+
+    viewer_fixtures.m_cmd.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ('low_ram', 'meminfo', 'expected'),
+    [
+        (False, 'MemAvailable:    2097152 kB\n', True),
+        (True, 'MemAvailable:    2097152 kB\n', False),
+        (False, 'MemTotal:    2097152 kB\n', False),
+    ],
+)
+def test_standby_headroom(low_ram: bool, meminfo: str, expected: bool) -> None:
+    with (
+        mock.patch.object(viewer, 'is_low_ram_device', return_value=low_ram),
+        mock.patch('builtins.open', mock.mock_open(read_data=meminfo)),
+    ):
+        assert viewer._standby_has_headroom() is expected
+
+
+def test_standby_is_opt_in_and_cage_only(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv('WAYLAND_DISPLAY', '/run/wayland-0')
+    monkeypatch.delenv('WEBVIEW_STANDBY', raising=False)
+    assert viewer._standby_enabled() is False
+
+    monkeypatch.setenv('WEBVIEW_STANDBY', '1')
+    assert viewer._standby_enabled() is True
+
+    monkeypatch.delenv('WAYLAND_DISPLAY')
+    assert viewer._standby_enabled() is False
+
+
 def test_bounded_webview_output_discards_old_data(
     viewer_fixtures: _ViewerFixtures,
 ) -> None:
@@ -1233,6 +1417,74 @@ def test_view_webpage_respawns_webview_on_mid_call_death(
     fake_bus.setReloadInterval.assert_called_once_with(30)
 
 
+def test_view_image_records_load_latency_and_respawns(
+    viewer_fixtures: _ViewerFixtures,
+) -> None:
+    """The load latency covers the whole wait before the image is up,
+    including the respawn of a webview found dead between assets."""
+    fake_bus = mock.Mock()
+    fake_browser = mock.Mock()
+    fake_browser.is_alive.return_value = False
+
+    with (
+        mock.patch.object(viewer_fixtures.u, 'browser_bus', fake_bus),
+        mock.patch.object(viewer_fixtures.u, 'browser', fake_browser),
+        mock.patch.object(viewer_fixtures.u, 'current_browser_url', None),
+        mock.patch.object(viewer_fixtures.u, 'load_browser'),
+        mock.patch.object(
+            viewer_fixtures.u, 'monotonic', side_effect=[10.0, 10.4]
+        ),
+        mock.patch.object(viewer_fixtures.u, 'playback_metrics') as metrics,
+    ):
+        viewer_fixtures.u.view_image('https://example.com/a.png')
+
+    metrics.increment.assert_called_once_with(
+        'webview_respawns', 'between_assets'
+    )
+    metrics.observe.assert_called_once_with('load_ms', 'image', mock.ANY)
+    assert metrics.observe.call_args.args[2] == pytest.approx(400)
+
+
+def test_view_image_unchanged_uri_records_nothing(
+    viewer_fixtures: _ViewerFixtures,
+) -> None:
+    """No load was issued, so there is no latency to record."""
+    fake_browser = mock.Mock()
+    fake_browser.is_alive.return_value = True
+    uri = 'https://example.com/a.png'
+
+    with (
+        mock.patch.object(viewer_fixtures.u, 'browser_bus', mock.Mock()),
+        mock.patch.object(viewer_fixtures.u, 'browser', fake_browser),
+        mock.patch.object(viewer_fixtures.u, 'current_browser_url', uri),
+        mock.patch.object(viewer_fixtures.u, 'playback_metrics') as metrics,
+    ):
+        viewer_fixtures.u.view_image(uri)
+
+    metrics.observe.assert_not_called()
+
+
+def test_mid_call_respawn_is_counted(
+    viewer_fixtures: _ViewerFixtures,
+) -> None:
+    fake_bus = mock.Mock()
+    fake_bus.loadPage.side_effect = [RuntimeError(_NOREPLY_ERROR), None]
+    fake_browser = mock.Mock()
+    fake_browser.is_alive.side_effect = [True, False]
+
+    with (
+        mock.patch.object(viewer_fixtures.u, 'browser_bus', fake_bus),
+        mock.patch.object(viewer_fixtures.u, 'browser', fake_browser),
+        mock.patch.object(viewer_fixtures.u, 'current_browser_url', None),
+        mock.patch.object(viewer_fixtures.u, 'load_browser'),
+        mock.patch.object(viewer_fixtures.u, 'playback_metrics') as metrics,
+    ):
+        viewer_fixtures.u.view_webpage('https://example.com', 0)
+
+    metrics.increment.assert_called_once_with('webview_respawns', 'mid_call')
+    metrics.observe.assert_called_once_with('load_ms', 'web', mock.ANY)
+
+
 def test_view_image_reraises_unrelated_dbus_error(
     viewer_fixtures: _ViewerFixtures,
 ) -> None:
@@ -1541,6 +1793,39 @@ def test_asset_loop_passes_nocache_flag_to_view_webpage() -> None:
     assert kwargs['nocache'] is True
 
 
+def test_asset_loop_plays_prefetched_copy_and_warms_next(
+    _idle_prefetcher: mock.Mock,
+) -> None:
+    """An image the prefetcher already fetched is shown from its local
+    copy, and the asset after it is handed over for warming."""
+    current = {
+        'asset_id': 'img',
+        'name': 'poster',
+        'uri': 'https://example.com/poster.jpg',
+        'mimetype': 'image',
+        'duration': 10,
+        'skip_asset_check': True,
+        'is_reachable': True,
+        'metadata': {},
+    }
+    upcoming = dict(current, asset_id='next')
+    scheduler = mock.Mock()
+    scheduler.get_next_asset.return_value = current
+    scheduler.peek_next_asset.return_value = upcoming
+    _idle_prefetcher.resolve.side_effect = None
+    _idle_prefetcher.resolve.return_value = '/data/prefetch-abc.jpg'
+    skip_event = mock.Mock()
+    skip_event.wait.return_value = False
+    with (
+        mock.patch('anthias_viewer.view_image') as view_image,
+        mock.patch('anthias_viewer.get_skip_event', return_value=skip_event),
+    ):
+        viewer.asset_loop(scheduler)
+    assert view_image.call_args.args[0] == '/data/prefetch-abc.jpg'
+    _idle_prefetcher.resolve.assert_called_once_with(current)
+    _idle_prefetcher.warm.assert_called_once_with(upcoming)
+
+
 def test_asset_loop_clamps_out_of_range_duration() -> None:
     """A stored duration past C ``PyTime_t`` range must not crash the
     loop (Sentry ANTHIAS-3E) — ``threading.Event.wait`` raises
@@ -3865,6 +4150,112 @@ def test_unavailable_asset_logs_once_per_offender(caplog: Any) -> None:
     assert '/missing/two.png' in msgs[1]
 
 
+# ---------------------------------------------------------------------------
+# Proof of play
+# ---------------------------------------------------------------------------
+
+_PLAYED = {
+    'asset_id': 'played',
+    'name': 'poster',
+    'uri': 'https://example.com/poster.jpg',
+    'mimetype': 'image',
+    'duration': 10,
+    'skip_asset_check': True,
+    'is_reachable': True,
+    'metadata': {},
+}
+
+
+@contextlib.contextmanager
+def _playing(asset: dict[str, Any], wait: Any) -> Iterator[mock.Mock]:
+    scheduler = mock.Mock()
+    scheduler.get_next_asset.return_value = asset
+    with (
+        _reset_log_latches(),
+        mock.patch.object(viewer, 'play_log') as play_log,
+        mock.patch.object(viewer, 'view_image'),
+        mock.patch.object(viewer, 'view_webpage'),
+        mock.patch.object(viewer, '_wayland_output_watchdog'),
+        mock.patch.object(viewer, '_consume_pending_rotation_bounce'),
+        mock.patch.object(viewer, 'get_skip_event') as skip,
+    ):
+        skip.return_value.wait.side_effect = wait
+        play_log.scheduler = scheduler
+        yield play_log
+
+
+def test_asset_loop_records_a_completed_rotation() -> None:
+    with _playing(_PLAYED, lambda timeout: False) as play_log:
+        viewer.asset_loop(play_log.scheduler)
+
+    play_log.record.assert_called_once()
+    args, kwargs = play_log.record.call_args
+    assert args == ('played',)
+    assert kwargs['outcome'] == 'completed'
+    assert kwargs['skip_reason'] == ''
+    assert kwargs['kind'] == 'image'
+    assert kwargs['end_ms'] >= kwargs['start_ms']
+
+
+def test_asset_loop_records_why_a_rotation_was_skipped() -> None:
+    def operator_presses_next(timeout: float) -> bool:
+        playback.skip_asset(mock.Mock())
+        return True
+
+    web = dict(_PLAYED, mimetype='webpage')
+    with _playing(web, operator_presses_next) as play_log:
+        viewer.asset_loop(play_log.scheduler)
+
+    kwargs = play_log.record.call_args.kwargs
+    assert kwargs['outcome'] == 'skipped'
+    assert kwargs['skip_reason'] == 'next'
+    assert kwargs['kind'] == 'web'
+    # Taken with the record, so it can't leak into the next one.
+    assert playback.take_skip_reason() == ''
+
+
+def test_asset_loop_records_a_failed_rotation() -> None:
+    with (
+        _playing(_PLAYED, lambda timeout: False) as play_log,
+        mock.patch.object(
+            viewer, 'view_image', side_effect=RuntimeError('webview gone')
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        viewer.asset_loop(play_log.scheduler)
+
+    assert play_log.record.call_args.kwargs['outcome'] == 'failed'
+
+
+def test_asset_loop_records_an_unavailable_asset_once() -> None:
+    with (
+        _playing(_PLAYED, lambda timeout: False) as play_log,
+        mock.patch.object(viewer, '_asset_is_displayable', return_value=False),
+        mock.patch.object(viewer, '_asset_is_local_file', return_value=True),
+    ):
+        for _ in range(3):
+            viewer.asset_loop(play_log.scheduler)
+
+    play_log.record.assert_called_once()
+    kwargs = play_log.record.call_args.kwargs
+    assert kwargs['outcome'] == 'unavailable'
+    assert kwargs['end_ms'] == kwargs['start_ms']
+
+
+def test_display_commands_note_their_skip_reason() -> None:
+    with (
+        mock.patch.object(viewer, '_is_wayland_board', return_value=False),
+        mock.patch.object(viewer, 'get_skip_event'),
+    ):
+        viewer.blank_display()
+        assert playback.take_skip_reason() == 'blank'
+        viewer.unblank_display()
+        assert playback.take_skip_reason() == 'unblank'
+    playback.stop_loop(mock.Mock())
+    assert playback.take_skip_reason() == 'stop'
+    get_skip_event().clear()
+
+
 def test_load_browser_short_circuits_a_vanished_display(caplog: Any) -> None:
     """Integration for the guard: the retry loop must abandon its budget
     on the FIRST failure, with the distinct message.
@@ -23,16 +23,11 @@ from anthias_common.internal_auth import (
     internal_auth_token,
 )
 from anthias_server.app.models import Asset
+from anthias_server.settings import PLAYLIST_REVISION_KEY
 from anthias_server.settings import settings as anthias_settings
 
 _DEFAULT_PLAY_DAYS = '[1, 2, 3, 4, 5, 6, 7]'
 
-# Mirrors anthias_server.api.views.v2._VIEWER_WINDOWED_DEADLINE_CAP_S
-# — duplicated here rather than imported because importing a private
-# constant for a single assertion isn't worth the coupling; bump
-# both if it ever changes.
-_VIEWER_WINDOWED_DEADLINE_CAP_S = 60
-
 
 @pytest.fixture(autouse=True)
 def _internal_auth_secret() -> Iterator[None]:
@@ -210,12 +205,13 @@ def test_playlist_deadline_picks_inactive_start_date_when_scheduled(
 
 
 @pytest.mark.django_db
-def test_playlist_deadline_caps_when_asset_has_time_window(
+def test_playlist_deadline_is_the_time_window_edge(
     _restore_shuffle_setting: None,
 ) -> None:
     """An asset with a play_time window can transition active state
-    without crossing a start/end boundary — the deadline must
-    include a 60s cap so the viewer comes back to re-check."""
+    without crossing a start/end boundary — the deadline is the exact
+    moment the window closes, as the Python viewer's timeline has it,
+    rather than a polling cap."""
     anthias_settings['shuffle_playlist'] = False
     # Travel to a fixed moment so play_time_from/to behaviour is
     # deterministic regardless of when the test happens to run.
@@ -235,13 +231,12 @@ def test_playlist_deadline_caps_when_asset_has_time_window(
         )
     body = response.json()
     assert body['deadline'] is not None
-    # Time is frozen via ``time_machine.travel(..., tick=False)``, so
-    # the server's ``timezone.now()`` matches the test's ``now``
-    # exactly and the windowed cap should land at ``now + 60s`` with
-    # no slack to account for. Parse rather than string-compare so
-    # the assertion isn't sensitive to DRF's exact ISO format.
+    # Parse rather than string-compare so the assertion isn't
+    # sensitive to DRF's exact ISO format.
     deadline = datetime.fromisoformat(body['deadline'])
-    assert deadline == now + timedelta(seconds=_VIEWER_WINDOWED_DEADLINE_CAP_S)
+    assert deadline == timezone.localtime(now).replace(
+        hour=23, minute=59, second=0, microsecond=0
+    )
 
 
 @pytest.mark.django_db
@@ -266,6 +261,118 @@ def test_playlist_shuffles_when_setting_enabled(
     assert ids == [f'a{i}' for i in range(5)]
 
 
+def _get_playlist(etag: str | None = None) -> Any:
+    headers = _auth_headers()
+    if etag is not None:
+        headers['If-None-Match'] = etag
+    return Client().get('/api/v2/viewer/playlist', headers=headers)
+
+
+@pytest.mark.django_db
+def test_playlist_is_not_modified_while_nothing_changes(
+    _mock_redis: Any,
+    _restore_shuffle_setting: None,
+    django_assert_num_queries: Any,
+) -> None:
+    """A viewer polling with the ETag it was given gets a bare 304 —
+    no query, no serialisation — until something moves."""
+    anthias_settings['shuffle_playlist'] = False
+    _make(asset_id='a')
+    _mock_redis.set(PLAYLIST_REVISION_KEY, 1)
+
+    first = _get_playlist()
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('W/"')
+
+    with django_assert_num_queries(0):
+        again = _get_playlist(etag)
+    assert again.status_code == 304
+    assert again.headers['ETag'] == etag
+    assert not again.content
+
+    # A poll without the tag still gets the body, from the cache.
+    with django_assert_num_queries(0):
+        body = _get_playlist().json()
+    assert [a['asset_id'] for a in body['assets']] == ['a']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_playlist_etag_follows_asset_writes(
+    _restore_shuffle_setting: None,
+    django_assert_num_queries: Any,
+) -> None:
+    """A write bumps the playlist revision; the next poll re-reads just
+    the rows it names and comes back 200 under a new tag."""
+    anthias_settings['shuffle_playlist'] = False
+    _make(asset_id='a', play_order=0)
+    _make(asset_id='b', play_order=1)
+    etag = _get_playlist().headers['ETag']
+
+    Asset.objects.filter(asset_id='b').update(is_enabled=False)
+    with django_assert_num_queries(1):
+        response = _get_playlist(etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert [a['asset_id'] for a in response.json()['assets']] == ['a']
+
+
+@pytest.mark.django_db
+def test_playlist_etag_follows_the_schedule_and_settings(
+    _mock_redis: Any,
+    _restore_shuffle_setting: None,
+) -> None:
+    anthias_settings['shuffle_playlist'] = False
+    with time_machine.travel('2026-05-18 12:00:00+00:00', tick=False) as t:
+        now = timezone.now()
+        _make(asset_id='ending', end_date=now + timedelta(hours=1))
+        _mock_redis.set(PLAYLIST_REVISION_KEY, 1)
+        etag = _get_playlist().headers['ETag']
+
+        anthias_settings['shuffle_playlist'] = True
+        shuffled = _get_playlist(etag)
+        assert shuffled.status_code == 200
+        etag = shuffled.headers['ETag']
+
+        # Crossing the deadline is a new segment: the asset has ended.
+        t.move_to(now + timedelta(hours=1))
+        response = _get_playlist(etag)
+    assert response.status_code == 200
+    assert response.json()['assets'] == []
+
+
+@pytest.mark.django_db
+def test_playlist_etag_changes_with_the_epoch(
+    _mock_redis: Any,
+    _restore_shuffle_setting: None,
+) -> None:
+    """Redis lost its data and the counter is back at the number the
+    viewer's tag was issued under: the new epoch keeps that from
+    answering 304 for a different playlist."""
+    anthias_settings['shuffle_playlist'] = False
+    _make(asset_id='a')
+    _mock_redis.set(PLAYLIST_REVISION_KEY, 1)
+    etag = _get_playlist().headers['ETag']
+
+    _mock_redis.flushdb()
+    _mock_redis.set(PLAYLIST_REVISION_KEY, 1)
+    response = _get_playlist(etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_playlist_without_a_revision_is_not_cached() -> None:
+    """Without the change feed there's no telling a cached playlist
+    from a stale one, so every request is evaluated and none tagged."""
+    _make(asset_id='a')
+    response = _get_playlist()
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    _make(asset_id='b', play_order=1)
+    assert len(_get_playlist().json()['assets']) == 2
+
+
 # ---------------------------------------------------------------------------
 # /api/v2/viewer/settings
 # ---------------------------------------------------------------------------